@@ -4,13 +4,35 @@ API 라우터 모듈
 """
 import logging
 import time
-from fastapi import APIRouter, Request, Body, status
-from fastapi.responses import JSONResponse, Response
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Request, Depends, status
+from fastapi.responses import Response
 from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
-from app.models.requests import SokindRequest
+from app.core import codec
+from app.core.config import settings
+from app.core.codec import FastJSONResponse
+from app.core.metrics import get_metrics, render_metrics, stage_timer
+from app.core.tracing import start_span
+from app.models.base import SokindBaseModel
+from app.models.requests import SokindRequest, parse_specialized_request, request_errors
+from app.api.streaming_ingest import parse_streaming_request, use_streaming_ingest
 from app.services.message_service import MessageService
-from app.services.rabbitmq import get_rabbitmq_client
+from app.services.rabbitmq import get_rabbitmq_pool
+from app.services.async_rabbitmq import get_async_rabbitmq_client, get_lane_connection_stats
+from app.services.publish_batcher import get_publish_batcher_stats
+from app.services.topology import get_queue_topology_cache
+from app.services.spool import get_publish_spool_stats
+from app.services.backpressure import LoadShedError, get_publish_admission_stats
+from app.services.node_health import get_node_health_stats
+from app.services.deadline import PublishDeadlineExceededError
+from app.services.publish_lanes import get_publish_lane_stats
+from app.services.compression import get_compression_stats
+from app.services.claim_check import get_claim_check_stats
+from app.services.routing import get_routing_rules
+from app.services.idempotency import IdempotencyCache, get_idempotency_cache, get_idempotency_stats
+from app.services.runtime_metrics import refresh_runtime_gauges
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -25,24 +47,58 @@ def health_check() -> Response:
     )
 
 
+@router.get("/status/ready")
+def readiness_check(request: Request):
+    """준비 상태 확인 (시작 시 큐 토폴로지 선언 완료 여부)"""
+    ready = getattr(request.app.state, "ready", False)
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "starting",
+            "timestamp": int(time.time())
+        }
+    )
+
+
+def _lane_status() -> dict:
+    """publish 레인별 지표와 레인 연결 상태"""
+    lane_stats = get_publish_lane_stats()
+    connections = get_lane_connection_stats()
+    return {
+        lane: {**lane_stats.get(lane, {}), "connection": connections.get(lane)}
+        for lane in sorted(set(lane_stats) | set(connections))
+    }
+
+
 @router.get("/status/rabbitmq")
-def rabbitmq_status():
+async def rabbitmq_status():
     """RabbitMQ 클러스터 상태 확인"""
     try:
-        client = get_rabbitmq_client()
+        client = get_async_rabbitmq_client()
+        if not await client.connect():
+            raise ConnectionError("Failed to establish RabbitMQ connection")
         cluster_status = client.get_cluster_status()
+        pool = get_rabbitmq_pool()
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "status": "ok",
                 "cluster": cluster_status,
+                "pool": pool.get_stats(),
+                "lanes": _lane_status(),
+                "batching": get_publish_batcher_stats(),
+                "compression": get_compression_stats(),
+                "claim_check": get_claim_check_stats(),
+                "topology": get_queue_topology_cache().get_stats(),
+                "backpressure": get_publish_admission_stats(),
+                "health_probe": get_node_health_stats(),
                 "timestamp": int(time.time())
             }
         )
     except Exception as e:
         logger.error(f"Failed to get RabbitMQ cluster status: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             content={
                 "status": "error",
@@ -54,6 +110,106 @@ def rabbitmq_status():
 
 
 
+@router.get("/status/spool")
+def spool_status():
+    """로컬 스풀 상태 확인 (깊이, 가장 오래된 레코드 나이, 재전송 속도)"""
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "enabled": settings.spool_enabled,
+            "spool": get_publish_spool_stats(),
+            "timestamp": int(time.time())
+        }
+    )
+
+
+@router.get("/status/routing")
+def routing_status():
+    """라우팅 규칙 상태 확인 (규칙 파일, 재적재 이력, 규칙이 없어 default_queue로 간 조합)"""
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "routing": get_routing_rules().get_stats(),
+            "timestamp": int(time.time())
+        }
+    )
+
+
+@router.get("/status/idempotency")
+def idempotency_status():
+    """멱등성 캐시 상태 확인 (적중률, 항목 수, 추정 메모리, 공유 저장소 오류)"""
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "enabled": settings.idempotency_enabled,
+            "idempotency": get_idempotency_stats(),
+            "timestamp": int(time.time())
+        }
+    )
+
+
+@router.get("/metrics")
+def metrics() -> Response:
+    """
+    Prometheus 메트릭 (multiprocess 모드면 모든 gunicorn 워커 합산)
+    응답하는 워커의 게이지는 조회 시점 값으로 갱신, 다른 워커는 METRICS_REFRESH_INTERVAL 주기로 기록한 값
+    """
+    if get_metrics() is None:
+        return FastJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Metrics unavailable", "message": "metrics disabled or prometheus_client not installed", "status": 503},
+        )
+    refresh_runtime_gauges()
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+def _idempotency_cache(request: Request) -> Optional[IdempotencyCache]:
+    """호출자가 X-Request-ID를 보낸 요청의 멱등성 캐시 (비활성화되었거나 생성된 ID면 None)"""
+    if not settings.idempotency_enabled or not getattr(request.state, "request_id_supplied", False):
+        return None
+    return get_idempotency_cache()
+
+
+async def specialized_request_body(request: Request) -> SokindBaseModel:
+    """
+    요청 본문 bytes → 교육 타입별 특화 모델
+    
+    코덱으로 한 번 디코딩한 뒤 edu_type(+generation_type) 태그 유니온으로 한 번만 검증.
+    오류는 기존 SokindRequest 본문 검증과 같은 형태의 RequestValidationError로 변환
+    스트리밍 수집 대상이면 청크 단위로 파싱하고 원본 유지 필드는 request.state.raw_fields에 보관
+    """
+    if use_streaming_ingest(request):
+        # 스트리밍 수집은 본문 수신과 파싱이 겹치므로 수신 시간 포함
+        with stage_timer("validation"), start_span("validation", {"streaming": True}):
+            model, request.state.raw_fields = await parse_streaming_request(request)
+        return model
+    body = await request.body()
+    if not body:
+        raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
+    with stage_timer("validation"), start_span("validation", {"body_bytes": len(body)}):
+        try:
+            data = codec.loads(body)
+        except ValueError as e:
+            raise RequestValidationError(
+                [{
+                    "type": "json_invalid",
+                    "loc": ("body", getattr(e, "pos", 0)),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": getattr(e, "msg", str(e))},
+                }],
+                body=body,
+            ) from e
+        try:
+            return parse_specialized_request(data)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in request_errors(e)],
+                body=data,
+            ) from e
+
+
 @router.post(
     "/",
     responses={
@@ -69,6 +225,43 @@ def rabbitmq_status():
                 }
             }
         },
+        202: {
+            "description": "Accepted (broker unavailable, stored in local spool for later delivery)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "accepted",
+                        "status": 202,
+                        "request_id": "12345678-1234-1234-1234-123456789012",
+                        "spooled": True
+                    }
+                }
+            }
+        },
+        429: {
+            "description": "Too many requests (publish queue saturated for this priority, retry after Retry-After seconds)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Service overloaded",
+                        "message": "Publish queue saturated for low priority (pending=500, limit=500)",
+                        "status": 429
+                    }
+                }
+            }
+        },
+        503: {
+            "description": "Service unavailable (broker blocked, publish latency degraded or publish deadline exceeded, retry after Retry-After seconds)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Service overloaded",
+                        "message": "Publish queue saturated for low priority (pending=3, limit=0)",
+                        "status": 503
+                    }
+                }
+            }
+        },
         422: {
             "description": "Validation error",
             "content": {
@@ -96,13 +289,19 @@ def rabbitmq_status():
     },
     tags=["sokind_analysis"],
     summary="Sokind 분석 요청 처리",
-    description="다양한 교육 타입의 Sokind 분석 요청을 처리하고 RabbitMQ로 전송합니다."
+    description="다양한 교육 타입의 Sokind 분석 요청을 처리하고 RabbitMQ로 전송합니다.",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": SokindRequest.model_json_schema()}},
+        }
+    },
 )
-async def sokind(request: Request, request_body: SokindRequest = Body()):
+async def sokind(request: Request, specialized_model: SokindBaseModel = Depends(specialized_request_body)):
     """
     Sokind 분석 요청 엔드포인트
     
-    - 교육 타입별 특화 모델로 변환하여 처리
+    - 요청 본문을 교육 타입별 특화 모델로 바로 검증하여 처리
     - Request ID 추적 지원
     - 클라이언트 IP 추출 및 포함
     """
@@ -116,33 +315,336 @@ async def sokind(request: Request, request_body: SokindRequest = Body()):
         # Request ID 가져오기
         request_id = getattr(request.state, "request_id", None)
         
-        # 특화 모델로 변환 (자동 검증 포함)
-        specialized_model = request_body.to_specialized_model()
-        
         # 메시지 서비스를 통해 전송
         message_service = MessageService()
-        result = message_service.send_message_with_model(
-            model=specialized_model,
-            client_ip=client_ip,
-            request_id=request_id
-        )
         
-        return result
+        def send():
+            return message_service.send_message_with_model_async(
+                model=specialized_model,
+                client_ip=client_ip,
+                request_id=request_id,
+                raw_fields=getattr(request.state, "raw_fields", None)
+            )
         
+        # 이미 접수된 request_id의 재시도는 publish하지 않고 원래 결과 반환
+        idempotency = _idempotency_cache(request)
+        if idempotency is None:
+            result, replayed = await send(), False
+        else:
+            result, replayed = await idempotency.execute(request_id, send)
+        if replayed:
+            logger.info(
+                "Duplicate request replayed from idempotency cache",
+                extra={"request_id": request_id, "edu_type": getattr(specialized_model, "edu_type", None)},
+            )
+        
+        return FastJSONResponse(
+            status_code=result.get("status", status.HTTP_200_OK),
+            headers={"Idempotent-Replayed": "true"} if replayed else None,
+            content=result,
+        )
+        
+    except LoadShedError as e:
+        logger.warning(
+            f"Request shed: {str(e)}",
+            extra={
+                "request_id": getattr(request.state, "request_id", None),
+                "edu_type": getattr(specialized_model, "edu_type", None),
+            },
+        )
+        return FastJSONResponse(
+            status_code=e.status_code,
+            headers={"Retry-After": str(e.retry_after)},
+            content={
+                "detail": "Service overloaded",
+                "message": str(e),
+                "status": e.status_code
+            },
+        )
+    except PublishDeadlineExceededError as e:
+        logger.error(
+            f"Publish deadline exceeded: {str(e)}",
+            extra={
+                "request_id": getattr(request.state, "request_id", None),
+                "edu_type": getattr(specialized_model, "edu_type", None),
+            },
+        )
+        return FastJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(settings.load_shed_retry_after)},
+            content={
+                "detail": "Publish deadline exceeded",
+                "message": str(e),
+                "status": 503
+            },
+        )
     except Exception as e:
         logger.error(
             f"Error processing sokind request: {str(e)}",
             extra={
                 "request_id": getattr(request.state, "request_id", None),
-                "edu_type": getattr(request_body, "edu_type", None),
+                "edu_type": getattr(specialized_model, "edu_type", None),
             },
             exc_info=True,
         )
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "detail": "Internal server error",
                 "message": str(e),
                 "status": 500
             },
-        )
\ No newline at end of file
+        )
+
+
+class BatchTooLargeError(Exception):
+    """배치 본문이 항목 수/바이트 한도를 넘은 경우 (413)"""
+    pass
+
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+async def _read_batch_body(request: Request) -> bytes:
+    """BATCH_MAX_BYTES까지만 본문을 읽음 (Content-Length가 있으면 먼저 확인)"""
+    limit = settings.batch_max_bytes
+    content_length = request.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise BatchTooLargeError(f"Batch body exceeds {limit} bytes")
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise BatchTooLargeError(f"Batch body exceeds {limit} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _split_batch(request: Request, body: bytes) -> List[Tuple[Any, Optional[str]]]:
+    """
+    배치 본문 → 항목별 (디코딩 결과, 디코딩 오류) 목록
+    - NDJSON: 줄마다 독립적으로 디코딩 (빈 줄 무시, 잘못된 줄은 해당 항목만 실패)
+    - JSON 배열: 전체를 한 번에 디코딩 (실패 시 RequestValidationError)
+    """
+    content_type = request.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append((codec.loads(line), None))
+            except ValueError as e:
+                items.append((None, f"body JSON decode error: {getattr(e, 'msg', e)}"))
+        return items
+
+    try:
+        data = codec.loads(body) if body else None
+    except ValueError as e:
+        raise RequestValidationError(
+            [{
+                "type": "json_invalid",
+                "loc": ("body", getattr(e, "pos", 0)),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": getattr(e, "msg", str(e))},
+            }],
+            body=body,
+        ) from e
+    if not isinstance(data, list):
+        raise RequestValidationError(
+            [{"type": "list_type", "loc": ("body",), "msg": "Input should be a valid list", "input": data}]
+        )
+    return [(item, None) for item in data]
+
+
+def _batch_item_error(index: int, error: Exception) -> Dict[str, Any]:
+    """항목별 실패 결과 (POST /와 같은 detail/message/status 형태)"""
+    if isinstance(error, LoadShedError):
+        return {
+            "index": index,
+            "detail": "Service overloaded",
+            "message": str(error),
+            "status": error.status_code,
+            "retry_after": error.retry_after,
+        }
+    if isinstance(error, PublishDeadlineExceededError):
+        return {"index": index, "detail": "Publish deadline exceeded", "message": str(error), "status": 503}
+    return {"index": index, "detail": "Internal server error", "message": str(error), "status": 500}
+
+
+@router.post(
+    "/batch",
+    responses={
+        200: {
+            "description": "Batch processed (per-item results in request order)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "partial",
+                        "status": 200,
+                        "request_id": "12345678-1234-1234-1234-123456789012",
+                        "total": 2,
+                        "accepted": 1,
+                        "failed": 1,
+                        "items": [
+                            {
+                                "index": 0,
+                                "message": "success",
+                                "status": 200,
+                                "request_id": "12345678-1234-1234-1234-123456789012-0",
+                                "queue": "periodic_report",
+                                "priority": 9
+                            },
+                            {
+                                "index": 1,
+                                "detail": "Validation error",
+                                "message": "member_key Field required",
+                                "status": 422
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        413: {
+            "description": "Batch exceeds BATCH_MAX_ITEMS items or BATCH_MAX_BYTES bytes",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Batch too large",
+                        "message": "Batch has 1500 items (limit 1000)",
+                        "status": 413
+                    }
+                }
+            }
+        },
+        422: {
+            "description": "Body is not a JSON array (or NDJSON stream)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Validation error",
+                        "message": "body Input should be a valid list",
+                        "status": 422
+                    }
+                }
+            }
+        },
+    },
+    tags=["sokind_analysis"],
+    summary="Sokind 분석 요청 일괄 처리",
+    description=(
+        "여러 Sokind 분석 요청을 한 번의 HTTP 호출로 처리합니다. "
+        "JSON 배열 또는 NDJSON(Content-Type: application/x-ndjson) 본문을 받아 항목별로 독립 검증하고, "
+        "같은 큐로 가는 메시지는 묶어서 RabbitMQ로 전송한 뒤 항목별 결과를 요청 순서대로 반환합니다."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": SokindRequest.model_json_schema()}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def sokind_batch(request: Request):
+    """
+    Sokind 분석 요청 배치 엔드포인트
+    
+    - 항목마다 POST /와 같은 단일 검증 (실패한 항목만 422 결과)
+    - 항목 request_id: "{요청 request_id}-{index}" (같은 배치 재전송 시 같은 ID)
+    - 검증된 항목은 마이크로 배칭 단계로 동시에 전송 (부하 차단/데드라인/스풀 동작은 항목별)
+    """
+    request_id = getattr(request.state, "request_id", None)
+    client_ip = request.client.host if request.client else None
+    fwd_for = request.headers.get("X-Forwarded-For")
+    if fwd_for:
+        client_ip = fwd_for.split(",")[0].strip()
+
+    try:
+        items = _split_batch(request, await _read_batch_body(request))
+        if len(items) > settings.batch_max_items:
+            raise BatchTooLargeError(f"Batch has {len(items)} items (limit {settings.batch_max_items})")
+    except BatchTooLargeError as e:
+        return FastJSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": "Batch too large", "message": str(e), "status": 413},
+        )
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    valid = []
+    for index, (data, decode_error) in enumerate(items):
+        if decode_error is not None:
+            results[index] = {"index": index, "detail": "Validation error", "message": decode_error, "status": 422}
+            continue
+        try:
+            with stage_timer("validation"):
+                valid.append((index, parse_specialized_request(data)))
+        except ValidationError as e:
+            errors = request_errors(e)
+            loc = errors[0]["loc"] if errors else ()
+            results[index] = {
+                "index": index,
+                "detail": "Validation error",
+                "message": f'{loc[0] if loc else "body"} {errors[0]["msg"]}' if errors else "Validation error",
+                "status": 422,
+            }
+
+    # 이미 접수된 항목(같은 배치의 재시도)은 publish하지 않고 원래 결과 사용
+    # 전송 전에 항목별 key를 예약하므로 동시에 들어온 재시도는 먼저 온 요청의 결과를 기다림
+    idempotency = _idempotency_cache(request)
+    if idempotency is not None:
+        pending = []
+        for index, model in valid:
+            cached = await idempotency.reserve(f"{request_id}-{index}")
+            if cached is None:
+                pending.append((index, model))
+            else:
+                results[index] = {"index": index, **cached}
+        valid = pending
+
+    accepted: Dict[int, Dict[str, Any]] = {}
+    try:
+        sent = await MessageService().send_batch_async(
+            [(model, f"{request_id}-{index}" if request_id else None) for index, model in valid],
+            client_ip,
+        )
+        for (index, model), result in zip(valid, sent, strict=True):
+            if isinstance(result, Exception):
+                if not isinstance(result, LoadShedError):
+                    logger.error(
+                        f"Error processing batch item {index}: {result}",
+                        extra={"request_id": request_id, "edu_type": getattr(model, "edu_type", None)},
+                    )
+                results[index] = _batch_item_error(index, result)
+            else:
+                accepted[index] = result
+                results[index] = {"index": index, **result}
+    finally:
+        if idempotency is not None:
+            for index, _ in valid:
+                await idempotency.release(f"{request_id}-{index}", accepted.get(index))
+
+    failed = sum(1 for result in results if result["status"] >= 400)
+    shed = [result["retry_after"] for result in results if "retry_after" in result]
+    if failed:
+        logger.warning(
+            f"Batch processed with {failed}/{len(results)} failed items",
+            extra={"request_id": request_id},
+        )
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK,
+        headers={"Retry-After": str(max(shed))} if shed else None,
+        content={
+            "message": "partial" if failed else "success",
+            "status": 200,
+            "request_id": request_id,
+            "total": len(results),
+            "accepted": len(results) - failed,
+            "failed": failed,
+            "items": results,
+        },
+    )
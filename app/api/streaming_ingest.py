@@ -0,0 +1,167 @@
+"""
+스트리밍 요청 본문 수집 (POST /, STREAMING_INGEST_ENABLED=true)
+
+본문 전체를 버퍼링/디코딩하지 않고 ASGI receive 채널의 청크를 증분 스캐너로 멤버 단위로 처리
+- 라우팅 필드(edu_type, generation_type, request_type)는 도착 즉시 검증하여 실패 시 나머지 본문을 읽지 않고 422
+- 큰 목록 필드(List[Dict] 타입, STREAMING_INGEST_RAW_FIELD_BYTES 이상)는 원소 단위로 디코딩/검증만 하고
+  원본 bytes를 그대로 메시지 본문에 사용 (필드 전체의 Python 객체 트리를 만들지 않음)
+- 나머지 필드는 기존 경로와 같이 디코딩 후 태그 유니온으로 한 번에 검증
+"""
+import typing
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from app.core import codec
+from app.core.config import settings
+from app.core.streaming_json import JSONStreamError, Member, ObjectStreamScanner
+from app.models.base import SokindBaseModel
+from app.models.requests import SokindRequest, parse_specialized_request, request_errors, validate_request_field
+
+# 도착 즉시 검증하는 라우팅 필드
+ROUTING_FIELDS = frozenset({"edu_type", "generation_type", "request_type"})
+# 본문 키(필드명/별칭) → 필드명
+_FIELD_NAMES = {
+    key: name
+    for name, field in SokindRequest.model_fields.items()
+    for key in (name, field.alias)
+    if key
+}
+# 원본 bytes로 전달할 수 있는 목록 필드 (원소가 임의의 JSON 객체라 원소별 디코딩 성공 = 검증 통과)
+RAW_LIST_FIELDS = frozenset(
+    name for name, field in SokindRequest.model_fields.items()
+    if field.annotation == typing.Optional[typing.List[typing.Dict[str, Any]]]
+)
+
+
+def use_streaming_ingest(request: Request) -> bool:
+    """스트리밍 수집 대상 요청인지 (Content-Length가 없거나 STREAMING_INGEST_MIN_BYTES 이상)"""
+    if not settings.streaming_ingest_enabled:
+        return False
+    length = request.headers.get("content-length")
+    try:
+        return length is None or int(length) >= settings.streaming_ingest_min_bytes
+    except ValueError:
+        return True
+
+
+def _json_invalid(pos: int, msg: str) -> RequestValidationError:
+    return RequestValidationError(
+        [{
+            "type": "json_invalid",
+            "loc": ("body", pos),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": msg},
+        }]
+    )
+
+
+def _decode(raw: bytes, offset: int, loads: Callable[[bytes], Any] = codec.loads) -> Any:
+    try:
+        return loads(raw)
+    except ValueError as e:
+        raise _json_invalid(offset + getattr(e, "pos", 0), getattr(e, "msg", str(e))) from e
+
+
+class StreamingRequestParser:
+    """
+    청크 → 검증용 dict + 원본 유지 필드
+    - data: 디코딩한 필드 (원본 유지 필드는 None, SokindRequest에 없는 키는 디코딩만 하고 버림)
+    - raw_fields: 필드명 → 원본 JSON bytes
+    """
+
+    def __init__(self, raw_field_bytes: Optional[int] = None):
+        self.raw_field_bytes = settings.streaming_ingest_raw_field_bytes if raw_field_bytes is None else raw_field_bytes
+        self.data: Dict[str, Any] = {}
+        self.raw_fields: Dict[str, bytes] = {}
+        self.received = 0
+        self._scanner = ObjectStreamScanner()
+        self._started = False
+        # 최상위 값이 객체가 아닌 본문 (기존 경로와 같은 검증 오류를 내도록 모아서 디코딩)
+        self._body: Optional[bytearray] = None
+
+    def feed(self, chunk: bytes) -> None:
+        self.received += len(chunk)
+        if self._body is not None:
+            self._body += chunk
+            return
+        if not self._started:
+            head = chunk.lstrip(b" \t\n\r")
+            if head:
+                self._started = True
+                if head[:1] != b"{":
+                    self._body = bytearray(chunk)
+                    return
+        try:
+            members = self._scanner.feed(chunk)
+        except JSONStreamError as e:
+            raise _json_invalid(e.pos, e.msg) from e
+        for member in members:
+            self._add(member)
+
+    def close(self) -> SokindBaseModel:
+        """본문 끝: 구조 확인 후 특화 모델로 검증"""
+        if not self.received:
+            raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
+        if self._body is not None:
+            data = _decode(bytes(self._body), 0)
+        else:
+            try:
+                self._scanner.close()
+            except JSONStreamError as e:
+                raise _json_invalid(e.pos, e.msg) from e
+            data = self.data
+        try:
+            return parse_specialized_request(data)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in request_errors(e)],
+                body=data,
+            ) from e
+
+    def _add(self, member: Member) -> None:
+        name = _FIELD_NAMES.get(member.key)
+        if (
+            name in RAW_LIST_FIELDS
+            and member.elements is not None
+            and len(member.raw) >= self.raw_field_bytes
+        ):
+            # 원소 하나씩 디코딩하여 버림 (동시에 메모리에 있는 객체 트리는 원소 하나)
+            loads = codec.loader()
+            for start, end in member.elements:
+                _decode(member.raw[start:end], member.offset + start, loads)
+            self.data[member.key] = None
+            self.raw_fields[name] = member.raw
+            return
+
+        value = _decode(member.raw, member.offset)
+        if name is None:
+            return
+        # 같은 필드가 다시 나오면 마지막 값 사용 (JSON 디코딩과 동일)
+        self.raw_fields.pop(name, None)
+        if member.key in ROUTING_FIELDS:
+            try:
+                validate_request_field(member.key, value)
+            except ValidationError as e:
+                raise RequestValidationError(
+                    [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+                    body={member.key: value},
+                ) from e
+        self.data[member.key] = value
+
+
+async def parse_streaming_request(request: Request) -> Tuple[SokindBaseModel, Dict[str, bytes]]:
+    """
+    ASGI receive 채널에서 본문을 청크 단위로 읽어 특화 모델과 원본 유지 필드 반환
+
+    Raises:
+        RequestValidationError: 기존 본문 검증과 같은 형태 (라우팅 필드 오류는 본문을 끝까지 읽기 전에 발생)
+    """
+    parser = StreamingRequestParser()
+    async for chunk in request.stream():
+        if chunk:
+            parser.feed(chunk)
+    return parser.close(), parser.raw_fields
@@ -0,0 +1,121 @@
+"""
+JSON 코덱
+요청/메시지/응답 본문을 UTF-8 bytes로 직접 인코딩하는 단일 계층
+- orjson (설치된 경우, pip install cdl-gateway[fast-json])
+- pydantic: pydantic-core의 Rust 직렬화기 (추가 의존성 없음)
+- json: 표준 라이브러리 (기존 출력과 바이트 단위로 동일)
+"""
+import json
+from typing import Any, Callable, Dict, Optional
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+_DUMPS = {
+    "orjson": _orjson_dumps,
+    "pydantic": pydantic_core.to_json,
+    "json": _json_dumps,
+}
+_LOADS = {
+    "orjson": lambda data: orjson.loads(data),
+    "pydantic": pydantic_core.from_json,
+    "json": json.loads,
+}
+
+
+def codec_name() -> str:
+    """사용할 코덱 (JSON_CODEC=auto면 orjson, 없으면 pydantic)"""
+    name = settings.json_codec
+    if name == "auto" or (name == "orjson" and orjson is None):
+        return "orjson" if orjson is not None else "pydantic"
+    return name
+
+
+def dumps(obj: Any) -> bytes:
+    """객체 → UTF-8 JSON bytes (비ASCII 문자는 이스케이프하지 않음)"""
+    return _DUMPS[codec_name()](obj)
+
+
+def loads(data: bytes) -> Any:
+    """JSON bytes/str → 객체"""
+    return _LOADS[codec_name()](data)
+
+
+def loader() -> Callable[[bytes], Any]:
+    """현재 코덱의 loads 함수 (작은 조각을 반복 디코딩할 때 코덱 선택을 한 번만 수행)"""
+    return _LOADS[codec_name()]
+
+
+def model_to_bytes(
+    model: BaseModel,
+    extra: Optional[Dict[str, Any]] = None,
+    raw: Optional[Dict[str, bytes]] = None,
+) -> bytes:
+    """
+    모델(추가 필드 포함) → UTF-8 JSON bytes
+
+    model.dict() 후 json.dumps와 같은 키/값을 pydantic-core 직렬화 한 번으로 생성하고,
+    extra의 키(request_id 등)는 객체 끝에 이어 붙임. 모델에 이미 있는 키를 덮어써야
+    하거나 json 코덱을 사용하면 dict 경로로 처리
+
+    raw(필드명 → 원본 JSON bytes)의 필드는 모델 값 대신 원본 bytes를 그대로 이어 붙임
+    (스트리밍 수집에서 검증만 하고 디코딩 결과를 버린 큰 목록 필드, 모델에 없는 필드는 무시)
+    """
+    name = codec_name()
+    raw = {key: value for key, value in (raw or {}).items() if key in type(model).model_fields}
+    exclude = set(raw) or None
+    if extra and (name == "json" or any(
+        key in type(model).model_fields or key in (model.__pydantic_extra__ or {}) for key in extra
+    )):
+        body = model.model_dump(exclude=exclude)
+        body.update(extra)
+        return _append_members(_DUMPS[name](body), raw)
+    if name == "json":
+        data = _json_dumps(model.model_dump(exclude=exclude))
+    else:
+        data = model.__pydantic_serializer__.to_json(model, exclude=exclude)
+    if extra:
+        raw[None] = _DUMPS[name](extra)[1:-1]
+    return _append_members(data, raw)
+
+
+def _append_members(data: bytes, members: Dict[Optional[str], bytes]) -> bytes:
+    """
+    직렬화된 객체 끝에 멤버 이어 붙이기 (키가 None이면 이미 "키":값 형태인 조각)
+    큰 원본 조각을 한 번만 복사하도록 join 한 번으로 조립
+    """
+    if not members:
+        return data
+    parts = [data[:-1]]
+    for key, value in members.items():
+        if len(parts) > 1 or data != b"{}":
+            parts.append(b",")
+        if key is not None:
+            parts += (_json_dumps(key), b":")
+        parts.append(value)
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+class FastJSONResponse(JSONResponse):
+    """코덱으로 본문을 렌더링하는 JSON 응답"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
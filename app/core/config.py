@@ -1,7 +1,6 @@
 from typing import Optional, List, Dict, Any
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, validator
-import os
+from pydantic import Field
 
 # AWS Secrets Manager에서 환경변수 로드
 # Secrets 로드는 시작 스크립트에서 수행합니다.
@@ -11,6 +10,10 @@ class Settings(BaseSettings):
     app_name: str = "CDL Gateway"
     environment: str = Field("production", env="ENVIRONMENT")
     log_level: str = Field("INFO", env="LOG_LEVEL")
+    log_format: str = Field("json", env="LOG_FORMAT")  # json (extra 필드 포함 한 줄 JSON) / text
+    log_async: bool = Field(True, env="LOG_ASYNC")  # 큐 + 백그라운드 writer 스레드로 stdout 기록
+    log_queue_size: int = Field(10000, env="LOG_QUEUE_SIZE")  # 가득 차면 INFO 이하 기록은 버림
+    log_sample_rates: str = Field("", env="LOG_SAMPLE_RATES")  # logger별 INFO 이하 기록 비율 (예: "request=0.1,app.services.message_service=0.1")
 
     # API Keys
     openai_api_key: Optional[str] = Field(None, env="OPENAI_API_KEY")
@@ -36,7 +39,130 @@ class Settings(BaseSettings):
     rabbitmq_retry_attempts: int = Field(3, env="RABBITMQ_RETRY_ATTEMPTS")
     rabbitmq_retry_delay: float = Field(2.0, env="RABBITMQ_RETRY_DELAY")
     rabbitmq_heartbeat: int = Field(600, env="RABBITMQ_HEARTBEAT")
-    
+
+    # publish 데드라인 예산(초): 연결, 재시도 대기, confirm 대기를 모두 포함
+    publish_deadline_default: float = Field(5.0, env="PUBLISH_DEADLINE_DEFAULT")
+    # 교육 타입별 예산 (JSON, 예: {"4": 15.0}) - 지정하면 레인 기본 예산보다 우선
+    publish_deadline_by_edu_type: Dict[int, float] = Field(
+        default_factory=dict, env="PUBLISH_DEADLINE_BY_EDU_TYPE"
+    )
+    # 재시도 백오프 (full jitter): [0, min(cap, base * 2^attempt)]
+    publish_retry_backoff_base: float = Field(0.05, env="PUBLISH_RETRY_BACKOFF_BASE")
+    publish_retry_backoff_cap: float = Field(1.0, env="PUBLISH_RETRY_BACKOFF_CAP")
+
+    # 처리 유형별 publish 레인 (real_time / batch / scheduled): 레인마다 별도 연결/채널
+    publish_lanes_enabled: bool = Field(True, env="PUBLISH_LANES_ENABLED")
+    # 레인별 워커당 동시 publish 한도 (JSON)
+    publish_lane_concurrency: Dict[str, int] = Field(
+        default_factory=lambda: {"real_time": 512, "batch": 64, "scheduled": 32}, env="PUBLISH_LANE_CONCURRENCY"
+    )
+    # 레인별 기본 publish 시간 예산(초, JSON) - 배치/예약 작업은 더 길게
+    publish_lane_timeouts: Dict[str, float] = Field(
+        default_factory=lambda: {"real_time": 5.0, "batch": 15.0, "scheduled": 30.0}, env="PUBLISH_LANE_TIMEOUTS"
+    )
+
+    # 노드별 회로 차단기: 연속 실패 RABBITMQ_RETRY_ATTEMPTS회면 open, 이 시간(초) 후 half-open 시험
+    rabbitmq_breaker_open_timeout: float = Field(30.0, env="RABBITMQ_BREAKER_OPEN_TIMEOUT")
+
+    # 백그라운드 노드 헬스 프로버 (사용자 요청 대신 노드 복구/장애를 확인)
+    rabbitmq_health_probe_enabled: bool = Field(True, env="RABBITMQ_HEALTH_PROBE_ENABLED")
+    rabbitmq_health_probe_interval: float = Field(5.0, env="RABBITMQ_HEALTH_PROBE_INTERVAL")  # 프로브 주기(초)
+    rabbitmq_health_probe_timeout: float = Field(3.0, env="RABBITMQ_HEALTH_PROBE_TIMEOUT")  # 노드당 프로브 제한 시간(초)
+    # canary: 전용 큐로 publish(confirm) → get 왕복까지 확인
+    rabbitmq_canary_enabled: bool = Field(False, env="RABBITMQ_CANARY_ENABLED")
+    rabbitmq_canary_queue_prefix: str = Field("cdl-gateway.canary", env="RABBITMQ_CANARY_QUEUE_PREFIX")
+
+    # 워커별 연결/채널 풀 설정
+    rabbitmq_pool_size: int = Field(4, env="RABBITMQ_POOL_SIZE")  # 워커당 최대 연결 수
+    rabbitmq_pool_acquire_timeout: float = Field(5.0, env="RABBITMQ_POOL_ACQUIRE_TIMEOUT")  # 대여 대기 시간(초)
+    rabbitmq_pool_health_check_interval: float = Field(30.0, env="RABBITMQ_POOL_HEALTH_CHECK_INTERVAL")  # 헬스체크 주기(초)
+
+    # Publisher confirm 설정
+    rabbitmq_publisher_confirms: bool = Field(True, env="RABBITMQ_PUBLISHER_CONFIRMS")
+    rabbitmq_confirm_window: int = Field(256, env="RABBITMQ_CONFIRM_WINDOW")  # 미확인 publish 최대 개수
+    rabbitmq_confirm_timeout: float = Field(10.0, env="RABBITMQ_CONFIRM_TIMEOUT")  # ack 대기 시간(초)
+
+    # 노드 선택: 노드별 publish/confirm RTT EWMA 가중치
+    rabbitmq_node_rtt_alpha: float = Field(0.2, env="RABBITMQ_NODE_RTT_ALPHA")
+    # 리더 인지 publish: 큐의 quorum 리더 노드 연결로 publish (관리 API 필요)
+    rabbitmq_leader_aware: bool = Field(False, env="RABBITMQ_LEADER_AWARE")
+    rabbitmq_management_url: Optional[str] = Field(None, env="RABBITMQ_MANAGEMENT_URL")  # 예: https://host:15671
+    rabbitmq_node_names: Optional[str] = Field(None, env="RABBITMQ_NODE_NAMES")  # 노드 순서대로 rabbit@... 콤마 구분
+    rabbitmq_leader_refresh_interval: float = Field(60.0, env="RABBITMQ_LEADER_REFRESH_INTERVAL")  # 리더 맵 갱신 주기(초)
+
+    # 큐 토폴로지 캐시 (선언 확인된 큐 재확인 주기, 초)
+    rabbitmq_topology_cache_ttl: float = Field(3600.0, env="RABBITMQ_TOPOLOGY_CACHE_TTL")
+    # 시작 시 라우팅 규칙의 모든 큐를 선언 (인자 불일치 시 워커 기동 실패, 브로커 연결 실패 시 not ready로 재시도)
+    rabbitmq_declare_topology_on_startup: bool = Field(True, env="RABBITMQ_DECLARE_TOPOLOGY_ON_STARTUP")
+    rabbitmq_declare_retry_interval: float = Field(5.0, env="RABBITMQ_DECLARE_RETRY_INTERVAL")  # 선언 재시도 간격(초)
+
+    # JSON 코덱: auto(orjson, 없으면 pydantic) / orjson / pydantic / json(표준 라이브러리)
+    json_codec: str = Field("auto", env="JSON_CODEC")
+
+    # 마이크로 배칭 설정 (선택)
+    publish_batching_enabled: bool = Field(False, env="PUBLISH_BATCHING_ENABLED")
+    publish_batch_flush_interval_ms: float = Field(2.0, env="PUBLISH_BATCH_FLUSH_INTERVAL_MS")  # 최대 대기 시간
+    publish_batch_max_size: int = Field(64, env="PUBLISH_BATCH_MAX_SIZE")  # 배치당 최대 메시지 수
+    publish_batch_max_bytes: int = Field(1048576, env="PUBLISH_BATCH_MAX_BYTES")  # 배치당 최대 바이트 (1MB)
+
+    # 메시지 본문 압축 (컨슈머가 content_encoding을 처리할 수 있을 때 활성화)
+    publish_compression_enabled: bool = Field(False, env="PUBLISH_COMPRESSION_ENABLED")
+    publish_compression_threshold: int = Field(16384, env="PUBLISH_COMPRESSION_THRESHOLD")  # 압축 대상 최소 바이트 (16KB)
+    publish_compression_algorithm: str = Field("zlib", env="PUBLISH_COMPRESSION_ALGORITHM")  # zlib 또는 zstd (zstandard 필요)
+    publish_compression_level: Optional[int] = Field(None, env="PUBLISH_COMPRESSION_LEVEL")  # 없으면 알고리즘 기본값
+
+    # claim-check: 임계값 이상인 본문은 blob 저장소에 두고 포인터 메시지만 publish
+    claim_check_enabled: bool = Field(False, env="CLAIM_CHECK_ENABLED")
+    claim_check_threshold: int = Field(1048576, env="CLAIM_CHECK_THRESHOLD")  # 직렬화 본문 기준 (1MB)
+    claim_check_backend: str = Field("local", env="CLAIM_CHECK_BACKEND")  # local 또는 s3
+    claim_check_local_dir: str = Field("/var/lib/cdl-gateway/blobs", env="CLAIM_CHECK_LOCAL_DIR")  # 컨슈머와 공유하는 볼륨
+    claim_check_s3_bucket: Optional[str] = Field(None, env="CLAIM_CHECK_S3_BUCKET")
+    claim_check_s3_prefix: str = Field("cdl-gateway/claim-check", env="CLAIM_CHECK_S3_PREFIX")
+
+    # 부하 차단(load shedding) 설정: 워커당 진행 중 publish 상한과 우선순위별 입장 한도
+    load_shedding_enabled: bool = Field(True, env="LOAD_SHEDDING_ENABLED")
+    publish_queue_max_pending: int = Field(1000, env="PUBLISH_QUEUE_MAX_PENDING")  # 워커당 진행 중 publish 최대 수
+    load_shed_medium_threshold: float = Field(0.8, env="LOAD_SHED_MEDIUM_THRESHOLD")  # 중간 우선순위 입장 한도 (비율)
+    load_shed_low_threshold: float = Field(0.5, env="LOAD_SHED_LOW_THRESHOLD")  # 낮은 우선순위 입장 한도 (비율)
+    load_shed_latency_threshold_ms: float = Field(1000.0, env="LOAD_SHED_LATENCY_THRESHOLD_MS")  # publish 지연 EWMA 임계값
+    load_shed_retry_after: int = Field(5, env="LOAD_SHED_RETRY_AFTER")  # Retry-After 헤더 값(초)
+
+    # 배치 수집 엔드포인트 (POST /batch): 요청당 최대 항목 수/본문 크기
+    batch_max_items: int = Field(1000, env="BATCH_MAX_ITEMS")
+    batch_max_bytes: int = Field(16777216, env="BATCH_MAX_BYTES")  # 16MB
+
+    # 스트리밍 수집 (POST /): 본문을 청크 단위로 파싱하고 큰 목록 필드는 원본 bytes 그대로 메시지에 사용
+    streaming_ingest_enabled: bool = Field(False, env="STREAMING_INGEST_ENABLED")
+    streaming_ingest_min_bytes: int = Field(1048576, env="STREAMING_INGEST_MIN_BYTES")  # Content-Length 기준 (없으면 항상 사용)
+    streaming_ingest_raw_field_bytes: int = Field(65536, env="STREAMING_INGEST_RAW_FIELD_BYTES")  # 원본 유지 목록 필드 최소 크기
+
+    # 멱등성 캐시: 호출자가 보낸 X-Request-ID로 이미 접수된 요청은 publish하지 않고 원래 결과 반환
+    idempotency_enabled: bool = Field(False, env="IDEMPOTENCY_ENABLED")
+    idempotency_ttl: float = Field(86400.0, env="IDEMPOTENCY_TTL")  # 결과 보관 시간(초)
+    idempotency_max_entries: int = Field(100000, env="IDEMPOTENCY_MAX_ENTRIES")  # 워커당 로컬 LRU 최대 항목 수
+    idempotency_backend: str = Field("none", env="IDEMPOTENCY_BACKEND")  # none / sqlite / redis (워커 간 공유)
+    idempotency_sqlite_path: str = Field("/var/lib/cdl-gateway/idempotency.db", env="IDEMPOTENCY_SQLITE_PATH")
+    idempotency_redis_url: Optional[str] = Field(None, env="IDEMPOTENCY_REDIS_URL")
+    idempotency_key_prefix: str = Field("cdl-gateway:idempotency:", env="IDEMPOTENCY_KEY_PREFIX")
+
+    # Prometheus 메트릭 (GET /metrics, prometheus_client 필요)
+    # 워커 간 집계는 PROMETHEUS_MULTIPROC_DIR (start.sh에서 gunicorn 시작 전에 지정)
+    metrics_enabled: bool = Field(True, env="METRICS_ENABLED")
+    metrics_refresh_interval: float = Field(5.0, env="METRICS_REFRESH_INTERVAL")  # 워커별 노드/풀/백프레셔 게이지 갱신 주기(초)
+
+    # 트레이싱: hot path 단계별 span, traceparent를 HTTP 요청에서 이어받아 AMQP 메시지 headers로 전파
+    tracing_enabled: bool = Field(False, env="TRACING_ENABLED")
+    tracing_sample_rate: float = Field(0.1, env="TRACING_SAMPLE_RATE")  # 루트 span 기록 비율 (상위 trace가 있으면 그 결정을 따름)
+    tracing_exporter: str = Field("otlp", env="TRACING_EXPORTER")  # otlp (OTLP/HTTP JSON) / file (JSON Lines)
+    tracing_otlp_endpoint: str = Field("http://localhost:4318/v1/traces", env="TRACING_OTLP_ENDPOINT")
+    tracing_otlp_headers: Optional[str] = Field(None, env="TRACING_OTLP_HEADERS")  # "key=value,key2=value2" (인증 헤더 등)
+    tracing_export_timeout: float = Field(5.0, env="TRACING_EXPORT_TIMEOUT")  # 내보내기 요청 제한 시간(초)
+    tracing_file_path: str = Field("/var/log/cdl-gateway/traces.jsonl", env="TRACING_FILE_PATH")
+    tracing_service_name: str = Field("cdl-gateway", env="TRACING_SERVICE_NAME")
+    tracing_max_queue_size: int = Field(2048, env="TRACING_MAX_QUEUE_SIZE")  # 내보내기 대기 span 수 (초과 시 버림)
+    tracing_export_batch_size: int = Field(512, env="TRACING_EXPORT_BATCH_SIZE")
+    tracing_export_interval: float = Field(2.0, env="TRACING_EXPORT_INTERVAL")  # 내보내기 주기(초)
+
     # AWS MQ settings (fallback 용도)
     rabbitmq_broker_id: Optional[str] = Field(None, env="RABBITMQ_BROKER_ID")
     rabbitmq_region: str = Field("ap-northeast-2", env="RABBITMQ_REGION")
@@ -71,6 +197,9 @@ class Settings(BaseSettings):
 
     # Queue settings
     default_queue: str = "sokind"
+    # 라우팅 규칙 파일 (edu_type/request_type/generation_type → 큐/우선순위/큐 인자, 미지정 시 내장 규칙)
+    routing_rules_path: Optional[str] = Field(None, env="ROUTING_RULES_PATH")
+    routing_rules_reload_interval: float = Field(5.0, env="ROUTING_RULES_RELOAD_INTERVAL")  # 파일 변경 확인 주기(초), 0이면 SIGHUP으로만 재적재
     
     # Priority settings
     priority_high: int = 1
@@ -83,6 +212,15 @@ class Settings(BaseSettings):
     quorum_max_in_memory_length: int = Field(100000, env="QUORUM_MAX_IN_MEMORY_LENGTH")  # 메모리 메시지 수
     quorum_max_in_memory_bytes: int = Field(104857600, env="QUORUM_MAX_IN_MEMORY_BYTES")  # 100MB
 
+    # 로컬 스풀 (클러스터 장애 시 디스크에 기록 후 복구되면 재전송)
+    spool_enabled: bool = Field(False, env="SPOOL_ENABLED")
+    spool_dir: str = Field("/var/lib/cdl-gateway/spool", env="SPOOL_DIR")
+    spool_segment_bytes: int = Field(16777216, env="SPOOL_SEGMENT_BYTES")  # 세그먼트 파일 크기 (16MB)
+    spool_max_bytes: int = Field(1073741824, env="SPOOL_MAX_BYTES")  # 워커당 최대 스풀 크기 (1GB)
+    spool_fsync: bool = Field(True, env="SPOOL_FSYNC")  # 레코드마다 fsync
+    spool_drain_rate: float = Field(200.0, env="SPOOL_DRAIN_RATE")  # 초당 최대 재전송 수
+    spool_poll_interval: float = Field(1.0, env="SPOOL_POLL_INTERVAL")  # 빈 스풀 확인 주기(초)
+
     # Server settings  
     gunicorn_workers: int = Field(5, env="GUNICORN_WORKERS")
     uvicorn_log_level: str = "info"
@@ -1,43 +1,250 @@
+"""
+로깅 설정
+- json: 한 줄 JSON (logger.xxx(..., extra={...})의 extra 필드 포함)
+- text: 기존 형식 (시간 레벨 로거 [함수:줄] 메시지)
+- 비동기 기록: 호출 스레드는 큐에 넣기만 하고 포맷/stdout 쓰기는 백그라운드 writer 스레드에서 수행
+- 샘플링: logger별로 INFO 이하 기록의 일부만 남김 (WARNING 이상은 항상 기록)
+"""
+import atexit
 import logging
+import os
+import queue
+import random
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import pydantic_core
+
+from app.core.config import settings
+
 try:
     from zoneinfo import ZoneInfo  # Python 3.9+
 except Exception:  # pragma: no cover
     ZoneInfo = None  # Fallback: system localtime
 
+_KST = ZoneInfo("Asia/Seoul") if ZoneInfo is not None else None
+# LogRecord 기본 속성 (이 외의 속성은 extra로 전달된 필드)
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
 
 class _KSTFormatter(logging.Formatter):
-    """KST(Asia/Seoul) 타임존으로 시간 포맷팅하는 Formatter."""
+    """KST(Asia/Seoul) 타임존으로 시간 포맷팅하는 Formatter (같은 초의 시간 문자열은 재사용)"""
+
+    _time_cache = (None, None, "")
 
     def formatTime(self, record, datefmt=None):  # type: ignore[override]
-        if ZoneInfo is None:
+        if _KST is None:
             return super().formatTime(record, datefmt)
-        dt = datetime.fromtimestamp(record.created, tz=ZoneInfo("Asia/Seoul"))
-        if datefmt:
-            return dt.strftime(datefmt)
-        return dt.isoformat(timespec="seconds")
+        second = int(record.created)
+        cached_second, cached_fmt, text = self._time_cache
+        if cached_second == second and cached_fmt == datefmt:
+            return text
+        dt = datetime.fromtimestamp(second, tz=_KST)
+        text = dt.strftime(datefmt) if datefmt else dt.isoformat(timespec="seconds")
+        self._time_cache = (second, datefmt, text)
+        return text
+
+
+class JSONFormatter(_KSTFormatter):
+    """
+    한 줄 JSON 포맷터
+    time(밀리초, KST), level, logger, func, line, message + extra 필드 (+ exc_info, stack_info)
+    직렬화할 수 없는 extra 값은 str()로 기록
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        # 같은 초의 "YYYY-MM-DDTHH:MM:SS+09:00"을 재사용하고 밀리초만 끼워 넣음
+        stamp = self.formatTime(record)
+        entry = {
+            "time": f"{stamp[:19]}.{int(record.msecs):03d}{stamp[19:]}",
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return pydantic_core.to_json(entry, fallback=str).decode("utf-8")
+
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, float]:
+    """
+    "request=0.1,app.services.message_service=0.05" → {logger 이름: 기록 비율}
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 비율이 0~1 범위를 벗어난 경우
+    """
+    rates: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, value = item.partition("=")
+        rate = float(value) if sep else -1.0
+        if not name.strip() or not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Invalid LOG_SAMPLE_RATES entry: {item!r}")
+        rates[name.strip()] = rate
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    logger별 INFO 이하 기록 샘플링 (WARNING 이상은 항상 통과)
+    비율은 가장 가까운 상위 logger 이름의 설정을 따름 ("app.services" → "app.services.message_service")
+    남긴 기록에는 sample_rate 필드를 붙여 집계 시 보정할 수 있게 함
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.sampled_out = 0
+        self._resolved: Dict[str, float] = {}
 
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate, probe = 1.0, name
+            while probe:
+                if probe in self.rates:
+                    rate = self.rates[probe]
+                    break
+                probe = probe.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
 
-def configure_logging(level: str = "INFO") -> None:
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        if random.random() < rate:
+            record.sample_rate = rate
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    호출 스레드에서는 메시지 인자만 합쳐 큐에 넣음 (포맷/쓰기는 writer 스레드)
+    큐가 가득 차면 INFO 이하는 버리고 집계, WARNING 이상은 자리가 날 때까지 대기
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스 안의 큐이므로 복사/사전 포맷 없이 인자만 확정 (exc_info는 writer에서 포맷)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record)
+            else:
+                self.dropped += 1
+
+
+# configure_logging이 루트 로거에 설치한 핸들러와 writer 스레드 (재설정 시 교체)
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+_hooks_registered = False
+
+
+def _stop_listener() -> None:
+    """writer 스레드 종료 (큐에 남은 기록을 모두 쓴 뒤 반환)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener_in_child() -> None:
+    """fork된 자식 프로세스에는 writer 스레드가 없으므로 새 큐/스레드로 다시 시작"""
+    global _listener
+    if isinstance(_handler, _NonBlockingQueueHandler) and _listener is not None:
+        handlers = _listener.handlers
+        _handler.queue = queue.Queue(_handler.queue.maxsize)
+        _listener = QueueListener(_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def configure_logging(
+    level: str = "INFO",
+    log_format: Optional[str] = None,
+    async_enabled: Optional[bool] = None,
+    sample_rates: Optional[str] = None,
+    queue_size: Optional[int] = None,
+    stream=None,
+) -> None:
     """
-    로깅 설정을 구성합니다.
-    
+    로깅 설정을 구성합니다. (여러 번 호출해도 이전에 설치한 핸들러/스레드를 교체)
+
     Args:
         level: 로깅 레벨 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        log_format: json / text (기본값 LOG_FORMAT)
+        async_enabled: 큐 + 백그라운드 writer 스레드 사용 여부 (기본값 LOG_ASYNC)
+        sample_rates: logger별 INFO 이하 기록 비율 (기본값 LOG_SAMPLE_RATES)
+        queue_size: 비동기 기록 큐 크기 (기본값 LOG_QUEUE_SIZE)
+        stream: 출력 스트림 (기본값 sys.stdout)
     """
+    global _handler, _listener, _hooks_registered
+    log_format = log_format or settings.log_format
+    async_enabled = settings.log_async if async_enabled is None else async_enabled
+    sample_rates = settings.log_sample_rates if sample_rates is None else sample_rates
+    queue_size = queue_size or settings.log_queue_size
     log_level = getattr(logging, level.upper(), logging.INFO)
-    logging.basicConfig(level=log_level, stream=sys.stdout)
 
-    # 루트 핸들러에 KST 포맷터 적용
+    if log_format == "json":
+        formatter: logging.Formatter = JSONFormatter()
+    else:
+        formatter = _KSTFormatter(
+            fmt="%(asctime)s %(levelname)s %(name)s [%(funcName)s:%(lineno)d] %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S %z",
+        )
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(formatter)
+
+    # 이전 설정 제거 (남은 기록은 기존 writer가 모두 쓴 뒤 종료)
     root_logger = logging.getLogger()
-    datefmt = "%Y-%m-%d %H:%M:%S %z"
-    formatter = _KSTFormatter(
-        fmt="%(asctime)s %(levelname)s %(name)s [%(funcName)s:%(lineno)d] %(message)s",
-        datefmt=datefmt,
-    )
-    for handler in root_logger.handlers:
-        handler.setFormatter(formatter)
+    if _handler is not None:
+        root_logger.removeHandler(_handler)
+    _stop_listener()
+
+    if async_enabled:
+        handler: logging.Handler = _NonBlockingQueueHandler(queue.Queue(queue_size))
+        _listener = QueueListener(handler.queue, writer, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = writer
+    rates = parse_sample_rates(sample_rates)
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+    _handler = handler
+    root_logger.addHandler(handler)
+    root_logger.setLevel(log_level)
+
+    if not _hooks_registered:
+        atexit.register(_stop_listener)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_restart_listener_in_child)
+        _hooks_registered = True
 
     # Uvicorn/Gunicorn 로거에도 동일 포맷터 적용
     for logger_name in ("uvicorn.error", "uvicorn.access", "gunicorn.error", "gunicorn.access"):
@@ -46,6 +253,14 @@ def configure_logging(level: str = "INFO") -> None:
         for h in lg.handlers:
             h.setFormatter(formatter)
 
-    # 시끄러운 로거들 레벨 조정
-    for noisy in ("uvicorn.error", "uvicorn.access", "gunicorn.error"):
-        logging.getLogger(noisy).setLevel(log_level)
\ No newline at end of file
+
+def get_logging_stats() -> Dict[str, Optional[int]]:
+    """비동기 기록 큐 길이, 큐가 가득 차 버린 수, 샘플링으로 제외된 수"""
+    handler = _handler
+    sampling = next((f for f in getattr(handler, "filters", ()) if isinstance(f, SamplingFilter)), None)
+    is_async = isinstance(handler, _NonBlockingQueueHandler)
+    return {
+        "queued": handler.queue.qsize() if is_async else None,
+        "dropped": handler.dropped if is_async else None,
+        "sampled_out": sampling.sampled_out if sampling is not None else 0,
+    }
@@ -0,0 +1,193 @@
+"""
+Prometheus 메트릭
+- 단계별 지연 히스토그램: validation, to_specialized_model, routing, serialization, publish, reconnect
+- 큐/edu_type/우선순위/결과별 메시지 카운터
+- 노드 연결 상태, 채널 풀, 백프레셔 게이지 (워커가 주기적으로 자기 값을 기록)
+- gunicorn 워커 간 집계: PROMETHEUS_MULTIPROC_DIR가 설정되면 prometheus_client multiprocess 모드
+  (워커별 mmap 파일에 기록하고 /metrics를 처리하는 워커가 모든 파일을 합산)
+  이 환경변수는 prometheus_client import 전에 설정되어야 하므로 start.sh에서 지정
+"""
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # 선택 의존성 (pip install cdl-gateway[metrics])
+    prometheus_client = None
+
+STAGES = ("validation", "to_specialized_model", "routing", "serialization", "publish", "reconnect")
+# 직렬화/라우팅은 수십 µs, publish(confirm 대기)/재연결은 수 ms ~ 수 초
+STAGE_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+MESSAGE_RESULTS = ("sent", "spooled", "failed")
+
+
+class _StageTimer:
+    """단계 실행 시간을 히스토그램에 기록하는 컨텍스트 매니저 (예외로 끝나도 기록)"""
+
+    __slots__ = ("_histogram", "_started")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self) -> "_StageTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.observe(time.perf_counter() - self._started)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class GatewayMetrics:
+    """게이트웨이 메트릭 모음 (프로세스당 하나, get_metrics()로 접근)"""
+
+    def __init__(self, registry=None):
+        registry = registry or prometheus_client.REGISTRY
+        self.stage_seconds = prometheus_client.Histogram(
+            "cdl_gateway_stage_seconds",
+            "Hot-path stage latency",
+            ["stage"],
+            buckets=STAGE_BUCKETS,
+            registry=registry,
+        )
+        # 라벨 조회 비용을 요청마다 치르지 않도록 단계별 child를 미리 생성
+        self._stages = {stage: self.stage_seconds.labels(stage) for stage in STAGES}
+        self.messages = prometheus_client.Counter(
+            "cdl_gateway_messages",
+            "Messages by destination queue, edu_type, priority and result (sent/spooled/failed)",
+            ["queue", "edu_type", "priority", "result"],
+            registry=registry,
+        )
+        self._message_children: Dict[Tuple[str, object, int, str], object] = {}
+        # 게이지: 워커별 값을 합산(livesum)하거나 최댓값(livemax), 종료된 워커의 값은 제외
+        self.node_status = prometheus_client.Gauge(
+            "cdl_gateway_rabbitmq_node_status",
+            "Number of workers that currently see the RabbitMQ node in each status",
+            ["node", "status"],
+            registry=registry,
+            multiprocess_mode="livesum",
+        )
+        self.node_connections = prometheus_client.Gauge(
+            "cdl_gateway_rabbitmq_node_connections",
+            "Open gateway connections per RabbitMQ node",
+            ["node"],
+            registry=registry,
+            multiprocess_mode="livesum",
+        )
+        self.pool_clients = prometheus_client.Gauge(
+            "cdl_gateway_channel_pool_clients",
+            "Sync channel pool clients by state (open/idle/in_use)",
+            ["state"],
+            registry=registry,
+            multiprocess_mode="livesum",
+        )
+        self.confirms_in_flight = prometheus_client.Gauge(
+            "cdl_gateway_publish_confirms_in_flight",
+            "Publishes waiting for a broker confirm per lane",
+            ["lane"],
+            registry=registry,
+            multiprocess_mode="livesum",
+        )
+        self.publish_pending = prometheus_client.Gauge(
+            "cdl_gateway_publish_pending",
+            "Publishes admitted and not yet finished (load shedding)",
+            registry=registry,
+            multiprocess_mode="livesum",
+        )
+        self.broker_blocked = prometheus_client.Gauge(
+            "cdl_gateway_broker_blocked",
+            "1 if any worker connection is blocked by a broker resource alarm",
+            registry=registry,
+            multiprocess_mode="livemax",
+        )
+        self.admission_degraded = prometheus_client.Gauge(
+            "cdl_gateway_publish_admission_degraded",
+            "1 if any worker has lowered its publish admission limits",
+            registry=registry,
+            multiprocess_mode="livemax",
+        )
+
+    def stage(self, stage: str) -> _StageTimer:
+        return _StageTimer(self._stages[stage])
+
+    def record_message(self, queue: str, edu_type: Optional[int], priority: int, result: str) -> None:
+        key = (queue, edu_type, priority, result)
+        child = self._message_children.get(key)
+        if child is None:
+            child = self._message_children[key] = self.messages.labels(
+                queue, "" if edu_type is None else str(edu_type), str(priority), result
+            )
+        child.inc()
+
+
+_metrics_instance: Optional[GatewayMetrics] = None
+
+
+def get_metrics() -> Optional[GatewayMetrics]:
+    """프로세스 메트릭 (METRICS_ENABLED=false이거나 prometheus_client 미설치 시 None)"""
+    global _metrics_instance
+    if _metrics_instance is None:
+        if prometheus_client is None or not settings.metrics_enabled:
+            return None
+        _metrics_instance = GatewayMetrics()
+    return _metrics_instance
+
+
+def stage_timer(stage: str):
+    """
+    hot-path 단계 시간 측정 컨텍스트 매니저
+
+        with stage_timer("routing"):
+            ...
+    """
+    metrics = get_metrics()
+    return metrics.stage(stage) if metrics is not None else _NOOP_TIMER
+
+
+def record_message(queue: str, edu_type: Optional[int], priority: int, result: str) -> None:
+    """메시지 처리 결과 집계 (result: sent / spooled / failed)"""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.record_message(queue, edu_type, priority, result)
+
+
+def multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus 텍스트 형식 (본문, Content-Type)
+    multiprocess 모드면 모든 워커의 mmap 파일을 합산, 아니면 현재 프로세스 레지스트리
+    """
+    if multiprocess_dir():
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """종료된 워커의 live* 게이지 파일 제거 (gunicorn child_exit 훅)"""
+    if prometheus_client is not None and multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,256 @@
+"""
+증분 JSON 객체 스캐너
+최상위 JSON 객체를 청크 단위로 받아 멤버(key, 원본 값 bytes)로 나눔.
+값은 디코딩하지 않고 경계만 찾으며(괄호가 아닌 구간과 문자열은 정규식으로 한 번에 건너뜀),
+배열 값이면 깊이 1의 객체 원소 범위를 함께 기록하여 호출자가 원소 단위로 검증할 수 있게 함
+"""
+import json
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+_WS = re.compile(rb"[ \t\n\r]*")
+# 괄호/따옴표가 아닌 구간과 닫힌 문자열을 한 번에 건너뜀 (멈춘 위치는 괄호, 닫히지 않은 문자열 또는 버퍼 끝)
+_SKIP = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+# 문자열 내부 (닫는 따옴표, 청크 경계에서 잘린 이스케이프 또는 버퍼 끝에서 멈춤)
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_SCALAR = re.compile(rb"[^,}\]\s]+")
+_GAP = re.compile(rb"[ \t\n\r]*,[ \t\n\r]*")
+
+_QUOTE = ord('"')
+_LBRACE = ord("{")
+_OPEN = frozenset(b"{[")
+
+
+class JSONStreamError(ValueError):
+    """잘못된 JSON (pos: 본문 시작 기준 바이트 위치)"""
+
+    def __init__(self, msg: str, pos: int):
+        super().__init__(f"{msg}: char {pos}")
+        self.msg = msg
+        self.pos = pos
+
+
+class Member(NamedTuple):
+    """최상위 객체 멤버"""
+    key: str
+    raw: bytes
+    # 값이 객체만 담은 배열이면 raw 기준 원소 (시작, 끝) 목록, 아니면 None
+    elements: Optional[List[Tuple[int, int]]] = None
+    # 본문 시작 기준 값의 바이트 위치 (오류 위치 계산용)
+    offset: int = 0
+
+
+class ObjectStreamScanner:
+    """
+    최상위 JSON 객체 증분 스캐너
+    - feed(chunk): 이번 청크로 완성된 멤버 목록 반환
+    - close(): 본문 끝에서 객체가 완결되었는지 확인
+    - 완성된 멤버의 bytes는 즉시 버퍼에서 제거 (버퍼에는 진행 중인 멤버 하나만 유지)
+    - 구조(괄호 짝, 문자열 경계, 구분자)만 확인하므로 값 자체의 유효성은 호출자가 디코딩으로 확인
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._offset = 0  # 버퍼 앞에서 버린 바이트 수
+        self._pos = 0  # 버퍼 내 스캔 위치
+        self._string_start: Optional[int] = None  # 청크 경계에 걸친 문자열의 여는 따옴표 위치
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._stack = bytearray()  # 값 내부의 열린 괄호
+        self._elements: Optional[List[Tuple[int, int]]] = None
+        self._element_start = 0
+
+    @property
+    def complete(self) -> bool:
+        return self._state == "end"
+
+    def feed(self, chunk: bytes) -> List[Member]:
+        self._buf += chunk
+        members = []
+        while True:
+            member = self._step()
+            if member is None:
+                return members
+            if member is not True:
+                members.append(member)
+
+    def close(self) -> None:
+        if self._state == "end":
+            self._skip_ws()
+            if self._pos == len(self._buf):
+                return
+            raise self._error("Extra data")
+        raise self._error("Unexpected end of JSON")
+
+    def _error(self, msg: str) -> JSONStreamError:
+        return JSONStreamError(msg, self._offset + self._pos)
+
+    def _skip_ws(self) -> None:
+        self._pos = _WS.match(self._buf, self._pos).end()
+
+    def _consume(self) -> None:
+        """스캔이 끝난 앞부분을 버퍼에서 제거"""
+        del self._buf[:self._pos]
+        self._offset += self._pos
+        self._pos = 0
+
+    def _string_end(self, start: int) -> Optional[int]:
+        """
+        start의 따옴표로 시작하는 문자열의 끝(닫는 따옴표 다음) 위치
+        아직 닫히지 않았으면 None을 반환하고 이어서 스캔할 위치를 기억 (긴 문자열을 청크마다 다시 훑지 않음)
+        """
+        buf = self._buf
+        resume = self._pos if self._string_start == start else start + 1
+        end = _STRING_BODY.match(buf, resume).end()
+        if end < len(buf) and buf[end] == _QUOTE:
+            self._string_start = None
+            return end + 1
+        self._string_start = start
+        self._pos = end
+        return None
+
+    def _step(self):
+        """상태 하나를 진행 (완성된 멤버, 진행했으면 True, 데이터가 더 필요하면 None)"""
+        if self._state == "value":
+            return self._scan_value()
+
+        buf = self._buf
+        if self._string_start is None:
+            self._skip_ws()
+            if self._pos >= len(buf):
+                return None
+        char = buf[self._pos] if self._string_start is None else _QUOTE
+        state = self._state
+
+        if state == "start":
+            if char != ord("{"):
+                raise self._error("Expecting '{'")
+            self._pos += 1
+            self._state = "first_key"
+        elif state in ("first_key", "key"):
+            if char == ord("}") and state == "first_key":
+                self._pos += 1
+                self._state = "end"
+            elif char == _QUOTE:
+                start = self._pos if self._string_start is None else self._string_start
+                end = self._string_end(start)
+                if end is None:
+                    return None
+                try:
+                    self._key = json.loads(bytes(buf[start:end]))
+                except ValueError:
+                    self._pos = start
+                    raise self._error("Invalid property name")
+                self._pos = end
+                self._state = "colon"
+            else:
+                raise self._error("Expecting property name enclosed in double quotes")
+        elif state == "colon":
+            if char != ord(":"):
+                raise self._error("Expecting ':' delimiter")
+            self._pos += 1
+            self._skip_ws()
+            self._consume()
+            self._state = "value"
+        elif state == "next":
+            if char == ord(","):
+                self._state = "key"
+            elif char == ord("}"):
+                self._state = "end"
+            else:
+                raise self._error("Expecting ',' delimiter")
+            self._pos += 1
+        else:  # end
+            raise self._error("Extra data")
+        return True
+
+    def _scan_value(self):
+        """값 하나의 끝을 찾음 (버퍼 시작이 값의 시작)"""
+        buf = self._buf
+        stack = self._stack
+        if not stack:
+            if self._string_start is None:
+                # 콜론 직후 청크가 끝난 경우 다음 청크 앞의 공백
+                self._pos = _WS.match(buf).end()
+                self._consume()
+                if not buf:
+                    return None
+            first = buf[0]
+            if first in _OPEN:
+                stack.append(first)
+                self._pos = 1
+                self._elements = [] if first == ord("[") else None
+            elif first == _QUOTE:
+                end = self._string_end(0)
+                return None if end is None else self._emit(end)
+            else:
+                match = _SCALAR.match(buf)
+                if match is None:
+                    raise self._error("Expecting value")
+                if match.end() == len(buf):
+                    return None  # 숫자가 다음 청크로 이어질 수 있음
+                return self._emit(match.end())
+
+        pos = self._pos
+        if self._string_start is not None:
+            pos = self._string_end(self._string_start)
+            if pos is None:
+                return None
+        size = len(buf)
+        skip = _SKIP.match
+        elements = self._elements
+        while True:
+            pos = skip(buf, pos).end()
+            if pos >= size:
+                self._pos = size
+                return None
+            char = buf[pos]
+            if char == _QUOTE:
+                # 청크 경계에서 잘린 문자열
+                pos = self._string_end(pos)
+                if pos is None:
+                    return None
+                continue
+            if char in _OPEN:
+                if elements is not None and len(stack) == 1:
+                    if char == _LBRACE:
+                        self._element_start = pos
+                    else:
+                        self._elements = elements = None  # 객체가 아닌 원소
+                stack.append(char)
+            else:
+                if stack.pop() != char - 2:  # "[" 0x5B/"]" 0x5D, "{" 0x7B/"}" 0x7D
+                    self._pos = pos
+                    raise self._error("Mismatched bracket")
+                if not stack:
+                    return self._emit(pos + 1)
+                if elements is not None and len(stack) == 1:
+                    elements.append((self._element_start, pos + 1))
+            pos += 1
+
+    def _emit(self, end: int) -> Member:
+        """버퍼의 [0, end)를 멤버 값으로 떼어냄"""
+        with memoryview(self._buf) as view:
+            raw = bytes(view[:end])  # 큰 값을 한 번만 복사
+        offset = self._offset
+        elements = self._elements if raw[:1] == b"[" else None
+        if elements is not None and not _only_separators(raw, elements):
+            elements = None  # 객체가 아닌 원소(숫자, 문자열 등)가 섞인 배열
+        self._pos = end
+        self._consume()
+        self._state = "next"
+        self._elements = None
+        return Member(self._key, raw, elements, offset)
+
+
+def _only_separators(raw: bytes, elements: List[Tuple[int, int]]) -> bool:
+    """배열의 원소 사이가 공백과 쉼표 하나뿐인지 확인"""
+    previous = None
+    for start, end in elements:
+        if previous is None:
+            if _WS.fullmatch(raw, 1, start) is None:
+                return False
+        elif _GAP.fullmatch(raw, previous, start) is None:
+            return False
+        previous = end
+    return _WS.fullmatch(raw, previous or 1, len(raw) - 1) is not None
@@ -0,0 +1,485 @@
+"""
+경량 트레이싱
+요청 한 건이 hot path의 어느 단계(검증, 라우팅, 직렬화, 큐 확인, 연결, publish)에서 시간을 썼는지 span으로 기록
+- W3C Trace Context: HTTP traceparent 헤더로 상위 trace를 이어받고 AMQP 메시지 headers에 traceparent를 실어
+  컨슈머 쪽 처리 시간을 게이트웨이 span에 연결
+- 샘플링: 상위 span의 결정을 따르고, 루트에서만 TRACING_SAMPLE_RATE 비율로 기록 여부 결정
+  (기록하지 않는 trace도 컨텍스트는 전파하여 하위 단계가 따로 샘플링되지 않도록 함)
+- 내보내기: 종료된 span을 큐에 넣고 백그라운드 스레드가 묶어서 전송 (요청 경로에서 I/O 없음)
+  - otlp: OTLP/HTTP JSON (/v1/traces, OpenTelemetry Collector 등)
+  - file: JSON Lines 파일 (로컬 확인/테스트용)
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+# OTLP span kind
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+
+
+class SpanContext(NamedTuple):
+    """trace 식별자 (trace_id 32자리, span_id 16자리 소문자 hex)"""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """W3C traceparent 헤더 → SpanContext (형식이 잘못되었으면 None)"""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    _, trace_id, span_id, flags = parts[:4]
+    if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        if int(trace_id, 16) == 0 or int(span_id, 16) == 0:
+            return None
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+    return SpanContext(trace_id.lower(), span_id.lower(), sampled)
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128) or 1:032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+# 현재 span 컨텍스트 (asyncio 태스크마다 복사되므로 동시 요청 간에 섞이지 않음)
+_current: contextvars.ContextVar[Optional[SpanContext]] = contextvars.ContextVar("trace_context", default=None)
+
+
+def current_context() -> Optional[SpanContext]:
+    return _current.get()
+
+
+def inject_headers(headers: Dict[str, Any]) -> Dict[str, Any]:
+    """현재 trace 컨텍스트가 있으면 traceparent 추가 (AMQP 메시지 headers용)"""
+    context = _current.get()
+    if context is not None:
+        headers[TRACEPARENT_HEADER] = context.traceparent
+    return headers
+
+
+@contextlib.contextmanager
+def attach(context: Optional[SpanContext]) -> Iterator[None]:
+    """
+    다른 태스크/스레드에서 캡처한 컨텍스트를 현재 컨텍스트로 설정
+    (publish 배처처럼 요청 태스크 밖에서 전송하는 경로에서 요청의 trace를 이어감)
+    """
+    token = _current.set(context)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class _NoopSpan:
+    """트레이싱 비활성화 시 반환 (컨텍스트를 바꾸지 않음)"""
+
+    __slots__ = ()
+    recording = False
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    단계 하나의 실행 구간 (with 블록 동안 현재 컨텍스트로 설정, 예외로 끝나면 error 상태)
+    recording=False면 식별자만 전파하고 내보내지 않음 (샘플링되지 않은 trace)
+    """
+
+    __slots__ = (
+        "name", "context", "parent_id", "kind", "attributes", "events",
+        "start_ns", "end_ns", "status", "status_message", "_processor", "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str],
+        kind: str,
+        attributes: Optional[Dict[str, Any]],
+        processor: Optional["BatchSpanProcessor"],
+    ):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes if attributes is not None else {}
+        self.events: List[Dict[str, Any]] = []
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status = "unset"
+        self.status_message = ""
+        self._processor = processor
+
+    @property
+    def recording(self) -> bool:
+        return self.context.sampled
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.context.sampled:
+            self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self.context)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if not self.context.sampled:
+            return
+        if exc is not None:
+            self.status = "error"
+            self.status_message = f"{exc_type.__name__}: {exc}"
+            self.events.append({
+                "name": "exception",
+                "time_ns": self.end_ns,
+                "attributes": {"exception.type": exc_type.__name__, "exception.message": str(exc)},
+            })
+        self._processor.on_end(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """파일 내보내기용 평면 형식"""
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "status_message": self.status_message or None,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class SpanExporter(ABC):
+    """span 내보내기 인터페이스 (백그라운드 스레드에서 호출, 블로킹 I/O 가능)"""
+
+    name: str = ""
+
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """span 묶음 전송 (실패 시 예외)"""
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FileSpanExporter(SpanExporter):
+    """JSON Lines 파일 (span 하나당 한 줄)"""
+
+    name = "file"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.tracing_file_path
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """OTLP/HTTP JSON 전송 (OpenTelemetry Collector, Jaeger, Tempo 등의 /v1/traces)"""
+
+    name = "otlp"
+    STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+    def __init__(self, endpoint: Optional[str] = None, headers: Optional[str] = None, timeout: Optional[float] = None):
+        self.endpoint = endpoint or settings.tracing_otlp_endpoint
+        self.headers = {"Content-Type": "application/json"}
+        for item in (headers if headers is not None else settings.tracing_otlp_headers or "").split(","):
+            key, sep, value = item.partition("=")
+            if sep and key.strip():
+                self.headers[key.strip()] = value.strip()
+        self.timeout = timeout or settings.tracing_export_timeout
+        self.resource = {"attributes": _otlp_attributes({
+            "service.name": settings.tracing_service_name,
+            "deployment.environment": settings.environment,
+            "process.pid": os.getpid(),
+        })}
+
+    def encode(self, spans: List[Span]) -> bytes:
+        """OTLP ExportTraceServiceRequest JSON"""
+        return json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{
+                    "scope": {"name": "cdl-gateway"},
+                    "spans": [
+                        {
+                            "traceId": span.context.trace_id,
+                            "spanId": span.context.span_id,
+                            **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                            "name": span.name,
+                            "kind": SPAN_KINDS[span.kind],
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": _otlp_attributes(span.attributes),
+                            "events": [
+                                {
+                                    "name": event["name"],
+                                    "timeUnixNano": str(event["time_ns"]),
+                                    "attributes": _otlp_attributes(event["attributes"]),
+                                }
+                                for event in span.events
+                            ],
+                            "status": {
+                                "code": self.STATUS_CODES[span.status],
+                                **({"message": span.status_message} if span.status_message else {}),
+                            },
+                        }
+                        for span in spans
+                    ],
+                }],
+            }],
+        }, default=str).encode("utf-8")
+
+    def export(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(self.endpoint, data=self.encode(spans), headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+EXPORTERS = {"otlp": OTLPHttpSpanExporter, "file": FileSpanExporter}
+
+
+class BatchSpanProcessor:
+    """
+    종료된 span을 큐에 모았다가 백그라운드 스레드에서 묶어서 내보냄
+    큐가 가득 차면 span을 버리고 집계 (요청 경로를 막지 않음), 내보내기 오류는 집계 후 무시
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        interval: Optional[float] = None,
+    ):
+        self.exporter = exporter
+        self.batch_size = batch_size or settings.tracing_export_batch_size
+        self.interval = interval or settings.tracing_export_interval
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(max_queue_size or settings.tracing_max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.stats = {"ended": 0, "exported": 0, "dropped": 0, "export_errors": 0}
+
+    def _ensure_thread(self) -> None:
+        # fork된 워커에는 부모의 스레드가 없으므로 PID가 바뀌면 새로 시작
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(self._queue.maxsize)
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+
+    def on_end(self, span: Span) -> None:
+        self._ensure_thread()
+        self.stats["ended"] += 1
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _export(self, batch: List[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+            self.stats["exported"] += len(batch)
+        except Exception as e:
+            self.stats["export_errors"] += 1
+            logger.warning(f"Span export to {self.exporter.name} failed ({len(batch)} spans): {e}")
+
+    def _run(self) -> None:
+        batch: List[Span] = []
+        flush_at = time.monotonic() + self.interval
+        while True:
+            try:
+                span = self._queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+            except queue.Empty:
+                span = False
+            if span is None:
+                # shutdown(): 남은 span 전송 후 종료
+                if batch:
+                    self._export(batch)
+                return
+            if span:
+                batch.append(span)
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= flush_at):
+                self._export(batch)
+                batch = []
+            if time.monotonic() >= flush_at:
+                flush_at = time.monotonic() + self.interval
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """큐에 남은 span을 내보내고 스레드 종료"""
+        if self._thread is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+        self.exporter.shutdown()
+
+
+class Tracer:
+    """span 생성 및 샘플링 (상위 span이 있으면 그 결정을 따르고, 루트에서만 sample_rate 적용)"""
+
+    def __init__(self, processor: BatchSpanProcessor, sample_rate: Optional[float] = None):
+        self.processor = processor
+        self.sample_rate = settings.tracing_sample_rate if sample_rate is None else sample_rate
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: str = "internal",
+        parent: Optional[SpanContext] = None,
+    ) -> Span:
+        parent = parent or _current.get()
+        if parent is None:
+            context = SpanContext(_new_trace_id(), _new_span_id(), random.random() < self.sample_rate)
+            return Span(name, context, None, kind, attributes, self.processor)
+        context = SpanContext(parent.trace_id, _new_span_id(), parent.sampled)
+        return Span(name, context, parent.span_id, kind, attributes, self.processor)
+
+
+_tracer_instance: Optional[Tracer] = None
+_tracer_loaded = False
+
+
+def configure_tracing(
+    enabled: Optional[bool] = None,
+    exporter: Optional[SpanExporter] = None,
+    sample_rate: Optional[float] = None,
+) -> Optional[Tracer]:
+    """
+    트레이서 구성 (이전 트레이서가 있으면 남은 span을 내보내고 교체)
+
+    Args:
+        enabled: 기본값 TRACING_ENABLED
+        exporter: 기본값 TRACING_EXPORTER (otlp / file)
+        sample_rate: 루트 span 기록 비율 (기본값 TRACING_SAMPLE_RATE)
+    """
+    global _tracer_instance, _tracer_loaded
+    shutdown_tracing()
+    _tracer_loaded = True
+    if not (settings.tracing_enabled if enabled is None else enabled):
+        return None
+    if exporter is None:
+        exporter_class = EXPORTERS.get(settings.tracing_exporter)
+        if exporter_class is None:
+            raise RuntimeError(f"Unknown tracing exporter: {settings.tracing_exporter}")
+        exporter = exporter_class()
+    _tracer_instance = Tracer(BatchSpanProcessor(exporter), sample_rate)
+    return _tracer_instance
+
+
+def get_tracer() -> Optional[Tracer]:
+    """프로세스 트레이서 (TRACING_ENABLED=false면 None, 첫 호출 시 설정으로 구성)"""
+    if not _tracer_loaded:
+        configure_tracing()
+    return _tracer_instance
+
+
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: str = "internal",
+    parent: Optional[SpanContext] = None,
+):
+    """
+    단계 span 컨텍스트 매니저 (트레이싱 비활성화 시 아무 것도 하지 않음)
+
+        with start_span("routing", {"edu_type": 9}) as span:
+            ...
+            span.set_attribute("queue", queue)
+    """
+    tracer = _tracer_instance if _tracer_loaded else get_tracer()
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.start_span(name, attributes, kind, parent)
+
+
+def shutdown_tracing() -> None:
+    """남은 span 내보내기 후 트레이서 해제 (애플리케이션 종료 시)"""
+    global _tracer_instance, _tracer_loaded
+    if _tracer_instance is not None:
+        _tracer_instance.processor.shutdown()
+    _tracer_instance = None
+    _tracer_loaded = False
+
+
+def get_tracing_stats() -> Optional[Dict[str, Any]]:
+    """트레이싱 현황 (비활성화 시 None)"""
+    tracer = _tracer_instance
+    if tracer is None:
+        return None
+    return {
+        "exporter": tracer.processor.exporter.name,
+        "sample_rate": tracer.sample_rate,
+        "queued": tracer.processor._queue.qsize(),
+        **tracer.processor.stats,
+    }
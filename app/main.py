@@ -2,20 +2,122 @@
 CDL Gateway 애플리케이션 진입점
 FastAPI 애플리케이션 초기화 및 실행
 """
-import os
-import sys
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 
 # Secrets 로드는 컨테이너 시작 스크립트(start.sh)에서 선행되며, 애플리케이션 코드에서는 수행하지 않습니다.
 
 from app.core.config import settings
+from app.core.codec import FastJSONResponse
 from app.core.logging_config import configure_logging
-from app.middleware.request_logging import RequestLoggingMiddleware
-from app.middleware.request_id import RequestIdMiddleware
+from app.core.tracing import shutdown_tracing
+from app.middleware.request_context import RequestContextMiddleware
 from app.api.routes import router
+from app.services.message_service import MessageService
+from app.services.async_rabbitmq import get_async_rabbitmq_client, close_async_rabbitmq_client
+from app.services.publish_batcher import close_publish_batcher
+from app.services.rabbitmq import get_rabbitmq_pool
+from app.services.topology import TopologyConflictError, declare_topology
+from app.services.spool import get_publish_spool, SpoolDrainer
+from app.services.idempotency import get_idempotency_cache
+from app.services.node_health import start_node_health_prober, stop_node_health_prober
+from app.services.routing import get_routing_rules
+from app.services.runtime_metrics import start_runtime_gauge_refresher, stop_runtime_gauge_refresher
+
+logger = logging.getLogger(__name__)
+
+
+async def _declare_topology_until_ready(app: FastAPI) -> None:
+    """
+    브로커에 연결될 때까지 시작 단계 큐 선언을 주기적으로 재시도하고 성공하면 ready 표시
+    (인자 불일치가 확인되면 재시도를 멈추고 not ready 유지)
+    """
+    while True:
+        await asyncio.sleep(settings.rabbitmq_declare_retry_interval)
+        try:
+            await declare_topology(get_async_rabbitmq_client(), MessageService().get_queue_topology())
+        except TopologyConflictError as e:
+            logger.critical(f"Startup queue declaration conflicts with the broker, staying not ready: {e}")
+            return
+        except Exception as e:
+            logger.warning(f"Startup queue declaration failed, retrying: {e}")
+            continue
+        app.state.ready = True
+        logger.info("Startup queue declaration succeeded; worker is ready")
+        return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    애플리케이션 시작/종료 단계
+    
+    - 시작: 라우팅 규칙으로 도달 가능한 모든 큐를 병렬 선언 후 ready 표시
+      (기존 큐와 인자 불일치(406) 시 예외로 워커 기동 실패 → 배포 실패,
+       브로커 연결 실패 등은 not ready로 기동하고 백그라운드에서 선언 재시도)
+    - 스풀 사용 시 백그라운드 drainer 시작
+    - 멱등성 사용 시 공유 저장소 생성 (설정 누락/의존성 미설치면 워커 기동 실패)
+    - 노드 헬스 프로버 시작 (노드별 회로 차단기를 백그라운드에서 갱신)
+    - 라우팅 규칙 적재 및 재적재 감시 시작 (SIGHUP/파일 변경, 새 규칙의 큐는 재적재 직후 선언)
+    - 메트릭 사용 시 워커별 런타임 게이지(노드 상태, 풀, 백프레셔) 주기적 갱신 시작
+    - 종료: 대기 중인 배치 flush 및 브로커 연결 정리
+    """
+    if settings.idempotency_enabled:
+        # 공유 저장소 설정/의존성 문제는 첫 요청이 아니라 기동 시점에 실패
+        get_idempotency_cache()
+    
+    if settings.rabbitmq_health_probe_enabled and settings.get_rabbitmq_nodes():
+        start_node_health_prober()
+    
+    async def declare_reloaded_topology():
+        if settings.rabbitmq_declare_topology_on_startup and settings.get_rabbitmq_nodes():
+            await declare_topology(get_async_rabbitmq_client(), MessageService().get_queue_topology())
+    
+    routing_rules = get_routing_rules()
+    routing_rules.start(on_reload=declare_reloaded_topology)
+    
+    declare_task = None
+    
+    if not settings.rabbitmq_declare_topology_on_startup:
+        app.state.ready = True
+    elif not settings.get_rabbitmq_nodes():
+        logger.warning("RabbitMQ configuration is missing; skipping startup queue declaration")
+    else:
+        try:
+            await declare_topology(get_async_rabbitmq_client(), MessageService().get_queue_topology())
+            app.state.ready = True
+        except TopologyConflictError:
+            raise
+        except Exception as e:
+            logger.error(f"Startup queue declaration failed, starting not ready and retrying: {e}")
+            declare_task = asyncio.create_task(_declare_topology_until_ready(app))
+    
+    drainer = None
+    if settings.spool_enabled:
+        drainer = SpoolDrainer(get_publish_spool(), MessageService().publish_spooled)
+        drainer.start()
+    
+    start_runtime_gauge_refresher()
+    
+    yield
+    
+    app.state.ready = False
+    if declare_task is not None:
+        declare_task.cancel()
+    await stop_runtime_gauge_refresher()
+    if drainer is not None:
+        await drainer.stop()
+        get_publish_spool().close()
+    await routing_rules.stop()
+    await stop_node_health_prober()
+    await close_publish_batcher()
+    await close_async_rabbitmq_client()
+    get_rabbitmq_pool().close()
+    shutdown_tracing()
 
 
 def create_app() -> FastAPI:
@@ -23,6 +125,7 @@ def create_app() -> FastAPI:
     FastAPI 애플리케이션 팩토리
     
     - 로깅 설정
+    - 시작/종료 단계(lifespan) 등록
     - 미들웨어 등록
     - 라우터 등록
     - 예외 핸들러 등록
@@ -35,12 +138,15 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
+    # 시작 단계(큐 선언)가 끝나기 전까지 readiness 미충족
+    app.state.ready = False
 
-    # 미들웨어 등록 (순서 중요: Request ID → Request Logging)
-    app.add_middleware(RequestIdMiddleware)
-    app.add_middleware(RequestLoggingMiddleware)
+    # 미들웨어 등록 (Request ID + Request Logging, 순수 ASGI 한 계층)
+    app.add_middleware(RequestContextMiddleware)
     
     # 라우터 포함
     app.include_router(router)
@@ -63,9 +169,13 @@ def create_app() -> FastAPI:
                     "type": error["type"]
                 })
 
-        error_message = f'{errors[0]["loc"][1]} {errors[0]["msg"]}' if errors else "Validation error"
+        error_message = "Validation error"
+        if errors:
+            # 본문 전체 오류(빈 본문, 객체가 아닌 본문)는 loc가 ("body",)뿐
+            loc = errors[0]["loc"]
+            error_message = f'{loc[1] if len(loc) > 1 else loc[0]} {errors[0]["msg"]}'
         
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "detail": "Validation error",
                 "message": error_message,
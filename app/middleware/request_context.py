@@ -0,0 +1,106 @@
+import time
+import uuid
+import logging
+from typing import Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import parse_traceparent, start_span
+
+# 로그에 남기는 요청 헤더 (ASGI 헤더 이름은 소문자 bytes)
+_LOGGED_HEADERS = (b"x-request-id", b"x-forwarded-for", b"x-real-ip", b"user-agent", b"referer")
+_REQUEST_ID_HEADER = b"x-request-id"
+_TRACEPARENT_HEADER = b"traceparent"
+_READ_HEADERS = _LOGGED_HEADERS + (_TRACEPARENT_HEADER,)
+
+
+class RequestContextMiddleware:
+    """
+    요청 ID + 요청/응답 로깅 순수 ASGI 미들웨어
+    (RequestIdMiddleware, RequestLoggingMiddleware 두 BaseHTTPMiddleware 계층을 대체)
+
+    - X-Request-ID 헤더가 있으면 사용하고, 없으면 새로 생성
+    - request.state.request_id / request.state.request_id_supplied 설정 (scope["state"])
+    - 응답 시작 메시지에 X-Request-ID 헤더 추가 (응답 스트림을 감싸거나 별도 태스크를 만들지 않음)
+    - 응답 본문 전송이 끝난 뒤 메소드, 경로, 쿼리, 상태코드, 응답시간, 클라이언트 정보 로그
+    - 요청 전체를 server span으로 기록 (traceparent 헤더가 있으면 그 trace를 이어받음)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.logger = logging.getLogger("request")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        headers: Dict[bytes, Optional[str]] = dict.fromkeys(_READ_HEADERS)
+        for name, value in scope["headers"]:
+            if name in headers and headers[name] is None:
+                headers[name] = value.decode("latin-1")
+
+        supplied = headers[_REQUEST_ID_HEADER]
+        request_id = supplied or str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["request_id_supplied"] = bool(supplied)
+        request_id_header = (_REQUEST_ID_HEADER, request_id.encode("latin-1"))
+        status_code = 500
+        method = scope["method"]
+        path = scope["path"]
+        span = start_span(
+            f"{method} {path}",
+            {"http.method": method, "http.target": path, "request_id": request_id},
+            kind="server",
+            parent=parse_traceparent(headers[_TRACEPARENT_HEADER]),
+        )
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                span.set_attribute("http.status_code", status_code)
+                response_headers = [
+                    header for header in message.get("headers", ()) if header[0].lower() != _REQUEST_ID_HEADER
+                ]
+                response_headers.append(request_id_header)
+                message = {**message, "headers": response_headers}
+            await send(message)
+
+        try:
+            with span:
+                await self.app(scope, receive, send_with_request_id)
+        except Exception as exc:
+            status_code = 500
+            self.logger.error(
+                "Exception during request processing",
+                extra={
+                    "request_id": request_id,
+                    "method": method,
+                    "path": path,
+                    "exception": str(exc)
+                },
+                exc_info=True
+            )
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+            client = scope.get("client")
+            self.logger.info(
+                "%s %s - %s", method, path, status_code,
+                extra={
+                    "request_id": request_id,
+                    "method": method,
+                    "path": path,
+                    "query": scope.get("query_string", b"").decode("latin-1"),
+                    "status": status_code,
+                    "elapsed_ms": round(elapsed_ms, 2),
+                    "client_ip": client[0] if client else None,
+                    "x_forwarded_for": headers[b"x-forwarded-for"],
+                    "x_real_ip": headers[b"x-real-ip"],
+                    "user_agent": headers[b"user-agent"],
+                    "referer": headers[b"referer"],
+                },
+            )
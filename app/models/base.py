@@ -2,7 +2,7 @@
 기본 모델 정의
 모든 요청 모델의 기본이 되는 클래스 제공
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from pydantic import BaseModel
 
 
@@ -26,6 +26,14 @@ class SokindBaseModel(BaseModel):
         """
         return "normal"  # 기본값
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """
+        이 모델의 요청이 가질 수 있는 비즈니스 우선순위 목록
+        (인스턴스 없이 큐 토폴로지를 계산할 때 사용, get_business_priority를 재정의하면 함께 재정의)
+        """
+        return ("normal",)
+    
     def get_required_fields(self) -> List[str]:
         """비즈니스 로직상 필수 필드 목록"""
         return []
@@ -2,7 +2,7 @@
 교육 타입별 요청 모델 정의
 각 교육 타입별로 특화된 요청 모델 클래스 제공
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from pydantic import validator, Field
 from .base import SokindBaseModel
 
@@ -41,6 +41,11 @@ class BasicEducationModel(SokindBaseModel):
             return "high"  # 기본 응대 교육은 높은 우선순위
         return "normal"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("high",) if edu_type == 1 else ("normal",)
+    
     def get_required_fields(self) -> List[str]:
         """필수 비즈니스 필드"""
         return ["edu_key", "member_key", "edu_type"]
@@ -83,6 +88,11 @@ class ListenAndRepeatModel(BasicEducationModel):
         """듣고 따라하기는 낮은 우선순위"""
         return "low"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("low",)
+    
     def get_processing_type(self) -> str:
         """배치 처리 가능"""
         return "batch"
@@ -117,6 +127,11 @@ class VirtualActorDialogueV1Model(BasicEducationModel):
         """대화형 교육은 높은 우선순위"""
         return "high"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("high",)
+    
     def get_dialogue_length(self) -> int:
         """대화 라운드 반환"""
         return self.chat_round or 0
@@ -156,6 +171,11 @@ class VirtualActorDialogueV2Model(SokindBaseModel):
         """고급 대화형 교육은 높은 우선순위"""
         return "high"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("high",)
+    
     def get_processing_type(self) -> str:
         """실시간 대화 처리 필요"""
         return "real_time"
@@ -195,6 +215,11 @@ class VirtualActorDialogueV2ForeignDemoModel(SokindBaseModel):
         """데모 버전은 일반 우선순위"""
         return "normal"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("normal",)
+    
     def is_demo_generation_type(self) -> bool:
         """데모 생성 타입인지 확인"""
         return self.request_type in [1, 2]
@@ -218,6 +243,11 @@ class PeriodicReportModel(SokindBaseModel):
         """리포트는 낮은 우선순위 (비실시간)"""
         return "low"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("low",)
+    
     def get_processing_type(self) -> str:
         """스케줄링 처리 가능"""
         return "scheduled"
@@ -239,6 +269,11 @@ class VirtualActorDialogueV3BaseModel(SokindBaseModel):
         """V3는 고급 AI 기능으로 높은 우선순위"""
         return "high"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("high",)
+    
     def get_processing_type(self) -> str:
         """실시간 AI 생성 처리"""
         return "real_time"
@@ -281,6 +316,11 @@ class VirtualActorDialogueV3QuestionModel(VirtualActorDialogueV3BaseModel):
         """질문 생성은 진적 우선순위"""
         return "urgent" if self.user_answer_text else "high"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("urgent", "high")
+    
     def has_conversation_context(self) -> bool:
         """대화 컨텍스트가 있는지 확인"""
         return bool(self.previous_chat_history_data_list)
@@ -312,6 +352,11 @@ class VirtualActorDialogueV3ReportModel(VirtualActorDialogueV3BaseModel):
         """리포트 생성은 일반 우선순위"""
         return "normal"
     
+    @classmethod
+    def business_priorities(cls, edu_type: Optional[int] = None) -> Tuple[str, ...]:
+        """get_business_priority가 반환할 수 있는 값"""
+        return ("normal",)
+    
     def get_processing_type(self) -> str:
         """리포트는 배치 처리 가능"""
         return "batch"
@@ -1,5 +1,8 @@
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Dict, Any, Union, Annotated, Type
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag, TypeAdapter, ValidationError, validator
+from app.core.metrics import stage_timer
+from app.core.tracing import start_span
+from .base import SokindBaseModel
 from .education_models import (
     BasicEducationModel,
     FillOutBlankScriptModel, 
@@ -16,6 +19,23 @@ from .education_models import (
 )
 
 
+# edu_type 10 (V3) generation_type별 모델 매핑 (그 외 값은 AUGMENTATION)
+V3_GENERATION_TYPE_MODELS = {
+    "AUGMENTATION": VirtualActorDialogueV3AugmentationModel,
+    "QUESTION": VirtualActorDialogueV3QuestionModel,
+    "REPORT": VirtualActorDialogueV3ReportModel,
+}
+
+
+def specialized_model_class(edu_type: Any, generation_type: Any = None) -> Type[SokindBaseModel]:
+    """edu_type(과 V3의 generation_type)에 해당하는 특화 모델 클래스"""
+    # edu_type 10 (V3)의 경우 generation_type에 따라 세분화
+    if edu_type == 10:
+        return V3_GENERATION_TYPE_MODELS.get(generation_type, VirtualActorDialogueV3AugmentationModel)
+    # 일반 교육 타입들
+    return EDUCATION_TYPE_MODELS.get(edu_type, BasicEducationModel)
+
+
 class SokindRequest(BaseModel):
     """
     통합 Sokind 분석 요청 모델
@@ -117,23 +137,118 @@ class SokindRequest(BaseModel):
         Returns:
             교육 타입에 맞는 특화된 모델 인스턴스
         """
-        # edu_type 10 (V3)의 경우 generation_type에 따라 세분화
-        if self.edu_type == 10:
-            v3_models = {
-                "AUGMENTATION": VirtualActorDialogueV3AugmentationModel,
-                "QUESTION": VirtualActorDialogueV3QuestionModel,
-                "REPORT": VirtualActorDialogueV3ReportModel,
-            }
-            model_class = v3_models.get(self.generation_type, VirtualActorDialogueV3AugmentationModel)
-            return model_class(**self.dict())
-        
-        # 일반 교육 타입들
-        model_class = EDUCATION_TYPE_MODELS.get(self.edu_type, BasicEducationModel)
-        return model_class(**self.dict())
+        return specialized_model_class(self.edu_type, self.generation_type)(**self.dict())
     
     @validator("edu_type")
     def validate_edu_type(cls, v):
         """edu_type 유효성 검사"""
         if v not in range(1, 11):
             raise ValueError("edu_type must be between 1 and 10")
-        return v
\ No newline at end of file
+        return v
+
+
+def _request_variant(model_class: Type[SokindBaseModel]) -> Type[SokindBaseModel]:
+    """
+    특화 모델의 요청 검증용 변형 (같은 이름의 하위 클래스)
+
+    SokindRequest 검증 → .dict() → 특화 모델 재검증과 같은 결과를 한 번의 검증으로 생성
+    - SokindRequest의 모든 필드를 같은 타입/기본값/별칭으로 선언
+      (특화 모델 필드는 기존 위치, 나머지는 SokindRequest 순서로 뒤에 → 직렬화 키 순서 동일)
+    - 알 수 없는 키는 무시 (SokindRequest와 동일)
+    - 특화 모델의 검증기와 비즈니스 메서드는 그대로 상속
+    """
+    annotations = {}
+    namespace = {
+        "__module__": model_class.__module__,
+        "__qualname__": model_class.__qualname__,
+        "__annotations__": annotations,
+        "model_config": ConfigDict(extra="ignore"),
+    }
+    for name, field in SokindRequest.model_fields.items():
+        annotations[name] = field.annotation
+        namespace[name] = Field(field.default, alias=field.alias)
+    return type(model_class)(model_class.__name__, (model_class,), namespace)
+
+
+# 요청 태그 → 단일 검증 대상 모델
+# (edu_type이 정수 1~10이 아니거나 generation_type이 문자열이 아닌 경우는 기존 2단계 경로)
+LEGACY_REQUEST_TAG = "legacy"
+_VARIANTS = {
+    model_class: _request_variant(model_class)
+    for model_class in {*EDUCATION_TYPE_MODELS.values(), BasicEducationModel, *V3_GENERATION_TYPE_MODELS.values()}
+}
+SPECIALIZED_REQUEST_MODELS: Dict[str, Type[BaseModel]] = {
+    **{str(edu_type): _VARIANTS[EDUCATION_TYPE_MODELS.get(edu_type, BasicEducationModel)] for edu_type in range(1, 10)},
+    **{f"10:{name}": _VARIANTS[model_class] for name, model_class in V3_GENERATION_TYPE_MODELS.items()},
+    LEGACY_REQUEST_TAG: SokindRequest,
+}
+_FIELD_ORDER = {
+    key: index
+    for index, (name, field) in enumerate(SokindRequest.model_fields.items())
+    for key in (name, field.alias)
+    if key
+}
+
+
+def request_tag(data: Any) -> str:
+    """요청 본문 → 태그 (edu_type, edu_type 10은 generation_type까지)"""
+    if not isinstance(data, dict):
+        return LEGACY_REQUEST_TAG
+    edu_type = data.get("edu_type")
+    if type(edu_type) is not int or edu_type not in range(1, 11):
+        return LEGACY_REQUEST_TAG
+    if edu_type != 10:
+        return str(edu_type)
+    generation_type = data.get("generation_type")
+    if generation_type is not None and not isinstance(generation_type, str):
+        return LEGACY_REQUEST_TAG
+    return f"10:{generation_type if generation_type in V3_GENERATION_TYPE_MODELS else 'AUGMENTATION'}"
+
+
+# edu_type (+ generation_type) 태그 유니온
+SpecializedRequest = Annotated[
+    Union[tuple(Annotated[model, Tag(tag)] for tag, model in SPECIALIZED_REQUEST_MODELS.items())],
+    Discriminator(request_tag),
+]
+_REQUEST_ADAPTER = TypeAdapter(SpecializedRequest)
+
+
+def parse_specialized_request(data: Any) -> SokindBaseModel:
+    """
+    요청 본문(JSON 디코딩 결과) → 교육 타입별 특화 모델 (단일 검증)
+
+    Raises:
+        ValidationError: request_errors()로 SokindRequest 검증과 같은 형태의 오류 목록 변환
+    """
+    model = _REQUEST_ADAPTER.validate_python(data)
+    if isinstance(model, SokindRequest):
+        with stage_timer("to_specialized_model"), start_span("to_specialized_model"):
+            return model.to_specialized_model()
+    return model
+
+
+def request_errors(exc: ValidationError) -> List[Dict[str, Any]]:
+    """
+    검증 오류 → SokindRequest 검증과 같은 loc/순서의 오류 목록
+    (유니온 태그를 loc에서 제거하고 SokindRequest 필드 순서로 정렬)
+    """
+    errors = []
+    for error in exc.errors(include_url=False):
+        loc = error["loc"]
+        if loc and loc[0] in SPECIALIZED_REQUEST_MODELS:
+            error["loc"] = loc = loc[1:]
+        errors.append(error)
+    return sorted(errors, key=lambda error: _FIELD_ORDER.get(error["loc"][0], -1) if error["loc"] else -1)
+
+
+def validate_request_field(name: str, value: Any) -> Any:
+    """
+    본문 필드 하나를 SokindRequest 필드 규칙(타입, 검증기)으로 검증 (스트리밍 수집의 조기 검증용)
+
+    Raises:
+        ValidationError: loc이 (필드명,)인 오류
+    """
+    return getattr(
+        SokindRequest.__pydantic_validator__.validate_assignment(SokindRequest.model_construct(), name, value),
+        name,
+    )
@@ -0,0 +1,842 @@
+"""
+비동기 RabbitMQ 클러스터 클라이언트
+aio-pika 기반으로 이벤트 루프를 블로킹하지 않고 RabbitMQClusterClient와 동일한
+다중 노드 fallback, 회로 차단기, 재시도 의미를 제공
+"""
+import asyncio
+import logging
+import time
+import weakref
+from typing import Optional, Dict, Any, List, Sequence, Union, Tuple
+
+import aio_pika
+
+from app.core import codec
+from app.core.config import settings
+from app.core.metrics import stage_timer
+from app.core.tracing import SpanContext, attach, inject_headers, start_span
+from app.services.topology import TopologyConflictError, get_queue_topology_cache
+from app.services.cluster_nodes import NodeStatus, get_cluster_node_registry, node_key_for
+from app.services.deadline import Deadline, PublishDeadlineExceededError
+from app.services.publish_lanes import DEFAULT_LANE
+from app.services.compression import encode_body
+
+logger = logging.getLogger(__name__)
+
+# 대기 없이 곧바로 다른 노드로 failover하는 연결 수준 오류
+CONNECTION_ERRORS = (ConnectionError, aio_pika.exceptions.AMQPConnectionError)
+
+
+class PublishNackError(Exception):
+    """브로커가 publish를 거부(Basic.Nack)한 경우"""
+    pass
+
+
+class QueueNotFoundError(Exception):
+    """대상 큐/익스체인지가 없어 브로커가 메시지를 반환(NO_ROUTE)하거나 404로 채널을 닫은 경우"""
+    pass
+
+
+class _BlockedConnectionTracker(logging.Filter):
+    """
+    브로커의 connection.blocked / connection.unblocked 통지를 직접 추적
+
+    aio-pika/aiormq는 blocked/unblocked 콜백을 제공하지 않고, 두 프레임을 받을 때마다
+    aiormq.connection 로거에 연결 객체를 인자로 경고를 남긴다. 그 로그 레코드를 받아
+    차단된 aiormq 연결을 기록한다 (로그 자체는 그대로 통과).
+    """
+
+    BLOCKED_MSG = "Connection %r was blocked by: %r"
+    UNBLOCKED_MSG = "Connection %r was unblocked"
+
+    def __init__(self):
+        super().__init__()
+        self._blocked = weakref.WeakSet()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.msg in (self.BLOCKED_MSG, self.UNBLOCKED_MSG) and record.args:
+            connection = record.args[0]
+            if record.msg == self.BLOCKED_MSG:
+                self._blocked.add(connection)
+            else:
+                self._blocked.discard(connection)
+        return True
+
+    def is_blocked(self, connection) -> bool:
+        return connection is not None and connection in self._blocked
+
+
+_blocked_tracker = _BlockedConnectionTracker()
+logging.getLogger("aiormq.connection").addFilter(_blocked_tracker)
+
+
+class _ChannelTarget:
+    """
+    배치 publish 대상 (aiormq 채널에 직접 basic_publish)
+    drain=False면 프레임을 쓰기 큐에 넣기만 하고 소켓 drain을 기다리지 않음
+    """
+
+    __slots__ = ("channel", "exchange", "drain")
+
+    def __init__(self, channel, exchange: str, drain: bool):
+        self.channel = channel
+        self.exchange = exchange
+        self.drain = drain
+
+    async def publish(self, message: aio_pika.Message, routing_key: str, mandatory: bool = True, timeout=None):
+        return await self.channel.basic_publish(
+            message.body,
+            exchange=self.exchange,
+            routing_key=routing_key,
+            properties=message.properties,
+            mandatory=mandatory,
+            timeout=timeout,
+            wait=self.drain,
+        )
+
+
+class AsyncRabbitMQClusterClient:
+    """
+    비동기 RabbitMQ 클러스터 클라이언트
+    - 다중 노드 자동 fallback (노드 레지스트리 순위: RTT EWMA × 열린 연결 수, 실패 노드는 마지막)
+    - (선택) 리더 인지 publish: 큐의 quorum 리더 노드로 별도 연결을 열어 클러스터 내부 홉 제거
+    - 노드별 회로 차단기 (closed/open/half-open, 프로세스 내 클라이언트와 헬스 프로버가 공유)
+    - 하나의 연결/채널 위에서 여러 코루틴이 동시에 publish
+    - 요청별 데드라인 예산 안에서 재시도: 연결 오류는 즉시 다른 노드로 failover,
+      그 밖의 오류는 full jitter 백오프(asyncio.sleep, 다른 요청을 막지 않음)
+    - 윈도우 방식 publisher confirm: 미확인 delivery tag 수를 제한하면서
+      여러 publish의 ack를 파이프라이닝 (메시지당 왕복 대기 없음)
+    - publish 레인마다 별도 인스턴스(연결/채널/confirm 윈도우)를 사용
+    """
+
+    def __init__(self, lane: str = DEFAULT_LANE):
+        self.lane = lane
+        self.connection: Optional[aio_pika.abc.AbstractConnection] = None
+        self.channel: Optional[aio_pika.abc.AbstractChannel] = None
+        self.cluster_nodes = settings.get_rabbitmq_nodes()
+        if not self.cluster_nodes:
+            raise RuntimeError("RabbitMQ configuration is missing. Check environment variables.")
+        self.node_keys = [node_key_for(node) for node in self.cluster_nodes]
+        self.current_node_index = 0
+        self._connected_node_key: Optional[str] = None
+        # 리더 인지 모드에서 주 연결과 다른 노드로 여는 연결: 노드 인덱스 → (연결, 채널)
+        self._leader_links: Dict[int, Tuple[aio_pika.abc.AbstractConnection, aio_pika.abc.AbstractChannel]] = {}
+        self._leader_link_retry_at: Dict[int, float] = {}
+        self.last_successful_node = None
+        # 동시에 여러 요청이 재연결을 시도하지 않도록 직렬화
+        self._connect_lock = asyncio.Lock()
+        # 브로커 ack를 기다리는 미확인 publish 수 제한 (confirm 윈도우)
+        self._confirm_window = asyncio.Semaphore(settings.rabbitmq_confirm_window)
+        self.confirm_stats = {
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "acked": 0,
+            "nacked": 0,
+            "timeouts": 0,
+        }
+
+
+    def _connect_order(self) -> list:
+        """
+        연결 시도 순서
+        노드 레지스트리 순위(publish/confirm RTT EWMA × 열린 연결 수, 동점이면 PID 기준 회전),
+        실패한 노드는 마지막
+        """
+        ranked = get_cluster_node_registry().rank_nodes(self.node_keys)
+        failed = [i for i in ranked if self._get_node_status(i) == NodeStatus.FAILED]
+        return [i for i in ranked if i not in failed] + failed
+
+    async def _connect_to_cluster(self, deadline: Optional[Deadline] = None) -> bool:
+        """클러스터 노드들을 순위대로 시도하여 연결 (데드라인이 있으면 남은 예산 안에서만)"""
+        for node_index in self._connect_order():
+            if deadline is not None and deadline.expired:
+                break
+            if await self._try_connect_to_node(node_index, deadline):
+                return True
+
+        logger.error("Failed to connect to any RabbitMQ cluster nodes")
+        return False
+
+    async def _try_connect_to_node(self, node_index: int, deadline: Optional[Deadline] = None) -> bool:
+        """특정 노드에 연결 시도 (연결 제한 시간은 남은 예산으로 절단)"""
+        node = self.cluster_nodes[node_index]
+        node_key = f"{node['host']}:{node['port']}"
+
+        # 회로 차단기: 열린 노드는 건너뛰기
+        # (헬스 프로버가 동작 중이면 half-open 시험은 프로버가 수행하므로 사용자 요청은 시험하지 않음)
+        registry = get_cluster_node_registry()
+        breaker = registry.breaker(node_key)
+        if not breaker.allow_request(claim_trial=not registry.probing):
+            logger.debug(f"Circuit breaker active for {node_key}")
+            return False
+
+        try:
+            logger.info(f"Attempting to connect to RabbitMQ node: {node_key}")
+
+            timeout = settings.rabbitmq_connection_timeout
+            if deadline is not None:
+                timeout = deadline.timeout(timeout)
+            connection = await self._open_connection(node, timeout=timeout)
+            channel = await self._open_channel(connection)
+
+            self.connection = connection
+            self.channel = channel
+            self.current_node_index = node_index
+            self.last_successful_node = node_index
+            self._connected_node_key = node_key
+            breaker.record_success()
+            registry.record_success(node_key)
+            registry.connection_opened(node_key)
+
+            logger.info(f"Successfully connected to RabbitMQ node: {node_key}")
+            return True
+
+        except Exception as e:
+            breaker.record_failure()
+            registry.record_failure(node_key)
+
+            logger.warning(
+                f"Failed to connect to RabbitMQ node {node_key} "
+                f"(attempt {breaker.failures}): {e}"
+            )
+            return False
+
+    async def _open_connection(
+        self,
+        node: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> aio_pika.abc.AbstractConnection:
+        """노드에 AMQP 연결 생성"""
+        return await aio_pika.connect(
+            host=node['host'],
+            port=node['port'],
+            login=node['user'],
+            password=node['password'],
+            timeout=timeout if timeout is not None else settings.rabbitmq_connection_timeout,
+            heartbeat=settings.rabbitmq_heartbeat,
+            # 관리 UI에서 레인별 연결을 구분할 수 있도록 이름 지정
+            client_properties={"connection_name": f"cdl-gateway:{self.lane}"},
+        )
+
+    async def _open_channel(self, connection) -> aio_pika.abc.AbstractChannel:
+        """publish용 채널 생성 (설정에 따라 confirm 모드)"""
+        return await connection.channel(
+            publisher_confirms=settings.rabbitmq_publisher_confirms,
+            # mandatory 메시지가 반환되면 PublishError로 받아 토폴로지 캐시를 무효화
+            on_return_raises=True,
+        )
+
+    def _get_node_status(self, node_index: int) -> NodeStatus:
+        """노드 상태 조회"""
+        node = self.cluster_nodes[node_index]
+        node_key = f"{node['host']}:{node['port']}"
+        return get_cluster_node_registry().get_node_status(node_key)
+
+    def _is_connected(self) -> bool:
+        return (
+            self.connection is not None and not self.connection.is_closed
+            and self.channel is not None and not self.channel.is_closed
+        )
+
+    async def _ensure_connection(self, deadline: Optional[Deadline] = None) -> bool:
+        """연결 상태 확인 및 필요시 재연결"""
+        if self._is_connected():
+            return True
+
+        async with self._connect_lock:
+            # 락 대기 중 다른 코루틴이 이미 재연결했을 수 있음
+            if self._is_connected():
+                return True
+
+            with stage_timer("reconnect"), start_span("reconnect", {"lane": self.lane}):
+                if self.connection is not None and not self.connection.is_closed:
+                    try:
+                        self.channel = await self._open_channel(self.connection)
+                        return True
+                    except Exception as e:
+                        logger.warning(f"Failed to reopen channel, reconnecting: {e}")
+
+                logger.info("Connection lost, attempting to reconnect...")
+                await self.close()
+                return await self._connect_to_cluster(deadline)
+
+    async def connect(self) -> bool:
+        """클러스터 연결 확보 (이미 연결되어 있으면 즉시 반환)"""
+        return await self._ensure_connection()
+
+    def is_blocked(self) -> bool:
+        """
+        브로커가 메모리/디스크 알람으로 연결을 차단(connection.blocked)했는지 확인
+
+        차단 중의 publish는 aiormq가 unblocked까지 대기시키므로 admission 단계에서 미리 거절한다.
+        """
+        if self.connection is None or self.connection.is_closed:
+            return False
+        transport = getattr(self.connection, "transport", None)
+        return _blocked_tracker.is_blocked(getattr(transport, "connection", None))
+
+    async def queue_exists(self, queue_name: str) -> bool:
+        """
+        큐 존재 여부 확인
+        passive 선언 실패 시 브로커가 채널을 닫으므로 공유 채널 대신 임시 채널 사용
+        """
+        if not await self._ensure_connection():
+            raise ConnectionError("Failed to establish RabbitMQ connection")
+
+        try:
+            async with self.connection.channel(publisher_confirms=False) as channel:
+                await channel.declare_queue(queue_name, passive=True)
+            return True
+        except aio_pika.exceptions.ChannelClosed:
+            # 큐가 존재하지 않음
+            return False
+        except Exception as e:
+            logger.error(f"Error checking queue existence for {queue_name}: {e}")
+            return False
+
+    async def declare_queue(self, queue_name: str, raise_on_conflict: bool = False, **kwargs) -> bool:
+        """
+        큐 선언 (Quorum Queue 사용)
+
+        Raises:
+            TopologyConflictError: raise_on_conflict이고 기존 큐와 인자가 달라 406으로 거부된 경우
+        """
+        if not await self._ensure_connection():
+            raise ConnectionError("Failed to establish RabbitMQ connection")
+
+        try:
+            arguments = {
+                'x-queue-type': 'quorum',
+                'x-quorum-initial-group-size': settings.quorum_initial_group_size,
+                'x-delivery-limit': settings.quorum_delivery_limit,
+                'x-max-in-memory-length': settings.quorum_max_in_memory_length,
+                'x-max-in-memory-bytes': settings.quorum_max_in_memory_bytes,
+            }
+            arguments.update(kwargs.pop('arguments', {}))
+
+            # 인자 불일치(406) 등으로 브로커가 채널을 닫아도 publish 채널에 영향이 없도록 임시 채널 사용
+            async with self.connection.channel(publisher_confirms=False) as channel:
+                await channel.declare_queue(
+                    queue_name,
+                    durable=kwargs.pop('durable', True),
+                    exclusive=kwargs.pop('exclusive', False),
+                    auto_delete=kwargs.pop('auto_delete', False),
+                    arguments=arguments,
+                )
+            logger.info(f"Quorum queue declared: {queue_name}")
+            return True
+
+        except aio_pika.exceptions.ChannelPreconditionFailed as e:
+            logger.error(f"Queue {queue_name} exists with different arguments: {e}")
+            if raise_on_conflict:
+                raise TopologyConflictError(f"Queue {queue_name} exists with different arguments: {e}") from e
+            return False
+        except Exception as e:
+            logger.error(f"Failed to declare queue {queue_name}: {e}")
+            return False
+
+    async def send_message(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: Union[Dict[str, Any], bytes],
+        priority: int = 0,
+        retry_count: int = 3,
+        deadline: Optional[Deadline] = None,
+    ) -> bool:
+        """
+        메시지 전송 (데드라인 예산 안에서 재시도)
+
+        - 연결 오류: 해당 노드 순위를 내리고 대기 없이 곧바로 다른 노드로 failover
+        - 그 밖의 오류 / 모든 노드 연결 실패: full jitter 백오프 후 재시도
+        - 연결, 백오프, confirm 대기 모두 남은 예산으로 제한
+
+        Args:
+            exchange: 익스체인지 이름 (빈 문자열이면 기본 익스체인지)
+            routing_key: 라우팅 키 (일반적으로 큐 이름)
+            body: 메시지 본문 (dict 또는 직렬화된 bytes)
+            priority: 메시지 우선순위
+            retry_count: 재시도 횟수
+            deadline: publish 시간 예산 (없으면 기본 예산)
+
+        Returns:
+            전송 성공 여부
+
+        Raises:
+            PublishDeadlineExceededError: 예산을 모두 소진한 경우
+        """
+        if isinstance(body, dict):
+            body = codec.dumps(body)
+        # 임계값 이상이면 압축 (재시도마다 다시 압축하지 않도록 루프 밖에서 한 번)
+        body, content_encoding = encode_body(body, routing_key)
+        deadline = deadline or Deadline()
+        failovers = 0
+
+        for attempt in range(retry_count + 1):
+            deadline.check(f"publish to {routing_key}")
+            try:
+                async with asyncio.timeout(deadline.remaining()):
+                    if not await self._ensure_connection(deadline):
+                        if attempt == retry_count:
+                            raise ConnectionError("Failed to establish RabbitMQ connection after retries")
+                        # 모든 노드 연결 실패: 곧바로 다시 시도해도 의미가 없으므로 백오프
+                        await asyncio.sleep(deadline.backoff(attempt))
+                        continue
+                    await self._publish_message(
+                        exchange, routing_key, body, priority, deadline, content_encoding, attempt,
+                    )
+
+                logger.debug(f"Message sent to {routing_key} via node {self.current_node_index}")
+                return True
+
+            except (PublishNackError, QueueNotFoundError):
+                # 브로커가 명시적으로 거부/반환한 메시지는 호출자에게 그대로 전달
+                raise
+            except aio_pika.exceptions.ChannelNotFoundEntity as e:
+                # 404 NOT_FOUND 채널 종료: 캐시된 토폴로지가 더 이상 유효하지 않음
+                get_queue_topology_cache().invalidate(routing_key)
+                raise QueueNotFoundError(f"Publish target not found for {routing_key}: {e}") from e
+            except Exception as e:
+                if deadline.expired:
+                    raise PublishDeadlineExceededError(
+                        f"Publish deadline of {deadline.budget:.1f}s exceeded for {routing_key} "
+                        f"after {attempt + 1} attempt(s): {e!r}"
+                    ) from e
+                logger.error(
+                    f"Failed to send message to {routing_key} "
+                    f"(attempt {attempt + 1}/{retry_count + 1}): {e}"
+                )
+
+                if attempt >= retry_count:
+                    return False
+
+                if isinstance(e, CONNECTION_ERRORS) and self._connected_node_key is not None:
+                    # 연결 오류: 노드 순위를 내려 재연결 시 다른 노드가 선택되도록 함
+                    registry = get_cluster_node_registry()
+                    registry.breaker(self._connected_node_key).record_failure()
+                    registry.record_failure(self._connected_node_key)
+                    await self.close()
+                    if failovers < len(self.cluster_nodes) - 1:
+                        failovers += 1
+                        continue
+                else:
+                    await self.close()
+                await asyncio.sleep(deadline.backoff(attempt))
+
+        return False
+
+    async def send_batch(
+        self,
+        exchange: str,
+        routing_key: str,
+        messages: Sequence[Tuple[bytes, int, Optional[Deadline], Optional[SpanContext]]],
+        retry_count: int = 3,
+    ) -> List[Union[bool, BaseException]]:
+        """
+        같은 라우팅 키로 가는 메시지 묶음을 한 채널에 연속으로 publish하고 confirm을 함께 대기
+
+        - 연결 확보와 채널 선택은 배치당 한 번
+        - publish 프레임은 순서대로 채널 쓰기 큐에 넣고 소켓 drain은 마지막 메시지에서 한 번
+        - confirm 윈도우 안에서 모든 ack를 함께 대기 (배치당 왕복 한 번)
+        - 브로커 거부/반환, 데드라인 초과는 해당 메시지 결과로 반환
+        - 연결 오류 등으로 실패한 메시지만 send_message 재시도 경로로 다시 전송
+
+        Args:
+            exchange: 익스체인지 이름 (빈 문자열이면 기본 익스체인지)
+            routing_key: 라우팅 키 (일반적으로 큐 이름)
+            messages: (직렬화된 본문, 우선순위, 데드라인, trace 컨텍스트) 목록
+            retry_count: 실패한 메시지의 재시도 횟수 (배치 전송을 첫 시도로 셈)
+
+        Returns:
+            메시지별 전송 결과 (True/False 또는 예외)
+        """
+        deadlines = [deadline or Deadline() for _, _, deadline, _ in messages]
+        try:
+            # 연결 확보는 가장 여유 있는 메시지의 예산 안에서 (메시지별 예산은 confirm 대기에 적용)
+            longest = max(deadlines, key=lambda d: d.expires_at)
+            async with asyncio.timeout(longest.remaining()):
+                connected = await self._ensure_connection(longest)
+            if not connected:
+                raise ConnectionError("Failed to establish RabbitMQ connection")
+            node_index, channel = await self._select_channel(routing_key, longest)
+            node_key = self.node_keys[node_index]
+            underlay = await channel.get_underlay_channel()
+            last = len(messages) - 1
+            results: List[Union[bool, BaseException]] = await asyncio.gather(
+                *(
+                    self._publish_batched(
+                        _ChannelTarget(underlay, exchange, drain=index == last),
+                        routing_key, body, priority, deadline, context, node_key,
+                    )
+                    for index, ((body, priority, _, context), deadline) in enumerate(zip(messages, deadlines))
+                ),
+                return_exceptions=True,
+            )
+        except Exception as e:
+            results = [e] * len(messages)
+
+        retry = [
+            index for index, result in enumerate(results)
+            if result is not True and not isinstance(
+                result, (PublishNackError, QueueNotFoundError, PublishDeadlineExceededError),
+            )
+        ]
+        if not retry:
+            return results
+        if any(isinstance(results[index], CONNECTION_ERRORS) for index in retry) and self._connected_node_key:
+            # 연결 오류: 노드 순위를 내려 재시도가 다른 노드로 failover하도록 함
+            registry = get_cluster_node_registry()
+            registry.breaker(self._connected_node_key).record_failure()
+            registry.record_failure(self._connected_node_key)
+            await self.close()
+        retried = await asyncio.gather(
+            *(
+                self._resend(exchange, routing_key, messages[index], deadlines[index], results[index], retry_count)
+                for index in retry
+            ),
+            return_exceptions=True,
+        )
+        for index, result in zip(retry, retried):
+            results[index] = result
+        return results
+
+    async def _publish_batched(
+        self,
+        target: _ChannelTarget,
+        routing_key: str,
+        body: bytes,
+        priority: int,
+        deadline: Deadline,
+        context: Optional[SpanContext],
+        node_key: str,
+    ) -> bool:
+        """배치의 메시지 하나를 제출한 요청의 trace 컨텍스트 아래에서 publish"""
+        with attach(context):
+            deadline.check(f"publish to {routing_key}")
+            body, content_encoding = encode_body(body, routing_key)
+            span_attributes = {
+                "routing_key": routing_key, "cluster_node": node_key, "attempt": 0,
+                "body_bytes": len(body), "batched": True,
+            }
+            with start_span("basic_publish", span_attributes, kind="producer"):
+                message = self._build_message(body, priority, content_encoding, node_key)
+                try:
+                    await self._publish(target, message, routing_key, node_key, deadline)
+                except aio_pika.exceptions.ChannelNotFoundEntity as e:
+                    get_queue_topology_cache().invalidate(routing_key)
+                    raise QueueNotFoundError(f"Publish target not found for {routing_key}: {e}") from e
+                except asyncio.TimeoutError as e:
+                    if deadline.expired:
+                        raise PublishDeadlineExceededError(
+                            f"Publish deadline of {deadline.budget:.1f}s exceeded for {routing_key}: {e!r}"
+                        ) from e
+                    raise
+        return True
+
+    async def _resend(
+        self,
+        exchange: str,
+        routing_key: str,
+        message: Tuple[bytes, int, Optional[Deadline], Optional[SpanContext]],
+        deadline: Deadline,
+        error: BaseException,
+        retry_count: int,
+    ) -> bool:
+        """배치 전송에 실패한 메시지를 send_message 재시도 경로로 다시 전송"""
+        if retry_count < 1:
+            raise error
+        logger.warning(f"Batched publish to {routing_key} failed, retrying individually: {error!r}")
+        body, priority, _, context = message
+        with attach(context):
+            return await self.send_message(
+                exchange, routing_key, body, priority=priority, retry_count=retry_count - 1, deadline=deadline,
+            )
+
+    async def _publish_message(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: bytes,
+        priority: int,
+        deadline: Deadline,
+        content_encoding: Optional[str] = None,
+        attempt: int = 0,
+    ) -> None:
+        """연결된 노드(리더 인지 모드면 리더 노드)로 publish"""
+        node_index, channel = await self._select_channel(routing_key, deadline)
+        node_key = self.node_keys[node_index]
+        span_attributes = {
+            "routing_key": routing_key, "cluster_node": node_key, "attempt": attempt, "body_bytes": len(body),
+        }
+        with start_span("basic_publish", span_attributes, kind="producer"):
+            message = self._build_message(body, priority, content_encoding, node_key)
+            if exchange:
+                target = await channel.get_exchange(exchange, ensure=False)
+            else:
+                target = channel.default_exchange
+            await self._publish(target, message, routing_key, node_key, deadline)
+
+    @staticmethod
+    def _build_message(
+        body: bytes, priority: int, content_encoding: Optional[str], node_key: str,
+    ) -> aio_pika.Message:
+        """publish할 메시지 (현재 span의 traceparent를 헤더에 포함)"""
+        return aio_pika.Message(
+            body=body,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            priority=priority,
+            timestamp=int(time.time()),
+            content_type='application/json',
+            content_encoding=content_encoding,
+            # traceparent: 컨슈머가 이 publish span 아래로 처리 span을 이어 붙일 수 있도록 전달
+            headers=inject_headers({
+                'sender': 'cdl-gateway',
+                'cluster_node': node_key,
+            }),
+        )
+
+    async def _select_channel(
+        self,
+        routing_key: str,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[int, aio_pika.abc.AbstractChannel]:
+        """
+        publish에 사용할 (노드 인덱스, 채널)
+        리더 인지 모드에서 큐의 리더가 주 연결과 다른 노드면 해당 노드 연결을 사용
+        (리더 연결을 데드라인 안에 열 수 없으면 주 연결로 fallback)
+        """
+        if settings.rabbitmq_leader_aware:
+            registry = get_cluster_node_registry()
+            if registry.claim_leader_refresh():
+                # 관리 API 조회는 스레드에서 수행 (publish 경로를 막지 않음)
+                asyncio.get_running_loop().run_in_executor(None, registry.refresh_queue_leaders)
+            leader = registry.leader_for(routing_key)
+            if leader in self.node_keys and leader != self.node_keys[self.current_node_index]:
+                node_index = self.node_keys.index(leader)
+                channel = await self._leader_channel(node_index, deadline)
+                if channel is not None:
+                    return node_index, channel
+        return self.current_node_index, self.channel
+
+    async def _leader_channel(
+        self,
+        node_index: int,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[aio_pika.abc.AbstractChannel]:
+        """
+        리더 노드로의 연결/채널 (없으면 생성, 실패 시 일정 시간 재시도하지 않음)
+        락 대기와 연결 시도 모두 데드라인 예산 안에서만 수행 (예산이 없으면 None → 주 연결 사용)
+        """
+        link = self._leader_links.get(node_index)
+        if link is not None and not link[0].is_closed and not link[1].is_closed:
+            return link[1]
+        if self._leader_link_retry_at.get(node_index, 0.0) > time.monotonic():
+            return None
+
+        try:
+            async with asyncio.timeout(deadline.remaining() if deadline is not None else None):
+                await self._connect_lock.acquire()
+        except TimeoutError:
+            # 다른 코루틴이 연결 중: 예산을 넘겨 기다리지 않음
+            return None
+
+        try:
+            link = self._leader_links.get(node_index)
+            if link is not None and not link[0].is_closed and not link[1].is_closed:
+                return link[1]
+            if deadline is not None and deadline.expired:
+                return None
+            await self._close_leader_link(node_index)
+
+            node_key = self.node_keys[node_index]
+            timeout = settings.rabbitmq_connection_timeout
+            if deadline is not None:
+                timeout = deadline.timeout(timeout)
+            try:
+                connection = await self._open_connection(self.cluster_nodes[node_index], timeout=timeout)
+                channel = await self._open_channel(connection)
+            except Exception as e:
+                logger.warning(f"Failed to open leader connection to {node_key}: {e}")
+                get_cluster_node_registry().record_failure(node_key)
+                self._leader_link_retry_at[node_index] = (
+                    time.monotonic() + settings.rabbitmq_leader_refresh_interval
+                )
+                return None
+
+            registry = get_cluster_node_registry()
+            registry.record_success(node_key)
+            registry.connection_opened(node_key)
+            self._leader_links[node_index] = (connection, channel)
+            logger.info(f"Opened leader-local connection to RabbitMQ node: {node_key}")
+            return channel
+        finally:
+            self._connect_lock.release()
+
+    async def _close_leader_link(self, node_index: int) -> None:
+        """리더 노드 연결 종료"""
+        link = self._leader_links.pop(node_index, None)
+        if link is None:
+            return
+        get_cluster_node_registry().connection_closed(self.node_keys[node_index])
+        try:
+            if not link[0].is_closed:
+                await link[0].close()
+        except Exception as e:
+            logger.debug(f"Error closing leader connection: {e}")
+
+    async def _publish(
+        self,
+        target,
+        message: aio_pika.Message,
+        routing_key: str,
+        node_key: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """
+        confirm 윈도우 안에서 publish
+
+        confirm 모드에서는 aiormq가 delivery tag별 future를 관리하며 단일/multiple ack
+        프레임이 도착하면 해당 future들을 한 번에 완료시킨다. 윈도우가 가득 차면
+        ack가 돌아와 슬롯이 빌 때까지 새 publish가 대기한다.
+        publish~confirm 왕복 시간은 노드 레지스트리의 노드별 RTT EWMA에 반영한다.
+        """
+        if not settings.rabbitmq_publisher_confirms:
+            await target.publish(message, routing_key=routing_key, mandatory=False)
+            return
+
+        registry = get_cluster_node_registry()
+        async with self._confirm_window:
+            stats = self.confirm_stats
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            started = time.monotonic()
+            try:
+                await target.publish(
+                    message,
+                    routing_key=routing_key,
+                    mandatory=True,
+                    timeout=(
+                        deadline.timeout(settings.rabbitmq_confirm_timeout) if deadline is not None
+                        else settings.rabbitmq_confirm_timeout
+                    ),
+                )
+                stats["acked"] += 1
+                if node_key is not None:
+                    registry.record_rtt(node_key, time.monotonic() - started)
+            except aio_pika.exceptions.PublishError as e:
+                # NO_ROUTE 반환: 큐가 삭제되었거나 아직 선언되지 않음
+                get_queue_topology_cache().invalidate(routing_key)
+                raise QueueNotFoundError(f"Message returned as unroutable for {routing_key}: {e}") from e
+            except aio_pika.exceptions.DeliveryError as e:
+                stats["nacked"] += 1
+                raise PublishNackError(f"Broker rejected message for {routing_key}: {e}") from e
+            except asyncio.TimeoutError:
+                stats["timeouts"] += 1
+                if node_key is not None:
+                    registry.record_failure(node_key)
+                raise
+            finally:
+                stats["in_flight"] -= 1
+
+    def get_cluster_status(self) -> Dict[str, Any]:
+        """클러스터 상태 정보 반환"""
+        status_info = {
+            "lane": self.lane,
+            "total_nodes": len(self.cluster_nodes),
+            "current_node_index": self.current_node_index,
+            "connected": self.connection is not None and not self.connection.is_closed,
+            "blocked": self.is_blocked(),
+            "publisher_confirms": settings.rabbitmq_publisher_confirms,
+            "confirms": dict(self.confirm_stats),
+            "leader_aware": settings.rabbitmq_leader_aware,
+            "leader_links": sorted(self.node_keys[i] for i in self._leader_links),
+            "selection": get_cluster_node_registry().get_stats(),
+            "nodes": []
+        }
+
+        for i, node in enumerate(self.cluster_nodes):
+            node_key = f"{node['host']}:{node['port']}"
+            breaker = get_cluster_node_registry().breaker(node_key)
+            status_info["nodes"].append({
+                "index": i,
+                "host": node['host'],
+                "port": node['port'],
+                "status": breaker.node_status.value,
+                "circuit": breaker.state.value,
+                "connection_attempts": breaker.failures,
+                "is_current": i == self.current_node_index
+            })
+
+        return status_info
+
+    async def close(self):
+        """연결 종료 (리더 노드 연결 포함)"""
+        for node_index in list(self._leader_links):
+            await self._close_leader_link(node_index)
+
+        if self._connected_node_key is not None:
+            get_cluster_node_registry().connection_closed(self._connected_node_key)
+            self._connected_node_key = None
+
+        try:
+            if self.channel and not self.channel.is_closed:
+                await self.channel.close()
+        except Exception as e:
+            logger.debug(f"Error closing channel: {e}")
+
+        try:
+            if self.connection and not self.connection.is_closed:
+                await self.connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing connection: {e}")
+
+        self.channel = None
+        self.connection = None
+
+
+# 워커(이벤트 루프)별, publish 레인별 인스턴스
+_async_client_instances: Dict[str, AsyncRabbitMQClusterClient] = {}
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_async_rabbitmq_client(lane: str = DEFAULT_LANE) -> AsyncRabbitMQClusterClient:
+    """
+    현재 이벤트 루프에 바인딩된 레인별 비동기 클러스터 클라이언트 반환
+    aio-pika 연결은 생성된 루프에 묶이므로 루프가 바뀌면 새로 생성
+    """
+    global _async_client_instances, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client_loop is not loop:
+        _async_client_instances = {}
+        _async_client_loop = loop
+    client = _async_client_instances.get(lane)
+    if client is None:
+        client = _async_client_instances[lane] = AsyncRabbitMQClusterClient(lane)
+    return client
+
+
+async def close_async_rabbitmq_client() -> None:
+    """현재 루프의 모든 레인 클라이언트 연결 종료 (애플리케이션 종료 시)"""
+    global _async_client_instances, _async_client_loop
+    for client in _async_client_instances.values():
+        await client.close()
+    _async_client_instances = {}
+    _async_client_loop = None
+
+
+def get_lane_connection_stats() -> Dict[str, Any]:
+    """레인별 연결 상태 (연결된 노드, 차단 여부, confirm 지표)"""
+    return {
+        lane: {
+            "connected": client._is_connected(),
+            "node": client._connected_node_key,
+            "blocked": client.is_blocked(),
+            "confirms": dict(client.confirm_stats),
+        }
+        for lane, client in _async_client_instances.items()
+    }
+
+
+def is_broker_blocked() -> bool:
+    """어느 레인이든 비동기 클라이언트 연결이 브로커에 의해 차단된 상태인지 확인 (클라이언트 미생성 시 False)"""
+    return any(client.is_blocked() for client in _async_client_instances.values())
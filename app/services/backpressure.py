@@ -0,0 +1,177 @@
+"""
+publish 입장 제어 (load shedding)
+워커 단위로 진행 중인 publish 수를 제한하고, 포화 상태이거나 브로커가 연결을
+차단(connection.blocked)했거나 publish 지연이 커지면 낮은 우선순위 요청부터 거절
+"""
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Callable
+
+from app.core.config import settings
+from app.services.async_rabbitmq import is_broker_blocked
+
+logger = logging.getLogger(__name__)
+
+# publish 지연 EWMA 가중치
+LATENCY_EWMA_ALPHA = 0.2
+# 마지막 지연 샘플 이후 이 시간(초)이 지나면 지연 기반 차단을 해제
+# (낮은 우선순위만 들어오는 상황에서 오래된 EWMA로 영구 차단되지 않도록)
+LATENCY_SAMPLE_MAX_AGE = 5.0
+
+TIERS = ("high", "medium", "low")
+
+
+class LoadShedError(Exception):
+    """부하 차단으로 요청을 거절한 경우 (HTTP 상태 코드와 Retry-After 포함)"""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class PublishAdmissionController:
+    """
+    워커 단위 bounded publish 큐
+    - 진행 중(publish + confirm 대기) 메시지 수를 max_pending으로 제한
+    - 시스템 우선순위 등급별 입장 한도: 낮은 우선순위일수록 더 일찍 거절 (429)
+    - 브로커 연결 차단 중에는 높은 우선순위만 입장 (503)
+    - publish 지연 EWMA가 임계값을 넘으면 낮은 우선순위 거절, 중간 우선순위 한도 절반 (503)
+    """
+
+    def __init__(
+        self,
+        max_pending: Optional[int] = None,
+        medium_threshold: Optional[float] = None,
+        low_threshold: Optional[float] = None,
+        latency_threshold_ms: Optional[float] = None,
+        retry_after: Optional[int] = None,
+        blocked_probe: Optional[Callable[[], bool]] = None,
+    ):
+        self.max_pending = max_pending or settings.publish_queue_max_pending
+        self.thresholds = {
+            "high": 1.0,
+            "medium": medium_threshold if medium_threshold is not None else settings.load_shed_medium_threshold,
+            "low": low_threshold if low_threshold is not None else settings.load_shed_low_threshold,
+        }
+        self.latency_threshold = (
+            latency_threshold_ms if latency_threshold_ms is not None
+            else settings.load_shed_latency_threshold_ms
+        ) / 1000.0
+        self.retry_after = retry_after or settings.load_shed_retry_after
+        self._blocked_probe = blocked_probe or is_broker_blocked
+
+        self.pending = 0
+        self.latency_ewma: Optional[float] = None
+        self._last_sample_at = 0.0
+        self._blocked = False
+        self.stats = {
+            "max_pending_seen": 0,
+            "blocked_transitions": 0,
+            "admitted": {tier: 0 for tier in TIERS},
+            "shed": {tier: 0 for tier in TIERS},
+        }
+
+    @staticmethod
+    def tier_for_priority(priority: int) -> str:
+        """시스템 우선순위 → 입장 등급 (숫자가 작을수록 높은 우선순위)"""
+        if priority <= settings.priority_high:
+            return "high"
+        if priority <= settings.priority_medium:
+            return "medium"
+        return "low"
+
+    def _is_blocked(self) -> bool:
+        """브로커 차단 상태 조회 및 전환 기록"""
+        blocked = self._blocked_probe()
+        if blocked != self._blocked:
+            self._blocked = blocked
+            if blocked:
+                self.stats["blocked_transitions"] += 1
+                logger.warning("RabbitMQ connection blocked by broker, shedding non-urgent publishes")
+            else:
+                logger.info("RabbitMQ connection unblocked, resuming normal admission")
+        return blocked
+
+    def _is_degraded(self) -> bool:
+        """최근 publish 지연이 임계값을 넘었는지 확인"""
+        return (
+            self.latency_ewma is not None
+            and self.latency_ewma > self.latency_threshold
+            and time.monotonic() - self._last_sample_at < LATENCY_SAMPLE_MAX_AGE
+        )
+
+    def _limit_for(self, tier: str) -> tuple:
+        """등급별 현재 입장 한도와 거절 시 상태 코드"""
+        if tier != "high" and self._is_blocked():
+            return 0, 503
+        fraction = self.thresholds[tier]
+        if tier != "high" and self._is_degraded():
+            return (0 if tier == "low" else int(self.max_pending * fraction / 2)), 503
+        return int(self.max_pending * fraction), 429
+
+    def _record_latency(self, elapsed: float) -> None:
+        """publish 지연 EWMA 갱신"""
+        if self.latency_ewma is None:
+            self.latency_ewma = elapsed
+        else:
+            self.latency_ewma += LATENCY_EWMA_ALPHA * (elapsed - self.latency_ewma)
+        self._last_sample_at = time.monotonic()
+
+    @asynccontextmanager
+    async def admit(self, priority: int):
+        """
+        publish 입장 허가 (블록을 빠져나오면 슬롯 반환)
+
+        Raises:
+            LoadShedError: 현재 한도를 넘어 요청을 거절한 경우
+        """
+        tier = self.tier_for_priority(priority)
+        limit, status_code = self._limit_for(tier)
+        if self.pending >= limit:
+            self.stats["shed"][tier] += 1
+            raise LoadShedError(
+                f"Publish queue saturated for {tier} priority "
+                f"(pending={self.pending}, limit={limit})",
+                status_code=status_code,
+                retry_after=self.retry_after,
+            )
+
+        self.stats["admitted"][tier] += 1
+        self.pending += 1
+        self.stats["max_pending_seen"] = max(self.stats["max_pending_seen"], self.pending)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.pending -= 1
+            self._record_latency(time.monotonic() - started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """입장 제어 상태 반환"""
+        return {
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "limits": {tier: self._limit_for(tier)[0] for tier in TIERS},
+            "blocked": self._blocked,
+            "degraded": self._is_degraded(),
+            "latency_ewma_ms": round(self.latency_ewma * 1000.0, 2) if self.latency_ewma is not None else None,
+            **self.stats,
+        }
+
+
+_admission_instance: Optional[PublishAdmissionController] = None
+
+
+def get_publish_admission() -> PublishAdmissionController:
+    """워커 단위 publish 입장 제어기 반환"""
+    global _admission_instance
+    if _admission_instance is None:
+        _admission_instance = PublishAdmissionController()
+    return _admission_instance
+
+
+def get_publish_admission_stats() -> Optional[Dict[str, Any]]:
+    """입장 제어기가 생성된 경우 상태 반환"""
+    return _admission_instance.get_stats() if _admission_instance is not None else None
@@ -0,0 +1,142 @@
+"""
+claim-check용 blob 저장소
+큰 메시지 본문을 브로커 대신 저장소에 두고 포인터(URI)만 publish하기 위한 작은 인터페이스
+- local: 공유 볼륨 등 로컬 파일시스템 (기본)
+- s3: S3 버킷 (boto3)
+"""
+import logging
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore(ABC):
+    """blob 저장소 인터페이스 (블로킹 I/O, 비동기 경로에서는 스레드에서 호출)"""
+
+    scheme: str = ""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str = "application/json") -> str:
+        """데이터 저장 후 URI 반환 (같은 key는 덮어씀)"""
+
+    @abstractmethod
+    def get(self, uri: str) -> bytes:
+        """URI의 데이터 반환"""
+
+    @abstractmethod
+    def delete(self, uri: str) -> None:
+        """URI의 데이터 삭제 (없으면 무시)"""
+
+
+class LocalBlobStore(BlobStore):
+    """로컬 파일시스템 저장소 (임시 파일에 쓴 뒤 rename으로 원자적 교체)"""
+
+    scheme = "file"
+
+    def __init__(self, root: Optional[str] = None, fsync: Optional[bool] = None):
+        self.root = os.path.abspath(root or settings.claim_check_local_dir)
+        self.fsync = settings.spool_fsync if fsync is None else fsync
+
+    def _path(self, uri: str) -> str:
+        path = os.path.abspath(urlparse(uri).path)
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"Blob URI outside of store root: {uri}")
+        return path
+
+    def put(self, key: str, data: bytes, content_type: str = "application/json") -> str:
+        path = os.path.join(self.root, key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return f"file://{path}"
+
+    def get(self, uri: str) -> bytes:
+        with open(self._path(uri), "rb") as f:
+            return f.read()
+
+    def delete(self, uri: str) -> None:
+        try:
+            os.unlink(self._path(uri))
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """S3 저장소 (boto3 클라이언트는 첫 사용 시 생성)"""
+
+    scheme = "s3"
+
+    def __init__(self, bucket: Optional[str] = None, prefix: Optional[str] = None, client=None):
+        self.bucket = bucket or settings.claim_check_s3_bucket
+        if not self.bucket:
+            raise RuntimeError("CLAIM_CHECK_S3_BUCKET is required for the s3 blob store")
+        self.prefix = (prefix if prefix is not None else settings.claim_check_s3_prefix).strip("/")
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+
+                    self._client = boto3.client("s3", region_name=settings.aws_region or settings.rabbitmq_region)
+        return self._client
+
+    def _object_key(self, uri: str) -> str:
+        parsed = urlparse(uri)
+        if parsed.netloc != self.bucket:
+            raise ValueError(f"Blob URI outside of bucket {self.bucket}: {uri}")
+        return parsed.path.lstrip("/")
+
+    def put(self, key: str, data: bytes, content_type: str = "application/json") -> str:
+        object_key = f"{self.prefix}/{key}" if self.prefix else key
+        self.client.put_object(Bucket=self.bucket, Key=object_key, Body=data, ContentType=content_type)
+        return f"s3://{self.bucket}/{object_key}"
+
+    def get(self, uri: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(uri))
+        return response["Body"].read()
+
+    def delete(self, uri: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(uri))
+
+
+BACKENDS = {"local": LocalBlobStore, "s3": S3BlobStore}
+
+_store_instance: Optional[BlobStore] = None
+_store_pid: Optional[int] = None
+
+
+def get_blob_store() -> BlobStore:
+    """워커 프로세스별 blob 저장소 (CLAIM_CHECK_BACKEND)"""
+    global _store_instance, _store_pid
+    pid = os.getpid()
+    if _store_instance is None or _store_pid != pid:
+        backend = BACKENDS.get(settings.claim_check_backend)
+        if backend is None:
+            raise RuntimeError(f"Unknown claim-check backend: {settings.claim_check_backend}")
+        _store_instance = backend()
+        _store_pid = pid
+    return _store_instance
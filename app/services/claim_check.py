@@ -0,0 +1,138 @@
+"""
+claim-check 단계
+임계값 이상인 메시지 본문을 blob 저장소에 두고 크기/체크섬을 담은 작은 포인터 메시지만
+publish하여 payload 크기 분포와 관계없이 브로커 처리량과 메모리를 일정하게 유지
+컨슈머는 resolve()로 원본 본문을 복원
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Optional, Dict, Any
+
+from app.core import codec
+from app.core.config import settings
+from app.services.blob_store import BlobStore, get_blob_store
+
+logger = logging.getLogger(__name__)
+
+# 포인터 메시지에 그대로 남기는 필드 (라우팅/로깅/추적용)
+POINTER_FIELDS = (
+    "edu_type", "edu_key", "member_key", "request_type", "generation_type", "request_id", "client_ip",
+)
+CLAIM_CHECK_FIELD = "claim_check"
+
+
+class ClaimCheckIntegrityError(ValueError):
+    """저장소에서 읽은 본문의 크기/체크섬이 포인터와 다른 경우"""
+    pass
+
+
+_stats = {"offloaded": 0, "offloaded_bytes": 0, "max_bytes": 0, "failures": 0}
+
+
+def _blob_key(digest: str) -> str:
+    """내용 기반 키 (같은 본문의 재시도는 같은 blob을 덮어씀)"""
+    return f"{time.strftime('%Y/%m/%d')}/{digest}.json"
+
+
+def _should_offload(data: bytes) -> bool:
+    return settings.claim_check_enabled and len(data) >= settings.claim_check_threshold
+
+
+def _pointer_fields(model, extra: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """모델과 요청 메타데이터에서 포인터에 남길 필드 추출"""
+    source = dict(extra or {})
+    for field in POINTER_FIELDS:
+        if field not in source:
+            source[field] = getattr(model, field, None)
+    return {field: source[field] for field in POINTER_FIELDS if source.get(field) is not None}
+
+
+def _store(store: BlobStore, data: bytes, pointer: Dict[str, Any], queue: str) -> Optional[bytes]:
+    """본문을 저장하고 직렬화된 포인터 메시지 반환 (저장 실패 시 None → 원본 그대로 publish)"""
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        uri = store.put(_blob_key(digest), data)
+    except Exception as e:
+        _stats["failures"] += 1
+        logger.warning(f"Claim-check store failed for {queue}, publishing inline ({len(data)} bytes): {e}")
+        return None
+
+    _stats["offloaded"] += 1
+    _stats["offloaded_bytes"] += len(data)
+    _stats["max_bytes"] = max(_stats["max_bytes"], len(data))
+    logger.debug(f"Offloaded {len(data)} bytes for {queue} to {uri}")
+
+    pointer[CLAIM_CHECK_FIELD] = {
+        "uri": uri,
+        "size": len(data),
+        "sha256": digest,
+        "content_type": "application/json",
+    }
+    return codec.dumps(pointer)
+
+
+def offload(
+    data: bytes,
+    queue: str,
+    model=None,
+    extra: Optional[Dict[str, Any]] = None,
+    store: Optional[BlobStore] = None,
+) -> Optional[bytes]:
+    """
+    임계값 이상인 직렬화 본문을 저장소에 두고 포인터 메시지 반환
+
+    Args:
+        data: 직렬화된 메시지 본문
+        queue: 대상 큐 (로그/지표용)
+        model: 포인터에 남길 필드(POINTER_FIELDS)를 읽을 모델
+        extra: 모델 밖의 요청 메타데이터 (request_id, client_ip)
+
+    Returns:
+        직렬화된 포인터 메시지 (대상이 아니거나 저장에 실패하면 None)
+    """
+    if not _should_offload(data):
+        return None
+    return _store(store or get_blob_store(), data, _pointer_fields(model, extra), queue)
+
+
+async def offload_async(
+    data: bytes,
+    queue: str,
+    model=None,
+    extra: Optional[Dict[str, Any]] = None,
+    store: Optional[BlobStore] = None,
+) -> Optional[bytes]:
+    """offload의 비동기 버전 (저장소 I/O는 스레드에서 수행)"""
+    if not _should_offload(data):
+        return None
+    pointer = _pointer_fields(model, extra)
+    return await asyncio.to_thread(_store, store or get_blob_store(), data, pointer, queue)
+
+
+def resolve(body: Dict[str, Any], store: Optional[BlobStore] = None) -> Dict[str, Any]:
+    """
+    컨슈머용: 포인터 메시지면 저장소에서 원본 본문을 읽어 검증 후 반환 (아니면 그대로)
+
+    Raises:
+        ClaimCheckIntegrityError: 크기/체크섬 불일치
+    """
+    pointer = body.get(CLAIM_CHECK_FIELD)
+    if not isinstance(pointer, dict):
+        return body
+    data = (store or get_blob_store()).get(pointer["uri"])
+    if len(data) != pointer["size"] or hashlib.sha256(data).hexdigest() != pointer["sha256"]:
+        raise ClaimCheckIntegrityError(f"Claim-check payload mismatch for {pointer['uri']}")
+    return codec.loads(data)
+
+
+def get_claim_check_stats() -> Optional[Dict[str, Any]]:
+    """claim-check 사용 시 지표 반환"""
+    if not settings.claim_check_enabled:
+        return None
+    return {
+        "backend": settings.claim_check_backend,
+        "threshold": settings.claim_check_threshold,
+        **_stats,
+    }
@@ -0,0 +1,289 @@
+"""
+클러스터 노드 레지스트리
+노드별 publish/confirm RTT와 열린 연결 수를 프로세스 단위로 집계하여
+연결할 노드를 고르고, 노드별 회로 차단기와 (선택) 큐별 quorum 리더 노드를 추적
+"""
+import base64
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from enum import Enum
+from typing import Optional, Dict, Any, List
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# RTT 샘플이 없는 노드의 기본 추정치(초): 다른 노드 샘플이 있으면 그 최솟값을 사용해
+# 아직 측정되지 않은 노드도 선택될 기회를 갖도록 함
+DEFAULT_RTT = 0.005
+# 연결 실패마다 노드 점수에 곱하는 벌점 (RTT 평균과 별도로 보관, 성공 시 해제)
+FAILURE_PENALTY = 4.0
+# 연속 실패로 누적되는 벌점 상한
+MAX_FAILURE_PENALTY = 64.0
+
+
+class NodeStatus(Enum):
+    """노드 상태"""
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+    FAILED = "failed"
+    UNKNOWN = "unknown"
+
+
+class CircuitState(Enum):
+    """회로 차단기 상태"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def node_key_for(node: Dict[str, Any]) -> str:
+    """노드 식별 키 (host:port)"""
+    return f"{node['host']}:{node['port']}"
+
+
+class NodeCircuitBreaker:
+    """
+    노드 단위 회로 차단기
+    - closed: 정상. 연속 실패가 failure_threshold에 도달하면 open
+    - open: 연결 시도 차단. open_timeout 경과 후 시험 요청 하나만 허용하며 half-open으로 전환
+    - half-open: 시험 결과가 성공이면 closed, 실패면 다시 open (타이머 재시작)
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = None, open_timeout: Optional[float] = None):
+        self.failure_threshold = failure_threshold or settings.rabbitmq_retry_attempts
+        self.open_timeout = open_timeout if open_timeout is not None else settings.rabbitmq_breaker_open_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._observed = False
+        self._lock = threading.Lock()
+
+    def allow_request(self, claim_trial: bool = True) -> bool:
+        """
+        연결 시도 허용 여부
+
+        Args:
+            claim_trial: open 상태에서 타임아웃이 지났을 때 half-open 시험을 가져갈지 여부
+                (백그라운드 프로버가 동작 중이면 사용자 요청은 False로 호출해 시험 비용을 치르지 않음)
+        """
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return True
+            if (self.state is CircuitState.OPEN and claim_trial
+                    and time.monotonic() - self.opened_at >= self.open_timeout):
+                self.state = CircuitState.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._observed = True
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._observed = True
+            self.failures += 1
+            if self.state is CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+
+    @property
+    def node_status(self) -> NodeStatus:
+        """차단기 상태 → NodeStatus"""
+        if not self._observed:
+            return NodeStatus.UNKNOWN
+        if self.state is CircuitState.OPEN:
+            return NodeStatus.FAILED
+        if self.state is CircuitState.HALF_OPEN or self.failures:
+            return NodeStatus.DEGRADED
+        return NodeStatus.HEALTHY
+
+
+class ClusterNodeRegistry:
+    """
+    프로세스 단위 노드 선택 정보
+    - 노드별 publish/confirm RTT EWMA
+    - 노드별 열린 연결 수 (동기 풀 클라이언트 + 비동기 클라이언트)
+    - 노드별 회로 차단기 (사용자 요청 경로와 백그라운드 프로버가 공유)
+    - 노드별 실패 벌점 (연속 실패마다 누적, 다음 연결/프로브/confirm 성공 시 해제)
+    - 점수 = RTT 추정치 × 실패 벌점 × (1 + 열린 연결 수): 빠른 노드를 선호하되 한 노드로 몰리지 않음
+    - 동점이면 PID 기준으로 시작 노드를 회전시켜 워커들이 노드 0에 몰리지 않도록 분산
+    - 큐 이름 → 리더 노드 키 (관리 API에서 주기적으로 갱신)
+    """
+
+    def __init__(self, alpha: Optional[float] = None):
+        self.alpha = alpha if alpha is not None else settings.rabbitmq_node_rtt_alpha
+        self._rtt: Dict[str, float] = {}
+        self._connections: Dict[str, int] = {}
+        self._samples: Dict[str, int] = {}
+        self._penalty: Dict[str, float] = {}
+        self._leaders: Dict[str, str] = {}
+        self._leaders_updated_at = 0.0
+        self._leader_refresh_running = False
+        self._breakers: Dict[str, NodeCircuitBreaker] = {}
+        # 백그라운드 헬스 프로버 동작 여부 (동작 중이면 half-open 시험은 프로버가 수행)
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def breaker(self, node_key: str) -> NodeCircuitBreaker:
+        """노드 회로 차단기 (없으면 생성)"""
+        breaker = self._breakers.get(node_key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(node_key, NodeCircuitBreaker())
+        return breaker
+
+    def get_node_status(self, node_key: str) -> NodeStatus:
+        """노드 상태 (회로 차단기 기준)"""
+        return self.breaker(node_key).node_status
+
+    def record_rtt(self, node_key: str, seconds: float) -> None:
+        """publish/confirm 왕복 시간 샘플 반영"""
+        with self._lock:
+            current = self._rtt.get(node_key)
+            self._rtt[node_key] = seconds if current is None else current + self.alpha * (seconds - current)
+            self._samples[node_key] = self._samples.get(node_key, 0) + 1
+            self._penalty.pop(node_key, None)
+
+    def record_success(self, node_key: str) -> None:
+        """연결/프로브 성공: 실패 벌점 해제 (RTT 평균은 그대로)"""
+        with self._lock:
+            self._penalty.pop(node_key, None)
+
+    def record_failure(self, node_key: str) -> None:
+        """연결/전송 실패: 실패 벌점을 누적해 순위를 낮춤 (RTT 평균은 건드리지 않음)"""
+        with self._lock:
+            self._penalty[node_key] = min(self._penalty.get(node_key, 1.0) * FAILURE_PENALTY, MAX_FAILURE_PENALTY)
+
+    def connection_opened(self, node_key: str) -> None:
+        with self._lock:
+            self._connections[node_key] = self._connections.get(node_key, 0) + 1
+
+    def connection_closed(self, node_key: str) -> None:
+        with self._lock:
+            self._connections[node_key] = max(0, self._connections.get(node_key, 0) - 1)
+
+    def _estimate(self, node_key: str) -> float:
+        """노드 RTT 추정치 (샘플이 없으면 측정된 노드 중 최솟값)"""
+        rtt = self._rtt.get(node_key)
+        if rtt is not None:
+            return rtt
+        return min(self._rtt.values(), default=DEFAULT_RTT)
+
+    def rank_nodes(self, node_keys: List[str]) -> List[int]:
+        """연결 시도 순서 (node_keys 인덱스, 점수가 낮은 노드부터)"""
+        count = len(node_keys)
+        offset = os.getpid() % count if count else 0
+        with self._lock:
+            scores = [
+                self._estimate(key) * self._penalty.get(key, 1.0) * (1 + self._connections.get(key, 0))
+                for key in node_keys
+            ]
+        return sorted(range(count), key=lambda i: (scores[i], (i - offset) % count))
+
+    def leader_for(self, queue: str) -> Optional[str]:
+        """큐의 리더 노드 키 (알 수 없으면 None)"""
+        return self._leaders.get(queue)
+
+    def set_queue_leaders(self, leaders: Dict[str, str]) -> None:
+        """큐 → 리더 노드 키 맵 교체"""
+        with self._lock:
+            self._leaders = dict(leaders)
+            self._leaders_updated_at = time.monotonic()
+
+    def claim_leader_refresh(self) -> bool:
+        """리더 맵 갱신 주기가 지났으면 갱신 권한 획득 (동시에 하나의 갱신만 수행)"""
+        with self._lock:
+            if (self._leader_refresh_running
+                    or time.monotonic() - self._leaders_updated_at < settings.rabbitmq_leader_refresh_interval):
+                return False
+            self._leader_refresh_running = True
+            return True
+
+    def refresh_queue_leaders(self) -> bool:
+        """
+        관리 API에서 큐별 리더 노드를 조회하여 갱신 (블로킹 HTTP, 스레드에서 호출)
+
+        Returns:
+            갱신 성공 여부
+        """
+        try:
+            leaders = fetch_queue_leaders(settings.get_rabbitmq_nodes())
+        except Exception as e:
+            logger.warning(f"Failed to refresh queue leaders: {e}")
+            # 실패해도 다음 주기까지 재시도하지 않음 (관리 API 장애가 publish에 영향 주지 않도록)
+            with self._lock:
+                self._leaders_updated_at = time.monotonic()
+            return False
+        finally:
+            self._leader_refresh_running = False
+        self.set_queue_leaders(leaders)
+        logger.debug(f"Refreshed leaders for {len(leaders)} queues")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """노드별 RTT/연결 수/차단기 상태와 리더 맵 반환"""
+        with self._lock:
+            nodes = {
+                key: {
+                    "rtt_ewma_ms": round(self._rtt[key] * 1000.0, 3) if key in self._rtt else None,
+                    "samples": self._samples.get(key, 0),
+                    "failure_penalty": self._penalty.get(key, 1.0),
+                    "connections": self._connections.get(key, 0),
+                    "circuit": self._breakers[key].state.value if key in self._breakers else None,
+                }
+                for key in sorted(set(self._rtt) | set(self._penalty) | set(self._connections) | set(self._breakers))
+            }
+            return {"nodes": nodes, "probing": self.probing, "queue_leaders": dict(self._leaders)}
+
+
+def fetch_queue_leaders(nodes: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    RabbitMQ 관리 API(/api/queues)에서 큐별 리더 노드 조회
+
+    Erlang 노드 이름(rabbit@...)은 RABBITMQ_NODE_NAMES에 get_rabbitmq_nodes()와
+    같은 순서로 지정해야 노드(host:port)에 매핑할 수 있다.
+    """
+    names = [name.strip() for name in (settings.rabbitmq_node_names or "").split(",") if name.strip()]
+    if not settings.rabbitmq_management_url or not nodes or len(names) != len(nodes):
+        raise RuntimeError("RABBITMQ_MANAGEMENT_URL and RABBITMQ_NODE_NAMES (one per node) are required")
+    key_by_name = {name: node_key_for(node) for name, node in zip(names, nodes)}
+
+    # 게이트웨이는 기본 vhost("/")에만 연결
+    url = f"{settings.rabbitmq_management_url.rstrip('/')}/api/queues/%2F?columns=name,type,leader,node"
+    credentials = base64.b64encode(f"{nodes[0]['user']}:{nodes[0]['password']}".encode()).decode()
+    request = urllib.request.Request(url, headers={"Authorization": f"Basic {credentials}"})
+    with urllib.request.urlopen(request, timeout=settings.rabbitmq_connection_timeout) as response:
+        queues = json.loads(response.read())
+
+    leaders = {}
+    for queue in queues:
+        # quorum 큐는 leader, classic 큐는 node 필드에 소유 노드가 있음
+        key = key_by_name.get(queue.get("leader") or queue.get("node"))
+        if key is not None:
+            leaders[queue["name"]] = key
+    return leaders
+
+
+_registry_instance: Optional[ClusterNodeRegistry] = None
+_registry_pid: Optional[int] = None
+_registry_lock = threading.Lock()
+
+
+def get_cluster_node_registry() -> ClusterNodeRegistry:
+    """워커 프로세스별 노드 레지스트리 반환 (동기 풀과 비동기 클라이언트가 공유)"""
+    global _registry_instance, _registry_pid
+    pid = os.getpid()
+    if _registry_instance is None or _registry_pid != pid:
+        with _registry_lock:
+            if _registry_instance is None or _registry_pid != pid:
+                _registry_instance = ClusterNodeRegistry()
+                _registry_pid = pid
+    return _registry_instance
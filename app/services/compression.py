@@ -0,0 +1,151 @@
+"""
+메시지 본문 압축
+임계값 이상인 본문을 zlib/zstd로 압축하고 content_encoding으로 표시하여
+quorum 큐 메모리(x-max-in-memory-bytes)에 더 많은 메시지를 보관
+컨슈머는 decode_body()로 content_encoding에 맞게 복원
+"""
+import logging
+import threading
+import zlib
+from typing import Optional, Dict, Any, Tuple
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성 (pip install cdl-gateway[compression])
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 알고리즘 → AMQP content_encoding 값 (zlib 스트림은 HTTP의 deflate와 같은 형식)
+CONTENT_ENCODINGS = {"zlib": "deflate", "zstd": "zstd"}
+# 압축 후 크기가 원본의 이 비율을 넘으면 압축하지 않고 원본 전송 (이미 압축된 데이터 등)
+MIN_SAVING_RATIO = 0.9
+
+
+class UnsupportedContentEncodingError(ValueError):
+    """decode_body가 알 수 없는 content_encoding을 받은 경우"""
+    pass
+
+
+# zstd 압축/해제 객체는 스레드 간 공유 불가 (동기 풀 클라이언트는 여러 스레드에서 publish)
+_local = threading.local()
+
+
+def _zstd_compressor(level: int):
+    compressor = getattr(_local, "compressor", None)
+    if compressor is None or _local.level != level:
+        compressor = _local.compressor = zstandard.ZstdCompressor(level=level)
+        _local.level = level
+    return compressor
+
+
+def _zstd_decompressor():
+    decompressor = getattr(_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+
+def _algorithm() -> str:
+    """설정된 알고리즘 (zstandard 미설치 시 zlib)"""
+    algorithm = settings.publish_compression_algorithm
+    if algorithm == "zstd" and zstandard is None:
+        return "zlib"
+    return algorithm
+
+
+def compress(data: bytes, algorithm: str, level: Optional[int] = None) -> bytes:
+    """알고리즘별 압축 (level이 없으면 알고리즘 기본값)"""
+    if algorithm == "zstd":
+        return _zstd_compressor(level if level is not None else 3).compress(data)
+    if algorithm == "zlib":
+        return zlib.compress(data, level if level is not None else 6)
+    raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+
+
+def decode_body(body: bytes, content_encoding: Optional[str] = None) -> bytes:
+    """
+    컨슈머용 본문 복원 (properties.content_encoding / message.content_encoding 그대로 전달)
+
+    Raises:
+        UnsupportedContentEncodingError: 알 수 없는 인코딩
+    """
+    if not content_encoding or content_encoding == "identity":
+        return body
+    if content_encoding == "deflate":
+        return zlib.decompress(body)
+    if content_encoding == "zstd":
+        if zstandard is None:
+            raise UnsupportedContentEncodingError("zstd body received but zstandard is not installed")
+        # 스트리밍 압축 프레임은 원본 크기가 없을 수 있으므로 상한 없이 읽기
+        return _zstd_decompressor().decompressobj().decompress(body)
+    raise UnsupportedContentEncodingError(f"Unsupported content encoding: {content_encoding}")
+
+
+class CompressionStats:
+    """큐별 압축 지표 (메시지 수, 압축한 메시지 수, 원본/전송 바이트)"""
+
+    def __init__(self):
+        self._queues: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, queue: str, raw_bytes: int, encoded_bytes: int, compressed: bool) -> None:
+        with self._lock:
+            stats = self._queues.get(queue)
+            if stats is None:
+                stats = self._queues[queue] = {
+                    "messages": 0, "compressed": 0, "raw_bytes": 0, "encoded_bytes": 0,
+                }
+            stats["messages"] += 1
+            stats["compressed"] += int(compressed)
+            stats["raw_bytes"] += raw_bytes
+            stats["encoded_bytes"] += encoded_bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """큐별 지표와 압축률 (원본 바이트 / 전송 바이트)"""
+        with self._lock:
+            return {
+                queue: {
+                    **stats,
+                    "ratio": round(stats["raw_bytes"] / stats["encoded_bytes"], 3) if stats["encoded_bytes"] else None,
+                }
+                for queue, stats in sorted(self._queues.items())
+            }
+
+
+_stats = CompressionStats()
+
+
+def encode_body(body: bytes, queue: str) -> Tuple[bytes, Optional[str]]:
+    """
+    publish 직전 본문 압축
+
+    Returns:
+        (전송할 본문, content_encoding) - 압축하지 않으면 content_encoding은 None
+    """
+    if not settings.publish_compression_enabled:
+        return body, None
+
+    raw_size = len(body)
+    if raw_size >= settings.publish_compression_threshold:
+        algorithm = _algorithm()
+        encoded = compress(body, algorithm, settings.publish_compression_level)
+        if len(encoded) <= raw_size * MIN_SAVING_RATIO:
+            _stats.record(queue, raw_size, len(encoded), compressed=True)
+            return encoded, CONTENT_ENCODINGS[algorithm]
+
+    _stats.record(queue, raw_size, raw_size, compressed=False)
+    return body, None
+
+
+def get_compression_stats() -> Optional[Dict[str, Any]]:
+    """압축 사용 시 큐별 압축 지표 반환"""
+    if not settings.publish_compression_enabled:
+        return None
+    return {
+        "algorithm": _algorithm(),
+        "threshold": settings.publish_compression_threshold,
+        "queues": _stats.get_stats(),
+    }
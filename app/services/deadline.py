@@ -0,0 +1,81 @@
+"""
+publish 데드라인 예산
+요청 단위로 publish(연결, 재시도 대기, confirm 대기 포함)에 쓸 수 있는 시간을 제한하여
+워커가 장시간 붙잡히지 않고 예산 소진 시 빠르고 결정적으로 실패하도록 함
+"""
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.core.config import settings
+
+
+class PublishDeadlineExceededError(TimeoutError):
+    """publish 데드라인 예산을 모두 소진한 경우"""
+    pass
+
+
+class Deadline:
+    """
+    요청 단위 publish 시간 예산
+    - remaining(): 남은 시간(초)
+    - timeout(limit): 개별 단계 제한 시간을 남은 예산으로 절단
+    - backoff(attempt): full jitter 지수 백오프 (남은 예산을 넘지 않음)
+    - within(what): 남은 예산 안에서 비동기 블록 실행
+    """
+
+    __slots__ = ("budget", "expires_at")
+
+    def __init__(self, budget: Optional[float] = None):
+        self.budget = budget if budget is not None else settings.publish_deadline_default
+        self.expires_at = time.monotonic() + self.budget
+
+    @classmethod
+    def for_edu_type(cls, edu_type: Optional[int], default: Optional[float] = None) -> "Deadline":
+        """교육 타입별 예산 (PUBLISH_DEADLINE_BY_EDU_TYPE, 없으면 default 또는 기본값)"""
+        fallback = default if default is not None else settings.publish_deadline_default
+        return cls(settings.publish_deadline_by_edu_type.get(edu_type, fallback))
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, limit: float) -> float:
+        """단계별 제한 시간과 남은 예산 중 작은 값"""
+        return min(limit, self.remaining())
+
+    def backoff(self, attempt: int) -> float:
+        """full jitter 백오프: [0, min(cap, base * 2^attempt)] 구간 균등 분포"""
+        ceiling = min(
+            settings.publish_retry_backoff_cap,
+            settings.publish_retry_backoff_base * (2 ** attempt),
+        )
+        return min(random.uniform(0.0, ceiling), self.remaining())
+
+    def check(self, what: str) -> None:
+        """예산이 소진되었으면 PublishDeadlineExceededError"""
+        if self.expired:
+            raise PublishDeadlineExceededError(
+                f"Publish deadline of {self.budget:.1f}s exceeded ({what})"
+            )
+
+    @asynccontextmanager
+    async def within(self, what: str):
+        """블록을 남은 예산 안에서 실행 (초과 시 PublishDeadlineExceededError)"""
+        self.check(what)
+        try:
+            async with asyncio.timeout(self.remaining()):
+                yield
+        except PublishDeadlineExceededError:
+            raise
+        except TimeoutError as e:
+            if not self.expired:
+                raise
+            raise PublishDeadlineExceededError(
+                f"Publish deadline of {self.budget:.1f}s exceeded ({what})"
+            ) from e
@@ -0,0 +1,337 @@
+"""
+멱등성(중복 요청 억제) 캐시
+호출자가 보낸 X-Request-ID로 이미 접수된(200/202) 요청이 다시 오면 publish하지 않고
+원래 결과를 그대로 반환하여 재시도로 인한 AI 워커의 중복 분석을 방지
+- 워커별 TTL + 크기 제한 LRU (OrderedDict)
+- 선택적 공유 저장소 (로컬 miss 시 조회, 접수 결과 기록)
+  - sqlite: 로컬 파일 (같은 호스트의 워커 간 공유, 테스트용 대체 저장소)
+  - redis: Redis (redis-py 선택 의존성 cdl-gateway[redis], 여러 호스트 간 공유)
+- 같은 request_id가 전송 중이면 먼저 온 요청의 결과를 기다렸다가 반환
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Callable, Awaitable
+
+from app.core import codec
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # 선택 의존성 (pip install cdl-gateway[redis])
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# 재전송 대신 원래 결과를 돌려줄 상태 (전송 완료, 스풀 접수)
+ACCEPTED_STATUSES = (200, 202)
+# 로컬 항목 하나의 고정 메모리 (OrderedDict 노드 + (만료 시각, 값) 튜플 + float)
+_ENTRY_OVERHEAD = sys.getsizeof((0.0, b"")) + sys.getsizeof(0.0) + 100
+
+
+class IdempotencyBackend(ABC):
+    """공유 저장소 인터페이스 (블로킹 I/O, 비동기 경로에서는 스레드에서 호출)"""
+
+    name: str = ""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """만료되지 않은 값 반환 (없으면 None)"""
+
+    @abstractmethod
+    def put(self, key: str, value: bytes, ttl: float) -> None:
+        """ttl초 동안 값 보관 (같은 key는 덮어씀)"""
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteIdempotencyBackend(IdempotencyBackend):
+    """로컬 SQLite 파일 저장소 (WAL 모드, 같은 호스트의 워커 프로세스 간 공유)"""
+
+    name = "sqlite"
+    # 기록 이 횟수마다 만료된 행 정리
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.idempotency_sqlite_path
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM idempotency WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def put(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO idempotency (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM idempotency WHERE expires_at <= ?", (now,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisIdempotencyBackend(IdempotencyBackend):
+    """Redis 저장소 (redis-py 클라이언트는 첫 사용 시 생성, 만료는 Redis TTL)"""
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, prefix: Optional[str] = None, client=None):
+        self.url = url or settings.idempotency_redis_url
+        if client is None:
+            if redis is None:
+                raise RuntimeError(
+                    "redis is not installed; install cdl-gateway[redis] to use the redis idempotency backend"
+                )
+            if not self.url:
+                raise RuntimeError("IDEMPOTENCY_REDIS_URL is required for the redis idempotency backend")
+        self.prefix = settings.idempotency_key_prefix if prefix is None else prefix
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.prefix}{key}")
+
+    def put(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(f"{self.prefix}{key}", value, px=max(1, int(ttl * 1000)))
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+
+
+BACKENDS = {"sqlite": SQLiteIdempotencyBackend, "redis": RedisIdempotencyBackend}
+
+
+class IdempotencyCache:
+    """
+    request_id → 접수 결과 캐시
+    - execute(): 캐시된 결과가 있으면 재사용, 없으면 전송 후 접수 결과 기록
+    - reserve()/release(): execute()를 여러 key에 나눠 쓰는 경우 (배치 항목별 예약)
+    - 로컬 LRU는 만료 시각이 지난 항목을 조회 시 제거하고 max_entries를 넘으면 오래된 항목부터 제거
+    - 공유 저장소 오류는 집계 후 무시 (캐시 없이 전송)
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        backend: Optional[IdempotencyBackend] = None,
+    ):
+        self.max_entries = max_entries or settings.idempotency_max_entries
+        self.ttl = ttl or settings.idempotency_ttl
+        self.backend = backend
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "shared_hits": 0,
+            "inflight_hits": 0,
+            "misses": 0,
+            "stored": 0,
+            "evicted": 0,
+            "expired": 0,
+            "backend_errors": 0,
+        }
+
+    @staticmethod
+    def _entry_bytes(key: str, value: bytes) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value) + _ENTRY_OVERHEAD
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= self._entry_bytes(key, value)
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_local(self, key: str, value: bytes) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._bytes += self._entry_bytes(key, value)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats["evicted"] += 1
+
+    async def _lookup(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """(캐시된 값, "hits"/"shared_hits") 로컬 → 공유 저장소 순 조회"""
+        value = self._get_local(key)
+        if value is not None:
+            return value, "hits"
+        if self.backend is None:
+            return None, None
+        try:
+            value = await asyncio.to_thread(self.backend.get, key)
+        except Exception as e:
+            self.stats["backend_errors"] += 1
+            logger.warning(f"Idempotency backend lookup failed for {key}: {e}")
+            return None, None
+        if value is None:
+            return None, None
+        self._put_local(key, value)
+        return value, "shared_hits"
+
+    async def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 접수 결과 (없으면 None)"""
+        value, source = await self._lookup(key)
+        self.stats[source or "misses"] += 1
+        return codec.loads(value) if value is not None else None
+
+    async def remember(self, key: str, result: Dict[str, Any]) -> bool:
+        """접수된 결과 기록 (200/202가 아니면 기록하지 않음 → 재시도 시 다시 전송)"""
+        if result.get("status") not in ACCEPTED_STATUSES:
+            return False
+        value = codec.dumps(result)
+        self._put_local(key, value)
+        self.stats["stored"] += 1
+        if self.backend is not None:
+            try:
+                await asyncio.to_thread(self.backend.put, key, value, self.ttl)
+            except Exception as e:
+                self.stats["backend_errors"] += 1
+                logger.warning(f"Idempotency backend store failed for {key}: {e}")
+        return True
+
+    async def reserve(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 결과가 있으면 반환, 없으면 key를 전송 중으로 예약하고 None 반환
+        (None을 받은 호출자는 전송 후 반드시 release() 호출)
+        """
+        waited = False
+        while True:
+            value, source = await self._lookup(key)
+            if value is not None:
+                self.stats[source] += 1
+                if waited:
+                    self.stats["inflight_hits"] += 1
+                return codec.loads(value)
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                break
+            # 같은 request_id가 전송 중: 끝날 때까지 대기 후 다시 조회 (접수되지 않았으면 직접 전송)
+            waited = True
+            await asyncio.shield(waiter)
+
+        # 조회 이후 await 없이 예약하므로 같은 key를 두 요청이 동시에 예약할 수 없음
+        self.stats["misses"] += 1
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        return None
+
+    async def release(self, key: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """reserve()한 key의 예약 해제 (result가 있으면 먼저 기록하여 대기 중인 요청이 재사용)"""
+        try:
+            if result is not None:
+                await self.remember(key, result)
+        finally:
+            done = self._inflight.pop(key, None)
+            if done is not None:
+                done.set_result(None)
+
+    async def execute(
+        self, key: str, send: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        캐시된 결과가 있으면 반환, 없으면 send() 후 결과 기록
+
+        Returns:
+            (결과, 캐시에서 재사용했는지)
+        """
+        cached = await self.reserve(key)
+        if cached is not None:
+            return cached, True
+
+        result = None
+        try:
+            result = await send()
+            return result, False
+        finally:
+            await self.release(key, result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중률/항목 수/추정 메모리"""
+        hits = self.stats["hits"] + self.stats["shared_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "backend": self.backend.name if self.backend is not None else None,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_bytes": self._bytes,
+            "inflight": len(self._inflight),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **self.stats,
+        }
+
+
+_cache_instance: Optional[IdempotencyCache] = None
+_cache_pid: Optional[int] = None
+
+
+def get_idempotency_cache() -> IdempotencyCache:
+    """
+    워커 프로세스별 멱등성 캐시 (IDEMPOTENCY_BACKEND의 공유 저장소 포함)
+
+    Raises:
+        RuntimeError: 알 수 없는 저장소이거나 저장소를 만들 수 없는 경우 (설정 누락, 의존성 미설치)
+    """
+    global _cache_instance, _cache_pid
+    pid = os.getpid()
+    if _cache_instance is None or _cache_pid != pid:
+        backend = None
+        if settings.idempotency_backend not in (None, "", "none"):
+            backend_class = BACKENDS.get(settings.idempotency_backend)
+            if backend_class is None:
+                raise RuntimeError(f"Unknown idempotency backend: {settings.idempotency_backend}")
+            backend = backend_class()
+        _cache_instance = IdempotencyCache(backend=backend)
+        _cache_pid = pid
+    return _cache_instance
+
+
+def get_idempotency_stats() -> Optional[Dict[str, Any]]:
+    """멱등성 캐시 현황 (비활성화 시 None)"""
+    if not settings.idempotency_enabled:
+        return None
+    return get_idempotency_cache().get_stats()
@@ -2,129 +2,202 @@
 통합 메시지 서비스
 비즈니스 로직과 인프라 로직을 연결하는 단일 서비스
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, List, Union
+
+import aio_pika
 
 from app.core.config import settings
-from app.models.requests import SokindRequest
+from app.core.codec import model_to_bytes
+from app.core.metrics import record_message, stage_timer
+from app.core.tracing import start_span
+from app.models.requests import SokindRequest, specialized_model_class
 from app.models.education_models import SokindBaseModel
-from app.services.rabbitmq import MessageSender
+from app.services.rabbitmq import get_rabbitmq_pool
+from app.services.async_rabbitmq import CONNECTION_ERRORS, get_async_rabbitmq_client, QueueNotFoundError
+from app.services.publish_batcher import get_publish_batcher
+from app.services.topology import get_queue_topology_cache
+from app.services.spool import get_publish_spool
+from app.services.backpressure import get_publish_admission
+from app.services.deadline import Deadline
+from app.services.routing import get_routing_rules
+from app.services.claim_check import offload, offload_async
+from app.services.publish_lanes import (
+    DEFAULT_LANE,
+    SPOOL_LANE,
+    get_publish_lane,
+    lane_for,
+    lane_timeout,
+)
 
 logger = logging.getLogger(__name__)
 
+# 스풀로 보내는 오류 (ConnectionError/TimeoutError는 OSError 하위)
+# 그중 CONNECTION_ERRORS(AMQP 연결 오류)만 브로커 장애로 보고 이후 요청도 곧바로 스풀에 기록하며
+# EMFILE, 디스크 오류, 타임아웃 같은 그 밖의 OSError는 실패한 메시지만 스풀에 기록
+SPOOLABLE_ERRORS = (OSError, aio_pika.exceptions.AMQPConnectionError)
+
 
 class MessageService:
     """
     통합 메시지 서비스
-    - 비즈니스 우선순위를 시스템 우선순위로 매핑
-    - 교육 타입별 큐 라우팅 규칙 관리
+    - 라우팅 규칙 파일(app.services.routing)에 따라 큐/시스템 우선순위 결정
     - RabbitMQ 인프라 추상화
     """
     
-    # 비즈니스 우선순위 → 시스템 우선순위 매핑
-    @property
-    def PRIORITY_MAPPING(self):
-        return {
-            "urgent": settings.priority_high,
-            "high": settings.priority_high,
-            "normal": settings.priority_medium,
-            "medium": settings.priority_medium,
-            "low": settings.priority_low,
-        }
-    
-    # 교육 타입별 기본 큐 매핑
-    @property
-    def QUEUE_MAPPING(self):
-        return {
-            1: settings.default_queue,
-            2: settings.default_queue,
-            3: settings.default_queue,
-            4: settings.default_queue,
-            5: settings.default_queue,
-            6: settings.default_queue,
-            9: "periodic_report",
-        }
-    
     def get_queue_for_model(self, model: SokindBaseModel) -> str:
-        """모델의 비즈니스 특성에 따라 적절한 큐 결정"""
-        edu_type = getattr(model, 'edu_type', None)
-        
-        if edu_type in self.QUEUE_MAPPING:
-            return self.QUEUE_MAPPING[edu_type]
-        
-        # 동적 큐 결정
-        if edu_type == 7:
-            request_type = getattr(model, 'request_type', 0)
-            if request_type in [1, 2]:
-                return "sokind_conversation_generate_response"
-            else:
-                return "sokind_conversation"
-                
-        elif edu_type == 8:
-            request_type = getattr(model, 'request_type', 0)
-            if request_type in [1, 2]:
-                return "sokind_demo_generate_response"
-            elif request_type in [3, 4]:
-                return "sokind_demo_analyze_response"
-            else:
-                return settings.default_queue
-                
-        elif edu_type == 10:
-            generation_type = getattr(model, 'generation_type', '')
-            queue_map = {
-                "AUGMENTATION": "V3_PERSONA_GENERATION",
-                "QUESTION": "V3_RESPONSE_GENERATION", 
-                "REPORT": "V3_CONVERSATION_ANALYSIS_REPORT",
-            }
-            return queue_map.get(generation_type, settings.default_queue)
-        
-        return settings.default_queue
+        """라우팅 규칙에 따른 모델의 큐"""
+        return get_routing_rules().resolve(model)[0]
     
     def get_priority_for_model(self, model: SokindBaseModel) -> int:
-        """모델의 비즈니스 우선순위를 시스템 우선순위로 변환"""
-        if hasattr(model, 'get_business_priority'):
-            business_priority = model.get_business_priority()
-            return self.PRIORITY_MAPPING.get(business_priority, settings.priority_medium)
+        """라우팅 규칙(또는 모델의 비즈니스 우선순위)에 따른 시스템 우선순위"""
+        return get_routing_rules().resolve(model)[1]
+    
+    def get_queue_arguments(self, priority: int, queue: Optional[str] = None) -> Dict[str, Any]:
+        """큐 선언 시 기본 Quorum 설정에 덮어쓸 인자 반환 (규칙 파일의 arguments 우선)"""
+        return get_routing_rules().table.queue_arguments(queue, priority)
+    
+    def get_queue_topology(self) -> Dict[str, Dict[str, Any]]:
+        """
+        라우팅 규칙으로 도달 가능한 모든 큐와 선언 인자 반환
+        
+        규칙 키마다 get_queue_for_model과 같은 규칙 조회로 큐를 구하고, 규칙에 우선순위가 없으면
+        edu_type/generation_type으로 정해지는 특화 모델 클래스의 비즈니스 우선순위 후보를 사용.
+        같은 큐로 가는 조합 중 가장 높은 우선순위를 기준으로 큐 인자를 결정.
+        규칙이 없는 조합이 가는 default_queue는 항상 포함
+        """
+        table = get_routing_rules().table
+        queue_priorities: Dict[str, int] = {settings.default_queue: settings.priority_medium}
+        for edu_type, request_type, generation_type in table.keys():
+            route = table.match(edu_type, request_type, generation_type)
+            priority = route.priority
+            if priority is None:
+                model_class = specialized_model_class(edu_type, generation_type)
+                priority = min(
+                    table.priorities.get(name, settings.priority_medium)
+                    for name in model_class.business_priorities(edu_type)
+                )
+            queue_priorities[route.queue] = min(priority, queue_priorities.get(route.queue, priority))
         
-        # 기본값: 교육 타입별 우선순위 
-        edu_type = getattr(model, 'edu_type', None)
-        if edu_type == 1:
-            return settings.priority_high
-        elif edu_type == 4:
-            return settings.priority_low
-        else:
-            return settings.priority_medium
+        return {
+            queue: table.queue_arguments(queue, priority)
+            for queue, priority in sorted(queue_priorities.items())
+        }
     
-    def send_message_with_model(
+    def _prepare_message(
         self,
         model: SokindBaseModel,
         client_ip: str,
-        request_id: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """특화 모델을 사용한 메시지 전송"""
+        request_id: Optional[str] = None,
+        raw_fields: Optional[Dict[str, bytes]] = None
+    ) -> Tuple[str, bytes, int]:
+        """
+        큐, 메시지 바디(UTF-8 JSON bytes), 우선순위 결정
+        raw_fields: 모델 값 대신 그대로 사용할 필드별 원본 JSON bytes (스트리밍 수집)
+        """
         logger.info(
-            f"Sending message with model: {type(model).__name__}",
+            "Sending message with model",
             extra={
                 "request_id": request_id,
+                "model": type(model).__name__,
                 "edu_type": getattr(model, "edu_type", None),
                 "business_priority": model.get_business_priority(),
                 "processing_type": model.get_processing_type(),
             }
         )
         
-        # 큐와 우선순위 결정
-        queue = self.get_queue_for_model(model)
-        priority = self.get_priority_for_model(model)
+        # 큐와 우선순위 결정 (컴파일된 라우팅 테이블 조회)
+        with stage_timer("routing"), start_span("routing") as span:
+            queue, priority = get_routing_rules().resolve(model)
+            span.set_attribute("queue", queue)
+            span.set_attribute("priority", priority)
+        
+        # 메시지 바디 생성: 모델 → bytes 한 번에 직렬화 (dict/str 중간 단계 없음)
+        with stage_timer("serialization"), start_span("serialization") as span:
+            body = model_to_bytes(model, self._message_extra(request_id, client_ip), raw_fields)
+            span.set_attribute("body_bytes", len(body))
         
-        # 메시지 바디 생성
-        body = model.dict()
+        return queue, body, priority
+    
+    @staticmethod
+    def _message_extra(request_id: Optional[str], client_ip: Optional[str]) -> Dict[str, Any]:
+        """모델 필드 뒤에 덧붙이는 요청 메타데이터"""
+        extra = {}
         if request_id:
-            body["request_id"] = request_id
+            extra["request_id"] = request_id
         if client_ip:
-            body["client_ip"] = client_ip
+            extra["client_ip"] = client_ip
+        return extra
+    
+    def send_message_with_model(
+        self,
+        model: SokindBaseModel,
+        client_ip: str,
+        request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """특화 모델을 사용한 메시지 전송"""
+        edu_type = getattr(model, "edu_type", None)
+        with start_span("send_message_with_model", {"edu_type": edu_type, "request_id": request_id}):
+            lane = lane_for(model.get_processing_type())
+            deadline = Deadline.for_edu_type(edu_type, lane_timeout(lane))
+            queue, body, priority = self._prepare_message(model, client_ip, request_id)
+            # 큰 본문은 blob 저장소에 두고 포인터 메시지로 대체
+            body = offload(body, queue, model, self._message_extra(request_id, client_ip)) or body
+            
+            # 실제 전송
+            return self._send_to_queue(queue, body, priority, request_id, deadline, edu_type)
+    
+    async def send_message_with_model_async(
+        self,
+        model: SokindBaseModel,
+        client_ip: str,
+        request_id: Optional[str] = None,
+        batched: bool = False,
+        raw_fields: Optional[Dict[str, bytes]] = None
+    ) -> Dict[str, Any]:
+        """
+        특화 모델을 사용한 메시지 전송 (이벤트 루프를 블로킹하지 않음)
+        batched=True면 PUBLISH_BATCHING_ENABLED와 관계없이 마이크로 배칭 단계로 publish
+        raw_fields가 있으면 해당 필드는 모델 값 대신 원본 JSON bytes로 메시지 본문 구성
+        """
+        edu_type = getattr(model, "edu_type", None)
+        # 처리 유형별 publish 레인 (레인마다 별도 연결/채널, 동시 publish 한도)
+        lane = lane_for(model.get_processing_type())
+        with start_span("send_message_with_model", {"edu_type": edu_type, "request_id": request_id, "lane": lane}):
+            # publish 시간 예산 (연결, 재시도, confirm 대기 포함): 교육 타입 지정값, 없으면 레인 기본값
+            deadline = Deadline.for_edu_type(edu_type, lane_timeout(lane))
+            queue, body, priority = self._prepare_message(model, client_ip, request_id, raw_fields)
+            # 큰 본문은 blob 저장소에 두고 포인터 메시지로 대체
+            body = await offload_async(body, queue, model, self._message_extra(request_id, client_ip)) or body
+            
+            # 실제 전송
+            return await self._send_to_queue_async(
+                queue, body, priority, request_id, deadline, lane, edu_type, batched
+            )
+
+    async def send_batch_async(
+        self,
+        items: List[Tuple[SokindBaseModel, str]],
+        client_ip: str
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        여러 메시지를 동시에 전송 (배치 수집 엔드포인트용)
+        같은 큐로 가는 메시지는 마이크로 배칭 단계에서 한 번에 기록
+        
+        Args:
+            items: (특화 모델, request_id) 목록
         
-        # 실제 전송
-        return self._send_to_queue(queue, body, priority, request_id)
+        Returns:
+            항목별 전송 결과 또는 예외 (입력 순서)
+        """
+        return await asyncio.gather(
+            *(
+                self.send_message_with_model_async(model, client_ip, request_id, batched=True)
+                for model, request_id in items
+            ),
+            return_exceptions=True,
+        )
 
     def send_message(
         self,
@@ -133,71 +206,243 @@ class MessageService:
         request_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """기존 API 호환성을 위한 메시지 전송"""
-        specialized_model = request_body.to_specialized_model()
+        with stage_timer("to_specialized_model"), start_span("to_specialized_model"):
+            specialized_model = request_body.to_specialized_model()
         return self.send_message_with_model(specialized_model, client_ip, request_id)
     
     def _send_to_queue(
         self, 
         queue: str, 
-        body: Dict[str, Any], 
+        body: bytes, 
         priority: int, 
-        request_id: Optional[str] = None
+        request_id: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        edu_type: Optional[int] = None
     ) -> Dict[str, Any]:
         """실제 RabbitMQ 큐로 메시지 전송"""
+        with start_span("send_to_queue", {"queue": queue, "priority": priority}):
+            try:
+                # 워커 단위 풀에서 열린 연결/채널을 대여 (요청마다 새 연결 생성하지 않음)
+                with get_rabbitmq_pool().acquire() as sender:
+                    # 처음 보는 큐만 존재 확인/생성 (Quorum Queue로 생성)
+                    topology = get_queue_topology_cache()
+                    if not topology.is_known(queue):
+                        with start_span("ensure_queue", {"queue": queue}):
+                            if (sender.queue_exists(queue)
+                                    or sender.declare_queue(queue, **self.get_queue_arguments(priority, queue))):
+                                topology.mark_declared(queue)
+                    
+                    # 메시지 전송
+                    with stage_timer("publish"):
+                        sender.send_message(
+                            exchange="",
+                            routing_key=queue,
+                            body=body,
+                            priority=priority,
+                            deadline=deadline
+                        )
+            
+                return self._on_sent(queue, priority, request_id, edu_type)
+            
+            except Exception as e:
+                self._on_send_failed(e, queue, request_id, edu_type)
+                record_message(queue, edu_type, priority, "failed")
+                raise
+    
+    async def _send_to_queue_async(
+        self, 
+        queue: str, 
+        body: bytes, 
+        priority: int, 
+        request_id: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        lane: str = DEFAULT_LANE,
+        edu_type: Optional[int] = None,
+        batched: bool = False
+    ) -> Dict[str, Any]:
+        """실제 RabbitMQ 큐로 메시지 전송 (aio-pika)"""
+        with start_span("send_to_queue", {"queue": queue, "priority": priority, "lane": lane}):
+            if not settings.load_shedding_enabled:
+                return await self._deliver_async(queue, body, priority, request_id, deadline, lane, edu_type, batched)
+            
+            # 워커의 publish 큐가 포화되었거나 브로커가 연결을 차단한 경우
+            # 낮은 우선순위부터 LoadShedError로 거절 (라우터가 429/503 + Retry-After로 변환)
+            async with get_publish_admission().admit(priority):
+                return await self._deliver_async(queue, body, priority, request_id, deadline, lane, edu_type, batched)
+    
+    async def _deliver_async(
+        self, 
+        queue: str, 
+        body: bytes, 
+        priority: int, 
+        request_id: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        lane: str = DEFAULT_LANE,
+        edu_type: Optional[int] = None,
+        batched: bool = False
+    ) -> Dict[str, Any]:
+        """
+        publish 및 실패 시 스풀 fallback
+        데드라인 예산을 넘기면 PublishDeadlineExceededError (스풀 사용 시 스풀에 기록)
+        """
+        deadline = deadline or Deadline.for_edu_type(edu_type, lane_timeout(lane))
+        spool = get_publish_spool() if settings.spool_enabled else None
+        if spool is not None and not spool.broker_available:
+            # 클러스터 장애 중: 연결 시도 비용 없이 바로 스풀에 기록 (복구는 drainer가 확인)
+            return await self._spool_message(spool, queue, body, priority, request_id, edu_type)
+        
         try:
-            sender = MessageSender()
+            sender = get_async_rabbitmq_client(lane)
             
-            # 큐가 존재하지 않으면 생성 (Quorum Queue로 생성)
-            if not sender.queue_exists(queue):
-                # 특정 큐에 대한 커스텀 설정이 필요한 경우 여기에 추가
-                queue_args = {}
-                
-                # 우선순위가 높은 큐는 더 큰 메모리 제한 설정
-                if priority >= settings.priority_high:
-                    queue_args = {
-                        'arguments': {
-                            'x-max-in-memory-length': 200000,  # 고우선순위 큐는 더 많은 메시지 보관
-                            'x-max-in-memory-bytes': 209715200  # 200MB
-                        }
-                    }
-                
-                sender.declare_queue(queue, **queue_args)
-                
-            # 메시지 전송
-            sender.send_message(
-                exchange="",
-                routing_key=queue,
-                body=body,
-                priority=priority
-            )
-            sender.close()
+            async with deadline.within(f"declare {queue}"):
+                await self._ensure_queue_async(sender, queue, priority)
+            try:
+                await self._publish_async(sender, queue, body, priority, deadline, lane, batched)
+            except QueueNotFoundError:
+                # 캐시에 있던 큐가 브로커에서 사라진 경우: 다시 선언 후 한 번 재전송
+                logger.warning(f"Queue {queue} not found on publish, redeclaring")
+                async with deadline.within(f"declare {queue}"):
+                    await self._ensure_queue_async(sender, queue, priority)
+                await self._publish_async(sender, queue, body, priority, deadline, lane, batched)
             
-            logger.info(
-                f"Message sent successfully", 
-                extra={
-                    "queue": queue,
-                    "priority": priority,
-                    "request_id": request_id,
-                    "edu_type": body.get("edu_type"),
-                }
-            )
+            return self._on_sent(queue, priority, request_id, edu_type)
             
-            return {
-                "message": "success",
-                "status": 200,
+        except Exception as e:
+            self._on_send_failed(e, queue, request_id, edu_type)
+            if spool is not None and isinstance(e, SPOOLABLE_ERRORS):
+                if isinstance(e, CONNECTION_ERRORS):
+                    spool.broker_available = False
+                return await self._spool_message(spool, queue, body, priority, request_id, edu_type)
+            record_message(queue, edu_type, priority, "failed")
+            raise
+    
+    async def _spool_message(
+        self,
+        spool,
+        queue: str,
+        body: bytes,
+        priority: int,
+        request_id: Optional[str] = None,
+        edu_type: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """전송 실패 메시지를 로컬 스풀에 기록 (SpoolFullError는 호출자에게 전달)"""
+        await asyncio.to_thread(spool.append, queue, body, priority, request_id)
+        record_message(queue, edu_type, priority, "spooled")
+        
+        logger.warning(
+            f"Message spooled for later delivery",
+            extra={
+                "queue": queue,
+                "priority": priority,
                 "request_id": request_id,
+                "edu_type": edu_type,
+            }
+        )
+        
+        return {
+            "message": "accepted",
+            "status": 202,
+            "request_id": request_id,
+            "queue": queue,
+            "priority": priority,
+            "spooled": True
+        }
+    
+    async def publish_spooled(self, queue: str, body: bytes, priority: int) -> bool:
+        """스풀 drainer용 재전송 (배칭/스풀 단계를 거치지 않고 배치 레인 연결 사용)"""
+        sender = get_async_rabbitmq_client(SPOOL_LANE)
+        await self._ensure_queue_async(sender, queue, priority)
+        return await sender.send_message(
+            exchange="",
+            routing_key=queue,
+            body=body,
+            priority=priority
+        )
+    
+    async def _ensure_queue_async(self, sender, queue: str, priority: int) -> None:
+        """처음 보는 큐만 존재 확인/생성 (Quorum Queue로 생성)"""
+        topology = get_queue_topology_cache()
+        if topology.is_known(queue):
+            return
+        with start_span("ensure_queue", {"queue": queue}):
+            if (await sender.queue_exists(queue)
+                    or await sender.declare_queue(queue, **self.get_queue_arguments(priority, queue))):
+                topology.mark_declared(queue)
+    
+    async def _publish_async(
+        self,
+        sender,
+        queue: str,
+        body: bytes,
+        priority: int,
+        deadline: Optional[Deadline] = None,
+        lane: str = DEFAULT_LANE,
+        batched: bool = False
+    ) -> None:
+        """
+        레인 슬롯 안에서 메시지 전송 (confirm 모드에서는 브로커 ack까지 대기)
+        
+        Raises:
+            ConnectionError: 재시도 후에도 전송하지 못한 경우
+        """
+        deadline = deadline or Deadline(lane_timeout(lane))
+        batched = batched or settings.publish_batching_enabled
+        async with get_publish_lane(lane).slot(deadline):
+            with stage_timer("publish"), start_span("publish", {"queue": queue, "lane": lane, "batched": batched}):
+                if batched:
+                    sent = await get_publish_batcher(lane).submit(queue, body, priority, deadline)
+                else:
+                    sent = await sender.send_message(
+                        exchange="",
+                        routing_key=queue,
+                        body=body,
+                        priority=priority,
+                        deadline=deadline
+                    )
+            if not sent:
+                raise ConnectionError(f"Failed to publish message to {queue}")
+    
+    def _on_sent(
+        self,
+        queue: str,
+        priority: int,
+        request_id: Optional[str] = None,
+        edu_type: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """전송 성공 로그/집계 및 응답 생성"""
+        record_message(queue, edu_type, priority, "sent")
+        logger.info(
+            "Message sent successfully",
+            extra={
                 "queue": queue,
-                "priority": priority
+                "priority": priority,
+                "request_id": request_id,
+                "edu_type": edu_type,
             }
-            
-        except Exception as e:
-            logger.error(
-                f"Failed to send message: {e}",
-                extra={
-                    "queue": queue,
-                    "request_id": request_id,
-                    "edu_type": body.get("edu_type"),
-                },
-                exc_info=True,
-            )
-            raise
\ No newline at end of file
+        )
+        
+        return {
+            "message": "success",
+            "status": 200,
+            "request_id": request_id,
+            "queue": queue,
+            "priority": priority
+        }
+    
+    def _on_send_failed(
+        self,
+        error: Exception,
+        queue: str,
+        request_id: Optional[str] = None,
+        edu_type: Optional[int] = None
+    ) -> None:
+        """전송 실패 로그"""
+        logger.error(
+            f"Failed to send message: {error}",
+            extra={
+                "queue": queue,
+                "request_id": request_id,
+                "edu_type": edu_type,
+            },
+            exc_info=True,
+        )
@@ -0,0 +1,238 @@
+"""
+백그라운드 노드 헬스 프로버
+사용자 요청과 별개로 각 클러스터 노드를 주기적으로 확인하여 노드별 회로 차단기와
+NodeStatus를 갱신 (장애 감지와 복구 확인 비용을 사용자 요청이 치르지 않도록 함)
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+
+import aio_pika
+
+from app.core.config import settings
+from app.services.cluster_nodes import (
+    ClusterNodeRegistry,
+    CircuitState,
+    get_cluster_node_registry,
+    node_key_for,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _connect(node: Dict[str, Any]) -> aio_pika.abc.AbstractConnection:
+    """프로브 전용 연결 생성"""
+    return await aio_pika.connect(
+        host=node['host'],
+        port=node['port'],
+        login=node['user'],
+        password=node['password'],
+        timeout=settings.rabbitmq_health_probe_timeout,
+        heartbeat=settings.rabbitmq_heartbeat,
+    )
+
+
+class NodeHealthProber:
+    """
+    노드 헬스 프로버
+    - 노드마다 프로브 전용 연결을 유지하고 주기적으로 채널을 열어 응답 확인
+    - (선택) canary: 프로버 전용 exclusive 큐로 publish(confirm) 후 get으로 되돌아오는지 확인
+    - 성공/실패를 노드별 회로 차단기에 기록 (closed → open → half-open → closed)
+    - 성공 시 노드 레지스트리의 실패 벌점 해제(canary면 RTT 샘플 기록), 실패 벌점은 closed 상태에서만 누적
+    - open 노드는 open_timeout이 지나면 프로버가 half-open 시험을 수행하며,
+      동작 중에는 사용자 요청 경로가 half-open 시험을 가져가지 않음
+    """
+
+    def __init__(
+        self,
+        nodes: Optional[List[Dict[str, Any]]] = None,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        canary: Optional[bool] = None,
+        registry: Optional[ClusterNodeRegistry] = None,
+        connect: Optional[Callable[[Dict[str, Any]], Awaitable[Any]]] = None,
+    ):
+        self.nodes = nodes if nodes is not None else settings.get_rabbitmq_nodes()
+        self.interval = interval or settings.rabbitmq_health_probe_interval
+        self.timeout = timeout or settings.rabbitmq_health_probe_timeout
+        self.canary = canary if canary is not None else settings.rabbitmq_canary_enabled
+        self.registry = registry or get_cluster_node_registry()
+        self._connect = connect or _connect
+        self._connections: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, Dict[str, Any]] = {
+            node_key_for(node): {
+                "probes": 0,
+                "failures": 0,
+                "last_probe_at": None,
+                "last_ok": None,
+                "last_error": None,
+                "probe_ms": None,
+                "canary_rtt_ms": None,
+            }
+            for node in self.nodes
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self.registry.probing = True
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.registry.probing = False
+        for key in list(self._connections):
+            await self._close_connection(key)
+
+    async def probe_all(self) -> Dict[str, Optional[bool]]:
+        """모든 노드를 동시에 확인 (open 상태로 대기 중인 노드는 None)"""
+        results = await asyncio.gather(*(self.probe_node(node) for node in self.nodes))
+        return {node_key_for(node): result for node, result in zip(self.nodes, results)}
+
+    async def probe_node(self, node: Dict[str, Any]) -> Optional[bool]:
+        """
+        노드 하나 확인 후 회로 차단기 갱신
+
+        Returns:
+            성공 여부 (open 상태에서 open_timeout이 지나지 않아 건너뛰면 None)
+        """
+        key = node_key_for(node)
+        breaker = self.registry.breaker(key)
+        if not breaker.allow_request():
+            return None
+
+        stats = self.stats[key]
+        stats["probes"] += 1
+        stats["last_probe_at"] = int(time.time())
+        started = time.monotonic()
+        previous = breaker.state
+        try:
+            await asyncio.wait_for(self._check(node, key), self.timeout)
+        except Exception as e:
+            stats["failures"] += 1
+            stats["last_ok"] = False
+            stats["last_error"] = f"{type(e).__name__}: {e}"
+            breaker.record_failure()
+            if previous is CircuitState.CLOSED:
+                # 이미 open(half-open 시험 포함)인 노드는 차단기가 제외하므로 벌점을 더 누적하지 않음
+                self.registry.record_failure(key)
+            await self._close_connection(key)
+            if breaker.state is CircuitState.OPEN and previous is not CircuitState.OPEN:
+                logger.warning(f"Health probe opened circuit for RabbitMQ node {key}: {e}")
+            return False
+
+        stats["last_ok"] = True
+        stats["last_error"] = None
+        stats["probe_ms"] = round((time.monotonic() - started) * 1000.0, 3)
+        breaker.record_success()
+        # 복구를 노드 선택에도 반영: canary 왕복은 publish/confirm RTT로 기록, 아니면 실패 벌점만 해제
+        if self.canary and stats["canary_rtt_ms"] is not None:
+            self.registry.record_rtt(key, stats["canary_rtt_ms"] / 1000.0)
+        else:
+            self.registry.record_success(key)
+        if previous is not CircuitState.CLOSED:
+            logger.info(f"Health probe closed circuit for RabbitMQ node {key}")
+        return True
+
+    async def _check(self, node: Dict[str, Any], key: str) -> None:
+        """프로브 연결에서 채널 열기 (canary 사용 시 publish → get 왕복)"""
+        connection = self._connections.get(key)
+        if connection is None or connection.is_closed:
+            connection = await self._connect(node)
+            self._connections[key] = connection
+
+        async with connection.channel(publisher_confirms=self.canary) as channel:
+            if self.canary:
+                await self._canary(channel, node, key)
+
+    async def _canary(self, channel, node: Dict[str, Any], key: str) -> None:
+        """
+        canary 왕복: 프로버 전용 exclusive 큐(연결된 노드에 생성, 연결 종료 시 삭제)로
+        publish하고 confirm 후 같은 메시지를 get으로 회수
+        """
+        queue_name = f"{settings.rabbitmq_canary_queue_prefix}.{socket.gethostname()}.{os.getpid()}.{node['port']}"
+        queue = await channel.declare_queue(queue_name, exclusive=True, auto_delete=True)
+        token = uuid.uuid4().hex.encode()
+
+        started = time.monotonic()
+        await channel.default_exchange.publish(
+            aio_pika.Message(body=token),
+            routing_key=queue_name,
+            mandatory=True,
+            timeout=self.timeout,
+        )
+        while True:
+            message = await queue.get(no_ack=True, fail=False)
+            if message is not None and message.body == token:
+                break
+            if message is None:
+                await asyncio.sleep(0.01)
+        self.stats[key]["canary_rtt_ms"] = round((time.monotonic() - started) * 1000.0, 3)
+
+    async def _close_connection(self, key: str) -> None:
+        connection = self._connections.pop(key, None)
+        if connection is None:
+            return
+        try:
+            if not connection.is_closed:
+                await connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing probe connection: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Node health prober error: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """노드별 프로브 결과와 차단기 상태"""
+        return {
+            "interval": self.interval,
+            "canary": self.canary,
+            "nodes": {
+                key: {
+                    "circuit": self.registry.breaker(key).state.value,
+                    "status": self.registry.get_node_status(key).value,
+                    **stats,
+                }
+                for key, stats in self.stats.items()
+            },
+        }
+
+
+_prober_instance: Optional[NodeHealthProber] = None
+
+
+def start_node_health_prober() -> NodeHealthProber:
+    """현재 이벤트 루프에서 헬스 프로버 시작"""
+    global _prober_instance
+    if _prober_instance is None:
+        _prober_instance = NodeHealthProber()
+        _prober_instance.start()
+    return _prober_instance
+
+
+async def stop_node_health_prober() -> None:
+    """헬스 프로버 중지 및 프로브 연결 종료 (애플리케이션 종료 시)"""
+    global _prober_instance
+    if _prober_instance is not None:
+        await _prober_instance.stop()
+    _prober_instance = None
+
+
+def get_node_health_stats() -> Optional[Dict[str, Any]]:
+    """헬스 프로버가 동작 중이면 상태 반환"""
+    return _prober_instance.get_stats() if _prober_instance is not None else None
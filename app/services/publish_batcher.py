@@ -0,0 +1,203 @@
+"""
+마이크로 배칭 publish 단계
+짧은 flush 윈도우 동안 같은 큐로 가는 메시지를 모아 한 번에 기록하고
+각 호출자의 future는 개별적으로 완료
+"""
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+from app.core import codec
+from app.core.config import settings
+from app.core.tracing import SpanContext, current_context
+from app.services.async_rabbitmq import get_async_rabbitmq_client
+from app.services.deadline import Deadline
+from app.services.publish_lanes import DEFAULT_LANE
+
+logger = logging.getLogger(__name__)
+
+# 배치 크기 분포 집계 구간 (상한 기준)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class _PendingBatch:
+    """큐 하나에 쌓이는 배치"""
+
+    __slots__ = ("items", "bytes", "timer")
+
+    def __init__(self):
+        self.items: List[Tuple[bytes, int, Optional[Deadline], Optional[SpanContext], asyncio.Future]] = []
+        self.bytes = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class PublishBatcher:
+    """
+    큐별 마이크로 배칭 publish 단계
+    - flush 조건: 최대 대기 시간(ms), 최대 메시지 수, 최대 바이트 수
+    - flush 시 배치의 모든 publish 프레임을 연속으로 기록하고 confirm을 함께 대기
+    - 배치 크기 분포와 flush 사유 지표 제공
+    - publish 레인마다 별도 인스턴스 (레인 클라이언트로 flush)
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_bytes: Optional[int] = None,
+        client_getter=None,
+        lane: str = DEFAULT_LANE,
+    ):
+        self.lane = lane
+        self.flush_interval = (
+            flush_interval_ms if flush_interval_ms is not None
+            else settings.publish_batch_flush_interval_ms
+        ) / 1000.0
+        self.max_batch_size = max_batch_size or settings.publish_batch_max_size
+        self.max_batch_bytes = max_batch_bytes or settings.publish_batch_max_bytes
+        self._client_getter = client_getter or (lambda: get_async_rabbitmq_client(lane))
+        self._batches: Dict[str, _PendingBatch] = {}
+        self._flush_tasks = set()
+        self.stats = {
+            "batches": 0,
+            "messages": 0,
+            "bytes": 0,
+            "failed_messages": 0,
+            "flush_reasons": {"size": 0, "bytes": 0, "interval": 0, "shutdown": 0},
+            "batch_size_buckets": {str(b): 0 for b in BATCH_SIZE_BUCKETS} | {"+Inf": 0},
+        }
+
+    async def submit(
+        self,
+        queue: str,
+        body: Union[Dict[str, Any], bytes],
+        priority: int = 0,
+        deadline: Optional[Deadline] = None,
+    ) -> bool:
+        """메시지를 배치에 추가하고 해당 메시지의 전송 결과를 대기 (데드라인은 메시지별로 적용)"""
+        if isinstance(body, dict):
+            body = codec.dumps(body)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._batches.get(queue)
+        if batch is None:
+            batch = self._batches[queue] = _PendingBatch()
+            batch.timer = loop.call_later(self.flush_interval, self._schedule_flush, queue, "interval")
+
+        # flush 태스크에는 요청의 trace 컨텍스트가 없으므로 메시지별로 함께 보관
+        batch.items.append((body, priority, deadline, current_context(), future))
+        batch.bytes += len(body)
+
+        if len(batch.items) >= self.max_batch_size:
+            self._schedule_flush(queue, "size")
+        elif batch.bytes >= self.max_batch_bytes:
+            self._schedule_flush(queue, "bytes")
+
+        return await future
+
+    def _schedule_flush(self, queue: str, reason: str) -> None:
+        """현재 배치를 떼어내 별도 태스크로 flush"""
+        batch = self._batches.pop(queue, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._flush(queue, batch, reason))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, queue: str, batch: _PendingBatch, reason: str) -> None:
+        """배치 전송 후 호출자별 future 완료"""
+        self._record_batch(len(batch.items), batch.bytes, reason)
+
+        try:
+            client = self._client_getter()
+            # 한 채널에 publish 프레임을 연속으로 기록하고 confirm은 함께 대기
+            results = await client.send_batch(
+                exchange="",
+                routing_key=queue,
+                messages=[(body, priority, deadline, context) for body, priority, deadline, context, _ in batch.items],
+            )
+        except Exception as e:
+            results = [e] * len(batch.items)
+
+        for (*_, future), result in zip(batch.items, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                self.stats["failed_messages"] += 1
+                future.set_exception(result)
+            else:
+                if not result:
+                    self.stats["failed_messages"] += 1
+                future.set_result(result)
+
+        logger.debug(f"Flushed batch of {len(batch.items)} messages to {queue} ({reason})")
+
+    def _record_batch(self, size: int, nbytes: int, reason: str) -> None:
+        """배치 지표 기록"""
+        self.stats["batches"] += 1
+        self.stats["messages"] += size
+        self.stats["bytes"] += nbytes
+        self.stats["flush_reasons"][reason] += 1
+        for bound in BATCH_SIZE_BUCKETS:
+            if size <= bound:
+                self.stats["batch_size_buckets"][str(bound)] += 1
+                break
+        else:
+            self.stats["batch_size_buckets"]["+Inf"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배칭 지표 반환"""
+        batches = self.stats["batches"]
+        return {
+            "flush_interval_ms": self.flush_interval * 1000.0,
+            "max_batch_size": self.max_batch_size,
+            "max_batch_bytes": self.max_batch_bytes,
+            "pending_messages": sum(len(b.items) for b in self._batches.values()),
+            "avg_batch_size": round(self.stats["messages"] / batches, 2) if batches else 0.0,
+            **self.stats,
+        }
+
+    async def close(self) -> None:
+        """대기 중인 모든 배치를 flush하고 완료까지 대기"""
+        for queue in list(self._batches):
+            self._schedule_flush(queue, "shutdown")
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+
+# 워커(이벤트 루프)별, publish 레인별 인스턴스
+_batcher_instances: Dict[str, PublishBatcher] = {}
+_batcher_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_publish_batcher(lane: str = DEFAULT_LANE) -> PublishBatcher:
+    """현재 이벤트 루프에 바인딩된 레인별 배칭 단계 반환"""
+    global _batcher_instances, _batcher_loop
+    loop = asyncio.get_running_loop()
+    if _batcher_loop is not loop:
+        _batcher_instances = {}
+        _batcher_loop = loop
+    batcher = _batcher_instances.get(lane)
+    if batcher is None:
+        batcher = _batcher_instances[lane] = PublishBatcher(lane=lane)
+    return batcher
+
+
+def get_publish_batcher_stats() -> Optional[Dict[str, Any]]:
+    """배칭 단계가 생성된 경우 레인별 지표 반환"""
+    if not _batcher_instances:
+        return None
+    return {lane: batcher.get_stats() for lane, batcher in _batcher_instances.items()}
+
+
+async def close_publish_batcher() -> None:
+    """모든 레인의 대기 중인 배치를 flush (애플리케이션 종료 시)"""
+    global _batcher_instances, _batcher_loop
+    for batcher in _batcher_instances.values():
+        await batcher.close()
+    _batcher_instances = {}
+    _batcher_loop = None
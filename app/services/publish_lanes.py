@@ -0,0 +1,132 @@
+"""
+처리 유형별 publish 레인
+모델의 get_processing_type()(real_time / batch / scheduled)에 따라 publish를 분리하여
+큰 배치성 메시지 폭주가 실시간 메시지를 같은 채널/소켓에서 막지 않도록 함
+(레인마다 별도 연결/채널, 동시 publish 한도, 기본 시간 예산, 지표)
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any
+
+from app.core.config import settings
+from app.services.deadline import Deadline, PublishDeadlineExceededError
+
+logger = logging.getLogger(__name__)
+
+LANES = ("real_time", "batch", "scheduled")
+DEFAULT_LANE = "real_time"
+# 스풀 재전송은 백그라운드 대량 작업이므로 배치 레인 사용
+SPOOL_LANE = "batch"
+
+# publish 지연 EWMA 가중치
+LATENCY_EWMA_ALPHA = 0.2
+
+
+def lane_for(processing_type: Optional[str]) -> str:
+    """처리 유형 → publish 레인 (레인 분리를 끄면 모두 기본 레인)"""
+    if settings.publish_lanes_enabled and processing_type in LANES:
+        return processing_type
+    return DEFAULT_LANE
+
+
+def lane_timeout(lane: str) -> float:
+    """레인 기본 publish 시간 예산 (초)"""
+    return settings.publish_lane_timeouts.get(lane, settings.publish_deadline_default)
+
+
+class PublishLane:
+    """
+    레인 하나의 동시 publish 한도와 지표
+    - 한도를 넘으면 데드라인 예산 안에서 슬롯을 대기 (초과 시 PublishDeadlineExceededError)
+    - 진행 중/대기 중 수, 성공/실패/슬롯 대기 초과 수, publish 지연 EWMA/최댓값
+    """
+
+    def __init__(self, name: str, max_concurrency: Optional[int] = None):
+        self.name = name
+        self.max_concurrency = max_concurrency or settings.publish_lane_concurrency.get(name, 64)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.latency_ewma: Optional[float] = None
+        self.stats = {
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "waiting": 0,
+            "published": 0,
+            "failed": 0,
+            "slot_timeouts": 0,
+            "max_latency_ms": 0.0,
+        }
+
+    @asynccontextmanager
+    async def slot(self, deadline: Deadline):
+        """
+        레인 publish 슬롯 (블록을 빠져나오면 반환)
+
+        Raises:
+            PublishDeadlineExceededError: 슬롯을 기다리는 동안 예산을 소진한 경우
+        """
+        stats = self.stats
+        stats["waiting"] += 1
+        try:
+            async with deadline.within(f"{self.name} lane slot"):
+                await self._semaphore.acquire()
+        except PublishDeadlineExceededError:
+            stats["slot_timeouts"] += 1
+            raise
+        finally:
+            stats["waiting"] -= 1
+
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            stats["failed"] += 1
+            raise
+        else:
+            stats["published"] += 1
+            self._record_latency(time.monotonic() - started)
+        finally:
+            stats["in_flight"] -= 1
+            self._semaphore.release()
+
+    def _record_latency(self, elapsed: float) -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = elapsed
+        else:
+            self.latency_ewma += LATENCY_EWMA_ALPHA * (elapsed - self.latency_ewma)
+        self.stats["max_latency_ms"] = max(self.stats["max_latency_ms"], round(elapsed * 1000.0, 3))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """레인 지표 반환"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout": lane_timeout(self.name),
+            "latency_ewma_ms": round(self.latency_ewma * 1000.0, 3) if self.latency_ewma is not None else None,
+            **self.stats,
+        }
+
+
+# 워커(이벤트 루프)별 레인
+_lanes: Dict[str, PublishLane] = {}
+_lanes_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_publish_lane(lane: str = DEFAULT_LANE) -> PublishLane:
+    """현재 이벤트 루프에 바인딩된 publish 레인 반환"""
+    global _lanes, _lanes_loop
+    loop = asyncio.get_running_loop()
+    if _lanes_loop is not loop:
+        _lanes = {}
+        _lanes_loop = loop
+    instance = _lanes.get(lane)
+    if instance is None:
+        instance = _lanes[lane] = PublishLane(lane)
+    return instance
+
+
+def get_publish_lane_stats() -> Dict[str, Any]:
+    """생성된 레인별 지표 반환"""
+    return {name: lane.get_stats() for name, lane in _lanes.items()}
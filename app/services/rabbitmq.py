@@ -2,36 +2,37 @@
 RabbitMQ 클러스터 클라이언트
 다중 노드 fallback, 자동 재연결, 회로 차단기 패턴 구현
 """
-import ssl
-import json
 import pika
 import logging
 import time
-import random
-from typing import Optional, Dict, Any, List
+import os
+import queue
+import threading
+from typing import Optional, Dict, Any, Union
 from contextlib import contextmanager
-from enum import Enum
 
+from app.core import codec
 from app.core.config import settings
+from app.core.metrics import stage_timer
+from app.core.tracing import inject_headers, start_span
+from app.services.topology import get_queue_topology_cache
+from app.services.cluster_nodes import NodeStatus, get_cluster_node_registry, node_key_for
+from app.services.deadline import Deadline, PublishDeadlineExceededError
+from app.services.compression import encode_body
 
 logger = logging.getLogger(__name__)
 
-
-class NodeStatus(Enum):
-    """노드 상태"""
-    HEALTHY = "healthy"
-    DEGRADED = "degraded"
-    FAILED = "failed"
-    UNKNOWN = "unknown"
+# 대기 없이 곧바로 다른 노드로 failover하는 연결 수준 오류
+CONNECTION_ERRORS = (ConnectionError, pika.exceptions.AMQPConnectionError)
 
 
 class RabbitMQClusterClient:
     """
     RabbitMQ 클러스터 클라이언트
-    - 다중 노드 자동 fallback
-    - 회로 차단기 패턴
+    - 다중 노드 자동 fallback (노드 레지스트리 순위로 연결 노드 선택)
+    - 노드별 회로 차단기 (closed/open/half-open, 프로세스 내 클라이언트와 헬스 프로버가 공유)
     - 연결 상태 모니터링
-    - 자동 재시도 및 백오프
+    - 요청별 데드라인 예산 안에서 재시도 (연결 오류는 즉시 failover, 그 밖에는 jitter 백오프)
     """
     
     def __init__(self):
@@ -40,66 +41,53 @@ class RabbitMQClusterClient:
         self.cluster_nodes = settings.get_rabbitmq_nodes()
         if not self.cluster_nodes:
             raise RuntimeError("RabbitMQ configuration is missing. Check environment variables.")
+        self.node_keys = [node_key_for(node) for node in self.cluster_nodes]
         self.current_node_index = 0
-        self.node_status = {}
-        self.connection_attempts = {}
         self.last_successful_node = None
+        self._connected_node_key = None
         
         # 초기화
-        self._initialize_node_status()
         self._connect_to_cluster()
     
-    def _initialize_node_status(self):
-        """모든 노드 상태를 초기화"""
-        for i, node in enumerate(self.cluster_nodes):
-            node_key = f"{node['host']}:{node['port']}"
-            self.node_status[node_key] = NodeStatus.UNKNOWN
-            self.connection_attempts[node_key] = 0
-    
-    def _connect_to_cluster(self) -> bool:
+    def _connect_to_cluster(self, deadline: Optional[Deadline] = None) -> bool:
         """
         클러스터 노드들을 순차적으로 시도하여 연결
-        우선순위: 마지막 성공 노드 → 건강한 노드 → 모든 노드
+        순서: 노드 레지스트리 순위 (publish/confirm RTT EWMA × 열린 연결 수,
+        동점이면 PID 기준 회전) → 실패한 노드
+        풀의 여러 연결과 여러 워커가 한 노드에 몰리지 않고 분산됨
+        데드라인이 있으면 남은 예산 안에서만 시도
         """
-        # 1. 마지막 성공 노드부터 시도
-        if self.last_successful_node is not None:
-            if self._try_connect_to_node(self.last_successful_node):
-                return True
-        
-        # 2. 건강한 노드들 시도
-        healthy_nodes = [i for i, node in enumerate(self.cluster_nodes) 
-                        if self._get_node_status(i) == NodeStatus.HEALTHY]
-        for node_index in healthy_nodes:
-            if self._try_connect_to_node(node_index):
-                return True
-        
-        # 3. 모든 노드 시도 (실패한 노드 포함)
-        for node_index in range(len(self.cluster_nodes)):
-            if self._try_connect_to_node(node_index):
+        ranked = get_cluster_node_registry().rank_nodes(self.node_keys)
+        failed = [i for i in ranked if self._get_node_status(i) == NodeStatus.FAILED]
+        for node_index in [i for i in ranked if i not in failed] + failed:
+            if deadline is not None and deadline.expired:
+                break
+            if self._try_connect_to_node(node_index, deadline):
                 return True
         
         logger.error("Failed to connect to any RabbitMQ cluster nodes")
         return False
     
-    def _try_connect_to_node(self, node_index: int) -> bool:
-        """특정 노드에 연결 시도"""
+    def _try_connect_to_node(self, node_index: int, deadline: Optional[Deadline] = None) -> bool:
+        """특정 노드에 연결 시도 (소켓 제한 시간은 남은 예산으로 절단)"""
         node = self.cluster_nodes[node_index]
         node_key = f"{node['host']}:{node['port']}"
         
-        # 회로 차단기: 너무 많이 실패한 노드는 건너뛰기
-        if self.connection_attempts.get(node_key, 0) >= settings.rabbitmq_retry_attempts:
-            current_time = time.time()
-            # 5분마다 재시도 허용
-            if not hasattr(self, '_last_circuit_reset') or current_time - self._last_circuit_reset > 300:
-                self.connection_attempts[node_key] = 0
-                self._last_circuit_reset = current_time
-            else:
-                logger.debug(f"Circuit breaker active for {node_key}")
-                return False
+        # 회로 차단기: 열린 노드는 건너뛰기
+        # (헬스 프로버가 동작 중이면 half-open 시험은 프로버가 수행하므로 사용자 요청은 시험하지 않음)
+        registry = get_cluster_node_registry()
+        breaker = registry.breaker(node_key)
+        if not breaker.allow_request(claim_trial=not registry.probing):
+            logger.debug(f"Circuit breaker active for {node_key}")
+            return False
         
         try:
             logger.info(f"Attempting to connect to RabbitMQ node: {node_key}")
             
+            timeout = settings.rabbitmq_connection_timeout
+            if deadline is not None:
+                timeout = deadline.timeout(timeout)
+            
             # 연결 파라미터 설정
             connection_params = pika.ConnectionParameters(
                 host=node['host'],
@@ -110,9 +98,9 @@ class RabbitMQClusterClient:
                 ),
                 connection_attempts=1,
                 retry_delay=settings.rabbitmq_retry_delay,
-                socket_timeout=settings.rabbitmq_connection_timeout,
+                socket_timeout=timeout,
                 heartbeat=settings.rabbitmq_heartbeat,
-                blocked_connection_timeout=settings.rabbitmq_connection_timeout,
+                blocked_connection_timeout=timeout,
             )
             
             # 연결 시도
@@ -122,19 +110,21 @@ class RabbitMQClusterClient:
             # 연결 성공
             self.current_node_index = node_index
             self.last_successful_node = node_index
-            self.node_status[node_key] = NodeStatus.HEALTHY
-            self.connection_attempts[node_key] = 0
+            self._connected_node_key = node_key
+            breaker.record_success()
+            registry.record_success(node_key)
+            registry.connection_opened(node_key)
             
             logger.info(f"Successfully connected to RabbitMQ node: {node_key}")
             return True
             
         except Exception as e:
-            self.connection_attempts[node_key] = self.connection_attempts.get(node_key, 0) + 1
-            self.node_status[node_key] = NodeStatus.FAILED
+            breaker.record_failure()
+            registry.record_failure(node_key)
             
             logger.warning(
                 f"Failed to connect to RabbitMQ node {node_key} "
-                f"(attempt {self.connection_attempts[node_key]}): {e}"
+                f"(attempt {breaker.failures}): {e}"
             )
             return False
     
@@ -142,26 +132,30 @@ class RabbitMQClusterClient:
         """노드 상태 조회"""
         node = self.cluster_nodes[node_index]
         node_key = f"{node['host']}:{node['port']}"
-        return self.node_status.get(node_key, NodeStatus.UNKNOWN)
+        return get_cluster_node_registry().get_node_status(node_key)
     
-    def _ensure_connection(self) -> bool:
+    def _ensure_connection(self, deadline: Optional[Deadline] = None) -> bool:
         """연결 상태 확인 및 필요시 재연결"""
         try:
             # 기존 연결이 살아있는지 확인
             if self.connection and not self.connection.is_closed:
-                if self.channel and not self.channel.is_closed:
-                    # 간단한 heartbeat 체크
-                    self.connection.process_data_events(time_limit=1)
-                    return True
+                if self.channel is None or self.channel.is_closed:
+                    # 연결은 살아있고 채널만 닫힌 경우 채널만 재생성
+                    self.channel = self.connection.channel()
+                # 간단한 heartbeat 체크 (time_limit=0: 대기 없이 보류 이벤트만 처리)
+                self.connection.process_data_events(time_limit=0)
+                return True
             
             logger.info("Connection lost, attempting to reconnect...")
-            self.close()
-            return self._connect_to_cluster()
+            with stage_timer("reconnect"), start_span("reconnect"):
+                self.close()
+                return self._connect_to_cluster(deadline)
             
         except Exception as e:
             logger.error(f"Connection check failed: {e}")
-            self.close()
-            return self._connect_to_cluster()
+            with stage_timer("reconnect"), start_span("reconnect"):
+                self.close()
+                return self._connect_to_cluster(deadline)
     
     def queue_exists(self, queue_name: str) -> bool:
         """큐 존재 여부 확인"""
@@ -220,51 +214,72 @@ class RabbitMQClusterClient:
         self, 
         exchange: str, 
         routing_key: str, 
-        body: Dict[str, Any], 
+        body: Union[Dict[str, Any], bytes], 
         priority: int = 0,
-        retry_count: int = 3
+        retry_count: int = 3,
+        deadline: Optional[Deadline] = None
     ) -> bool:
         """
-        메시지 전송 (재시도 로직 포함)
+        메시지 전송 (데드라인 예산 안에서 재시도)
+        
+        - 연결 오류: 해당 노드 순위를 내리고 대기 없이 곧바로 다른 노드로 failover
+        - 그 밖의 오류 / 모든 노드 연결 실패: full jitter 백오프 (남은 예산을 넘지 않음)
         
         Args:
             exchange: 익스체인지 이름
             routing_key: 라우팅 키 (일반적으로 큐 이름)
-            body: 메시지 본문
+            body: 메시지 본문 (dict 또는 직렬화된 bytes)
             priority: 메시지 우선순위
             retry_count: 재시도 횟수
+            deadline: publish 시간 예산 (없으면 기본 예산)
             
         Returns:
             전송 성공 여부
+            
+        Raises:
+            PublishDeadlineExceededError: 예산을 모두 소진한 경우
         """
+        data = body if isinstance(body, bytes) else codec.dumps(body)
+        # 임계값 이상이면 압축 (재시도마다 다시 압축하지 않도록 루프 밖에서 한 번)
+        data, content_encoding = encode_body(data, routing_key)
+        deadline = deadline or Deadline()
+        failovers = 0
+        
         for attempt in range(retry_count + 1):
+            deadline.check(f"publish to {routing_key}")
             try:
-                if not self._ensure_connection():
+                if not self._ensure_connection(deadline):
                     if attempt == retry_count:
                         raise ConnectionError("Failed to establish RabbitMQ connection after retries")
-                    time.sleep(settings.rabbitmq_retry_delay * (2 ** attempt))  # 지수 백오프
+                    time.sleep(deadline.backoff(attempt))  # jitter 백오프 (남은 예산 이내)
                     continue
                 
-                # 메시지 속성 설정
-                properties = pika.BasicProperties(
-                    delivery_mode=2,  # 메시지 지속성
-                    priority=priority,
-                    timestamp=int(time.time()),
-                    content_type='application/json',
-                    headers={
-                        'sender': 'cdl-gateway',
-                        'cluster_node': f"{self.cluster_nodes[self.current_node_index]['host']}:"
-                                      f"{self.cluster_nodes[self.current_node_index]['port']}"
-                    }
-                )
-                
-                # 메시지 전송
-                self.channel.basic_publish(
-                    exchange=exchange,
-                    routing_key=routing_key,
-                    body=json.dumps(body, ensure_ascii=False),
-                    properties=properties
-                )
+                node_key = node_key_for(self.cluster_nodes[self.current_node_index])
+                span_attributes = {
+                    "routing_key": routing_key, "cluster_node": node_key, "attempt": attempt, "body_bytes": len(data),
+                }
+                with start_span("basic_publish", span_attributes, kind="producer"):
+                    # 메시지 속성 설정
+                    properties = pika.BasicProperties(
+                        delivery_mode=2,  # 메시지 지속성
+                        priority=priority,
+                        timestamp=int(time.time()),
+                        content_type='application/json',
+                        content_encoding=content_encoding,
+                        # traceparent: 컨슈머가 이 publish span 아래로 처리 span을 이어 붙일 수 있도록 전달
+                        headers=inject_headers({
+                            'sender': 'cdl-gateway',
+                            'cluster_node': node_key,
+                        })
+                    )
+                    
+                    # 메시지 전송
+                    self.channel.basic_publish(
+                        exchange=exchange,
+                        routing_key=routing_key,
+                        body=data,
+                        properties=properties
+                    )
                 
                 logger.debug(f"Message sent to {routing_key} via node {self.current_node_index}")
                 return True
@@ -275,13 +290,31 @@ class RabbitMQClusterClient:
                     f"(attempt {attempt + 1}/{retry_count + 1}): {e}"
                 )
                 
-                if attempt < retry_count:
-                    # 다른 노드로 fallback 시도
+                # 404 NOT_FOUND 채널 종료: 캐시된 토폴로지가 더 이상 유효하지 않음
+                if isinstance(e, pika.exceptions.ChannelClosedByBroker) and e.reply_code == 404:
+                    get_queue_topology_cache().invalidate(routing_key)
+                
+                if deadline.expired:
+                    raise PublishDeadlineExceededError(
+                        f"Publish deadline of {deadline.budget:.1f}s exceeded for {routing_key} "
+                        f"after {attempt + 1} attempt(s): {e!r}"
+                    ) from e
+                if attempt >= retry_count:
+                    return False
+                
+                # 다른 노드로 fallback 시도
+                if isinstance(e, CONNECTION_ERRORS) and self._connected_node_key is not None:
+                    # 연결 오류: 노드 순위를 내려 재연결 시 다른 노드가 선택되도록 하고 대기 없이 재시도
+                    registry = get_cluster_node_registry()
+                    registry.breaker(self._connected_node_key).record_failure()
+                    registry.record_failure(self._connected_node_key)
                     self.close()
-                    time.sleep(settings.rabbitmq_retry_delay * (2 ** attempt))
-                    continue
+                    if failovers < len(self.cluster_nodes) - 1:
+                        failovers += 1
+                        continue
                 else:
-                    return False
+                    self.close()
+                time.sleep(deadline.backoff(attempt))
         
         return False
     
@@ -296,12 +329,14 @@ class RabbitMQClusterClient:
         
         for i, node in enumerate(self.cluster_nodes):
             node_key = f"{node['host']}:{node['port']}"
+            breaker = get_cluster_node_registry().breaker(node_key)
             status_info["nodes"].append({
                 "index": i,
                 "host": node['host'],
                 "port": node['port'],
-                "status": self.node_status.get(node_key, NodeStatus.UNKNOWN).value,
-                "connection_attempts": self.connection_attempts.get(node_key, 0),
+                "status": breaker.node_status.value,
+                "circuit": breaker.state.value,
+                "connection_attempts": breaker.failures,
                 "is_current": i == self.current_node_index
             })
         
@@ -309,6 +344,10 @@ class RabbitMQClusterClient:
     
     def close(self):
         """연결 종료"""
+        if self._connected_node_key is not None:
+            get_cluster_node_registry().connection_closed(self._connected_node_key)
+            self._connected_node_key = None
+        
         try:
             if self.channel and not self.channel.is_closed:
                 self.channel.close()
@@ -358,8 +397,188 @@ def get_rabbitmq_client() -> RabbitMQClusterClient:
     """
     RabbitMQ 클러스터 클라이언트 싱글톤 인스턴스 반환
     멀티스레드 환경에서는 각 스레드별로 별도 인스턴스 사용 권장
+    (메시지 전송에는 get_rabbitmq_pool() 사용 권장)
     """
     global _cluster_client_instance
     if _cluster_client_instance is None:
         _cluster_client_instance = RabbitMQClusterClient()
-    return _cluster_client_instance
\ No newline at end of file
+    return _cluster_client_instance
+
+
+class RabbitMQChannelPool:
+    """
+    워커 프로세스 단위 RabbitMQ 연결/채널 풀
+    - 요청마다 TCP/AMQP 핸드셰이크를 반복하지 않도록 RabbitMQClusterClient 재사용
+    - 스레드 안전한 대여/반납 (BlockingConnection은 스레드 간 공유 불가하므로 대여 단위로 독점)
+    - 대여 시 주기적 헬스체크, 죽은 연결/채널은 투명하게 재연결
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        health_check_interval: Optional[float] = None,
+        client_factory=None,
+    ):
+        self.size = size or settings.rabbitmq_pool_size
+        self.acquire_timeout = (
+            acquire_timeout if acquire_timeout is not None else settings.rabbitmq_pool_acquire_timeout
+        )
+        self.health_check_interval = (
+            health_check_interval if health_check_interval is not None
+            else settings.rabbitmq_pool_health_check_interval
+        )
+        self._client_factory = client_factory or RabbitMQClusterClient
+        # LIFO: 최근 사용한(따뜻한) 연결을 우선 재사용
+        self._idle: "queue.LifoQueue[RabbitMQClusterClient]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._last_checked: Dict[int, float] = {}
+        self._closed = False
+        self.stats = {
+            "acquired": 0,
+            "created": 0,
+            "reconnected": 0,
+            "discarded": 0,
+            "timeouts": 0,
+        }
+
+    def _create_client(self) -> RabbitMQClusterClient:
+        """슬롯을 예약한 뒤 새 클라이언트 생성 (연결은 락 밖에서 수행)"""
+        try:
+            client = self._client_factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self.stats["created"] += 1
+        self._last_checked[id(client)] = time.monotonic()
+        return client
+
+    def _checkout(self, timeout: float) -> RabbitMQClusterClient:
+        """유휴 클라이언트 대여, 없으면 생성, 풀이 가득 차면 반납 대기"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            return self._create_client()
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self.stats["timeouts"] += 1
+            raise TimeoutError(
+                f"Timed out waiting for a RabbitMQ connection from pool (size={self.size})"
+            )
+
+    def _ensure_healthy(self, client: RabbitMQClusterClient) -> None:
+        """헬스체크 주기가 지났으면 연결 확인, 죽은 연결/채널은 재연결"""
+        now = time.monotonic()
+        if now - self._last_checked.get(id(client), 0.0) < self.health_check_interval:
+            return
+
+        was_open = client.connection is not None and not client.connection.is_closed
+        if not client._ensure_connection():
+            raise ConnectionError("Failed to establish RabbitMQ connection")
+        if not was_open:
+            with self._lock:
+                self.stats["reconnected"] += 1
+            logger.info("Replaced dead pooled RabbitMQ connection")
+        self._last_checked[id(client)] = now
+
+    def _discard(self, client: RabbitMQClusterClient) -> None:
+        """클라이언트를 풀에서 제거하고 슬롯 반환"""
+        try:
+            client.close()
+        finally:
+            self._last_checked.pop(id(client), None)
+            with self._lock:
+                self._created -= 1
+                self.stats["discarded"] += 1
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        풀에서 클라이언트를 대여하는 컨텍스트 매니저
+
+        블록 내에서 예외가 발생하면 다음 대여 시 즉시 헬스체크하도록 표시
+        """
+        if self._closed:
+            raise RuntimeError("RabbitMQ channel pool is closed")
+
+        client = self._checkout(self.acquire_timeout if timeout is None else timeout)
+        try:
+            self._ensure_healthy(client)
+        except Exception:
+            self._discard(client)
+            raise
+
+        with self._lock:
+            self.stats["acquired"] += 1
+        try:
+            yield client
+        except Exception:
+            # 예외 이후 상태를 신뢰할 수 없으므로 다음 대여 시 즉시 헬스체크
+            self._last_checked[id(client)] = 0.0
+            raise
+        finally:
+            if self._closed:
+                self._discard(client)
+            else:
+                self._idle.put(client)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 상태 정보 반환"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "idle": self._idle.qsize(),
+                "in_use": self._created - self._idle.qsize(),
+                **self.stats,
+            }
+
+    def close(self) -> None:
+        """유휴 클라이언트 모두 종료 (대여 중인 클라이언트는 반납 시 종료)"""
+        self._closed = True
+        while True:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(client)
+
+
+_channel_pool_instance: Optional[RabbitMQChannelPool] = None
+_channel_pool_pid: Optional[int] = None
+_channel_pool_lock = threading.Lock()
+
+
+def get_rabbitmq_pool() -> RabbitMQChannelPool:
+    """
+    워커 프로세스별 RabbitMQ 연결/채널 풀 반환
+    fork 이후 부모 프로세스의 소켓을 공유하지 않도록 PID가 바뀌면 새로 생성
+    """
+    global _channel_pool_instance, _channel_pool_pid
+    pid = os.getpid()
+    if _channel_pool_instance is None or _channel_pool_pid != pid:
+        with _channel_pool_lock:
+            if _channel_pool_instance is None or _channel_pool_pid != pid:
+                _channel_pool_instance = RabbitMQChannelPool()
+                _channel_pool_pid = pid
+    return _channel_pool_instance
+
+
+def get_rabbitmq_pool_stats() -> Optional[Dict[str, Any]]:
+    """현재 워커에 풀이 생성된 경우 상태 반환 (조회만으로 풀을 만들지 않음)"""
+    if _channel_pool_instance is None or _channel_pool_pid != os.getpid():
+        return None
+    return _channel_pool_instance.get_stats()
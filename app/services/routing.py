@@ -0,0 +1,326 @@
+"""
+데이터 기반 라우팅 테이블
+(edu_type, request_type, generation_type) → 큐/우선순위/큐 인자 규칙을 선언 파일(JSON)에서 읽어
+조회용 dict로 컴파일하고, SIGHUP 또는 파일 변경 시 새 테이블을 만든 뒤 참조만 교체
+(진행 중인 요청은 이미 가져간 테이블로 끝까지 처리되므로 요청 유실 없음)
+
+규칙 파일 형식 (기본: app/services/routing_rules.json)
+    {
+      "priorities": {"urgent": "high", "normal": "medium", ...},   # 비즈니스 우선순위 → 시스템 우선순위
+      "rules": [
+        {"edu_type": 7, "request_type": [1, 2], "queue": "sokind_conversation_generate_response"},
+        {"edu_type": 7, "queue": "sokind_conversation"},
+        {"edu_type": 9, "queue": "periodic_report", "priority": "low", "arguments": {...}}
+      ]
+    }
+- request_type/generation_type를 생략하면 와일드카드, 목록이면 각 값에 대해 같은 규칙
+- queue 생략 시 default_queue, priority 생략 시 모델의 비즈니스 우선순위를 priorities로 변환
+- arguments는 큐 선언 시 x-arguments 덮어쓰기 (생략 시 우선순위 기반 기본값)
+- 조회 순서: (e, r, g) → (e, r, *) → (e, *, g) → (e, *, *), 일치하는 규칙이 없으면
+  default_queue로 보내고 조합별로 집계 (MAX_UNMATCHED_KEYS개를 넘는 조합은 "other"로 합산)
+"""
+import asyncio
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from typing import Optional, Dict, Any, List, Union, NamedTuple, Tuple, Callable, Awaitable
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "routing_rules.json")
+
+RouteKey = Tuple[int, Optional[int], Optional[str]]
+
+# 미일치 조합 집계 상한 (request_type/generation_type은 클라이언트 입력이므로 그 이상은 한 항목으로 합산)
+MAX_UNMATCHED_KEYS = 256
+UNMATCHED_OVERFLOW_KEY = "other"
+
+
+class RoutingRulesError(ValueError):
+    """규칙 파일을 읽거나 컴파일할 수 없는 경우"""
+    pass
+
+
+class RoutingRule(BaseModel):
+    """규칙 파일의 규칙 하나"""
+    model_config = ConfigDict(extra="forbid")
+
+    edu_type: Union[int, List[int]]
+    request_type: Union[None, int, List[int]] = None
+    generation_type: Union[None, str, List[str]] = None
+    queue: Optional[str] = None
+    priority: Union[None, int, str] = None
+    arguments: Optional[Dict[str, Any]] = None
+
+
+class RoutingRulesFile(BaseModel):
+    """규칙 파일 전체"""
+    model_config = ConfigDict(extra="forbid")
+
+    priorities: Dict[str, Union[int, str]] = {}
+    rules: List[RoutingRule]
+
+
+class Route(NamedTuple):
+    """컴파일된 라우팅 결과 (priority가 None이면 모델의 비즈니스 우선순위 사용)"""
+    queue: str
+    priority: Optional[int] = None
+
+
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def _priority_level(value: Union[int, str]) -> int:
+    """우선순위 값 → 시스템 우선순위 ("high"/"medium"/"low" 또는 정수)"""
+    if isinstance(value, int):
+        return value
+    levels = {"high": settings.priority_high, "medium": settings.priority_medium, "low": settings.priority_low}
+    if value not in levels:
+        raise RoutingRulesError(f"Unknown priority level: {value!r}")
+    return levels[value]
+
+
+def default_queue_arguments(priority: int) -> Dict[str, Any]:
+    """큐 선언 시 기본 Quorum 설정에 덮어쓸 인자 (규칙에 arguments가 없는 큐)"""
+    # 우선순위가 높은 큐는 더 큰 메모리 제한 설정 (시스템 우선순위는 숫자가 작을수록 높음)
+    if priority <= settings.priority_high:
+        return {
+            'arguments': {
+                'x-max-in-memory-length': 200000,  # 고우선순위 큐는 더 많은 메시지 보관
+                'x-max-in-memory-bytes': 209715200  # 200MB
+            }
+        }
+    return {}
+
+
+class RoutingTable:
+    """
+    컴파일된 라우팅 테이블 (불변)
+    - 규칙을 (edu_type, request_type, generation_type) 키의 dict로 펼쳐 조회마다 최대 4번의 dict 조회
+    - 같은 키에 규칙이 둘 이상이거나 같은 큐에 서로 다른 arguments가 있으면 컴파일 실패
+    """
+
+    def __init__(self, data: Dict[str, Any], source: Optional[str] = None):
+        try:
+            parsed = RoutingRulesFile.model_validate(data)
+        except ValidationError as e:
+            raise RoutingRulesError(f"Invalid routing rules{f' in {source}' if source else ''}: {e}") from e
+
+        self.source = source
+        self.priorities: Dict[str, int] = {
+            name: _priority_level(level) for name, level in parsed.priorities.items()
+        }
+        self._routes: Dict[RouteKey, Route] = {}
+        self._arguments: Dict[str, Dict[str, Any]] = {}
+
+        for index, rule in enumerate(parsed.rules):
+            route = Route(
+                queue=rule.queue or settings.default_queue,
+                priority=_priority_level(rule.priority) if rule.priority is not None else None,
+            )
+            if rule.arguments is not None:
+                if self._arguments.get(route.queue, rule.arguments) != rule.arguments:
+                    raise RoutingRulesError(f"Conflicting arguments for queue {route.queue} (rule {index})")
+                self._arguments[route.queue] = rule.arguments
+            for edu_type in _as_list(rule.edu_type):
+                for request_type in _as_list(rule.request_type):
+                    for generation_type in _as_list(rule.generation_type):
+                        key = (edu_type, request_type, generation_type)
+                        if key in self._routes:
+                            raise RoutingRulesError(f"Duplicate routing rule for {key} (rule {index})")
+                        self._routes[key] = route
+
+    @classmethod
+    def from_file(cls, path: str) -> "RoutingTable":
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError) as e:
+            raise RoutingRulesError(f"Cannot read routing rules {path}: {e}") from e
+        return cls(data, source=path)
+
+    def match(
+        self, edu_type: Any, request_type: Any = None, generation_type: Any = None
+    ) -> Optional[Route]:
+        """가장 구체적인 규칙 반환 (없으면 None)"""
+        routes = self._routes
+        try:
+            return (
+                routes.get((edu_type, request_type, generation_type))
+                or routes.get((edu_type, request_type, None))
+                or routes.get((edu_type, None, generation_type))
+                or routes.get((edu_type, None, None))
+            )
+        except TypeError:  # 해시 불가능한 값
+            return None
+
+    def keys(self) -> List[RouteKey]:
+        """규칙 키 목록 (큐 토폴로지 계산용)"""
+        return list(self._routes)
+
+    def queues(self) -> List[str]:
+        """규칙에 등장하는 큐 목록"""
+        return sorted({route.queue for route in self._routes.values()})
+
+    def queue_arguments(self, queue: Optional[str], priority: int) -> Dict[str, Any]:
+        """큐 선언 인자 (규칙에 arguments가 있으면 우선)"""
+        if queue in self._arguments:
+            return {"arguments": dict(self._arguments[queue])}
+        return default_queue_arguments(priority)
+
+
+class RoutingRules:
+    """
+    현재 라우팅 테이블 보유 및 재적재
+    - reload(): 새 테이블 컴파일에 성공한 경우에만 참조 교체 (실패 시 기존 테이블 유지)
+    - 파일 mtime 주기 확인 및 SIGHUP으로 재적재
+    - 일치하는 규칙이 없는 조합 집계
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.routing_rules_path or DEFAULT_RULES_PATH
+        self.table = RoutingTable.from_file(self.path)
+        self._mtime = self._file_mtime()
+        self._reload_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._on_reload: Optional[Callable[[], Awaitable[None]]] = None
+        self.loaded_at = time.time()
+        self.stats: Dict[str, Any] = {"reloads": 0, "reload_failures": 0, "last_error": None}
+        self.unmatched: Dict[str, int] = {}
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def reload(self) -> bool:
+        """규칙 파일을 다시 읽어 테이블 교체 (실패 시 기존 테이블 유지)"""
+        with self._reload_lock:
+            mtime = self._file_mtime()
+            try:
+                table = RoutingTable.from_file(self.path)
+            except RoutingRulesError as e:
+                self._mtime = mtime
+                self.stats["reload_failures"] += 1
+                self.stats["last_error"] = str(e)
+                logger.error(f"Routing rules reload failed, keeping previous rules: {e}")
+                return False
+            self.table = table
+            self._mtime = mtime
+            self.loaded_at = time.time()
+            self.stats["reloads"] += 1
+            self.stats["last_error"] = None
+            logger.info(f"Routing rules reloaded from {self.path}: {len(table.keys())} routes")
+            return True
+
+    def route(
+        self,
+        edu_type: Any,
+        request_type: Any = None,
+        generation_type: Any = None,
+        table: Optional[RoutingTable] = None,
+    ) -> Route:
+        """조합에 맞는 경로 (규칙이 없으면 default_queue로 보내고 집계)"""
+        route = (table or self.table).match(edu_type, request_type, generation_type)
+        if route is not None:
+            return route
+        key = f"{edu_type}/{request_type}/{str(generation_type)[:64]}"
+        count = self.unmatched.get(key, 0)
+        if not count:
+            if len(self.unmatched) >= MAX_UNMATCHED_KEYS:
+                key = UNMATCHED_OVERFLOW_KEY
+                count = self.unmatched.get(key, 0)
+                if not count:
+                    logger.warning(
+                        f"More than {MAX_UNMATCHED_KEYS} unmatched routing combinations, "
+                        f"counting further ones as '{UNMATCHED_OVERFLOW_KEY}'"
+                    )
+            else:
+                logger.warning(f"No routing rule for {key}, using default queue {settings.default_queue}")
+        self.unmatched[key] = count + 1
+        return Route(queue=settings.default_queue)
+
+    def resolve(self, model) -> Tuple[str, int]:
+        """모델 → (큐, 시스템 우선순위), 같은 테이블 스냅샷 기준"""
+        table = self.table
+        route = self.route(
+            getattr(model, "edu_type", None),
+            getattr(model, "request_type", None),
+            getattr(model, "generation_type", None),
+            table,
+        )
+        if route.priority is not None:
+            return route.queue, route.priority
+        return route.queue, table.priorities.get(model.get_business_priority(), settings.priority_medium)
+
+    def start(self, on_reload: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        """현재 이벤트 루프에서 SIGHUP 핸들러와 파일 변경 감시 시작"""
+        self._on_reload = on_reload
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(self._reload_and_notify()))
+        except (NotImplementedError, RuntimeError, ValueError, AttributeError) as e:
+            # 메인 스레드가 아니거나 지원하지 않는 플랫폼
+            logger.debug(f"SIGHUP routing reload unavailable: {e}")
+        if self._task is None and settings.routing_rules_reload_interval > 0:
+            self._task = loop.create_task(self._watch())
+
+    async def stop(self) -> None:
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        except (NotImplementedError, RuntimeError, ValueError, AttributeError):
+            pass
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _reload_and_notify(self) -> None:
+        if self.reload() and self._on_reload is not None:
+            try:
+                await self._on_reload()
+            except Exception as e:
+                logger.error(f"Routing rules reload hook failed: {e}", exc_info=True)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(settings.routing_rules_reload_interval)
+            if self._file_mtime() != self._mtime:
+                await self._reload_and_notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """규칙 파일/재적재/미일치 조합 현황"""
+        return {
+            "path": self.path,
+            "loaded_at": int(self.loaded_at),
+            "routes": len(self.table.keys()),
+            "queues": self.table.queues(),
+            **self.stats,
+            "unmatched": dict(self.unmatched),
+        }
+
+
+_routing_rules_instance: Optional[RoutingRules] = None
+_routing_rules_lock = threading.Lock()
+
+
+def get_routing_rules() -> RoutingRules:
+    """프로세스 전역 라우팅 규칙 반환 (첫 호출 시 파일 적재/컴파일)"""
+    global _routing_rules_instance
+    if _routing_rules_instance is None:
+        with _routing_rules_lock:
+            if _routing_rules_instance is None:
+                _routing_rules_instance = RoutingRules()
+    return _routing_rules_instance
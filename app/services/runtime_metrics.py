@@ -0,0 +1,98 @@
+"""
+런타임 게이지 갱신
+노드 연결 상태, 채널 풀, 백프레셔 값은 각 워커 메모리에만 있으므로 워커마다 주기적으로 게이지에 기록
+(multiprocess 모드에서 /metrics를 처리하는 워커는 다른 워커의 메모리를 읽을 수 없고 mmap 파일만 합산)
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import GatewayMetrics, get_metrics
+from app.services.async_rabbitmq import get_lane_connection_stats, is_broker_blocked
+from app.services.backpressure import get_publish_admission_stats
+from app.services.cluster_nodes import NodeStatus, get_cluster_node_registry, node_key_for
+from app.services.rabbitmq import get_rabbitmq_pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_runtime_gauges(metrics: Optional[GatewayMetrics] = None) -> None:
+    """현재 워커의 노드 상태/연결 수, 채널 풀, confirm 대기, 입장 제어 값을 게이지에 기록"""
+    metrics = metrics or get_metrics()
+    if metrics is None:
+        return
+
+    registry = get_cluster_node_registry()
+    for node in settings.get_rabbitmq_nodes():
+        key = node_key_for(node)
+        current = registry.get_node_status(key)
+        for status in NodeStatus:
+            metrics.node_status.labels(key, status.value).set(1 if status is current else 0)
+    for key, node_stats in registry.get_stats()["nodes"].items():
+        metrics.node_connections.labels(key).set(node_stats["connections"])
+
+    pool = get_rabbitmq_pool_stats()
+    if pool is not None:
+        for state in ("open", "idle", "in_use"):
+            metrics.pool_clients.labels(state).set(pool[state])
+
+    for lane, lane_stats in get_lane_connection_stats().items():
+        metrics.confirms_in_flight.labels(lane).set(lane_stats["confirms"]["in_flight"])
+    metrics.broker_blocked.set(1 if is_broker_blocked() else 0)
+
+    admission = get_publish_admission_stats()
+    if admission is not None:
+        metrics.publish_pending.set(admission["pending"])
+        metrics.admission_degraded.set(1 if admission["degraded"] else 0)
+
+
+class RuntimeGaugeRefresher:
+    """워커 이벤트 루프에서 METRICS_REFRESH_INTERVAL마다 refresh_runtime_gauges() 실행"""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or settings.metrics_refresh_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                refresh_runtime_gauges()
+            except Exception as e:
+                logger.error(f"Runtime gauge refresh error: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+
+_refresher_instance: Optional[RuntimeGaugeRefresher] = None
+
+
+def start_runtime_gauge_refresher() -> Optional[RuntimeGaugeRefresher]:
+    """현재 이벤트 루프에서 게이지 갱신 시작 (메트릭 비활성화 시 None)"""
+    global _refresher_instance
+    if get_metrics() is None:
+        return None
+    if _refresher_instance is None:
+        _refresher_instance = RuntimeGaugeRefresher()
+        _refresher_instance.start()
+    return _refresher_instance
+
+
+async def stop_runtime_gauge_refresher() -> None:
+    """게이지 갱신 중지 (애플리케이션 종료 시)"""
+    global _refresher_instance
+    if _refresher_instance is not None:
+        await _refresher_instance.stop()
+    _refresher_instance = None
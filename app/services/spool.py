@@ -0,0 +1,471 @@
+"""
+로컬 내구성 스풀 (append-only write-ahead log)
+클러스터 전체가 응답하지 않을 때 publish 대상 메시지를 디스크에 기록하고,
+노드가 복구되면 백그라운드 drainer가 기록 순서대로 속도 제한을 걸어 재전송
+"""
+import asyncio
+import base64
+import fcntl
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple, Callable, Awaitable
+
+from app.core.config import settings
+from app.services.async_rabbitmq import CONNECTION_ERRORS, PublishNackError, QueueNotFoundError
+from app.services.topology import TopologyConflictError
+
+logger = logging.getLogger(__name__)
+
+# 레코드 헤더: payload 길이, payload CRC32 (빅엔디안)
+RECORD_HEADER = struct.Struct(">II")
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+CURSOR_FILE = "cursor.json"
+DEAD_LETTER_FILE = "dead-letter.jsonl"
+LOCK_FILE = "owner.lock"
+
+
+class SpoolFullError(Exception):
+    """스풀이 최대 크기에 도달한 경우"""
+    pass
+
+
+class SpoolRecord(NamedTuple):
+    """스풀에 기록된 publish 한 건"""
+    queue: str
+    body: bytes
+    priority: int
+    request_id: Optional[str]
+    created_at: float
+
+
+def _segment_name(seq: int) -> str:
+    return f"{SEGMENT_PREFIX}{seq:012d}{SEGMENT_SUFFIX}"
+
+
+class PublishSpool:
+    """
+    세그먼트 파일 기반 append-only 스풀
+    - 레코드마다 CRC32 체크섬 (깨진 꼬리 레코드는 재전송하지 않음)
+    - 세그먼트 크기/전체 크기 상한
+    - 재전송 위치(cursor)를 원자적으로 기록하여 재시작 후에도 순서 유지
+    - gunicorn 워커마다 잠금 파일로 슬롯 디렉터리를 독점 (재시작된 워커가 이전 슬롯을 이어받음)
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        segment_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        fsync: Optional[bool] = None,
+        max_slots: Optional[int] = None,
+    ):
+        self.root = directory or settings.spool_dir
+        self.segment_bytes = segment_bytes or settings.spool_segment_bytes
+        self.max_bytes = max_bytes or settings.spool_max_bytes
+        self.fsync = settings.spool_fsync if fsync is None else fsync
+        self.max_slots = max_slots or max(settings.gunicorn_workers, 1) * 2
+
+        # drainer가 복구를 확인하기 전까지는 브로커 연결을 시도하지 않고 바로 스풀에 기록
+        self.broker_available = True
+
+        self._lock = threading.Lock()
+        self._segments: List[int] = []
+        self._sizes: Dict[int, int] = {}
+        self._active_file = None
+        self._cursor: Tuple[int, int] = (0, 0)
+        self._drained_at: deque = deque(maxlen=10000)
+        self.stats = {
+            "appended": 0,
+            "drained": 0,
+            "rejected_full": 0,
+            "corrupt_records": 0,
+            "dead_lettered": 0,
+            "depth": 0,
+        }
+
+        os.makedirs(self.root, exist_ok=True)
+        self.directory, self._lock_handle = self._claim_slot()
+        self._recover()
+
+    def _claim_slot(self):
+        """잠기지 않은 첫 번째 슬롯 디렉터리를 독점"""
+        for slot in range(self.max_slots):
+            directory = os.path.join(self.root, f"slot-{slot}")
+            os.makedirs(directory, exist_ok=True)
+            handle = open(os.path.join(directory, LOCK_FILE), "a+")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                continue
+            logger.info(f"Claimed publish spool slot: {directory}")
+            return directory, handle
+        raise RuntimeError(f"No free publish spool slot under {self.root} (max_slots={self.max_slots})")
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, _segment_name(seq))
+
+    def _recover(self) -> None:
+        """기존 세그먼트/커서 복원 후 새 활성 세그먼트 시작"""
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                seq = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                self._segments.append(seq)
+                self._sizes[seq] = os.path.getsize(self._path(seq))
+        self._segments.sort()
+
+        cursor_path = os.path.join(self.directory, CURSOR_FILE)
+        if os.path.exists(cursor_path):
+            with open(cursor_path) as f:
+                data = json.load(f)
+            self._cursor = (data["segment"], data["offset"])
+        elif self._segments:
+            self._cursor = (self._segments[0], 0)
+
+        # 이미 재전송이 끝난 세그먼트 정리
+        for seq in [s for s in self._segments if s < self._cursor[0]]:
+            self._remove_segment(seq)
+
+        self.stats["depth"] = self._count_pending()
+
+        # 직전 프로세스의 마지막 세그먼트 꼬리가 깨졌을 수 있으므로 항상 새 세그먼트에 기록
+        next_seq = (self._segments[-1] + 1) if self._segments else 1
+        self._open_segment(next_seq)
+        if self._cursor[0] not in self._segments:
+            self._cursor = (self._segments[0], 0)
+
+        if self.stats["depth"]:
+            logger.warning(f"Recovered publish spool with {self.stats['depth']} pending records")
+
+    def _count_pending(self) -> int:
+        """커서 이후 유효 레코드 수"""
+        count = 0
+        for seq in self._segments:
+            offset = self._cursor[1] if seq == self._cursor[0] else 0
+            if seq < self._cursor[0]:
+                continue
+            with open(self._path(seq), "rb") as f:
+                f.seek(offset)
+                while self._read_record(f) is not None:
+                    count += 1
+        return count
+
+    def _open_segment(self, seq: int) -> None:
+        if self._active_file is not None:
+            self._active_file.close()
+        self._active_file = open(self._path(seq), "ab")
+        self._segments.append(seq)
+        self._sizes[seq] = self._active_file.tell()
+
+    def _remove_segment(self, seq: int) -> None:
+        try:
+            os.remove(self._path(seq))
+        except FileNotFoundError:
+            pass
+        self._segments.remove(seq)
+        self._sizes.pop(seq, None)
+
+    @property
+    def _active_seq(self) -> int:
+        return self._segments[-1]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def append(
+        self,
+        queue: str,
+        body: bytes,
+        priority: int,
+        request_id: Optional[str] = None,
+    ) -> None:
+        """레코드 추가 (fsync 설정 시 디스크 동기화까지 완료 후 반환)"""
+        header = json.dumps(
+            {"queue": queue, "priority": priority, "request_id": request_id, "ts": time.time()},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        payload = header + b"\n" + body
+        record = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        with self._lock:
+            if self.total_bytes + len(record) > self.max_bytes:
+                self.stats["rejected_full"] += 1
+                raise SpoolFullError(f"Publish spool is full ({self.max_bytes} bytes)")
+
+            if self._sizes[self._active_seq] and self._sizes[self._active_seq] + len(record) > self.segment_bytes:
+                self._open_segment(self._active_seq + 1)
+
+            self._active_file.write(record)
+            self._active_file.flush()
+            if self.fsync:
+                os.fsync(self._active_file.fileno())
+            self._sizes[self._active_seq] += len(record)
+            self.stats["appended"] += 1
+            self.stats["depth"] += 1
+
+    @staticmethod
+    def _read_record(f) -> Optional[SpoolRecord]:
+        """현재 위치에서 레코드 하나 읽기 (불완전/손상 시 None)"""
+        raw_header = f.read(RECORD_HEADER.size)
+        if len(raw_header) < RECORD_HEADER.size:
+            return None
+        length, checksum = RECORD_HEADER.unpack(raw_header)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return None
+        header, _, body = payload.partition(b"\n")
+        meta = json.loads(header)
+        return SpoolRecord(meta["queue"], body, meta["priority"], meta.get("request_id"), meta["ts"])
+
+    def peek(self) -> Optional[Tuple[SpoolRecord, Tuple[int, int]]]:
+        """다음 재전송 대상 레코드와 커밋할 위치 반환 (없으면 None)"""
+        with self._lock:
+            while True:
+                seq, offset = self._cursor
+                with open(self._path(seq), "rb") as f:
+                    f.seek(offset)
+                    record = self._read_record(f)
+                    position = f.tell()
+
+                if record is not None:
+                    return record, (seq, position)
+
+                if seq == self._active_seq:
+                    if offset < self._sizes[seq]:
+                        # 활성 세그먼트 중간 손상: 세그먼트를 봉인하고 나머지를 건너뜀
+                        self.stats["corrupt_records"] += 1
+                        self._open_segment(seq + 1)
+                        self._advance_segment(seq)
+                        continue
+                    return None
+
+                if offset < self._sizes[seq]:
+                    self.stats["corrupt_records"] += 1
+                    logger.error(f"Skipping corrupt tail of spool segment {_segment_name(seq)} at offset {offset}")
+                self._advance_segment(seq)
+
+    def _advance_segment(self, seq: int) -> None:
+        """다 읽은 세그먼트 삭제 후 다음 세그먼트로 커서 이동"""
+        next_seq = self._segments[self._segments.index(seq) + 1]
+        self._cursor = (next_seq, 0)
+        self._write_cursor()
+        self._remove_segment(seq)
+
+    def commit(self, position: Tuple[int, int]) -> None:
+        """재전송 완료된 위치까지 커서 이동"""
+        with self._lock:
+            self._cursor = position
+            self._write_cursor()
+            self.stats["drained"] += 1
+            self.stats["depth"] = max(self.stats["depth"] - 1, 0)
+            self._drained_at.append(time.monotonic())
+
+    def dead_letter(self, record: SpoolRecord, position: Tuple[int, int], reason: str) -> None:
+        """재전송할 수 없는 레코드를 dead-letter 파일로 옮기고 커서 이동"""
+        line = json.dumps(
+            {
+                "queue": record.queue,
+                "priority": record.priority,
+                "request_id": record.request_id,
+                "ts": record.created_at,
+                "reason": reason,
+                "body": base64.b64encode(record.body).decode("ascii"),
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            with open(os.path.join(self.directory, DEAD_LETTER_FILE), "a") as f:
+                f.write(line + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._cursor = position
+            self._write_cursor()
+            self.stats["dead_lettered"] += 1
+            self.stats["depth"] = max(self.stats["depth"] - 1, 0)
+
+    def _write_cursor(self) -> None:
+        path = os.path.join(self.directory, CURSOR_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"segment": self._cursor[0], "offset": self._cursor[1]}, f)
+        os.replace(tmp_path, path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스풀 깊이/나이/재전송 속도 반환"""
+        oldest_age = None
+        if self.stats["depth"]:
+            item = self.peek()
+            if item is not None:
+                oldest_age = round(time.time() - item[0].created_at, 3)
+
+        now = time.monotonic()
+        recent = sum(1 for t in self._drained_at if now - t <= 10.0)
+        return {
+            "directory": self.directory,
+            "broker_available": self.broker_available,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "segments": len(self._segments),
+            "oldest_age_seconds": oldest_age,
+            "drain_rate_per_second": round(recent / 10.0, 2),
+            **self.stats,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active_file is not None:
+                self._active_file.close()
+                self._active_file = None
+        self._lock_handle.close()
+
+
+class SpoolDrainer:
+    """
+    스풀 백그라운드 재전송기
+    - 기록 순서대로 한 건씩 재전송 (연결 실패 시 같은 레코드를 지수 백오프로 재시도)
+    - 브로커가 거부한 레코드(nack/큐 없음/인자 충돌)나 max_attempts번 실패한 레코드는
+      dead-letter 파일로 옮기고 다음 레코드 진행 (한 건 때문에 스풀 전체가 막히지 않도록)
+    - 초당 재전송 수 제한으로 복구 직후 브로커에 몰리는 부하 완화
+    """
+
+    # 재시도해도 결과가 같은 브로커 거부
+    REJECTED_ERRORS = (PublishNackError, QueueNotFoundError, TopologyConflictError)
+
+    def __init__(
+        self,
+        spool: PublishSpool,
+        publish: Callable[[str, bytes, int], Awaitable[bool]],
+        rate: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        max_backoff: float = 30.0,
+        max_attempts: int = 10,
+    ):
+        self.spool = spool
+        self.publish = publish
+        self.rate = rate or settings.spool_drain_rate
+        self.poll_interval = poll_interval or settings.spool_poll_interval
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._attempts = 0
+        self._task: Optional[asyncio.Task] = None
+        self._next_send = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _throttle(self) -> None:
+        """초당 rate건을 넘지 않도록 대기"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._next_send > now:
+            await asyncio.sleep(self._next_send - now)
+        self._next_send = max(now, self._next_send) + 1.0 / self.rate
+
+    async def drain_once(self) -> bool:
+        """레코드 하나 재전송 시도 (재전송 대상이 없거나 실패하면 False)"""
+        item = await asyncio.to_thread(self.spool.peek)
+        if item is None:
+            return False
+        record, position = item
+
+        await self._throttle()
+        try:
+            sent = await self.publish(record.queue, record.body, record.priority)
+        except self.REJECTED_ERRORS as e:
+            await self._dead_letter(record, position, f"{type(e).__name__}: {e}")
+            return True
+        except CONNECTION_ERRORS as e:
+            logger.warning(f"Spool replay failed for {record.queue}: {e}")
+            self.spool.broker_available = False
+            return False
+        except Exception as e:
+            # 연결 문제가 아니므로 브로커 상태는 그대로 두고 같은 레코드를 재시도
+            self._attempts += 1
+            logger.warning(
+                f"Spool replay failed for {record.queue} "
+                f"(attempt {self._attempts}/{self.max_attempts}): {e}"
+            )
+            if self._attempts >= self.max_attempts:
+                await self._dead_letter(record, position, f"{type(e).__name__}: {e}")
+                return True
+            return False
+
+        if not sent:
+            # 전송 재시도(노드 failover 포함)를 모두 소진
+            self.spool.broker_available = False
+            return False
+
+        self._attempts = 0
+        await asyncio.to_thread(self.spool.commit, position)
+        if not self.spool.broker_available:
+            logger.info("Broker reachable again, resuming direct publishes")
+        self.spool.broker_available = True
+        return True
+
+    async def _dead_letter(self, record: SpoolRecord, position: Tuple[int, int], reason: str) -> None:
+        self._attempts = 0
+        await asyncio.to_thread(self.spool.dead_letter, record, position, reason)
+        logger.error(
+            f"Spool record for {record.queue} (request_id={record.request_id}) "
+            f"moved to {DEAD_LETTER_FILE}: {reason}"
+        )
+
+    async def _run(self) -> None:
+        backoff = self.poll_interval
+        while True:
+            try:
+                if await self.drain_once():
+                    backoff = self.poll_interval
+                    continue
+            except Exception as e:
+                logger.error(f"Publish spool drainer error: {e}", exc_info=True)
+
+            # 비었거나 실패: 실패가 이어지면 대기 시간 증가
+            await asyncio.sleep(backoff)
+            if not self.spool.broker_available and self.spool.stats["depth"]:
+                backoff = min(backoff * 2, self.max_backoff)
+            else:
+                backoff = self.poll_interval
+
+
+_spool_instance: Optional[PublishSpool] = None
+_spool_pid: Optional[int] = None
+_spool_lock = threading.Lock()
+
+
+def get_publish_spool() -> PublishSpool:
+    """워커 프로세스별 스풀 반환 (fork 이후에는 새 슬롯을 잡음)"""
+    global _spool_instance, _spool_pid
+    pid = os.getpid()
+    if _spool_instance is None or _spool_pid != pid:
+        with _spool_lock:
+            if _spool_instance is None or _spool_pid != pid:
+                _spool_instance = PublishSpool()
+                _spool_pid = pid
+    return _spool_instance
+
+
+def get_publish_spool_stats() -> Optional[Dict[str, Any]]:
+    """스풀이 생성된 경우 지표 반환"""
+    if _spool_instance is None or _spool_pid != os.getpid():
+        return None
+    return _spool_instance.get_stats()
@@ -0,0 +1,121 @@
+"""
+큐 토폴로지 캐시
+이미 선언/확인된 큐를 프로세스 단위로 기억하여 publish마다 수행하던
+passive queue_declare 왕복을 제거
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TopologyConflictError(RuntimeError):
+    """큐가 다른 인자로 이미 선언되어 브로커가 406 PRECONDITION_FAILED로 거부한 경우"""
+    pass
+
+
+class QueueTopologyCache:
+    """
+    선언이 확인된 큐 목록 캐시
+    - TTL 경과 시 다음 publish에서 다시 확인
+    - 명시적 무효화 (브로커가 404 NOT_FOUND / NO_ROUTE로 응답한 경우 등)
+    - 워커 내 모든 풀 채널과 비동기 클라이언트가 공유 (스레드 안전)
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else settings.rabbitmq_topology_cache_ttl
+        self._expires_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def is_known(self, queue: str) -> bool:
+        """큐가 선언된 것으로 알려져 있고 TTL이 남아있는지 확인"""
+        with self._lock:
+            expires_at = self._expires_at.get(queue)
+            if expires_at is not None and expires_at > time.monotonic():
+                self.stats["hits"] += 1
+                return True
+            self.stats["misses"] += 1
+            return False
+
+    def mark_declared(self, queue: str) -> None:
+        """큐가 존재함을 기록"""
+        with self._lock:
+            self._expires_at[queue] = time.monotonic() + self.ttl
+
+    def invalidate(self, queue: Optional[str] = None) -> None:
+        """특정 큐(또는 전체) 캐시 무효화"""
+        with self._lock:
+            if queue is None:
+                self._expires_at.clear()
+            elif self._expires_at.pop(queue, None) is None:
+                return
+            self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 상태 반환"""
+        with self._lock:
+            return {
+                "ttl": self.ttl,
+                "known_queues": sorted(self._expires_at),
+                **self.stats,
+            }
+
+
+_topology_cache_instance: Optional[QueueTopologyCache] = None
+_topology_cache_lock = threading.Lock()
+
+
+def get_queue_topology_cache() -> QueueTopologyCache:
+    """프로세스 전역 큐 토폴로지 캐시 반환"""
+    global _topology_cache_instance
+    if _topology_cache_instance is None:
+        with _topology_cache_lock:
+            if _topology_cache_instance is None:
+                _topology_cache_instance = QueueTopologyCache()
+    return _topology_cache_instance
+
+
+async def declare_topology(client, queues: Dict[str, Dict[str, Any]]) -> None:
+    """
+    큐 토폴로지를 병렬로 멱등 선언하고 캐시에 기록
+
+    Args:
+        client: AsyncRabbitMQClusterClient
+        queues: 큐 이름 → declare_queue 추가 인자
+
+    Raises:
+        TopologyConflictError: 기존 큐와 인자가 달라 브로커가 선언을 거부 (재시도해도 해결되지 않음)
+        ConnectionError: 브로커 연결 실패
+        RuntimeError: 그 밖의 이유로 하나 이상의 큐 선언 실패
+    """
+    if not await client.connect():
+        raise ConnectionError("Failed to establish RabbitMQ connection")
+
+    names = list(queues)
+    results = await asyncio.gather(
+        *(client.declare_queue(name, raise_on_conflict=True, **queues[name]) for name in names),
+        return_exceptions=True,
+    )
+
+    cache = get_queue_topology_cache()
+    conflicts = []
+    failed = []
+    for name, result in zip(names, results):
+        if result is True:
+            cache.mark_declared(name)
+        elif isinstance(result, TopologyConflictError):
+            conflicts.append(name)
+        else:
+            failed.append(name)
+
+    if conflicts:
+        raise TopologyConflictError(f"Queue arguments conflict with existing queues: {', '.join(conflicts)}")
+    if failed:
+        raise RuntimeError(f"Failed to declare queues: {', '.join(failed)}")
+    logger.info(f"Declared {len(names)} queues at startup: {', '.join(names)}")
@@ -0,0 +1,268 @@
+"""
+부하 벤치마크용 로컬 브로커 대역 (AMQP 0-9-1 최소 구현)
+
+포트마다 클러스터 노드 하나로 보고 큐 목록은 모든 노드가 공유 (게이트웨이는 노드 3개를 요구)
+게이트웨이가 실제로 쓰는 명령만 처리: 연결 협상, 채널 열기/닫기, publisher confirm,
+큐 선언(passive 포함, 인자 불일치 406), publish(+mandatory 반환), basic.qos, heartbeat,
+자원 알람 흉내(connection.blocked/unblocked)
+메시지는 저장하지 않고 큐별 개수/바이트만 집계하며 confirm 모드면 ack 전송
+--ack-delay-ms로 quorum 큐의 복제 후 confirm 지연을 흉내냄
+
+    python -m benchmarks.amqp_stub [--host H] [--port P1 P2 P3] [--ack-delay-ms MS] [--stats-file PATH]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+
+from pamqp import commands, frame
+from pamqp.body import ContentBody
+from pamqp.exceptions import UnmarshalingException
+from pamqp.header import ContentHeader, ProtocolHeader
+from pamqp.heartbeat import Heartbeat
+
+FRAME_MAX = 131072
+
+
+class _Channel:
+    __slots__ = ("confirm", "delivery_tag", "method", "header", "body")
+
+    def __init__(self):
+        self.confirm = False
+        self.delivery_tag = 0
+        self.method: Optional[commands.Basic.Publish] = None
+        self.header: Optional[ContentHeader] = None
+        self.body: list = []
+
+
+class _AMQPConnection(asyncio.Protocol):
+    """클라이언트 연결 하나 (프레임 단위 파싱 후 명령별 응답)"""
+
+    def __init__(self, broker: "StubBroker"):
+        self.broker = broker
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = b""
+        self.channels: Dict[int, _Channel] = {}
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+        self.broker.stats["connections"] += 1
+        self.broker.connections.add(self)
+
+    def connection_lost(self, exc) -> None:
+        self.transport = None
+        self.broker.connections.discard(self)
+
+    def data_received(self, data: bytes) -> None:
+        self.buffer += data
+        while self.buffer:
+            try:
+                consumed, channel_id, value = frame.unmarshal(self.buffer)
+            except UnmarshalingException:
+                return  # 프레임이 아직 다 도착하지 않음
+            self.buffer = self.buffer[consumed:]
+            self._handle(channel_id, value)
+
+    def _send(self, channel_id: int, *values) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(b"".join(frame.marshal(value, channel_id) for value in values))
+
+    def _handle(self, channel_id: int, value) -> None:
+        if isinstance(value, ProtocolHeader):
+            self._send(0, commands.Connection.Start(
+                server_properties={"product": "cdl-gateway amqp stub", "capabilities": {
+                    "publisher_confirms": True, "basic.nack": True, "connection.blocked": True,
+                }},
+                mechanisms="PLAIN", locales="en_US",
+            ))
+        elif isinstance(value, Heartbeat):
+            self._send(0, Heartbeat())
+        elif isinstance(value, ContentHeader):
+            channel = self.channels[channel_id]
+            channel.header = value
+            if value.body_size == 0:
+                self._publish(channel_id, channel)
+        elif isinstance(value, ContentBody):
+            channel = self.channels[channel_id]
+            channel.body.append(value.value)
+            if sum(len(part) for part in channel.body) >= channel.header.body_size:
+                self._publish(channel_id, channel)
+        else:
+            handler = getattr(self, "_on_" + value.name.replace(".", "_").lower(), None)
+            if handler is not None:
+                handler(channel_id, value)
+
+    # 연결
+    def _on_connection_startok(self, channel_id, method) -> None:
+        self._send(0, commands.Connection.Tune(channel_max=2047, frame_max=FRAME_MAX, heartbeat=0))
+
+    def _on_connection_tuneok(self, channel_id, method) -> None:
+        pass
+
+    def _on_connection_open(self, channel_id, method) -> None:
+        self._send(0, commands.Connection.OpenOk())
+
+    def _on_connection_close(self, channel_id, method) -> None:
+        self._send(0, commands.Connection.CloseOk())
+        self.transport.close()
+
+    # 채널
+    def _on_channel_open(self, channel_id, method) -> None:
+        self.channels[channel_id] = _Channel()
+        self._send(channel_id, commands.Channel.OpenOk())
+
+    def _on_channel_close(self, channel_id, method) -> None:
+        self.channels.pop(channel_id, None)
+        self._send(channel_id, commands.Channel.CloseOk())
+
+    def _on_channel_closeok(self, channel_id, method) -> None:
+        self.channels.pop(channel_id, None)
+
+    def _on_confirm_select(self, channel_id, method) -> None:
+        self.channels[channel_id].confirm = True
+        if not method.nowait:
+            self._send(channel_id, commands.Confirm.SelectOk())
+
+    def _on_basic_qos(self, channel_id, method) -> None:
+        self._send(channel_id, commands.Basic.QosOk())
+
+    def _on_exchange_declare(self, channel_id, method) -> None:
+        if not method.nowait:
+            self._send(channel_id, commands.Exchange.DeclareOk())
+
+    def _on_queue_declare(self, channel_id, method) -> None:
+        if method.passive and method.queue not in self.broker.queues:
+            # RabbitMQ와 같이 404로 채널 종료
+            self._close_channel(channel_id, 404, f"NOT_FOUND - no queue '{method.queue}' in vhost '/'")
+            return
+        declared = self.broker.queues.get(method.queue)
+        if not method.passive and declared is not None and declared != (method.arguments or {}):
+            # 기존 큐와 인자가 다르면 RabbitMQ와 같이 406으로 채널 종료
+            self._close_channel(
+                channel_id, 406, f"PRECONDITION_FAILED - inequivalent arg for queue '{method.queue}' in vhost '/'",
+            )
+            return
+        if not method.passive:
+            self.broker.queues.setdefault(method.queue, method.arguments or {})
+        if not method.nowait:
+            self._send(channel_id, commands.Queue.DeclareOk(queue=method.queue, message_count=0, consumer_count=0))
+
+    def _close_channel(self, channel_id: int, reply_code: int, reply_text: str) -> None:
+        self.channels.pop(channel_id, None)
+        self._send(channel_id, commands.Channel.Close(
+            reply_code=reply_code, reply_text=reply_text, class_id=50, method_id=10,
+        ))
+
+    def _on_basic_publish(self, channel_id, method) -> None:
+        channel = self.channels[channel_id]
+        channel.method = method
+        channel.header = None
+        channel.body = []
+
+    def _publish(self, channel_id: int, channel: _Channel) -> None:
+        method, header, body = channel.method, channel.header, b"".join(channel.body)
+        channel.method, channel.header, channel.body = None, None, []
+        routed = method.exchange != "" or method.routing_key in self.broker.queues
+        self.broker.record(method.routing_key, len(body), routed)
+        if not routed and method.mandatory:
+            self._send(
+                channel_id,
+                commands.Basic.Return(
+                    reply_code=312, reply_text="NO_ROUTE", exchange=method.exchange, routing_key=method.routing_key,
+                ),
+                ContentHeader(body_size=len(body), properties=header.properties),
+                ContentBody(body),
+            )
+        if channel.confirm:
+            channel.delivery_tag += 1
+            ack = commands.Basic.Ack(delivery_tag=channel.delivery_tag)
+            if self.broker.ack_delay:
+                asyncio.get_running_loop().call_later(self.broker.ack_delay, self._send, channel_id, ack)
+            else:
+                self._send(channel_id, ack)
+
+
+class StubBroker:
+    """AMQP 브로커 대역 (큐 목록과 publish 집계만 유지)"""
+
+    def __init__(self, host: str = "127.0.0.1", ports: Sequence[int] = (0,), ack_delay_ms: float = 0.0):
+        self.host = host
+        self.ports = list(ports)
+        self.ack_delay = ack_delay_ms / 1000.0
+        # 큐 이름 → 선언 인자 (다른 인자로 다시 선언하면 406)
+        self.queues: Dict[str, Dict[str, Any]] = {}
+        self.published: Dict[str, Dict[str, int]] = defaultdict(lambda: {"messages": 0, "bytes": 0})
+        self.stats = {"connections": 0, "messages": 0, "bytes": 0, "unroutable": 0}
+        self.connections: set = set()
+        self._servers: List[asyncio.AbstractServer] = []
+        self._started = time.monotonic()
+
+    async def start(self) -> "StubBroker":
+        loop = asyncio.get_running_loop()
+        for index, port in enumerate(self.ports):
+            server = await loop.create_server(lambda: _AMQPConnection(self), self.host, port)
+            self._servers.append(server)
+            self.ports[index] = server.sockets[0].getsockname()[1]
+        self._started = time.monotonic()
+        return self
+
+    async def stop(self) -> None:
+        for server in self._servers:
+            server.close()
+        self._servers = []
+
+    def set_blocked(self, reason: Optional[str]) -> None:
+        """열린 모든 연결에 connection.blocked(reason) 전송 (None이면 connection.unblocked)"""
+        value = commands.Connection.Blocked(reason) if reason is not None else commands.Connection.Unblocked()
+        for connection in list(self.connections):
+            connection._send(0, value)
+
+    def record(self, routing_key: str, nbytes: int, routed: bool) -> None:
+        self.stats["messages"] += 1
+        self.stats["bytes"] += nbytes
+        if not routed:
+            self.stats["unroutable"] += 1
+            return
+        queue = self.published[routing_key]
+        queue["messages"] += 1
+        queue["bytes"] += nbytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        times = os.times()
+        return {
+            **self.stats,
+            "queues": dict(self.published),
+            "uptime_s": round(time.monotonic() - self._started, 3),
+            "cpu_s": round(times.user + times.system, 3),
+        }
+
+
+async def _serve(args) -> None:
+    broker = await StubBroker(args.host, args.port, args.ack_delay_ms).start()
+    print(f"amqp stub listening on {broker.host}:{','.join(map(str, broker.ports))}", flush=True)
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+    await stopped.wait()
+    await broker.stop()
+    if args.stats_file:
+        with open(args.stats_file, "w") as f:
+            json.dump(broker.get_stats(), f, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, nargs="+", default=[5672, 5673, 5674], help="노드별 포트")
+    parser.add_argument("--ack-delay-ms", type=float, default=0.0, help="publisher confirm 지연(ms)")
+    parser.add_argument("--stats-file", help="종료 시 집계를 저장할 JSON 파일 경로")
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+직렬화 경로 벤치마크 (교육 타입별)
+
+기존 경로: 특화 모델 .dict() → request_id/client_ip 추가 → json.dumps(ensure_ascii=False) → encode
+          응답은 Starlette JSONResponse.render
+코덱 경로: model_to_bytes (pydantic-core 직렬화 한 번 + 메타데이터 덧붙이기)
+          응답은 FastJSONResponse.render
+
+요청 디코딩/검증은 두 경로가 같으므로 측정에서 제외 (모델은 미리 생성)
+
+    python -m benchmarks.bench_codec [--number N] [--json PATH]
+"""
+import argparse
+import json
+import platform
+import timeit
+import warnings
+
+from fastapi.responses import JSONResponse
+
+from app.core import codec
+from app.core.codec import FastJSONResponse, model_to_bytes
+from app.models.requests import SokindRequest
+from benchmarks.payloads import PAYLOADS
+
+EXTRA = {"request_id": "0f8fad5b-d9cb-469f-a165-70867728950e", "client_ip": "203.0.113.10"}
+RESULT = {"message": "success", "status": 200, "request_id": EXTRA["request_id"], "queue": "sokind", "priority": 2}
+
+
+def legacy_path(model) -> bytes:
+    body = model.dict()
+    body.update(EXTRA)
+    data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    JSONResponse.render(None, RESULT)
+    return data
+
+
+def codec_path(model) -> bytes:
+    data = model_to_bytes(model, EXTRA)
+    FastJSONResponse.render(None, RESULT)
+    return data
+
+
+def _best_us(func, model, number: int) -> float:
+    """반복 측정 중 최솟값 (1회당 µs)"""
+    return min(timeit.repeat(lambda: func(model), number=number, repeat=5)) / number * 1e6
+
+
+def run(number: int) -> dict:
+    warnings.simplefilter("ignore", DeprecationWarning)
+    results = {}
+    for name, payload in PAYLOADS.items():
+        model = SokindRequest(**payload).to_specialized_model()
+        legacy_bytes = legacy_path(model)
+        # 같은 메시지인지 확인 (키 순서/값 동일, 공백만 다를 수 있음)
+        assert json.loads(codec_path(model)) == json.loads(legacy_bytes), name
+
+        legacy_us = _best_us(legacy_path, model, number)
+        codec_us = _best_us(codec_path, model, number)
+        results[name] = {
+            "model": type(model).__name__,
+            "body_bytes": len(legacy_bytes),
+            "legacy_us": round(legacy_us, 2),
+            "codec_us": round(codec_us, 2),
+            "saved_us": round(legacy_us - codec_us, 2),
+            "speedup": round(legacy_us / codec_us, 2),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="측정당 반복 횟수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    print(f"codec={codec.codec_name()} python={platform.python_version()}")
+    print(f"{'edu_type':<16}{'model':<42}{'bytes':>9}{'legacy µs':>12}{'codec µs':>11}{'saved µs':>11}{'x':>7}")
+    for name, row in results.items():
+        print(
+            f"{name:<16}{row['model']:<42}{row['body_bytes']:>9}{row['legacy_us']:>12}"
+            f"{row['codec_us']:>11}{row['saved_us']:>11}{row['speedup']:>7}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"codec": codec.codec_name(), "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
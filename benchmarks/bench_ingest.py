@@ -0,0 +1,136 @@
+"""
+요청 수집 경로 최대 메모리 벤치마크 (큰 V3 REPORT 본문)
+
+기존 경로: 본문 전체 버퍼링 → codec.loads → 특화 모델 검증 → model_to_bytes
+스트리밍 경로: 64KB 청크로 StreamingRequestParser에 전달 → 특화 모델 검증
+             → 큰 목록 필드는 원본 bytes로 model_to_bytes
+
+경로마다 별도 프로세스에서 한 번 실행하고 시작 전 대비 최대 RSS 증가량(ru_maxrss)과
+tracemalloc 최대 할당량(별도 실행)을 측정. 두 경로의 메시지 본문이 같은 JSON인지 확인
+
+    python -m benchmarks.bench_ingest [--mb 40] [--json PATH]
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+import warnings
+
+from app.core import codec
+from app.core.codec import model_to_bytes
+from app.models.requests import parse_specialized_request
+from app.api.streaming_ingest import StreamingRequestParser
+from benchmarks.payloads import PAYLOADS
+
+CHUNK_SIZE = 65536
+EXTRA = {"request_id": "0f8fad5b-d9cb-469f-a165-70867728950e", "client_ip": "203.0.113.10"}
+WARMUP_BODY = json.dumps(PAYLOADS["10-REPORT"]).encode("utf-8")
+# 본문 크기를 키우는 목록 필드 (REPORT 대화 이력/메모리)
+GROWN_FIELDS = ("previous_chat_history_data_list", "memory_data_list", "reference_data_list")
+
+
+def make_body(megabytes: float) -> bytes:
+    """REPORT 예시 본문의 목록 필드 원소를 반복하여 지정 크기 이상의 본문 생성"""
+    payload = dict(PAYLOADS["10-REPORT"])
+    base = len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    per_round = sum(len(json.dumps(payload[name], ensure_ascii=False).encode("utf-8")) for name in GROWN_FIELDS)
+    rounds = max(1, int(megabytes * 1024 * 1024 / per_round))
+    for name in GROWN_FIELDS:
+        payload[name] = [
+            {**item, "seq": index}
+            for index in range(rounds)
+            for item in PAYLOADS["10-REPORT"][name]
+        ]
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    assert len(body) > base
+    return body
+
+
+def buffered_path(body: bytes) -> bytes:
+    model = parse_specialized_request(codec.loads(body))
+    return model_to_bytes(model, EXTRA)
+
+
+def streaming_path(body: bytes) -> bytes:
+    parser = StreamingRequestParser()
+    view = memoryview(body)
+    for start in range(0, len(view), CHUNK_SIZE):
+        parser.feed(bytes(view[start:start + CHUNK_SIZE]))
+    model = parser.close()
+    return model_to_bytes(model, EXTRA, parser.raw_fields)
+
+
+PATHS = {"buffered": buffered_path, "streaming": streaming_path}
+
+
+def _maxrss_bytes() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _measure(name: str, body: bytes, trace: bool, results) -> None:
+    warnings.simplefilter("ignore", DeprecationWarning)
+    func = PATHS[name]
+    func(WARMUP_BODY)  # 임포트/검증기 초기화 비용 제외
+    if trace:
+        tracemalloc.start()
+        func(body)
+        results.put(tracemalloc.get_traced_memory()[1])
+        return
+    before = _maxrss_bytes()
+    started = time.perf_counter()
+    message = func(body)
+    elapsed = time.perf_counter() - started
+    results.put((_maxrss_bytes() - before, elapsed, message))
+
+
+def _run_isolated(name: str, body: bytes, trace: bool = False):
+    """새 프로세스에서 한 번 실행 (RSS 최댓값은 프로세스 단위로만 측정 가능)"""
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(name, body, trace, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def run(megabytes: float) -> dict:
+    body = make_body(megabytes)
+    results = {"body_bytes": len(body)}
+    messages = {}
+    for name in PATHS:
+        rss, elapsed, messages[name] = _run_isolated(name, body)
+        results[name] = {
+            "peak_rss_mb": round(rss / 1024 / 1024, 1),
+            "peak_traced_mb": round(_run_isolated(name, body, trace=True) / 1024 / 1024, 1),
+            "seconds": round(elapsed, 3),
+        }
+    # 같은 메시지인지 확인 (원본 유지 필드는 공백/이스케이프만 다를 수 있음)
+    assert json.loads(messages["buffered"]) == json.loads(messages["streaming"])
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=40.0, help="생성할 본문 크기 (MB)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = run(args.mb)
+    print(f"codec={codec.codec_name()} python={platform.python_version()} body={results['body_bytes']} bytes")
+    print(f"{'path':<12}{'peak RSS MB':>14}{'peak traced MB':>17}{'seconds':>10}")
+    for name in PATHS:
+        row = results[name]
+        print(f"{name:<12}{row['peak_rss_mb']:>14}{row['peak_traced_mb']:>17}{row['seconds']:>10}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
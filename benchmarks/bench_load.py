@@ -0,0 +1,472 @@
+"""
+종단 간 부하 벤치마크 (HTTP → 게이트웨이 워커 → AMQP)
+
+로컬 브로커 대역(benchmarks.amqp_stub)을 띄우고 실제 create_app()을 gunicorn(UvicornWorker) 또는
+uvicorn으로 실행한 뒤, 교육 타입별 payload를 트래픽 구성(mix) 비율대로 고정 RPS로 전송
+- 개방 루프(open loop): 요청 i는 시작 시각 + i/RPS에 예정되고 지연은 예정 시각부터 측정
+  (서버가 느려져도 전송 간격이 늘어나지 않으므로 대기열 지연이 결과에서 빠지지 않음)
+- 동시 요청 상한(--concurrency)을 넘는 요청은 슬롯이 날 때까지 대기 (대기 시간도 지연에 포함)
+- 측정 구간 동안 워커별 CPU 사용률, RSS를 /proc에서 샘플링
+- 결과 JSON에 git 커밋을 기록하고 --compare로 이전 결과와 p50/p95/p99/RPS 차이 출력
+
+    python -m benchmarks.bench_load [--mix production] [--rps 200 400] [--concurrency 64] [--duration 30]
+        [--server gunicorn|uvicorn] [--workers 2] [--ack-delay-ms 2] [--json PATH] [--compare OLD.json]
+    python -m benchmarks.bench_load --url http://127.0.0.1:8000   # 이미 실행 중인 게이트웨이 대상 (서버 기동 생략)
+
+트래픽 구성: 미리 정의된 이름(MIXES) 또는 "payload=가중치" 목록 (예: "10-QUESTION=6,1=2,9=1")
+payload 이름은 benchmarks.payloads.PAYLOADS의 키 (교육 타입 1~9, 10-AUGMENTATION/QUESTION/REPORT)
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core import codec
+from benchmarks.payloads import PAYLOADS
+
+# 트래픽 구성 (payload 키 → 가중치)
+MIXES: Dict[str, Dict[str, float]] = {
+    # 모든 교육 타입 균등
+    "uniform": {key: 1 for key in PAYLOADS},
+    # 운영 비율 근사: 실시간 대화(V3 질문/증강)가 대부분, 기본 교육 타입이 그다음, 리포트는 드묾
+    "production": {
+        "10-QUESTION": 40, "10-AUGMENTATION": 10, "10-REPORT": 2,
+        "1": 10, "2": 8, "3": 8, "4": 6, "5": 5, "6": 4, "7": 4, "8": 2, "9": 1,
+    },
+    # 실시간 레인만 (응답 지연에 민감한 요청)
+    "realtime": {"10-QUESTION": 6, "10-AUGMENTATION": 2, "1": 1, "6": 1},
+    # 큰 본문 위주 (리포트, 긴 대화 기록)
+    "heavy": {"10-REPORT": 3, "10-QUESTION": 3, "9": 1, "7": 1},
+}
+
+PERCENTILES = (50, 95, 99)
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """트래픽 구성 이름 또는 "payload=가중치,..." → {payload 키: 가중치}"""
+    if spec in MIXES:
+        return dict(MIXES[spec])
+    mix = {}
+    for item in spec.split(","):
+        key, sep, weight = item.strip().partition("=")
+        if key not in PAYLOADS:
+            raise ValueError(f"Unknown payload {key!r} in mix (choose from {', '.join(PAYLOADS)})")
+        mix[key] = float(weight) if sep else 1.0
+        if mix[key] < 0:
+            raise ValueError(f"Negative weight for {key!r}")
+    if not sum(mix.values()):
+        raise ValueError(f"Empty traffic mix: {spec!r}")
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수 (정렬된 값)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    values = sorted(latencies)
+    summary = {f"p{pct}": round(percentile(values, pct) * 1000, 3) for pct in PERCENTILES}
+    summary["max"] = round(values[-1] * 1000, 3) if values else 0.0
+    summary["mean"] = round(sum(values) / len(values) * 1000, 3) if values else 0.0
+    return summary
+
+
+class ProcessSampler:
+    """
+    /proc 기반 프로세스별 CPU 사용률, RSS 샘플링 (psutil 없이 Linux에서만 동작)
+    pids_getter는 샘플마다 호출 (gunicorn이 워커를 재시작해도 새 PID를 따라감)
+    """
+
+    def __init__(self, pids_getter, interval: float = 0.5):
+        self.pids_getter = pids_getter
+        self.interval = interval
+        self._start: Dict[int, Tuple[float, float]] = {}
+        self._last: Dict[int, Tuple[float, float]] = {}
+        self._rss_max: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def read(pid: int) -> Optional[Tuple[float, int]]:
+        """(누적 CPU 초, RSS 바이트) 또는 프로세스가 없으면 None"""
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            return None
+        # fields[0]은 원래 3번째 필드(state): utime=14, stime=15, rss=24번째 필드
+        return (int(fields[11]) + int(fields[12])) / CLK_TCK, int(fields[21]) * PAGE_SIZE
+
+    def sample(self) -> None:
+        now = time.monotonic()
+        for pid in self.pids_getter():
+            values = self.read(pid)
+            if values is None:
+                continue
+            cpu, rss = values
+            self._start.setdefault(pid, (now, cpu))
+            self._last[pid] = (now, cpu)
+            self._rss_max[pid] = max(self._rss_max.get(pid, 0), rss)
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> List[Dict[str, Any]]:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.sample()
+        results = []
+        for pid, (started, cpu_start) in sorted(self._start.items()):
+            ended, cpu_end = self._last[pid]
+            elapsed = ended - started
+            results.append({
+                "pid": pid,
+                "cpu_percent": round((cpu_end - cpu_start) / elapsed * 100, 1) if elapsed > 0 else 0.0,
+                "cpu_s": round(cpu_end - cpu_start, 3),
+                "rss_mb_max": round(self._rss_max[pid] / 2**20, 1),
+            })
+        return results
+
+
+def child_pids(pid: int) -> List[int]:
+    """직계 자식 프로세스 PID (gunicorn/uvicorn 워커)"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    rps: float,
+    duration: float,
+    concurrency: int,
+    warmup: float = 0.0,
+    seed: int = 0,
+    path: str = "/",
+) -> Dict[str, Any]:
+    """
+    고정 RPS 개방 루프 부하 (warmup 구간 요청은 집계에서 제외)
+
+    Returns:
+        요청 수, 달성 RPS, 상태코드별 개수, 전체/payload별 지연 요약(ms)
+    """
+    rng = random.Random(seed)
+    keys = list(mix)
+    weights = [mix[key] for key in keys]
+    # 요청마다 직렬화하지 않도록 payload는 미리 bytes로 인코딩
+    bodies = {key: codec.dumps(PAYLOADS[key]) for key in keys}
+    headers = {"Content-Type": "application/json"}
+    slots = asyncio.Semaphore(concurrency)
+    total = int((warmup + duration) * rps)
+    records: List[Tuple[str, int, float]] = []
+    tasks = []
+
+    async def request(key: str, scheduled: float, measured: bool) -> None:
+        async with slots:
+            try:
+                response = await client.post(path, content=bodies[key], headers=headers)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0  # 연결 실패/타임아웃
+        if measured:
+            records.append((key, status, time.perf_counter() - scheduled))
+
+    started = time.perf_counter()
+    for index in range(total):
+        scheduled = started + index / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        key = rng.choices(keys, weights)[0]
+        tasks.append(asyncio.create_task(request(key, scheduled, index >= warmup * rps)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started - warmup
+
+    status_counts: Dict[str, int] = {}
+    by_payload: Dict[str, List[float]] = {}
+    latencies = []
+    for key, status, latency in records:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+        if 200 <= status < 300:
+            latencies.append(latency)
+            by_payload.setdefault(key, []).append(latency)
+    return {
+        "requests": len(records),
+        "errors": len(records) - len(latencies),
+        "achieved_rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "status_counts": status_counts,
+        "latency_ms": summarize_latencies(latencies),
+        "by_payload": {
+            key: {"requests": len(values), **summarize_latencies(values)}
+            for key, values in sorted(by_payload.items())
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_revision() -> Dict[str, Any]:
+    def git(*args):
+        result = subprocess.run(["git", *args], capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+class GatewayStack:
+    """브로커 대역 + 게이트웨이 서버 프로세스 (종료 시 브로커 집계 수집)"""
+
+    def __init__(self, args, workdir: str):
+        self.args = args
+        self.workdir = workdir
+        self.port = args.port or _free_port()
+        self.broker_ports = [_free_port() for _ in range(3)]
+        self.broker_stats_file = os.path.join(workdir, "broker.json")
+        self.broker: Optional[subprocess.Popen] = None
+        self.server: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def _server_command(self) -> List[str]:
+        bind = f"127.0.0.1:{self.port}"
+        if self.args.server == "gunicorn":
+            return [
+                sys.executable, "-m", "gunicorn", "app.main:app",
+                "--config", "./scripts/gunicorn.conf.py",
+                "--bind", bind,
+                "--workers", str(self.args.workers),
+                "--worker-class", "uvicorn.workers.UvicornWorker",
+                "--log-level", "warning",
+            ]
+        return [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(self.port),
+            "--workers", str(self.args.workers),
+            "--log-level", "warning", "--no-access-log",
+        ]
+
+    def _server_env(self) -> Dict[str, str]:
+        metrics_dir = os.path.join(self.workdir, "metrics")
+        os.makedirs(metrics_dir, exist_ok=True)
+        return {
+            **os.environ,
+            "RABBITMQ_HOSTNAME": "127.0.0.1",
+            "RABBITMQ_PORT": str(self.broker_ports[0]),
+            "RABBITMQ_PORT2": str(self.broker_ports[1]),
+            "RABBITMQ_PORT3": str(self.broker_ports[2]),
+            "RABBITMQ_USER": "guest",
+            "RABBITMQ_PASSWORD": "guest",
+            "LOG_LEVEL": self.args.log_level,
+            "PROMETHEUS_MULTIPROC_DIR": metrics_dir,
+        }
+
+    async def start(self) -> None:
+        self.broker = subprocess.Popen(
+            [
+                sys.executable, "-m", "benchmarks.amqp_stub",
+                "--port", *map(str, self.broker_ports),
+                "--ack-delay-ms", str(self.args.ack_delay_ms),
+                "--stats-file", self.broker_stats_file,
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        self.server = subprocess.Popen(
+            self._server_command(), env=self._server_env(),
+            stdout=subprocess.DEVNULL, stderr=None if self.args.verbose else subprocess.DEVNULL,
+        )
+        await self._wait_ready()
+
+    async def _wait_ready(self, timeout: float = 60.0) -> None:
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(base_url=self.url) as client:
+            while time.monotonic() < deadline:
+                if self.server.poll() is not None:
+                    raise RuntimeError(f"Gateway exited during startup (code {self.server.returncode})")
+                try:
+                    if (await client.get("/status/ready")).status_code == 200:
+                        return
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError(f"Gateway not ready within {timeout:.0f}s")
+
+    def worker_pids(self) -> List[int]:
+        # uvicorn --workers 1은 워커 프로세스 없이 직접 처리
+        return child_pids(self.server.pid) or [self.server.pid]
+
+    def broker_pids(self) -> List[int]:
+        return [self.broker.pid]
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        for process in (self.server, self.broker):
+            if process is not None and process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+        for process in (self.server, self.broker):
+            if process is not None:
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        if os.path.exists(self.broker_stats_file):
+            with open(self.broker_stats_file) as f:
+                return json.load(f)
+        return None
+
+
+async def _run(args) -> Dict[str, Any]:
+    mixes = {spec: parse_mix(spec) for spec in args.mix}
+    result: Dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "server": "external" if args.url else args.server,
+            "workers": None if args.url else args.workers,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "ack_delay_ms": None if args.url else args.ack_delay_ms,
+            "mixes": mixes,
+        },
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="cdl-bench-load-") as workdir:
+        stack = None if args.url else GatewayStack(args, workdir)
+        try:
+            if stack is not None:
+                await stack.start()
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=args.url or stack.url, limits=limits, timeout=args.timeout) as client:
+                for spec, mix in mixes.items():
+                    for rps in args.rps:
+                        workers = ProcessSampler(stack.worker_pids if stack else lambda: [])
+                        broker = ProcessSampler(stack.broker_pids if stack else lambda: [])
+                        workers.start()
+                        broker.start()
+                        run = await run_load(
+                            client, mix, rps, args.duration, args.concurrency, args.warmup, args.seed,
+                        )
+                        run = {"mix": spec, "target_rps": rps, **run, "workers": await workers.stop()}
+                        broker_usage = await broker.stop()
+                        if broker_usage:
+                            run["broker"] = broker_usage[0]
+                        result["runs"].append(run)
+                        _print_run(run)
+        finally:
+            if stack is not None:
+                result["broker"] = stack.stop()
+    return result
+
+
+def _print_run(run: Dict[str, Any]) -> None:
+    latency = run["latency_ms"]
+    workers = run["workers"]
+    cpu = sum(worker["cpu_percent"] for worker in workers)
+    rss = sum(worker["rss_mb_max"] for worker in workers)
+    print(
+        f"{run['mix']:<12}{run['target_rps']:>8g}{run['achieved_rps']:>10}"
+        f"{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+        f"{run['errors']:>8}{cpu:>10.1f}{rss:>10.1f}",
+        flush=True,
+    )
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """같은 (mix, target_rps) 실행끼리 지연/처리량 변화율(%)"""
+    previous = {(run["mix"], run["target_rps"]): run for run in old["runs"]}
+    rows = []
+    for run in new["runs"]:
+        base = previous.get((run["mix"], run["target_rps"]))
+        if base is None:
+            continue
+        row = {"mix": run["mix"], "target_rps": run["target_rps"]}
+        pairs = [(f"p{pct}", base["latency_ms"][f"p{pct}"], run["latency_ms"][f"p{pct}"]) for pct in PERCENTILES]
+        pairs.append(("achieved_rps", base["achieved_rps"], run["achieved_rps"]))
+        for name, before, after in pairs:
+            row[name] = round((after - before) / before * 100, 1) if before else None
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", nargs="+", default=["production"], help=f"트래픽 구성 ({', '.join(MIXES)} 또는 payload=가중치,...)")
+    parser.add_argument("--rps", nargs="+", type=float, default=[200.0], help="목표 RPS (여러 개면 차례로 실행)")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 요청 상한 (HTTP 연결 수)")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 구간(초)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="집계에서 제외할 워밍업 구간(초)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="요청 제한 시간(초)")
+    parser.add_argument("--seed", type=int, default=0, help="payload 선택 난수 시드 (실행 간 같은 요청 순서)")
+    parser.add_argument("--server", choices=("gunicorn", "uvicorn"), default="gunicorn")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=0, help="게이트웨이 포트 (기본값: 빈 포트)")
+    parser.add_argument("--ack-delay-ms", type=float, default=2.0, help="브로커 대역의 confirm 지연(ms)")
+    parser.add_argument("--log-level", default="INFO", help="게이트웨이 LOG_LEVEL")
+    parser.add_argument("--url", help="이미 실행 중인 게이트웨이 주소 (브로커 대역/서버 기동 생략)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--verbose", action="store_true", help="게이트웨이 stderr 출력")
+    args = parser.parse_args()
+
+    print(f"{'mix':<12}{'rps':>8}{'achieved':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'errors':>8}{'cpu %':>10}{'rss MB':>10}")
+    result = asyncio.run(_run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(json.load(f), result)
+        print(f"\nvs {args.compare} (변화율 %, 지연은 음수가 개선)")
+        print(f"{'mix':<12}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'achieved':>10}")
+        for row in rows:
+            print(f"{row['mix']:<12}{row['target_rps']:>8g}{row['p50']!s:>9}{row['p95']!s:>9}"
+                  f"{row['p99']!s:>9}{row['achieved_rps']!s:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+로깅 경로 벤치마크 (호출 스레드 기준 기록당 비용)
+
+기존 경로: 기록마다 datetime 생성 + 텍스트 포맷 + stdout 동기 쓰기 (아래에 그대로 재현)
+새 경로: configure_logging (JSON 포맷터, 큐 + writer 스레드, 선택적 샘플링)
+
+요청 한 건이 남기는 INFO 기록 세 개(접근 로그, 전송 시작, 전송 성공)를 반복 기록하고
+호출 스레드가 logger.info()에서 보낸 시간을 측정. 출력은 /dev/null (writer 스레드가 비운 뒤 종료)
+--write-latency-us: 쓰기마다 지연을 넣어 느린 stdout(컨테이너 로그 드라이버 파이프가 찬 상태)을 재현
+
+    python -m benchmarks.bench_logging [--requests N] [--write-latency-us US] [--json PATH]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.core import logging_config
+from app.core.logging_config import configure_logging
+
+
+class SlowStream:
+    """쓰기마다 latency초 블로킹되는 출력 스트림 (GIL은 놓음)"""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class LegacyKSTFormatter(logging.Formatter):
+    """기존 _KSTFormatter (기록마다 tz-aware datetime 생성)"""
+
+    def formatTime(self, record, datefmt=None):
+        dt = datetime.fromtimestamp(record.created, tz=ZoneInfo("Asia/Seoul"))
+        return dt.strftime(datefmt) if datefmt else dt.isoformat(timespec="seconds")
+
+
+def _install_legacy(stream) -> None:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(LegacyKSTFormatter(
+        fmt="%(asctime)s %(levelname)s %(name)s [%(funcName)s:%(lineno)d] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S %z",
+    ))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+
+
+def _emit_request(request_logger, service_logger, index: int) -> None:
+    request_id = f"req-{index}"
+    request_logger.info(
+        "%s %s - %s", "POST", "/", 200,
+        extra={"request_id": request_id, "method": "POST", "path": "/", "status": 200, "elapsed_ms": 1.23},
+    )
+    service_logger.info(
+        "Sending message with model",
+        extra={"request_id": request_id, "model": "Edu10Request", "edu_type": 10, "business_priority": 1},
+    )
+    service_logger.info(
+        "Message sent successfully",
+        extra={"queue": "V3_RESPONSE_GENERATION", "priority": 1, "request_id": request_id, "edu_type": 10},
+    )
+
+
+def _measure(requests: int) -> float:
+    request_logger = logging.getLogger("request")
+    service_logger = logging.getLogger("app.services.message_service")
+    started = time.perf_counter()
+    for index in range(requests):
+        _emit_request(request_logger, service_logger, index)
+    return time.perf_counter() - started
+
+
+def run(requests: int, write_latency_us: float = 0.0) -> dict:
+    stream = open(os.devnull, "w")
+    if write_latency_us:
+        stream = SlowStream(stream, write_latency_us / 1e6)
+    modes = {
+        "legacy_sync_text": lambda: _install_legacy(stream),
+        "sync_json": lambda: configure_logging("INFO", "json", False, "", stream=stream),
+        "async_json": lambda: configure_logging("INFO", "json", True, "", requests * 3, stream=stream),
+        "async_json_sampled": lambda: configure_logging(
+            "INFO", "json", True, "request=0.1,app.services.message_service=0.1", requests * 3, stream=stream
+        ),
+    }
+    results = {}
+    for mode, install in modes.items():
+        logging.getLogger().handlers.clear()
+        install()
+        seconds = _measure(requests)
+        drain_started = time.perf_counter()
+        logging_config._stop_listener()
+        results[mode] = {
+            "us_per_request": round(seconds / requests * 1e6, 2),
+            "writer_drain_s": round(time.perf_counter() - drain_started, 3),
+        }
+    logging.getLogger().handlers.clear()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="기록할 요청 수 (요청당 INFO 3건)")
+    parser.add_argument("--write-latency-us", type=float, default=0.0, help="쓰기당 지연(µs), 느린 stdout 재현")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = run(args.requests, args.write_latency_us)
+    print(f"python={platform.python_version()} requests={args.requests} write_latency_us={args.write_latency_us}")
+    print(f"{'mode':<22}{'µs/req (caller)':>17}{'writer drain s':>16}")
+    for mode, row in results.items():
+        print(f"{mode:<22}{row['us_per_request']:>17}{row['writer_drain_s']:>16}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
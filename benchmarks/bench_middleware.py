@@ -0,0 +1,188 @@
+"""
+요청 ID/로깅 미들웨어 계층 벤치마크 (요청당 오버헤드)
+
+기존 경로: RequestIdMiddleware + RequestLoggingMiddleware (BaseHTTPMiddleware 두 계층, 아래에 그대로 재현)
+ASGI 경로: RequestContextMiddleware (순수 ASGI 한 계층)
+
+네트워크/서버 없이 같은 FastAPI 앱을 ASGI로 직접 호출하여 동시 요청(concurrency)을 반복 처리하고,
+미들웨어 없는 앱과의 차이를 요청당 오버헤드로 계산. 접근 로그는 /dev/null로 기록 (포맷 비용 포함)
+
+    python -m benchmarks.bench_middleware [--requests N] [--concurrency C] [--json PATH]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import time
+import uuid
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.core.codec import FastJSONResponse
+from app.middleware.request_context import RequestContextMiddleware
+
+
+class RequestIdMiddleware(BaseHTTPMiddleware):
+    """기존 요청 ID 미들웨어"""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class RequestLoggingMiddleware(BaseHTTPMiddleware):
+    """기존 요청/응답 로깅 미들웨어"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.logger = logging.getLogger("request")
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.perf_counter()
+        client_ip = request.client.host if request.client else None
+        fwd_for = request.headers.get("X-Forwarded-For")
+        real_ip = request.headers.get("X-Real-IP")
+        user_agent = request.headers.get("User-Agent")
+        referer = request.headers.get("Referer")
+        request_id = getattr(request.state, "request_id", "unknown")
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+            self.logger.info(
+                f"{request.method} {request.url.path} - {status_code}",
+                extra={
+                    "request_id": request_id,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "query": str(request.url.query),
+                    "status": status_code,
+                    "elapsed_ms": round(elapsed_ms, 2),
+                    "client_ip": client_ip,
+                    "x_forwarded_for": fwd_for,
+                    "x_real_ip": real_ip,
+                    "user_agent": user_agent,
+                    "referer": referer,
+                },
+            )
+        return response
+
+
+def make_app(stack: str) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.post("/")
+    async def accept(request: Request):
+        return {"message": "success", "status": 200, "request_id": getattr(request.state, "request_id", None)}
+
+    if stack == "base_http":
+        # 기존 create_app과 같은 등록 순서
+        app.add_middleware(RequestIdMiddleware)
+        app.add_middleware(RequestLoggingMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+STACKS = ("none", "base_http", "asgi")
+BODY = json.dumps({"edu_key": 1, "edu_type": 9, "member_key": 1}).encode()
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "POST",
+    "scheme": "http",
+    "path": "/",
+    "raw_path": b"/",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [
+        (b"host", b"gateway"),
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(BODY)).encode()),
+        (b"user-agent", b"bench"),
+        (b"x-forwarded-for", b"203.0.113.10"),
+    ],
+    "client": ("127.0.0.1", 50000),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+async def _call(app) -> int:
+    status = 0
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            await asyncio.sleep(3600)  # 연결 종료 대기 (응답 완료 후에는 호출되지 않음)
+        sent = True
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(dict(SCOPE, state={}), receive, send)
+    return status
+
+
+async def _run(app, requests: int, concurrency: int) -> float:
+    """동시 요청 concurrency개씩 requests건 처리에 걸린 시간(초)"""
+    await asyncio.gather(*(_call(app) for _ in range(concurrency)))  # 워밍업
+    started = time.perf_counter()
+    for _ in range(requests // concurrency):
+        statuses = await asyncio.gather(*(_call(app) for _ in range(concurrency)))
+        assert set(statuses) == {200}
+    return time.perf_counter() - started
+
+
+def run(requests: int, concurrency: int, repeat: int = 3) -> dict:
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    request_logger = logging.getLogger("request")
+    request_logger.addHandler(handler)
+    request_logger.setLevel(logging.INFO)
+    request_logger.propagate = False
+
+    results = {}
+    for stack in STACKS:
+        app = make_app(stack)
+        seconds = min(asyncio.run(_run(app, requests, concurrency)) for _ in range(repeat))
+        results[stack] = {
+            "rps": round(requests / seconds),
+            "us_per_request": round(seconds / requests * 1e6, 1),
+        }
+    for stack in ("base_http", "asgi"):
+        results[stack]["overhead_us"] = round(results[stack]["us_per_request"] - results["none"]["us_per_request"], 1)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=100, help="동시 요청 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = run(args.requests, args.concurrency)
+    print(f"python={platform.python_version()} requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'middleware':<12}{'req/s':>10}{'µs/req':>10}{'overhead µs':>14}")
+    for stack, row in results.items():
+        print(f"{stack:<12}{row['rps']:>10}{row['us_per_request']:>10}{row.get('overhead_us', ''):>14}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
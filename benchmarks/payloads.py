@@ -0,0 +1,111 @@
+"""
+벤치마크용 교육 타입별 요청 payload
+실제 요청과 비슷한 필드 구성과 크기를 재현 (대화 기록/메모리 목록 길이 등)
+"""
+from typing import Any, Dict, List
+
+
+def _turns(count: int, text: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "role": "user" if i % 2 else "assistant",
+            "content": f"{text} ({i})",
+            "turn": i,
+            "created_at": f"2025-01-01T09:{i % 60:02d}:00+09:00",
+        }
+        for i in range(count)
+    ]
+
+
+def _base(edu_type: int) -> Dict[str, Any]:
+    return {
+        "edu_key": 10231,
+        "edu_type": edu_type,
+        "member_key": 55012,
+        "company_key": 12,
+        "enterprise_key": 3,
+        "returnUrl": "https://api.example.com/sokind/callback",
+    }
+
+
+UTTERANCE = "고객님, 요청하신 상품은 현재 재고가 있으며 오늘 주문하시면 내일 도착합니다"
+
+
+def _v3(generation_type: str, history: int, memories: int, references: int) -> Dict[str, Any]:
+    return {
+        **_base(10),
+        "generation_type": generation_type,
+        "situation": "매장에서 환불을 요청하는 고객 응대",
+        "customer_data": {"name": "김고객", "age": 42, "persona": "꼼꼼하고 단호함", "tags": ["VIP", "재방문"]},
+        "chat_history_key": "ch-20250101-0001",
+        "title": "환불 요청 응대",
+        "user_role": "매장 직원",
+        "round_key": "rk-0001",
+        "edu_play_type": "PRACTICE",
+        "reference_data_list": [{"key": f"ref-{i}", "content": UTTERANCE * 2} for i in range(references)],
+        "previous_chat_history_data_list": _turns(history, UTTERANCE),
+        "memory_data_list": [{"key": f"mem-{i}", "summary": UTTERANCE} for i in range(memories)],
+        "mission_data_list": [{"mission": f"미션 {i}", "achieved": bool(i % 2)} for i in range(5)],
+        "evaluation_item_data": {"items": [{"name": f"항목 {i}", "weight": 0.1 * i} for i in range(10)]},
+        "user_answer_text": UTTERANCE if generation_type == "QUESTION" else None,
+    }
+
+
+PAYLOADS: Dict[str, Dict[str, Any]] = {
+    "1": {
+        **_base(1),
+        "round": 2,
+        "user_video_url": "https://cdn.example.com/video/55012/2.mp4",
+        "user_audio_url": "https://cdn.example.com/audio/55012/2.wav",
+        "script": UTTERANCE * 10,
+        "transcribed_script": UTTERANCE * 10,
+        "face_cut_time": [i * 0.5 for i in range(60)],
+        "disallowed_lst": ["반말", "비속어"],
+    },
+    "2": {
+        **_base(2),
+        "blank_script": UTTERANCE * 5,
+        "answerArr": [{"index": i, "answer": f"정답 {i}", "score": 1} for i in range(20)],
+    },
+    "3": {**_base(3), "script": UTTERANCE * 5, "user_audio_url": "https://cdn.example.com/audio/3.wav"},
+    "4": {
+        **_base(4),
+        "admin_type": 1,
+        "main_gender": 2,
+        "user_audio_url": "https://cdn.example.com/audio/4.wav",
+        "user_audio_url_sub": "https://cdn.example.com/audio/4-sub.wav",
+        "script": UTTERANCE * 3,
+    },
+    "5": {**_base(5), "arr_keyword": [f"키워드{i}" for i in range(30)], "script": UTTERANCE * 3},
+    "6": {
+        **_base(6),
+        "chat_list": _turns(20, UTTERANCE),
+        "edu_contents": {"title": "매장 응대", "steps": [f"단계 {i}" for i in range(10)]},
+        "chat_round": 20,
+        "use_feed_list": ["tone", "accuracy"],
+    },
+    "7": {
+        **_base(7),
+        "request_type": 1,
+        "edu_title": "가상 고객 응대",
+        "intro": _turns(3, UTTERANCE),
+        "mission": {"goal": "환불 대신 교환 유도", "hints": [UTTERANCE] * 3},
+        "interaction": {"mode": "voice", "max_turns": 20},
+        "intent_history": _turns(15, UTTERANCE),
+        "question_history": _turns(15, UTTERANCE),
+        "sp_summary": UTTERANCE,
+        "member_name": "홍길동",
+    },
+    "8": {
+        **_base(8),
+        "request_type": 3,
+        "intro": _turns(3, UTTERANCE),
+        "audio_analysis": {"pitch": [0.1 * i for i in range(100)], "speed": 1.1},
+        "intent_history": _turns(10, UTTERANCE),
+        "language": 2,
+    },
+    "9": {**_base(9), "period_report_data_url": "https://cdn.example.com/reports/2025-01.json"},
+    "10-AUGMENTATION": {**_v3("AUGMENTATION", 0, 0, 5), "customer_key": "cust-0001"},
+    "10-QUESTION": _v3("QUESTION", 30, 20, 10),
+    "10-REPORT": _v3("REPORT", 120, 60, 20),
+}
@@ -0,0 +1,10 @@
+"""
+gunicorn 서버 훅 (start.sh에서 --config로 지정, 나머지 옵션은 start.sh 명령행 인자)
+"""
+
+
+def child_exit(server, worker):
+    """종료된 워커의 Prometheus live* 게이지 mmap 파일 제거 (재시작된 워커 값이 합산되지 않도록)"""
+    from app.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
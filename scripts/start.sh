@@ -34,11 +34,17 @@ echo "  AWS_REGION: ${AWS_REGION}"
 # 로그 디렉토리 생성
 mkdir -p /var/log/cdl-gateway
 
+# Prometheus 워커 간 메트릭 집계 디렉토리 (prometheus_client import 전에 지정, 이전 실행의 mmap 파일 제거)
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/cdl-gateway-metrics}
+rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+
 # Gunicorn 서버 시작 (로그는 stdout/stderr로 출력)
 echo "🚀 Starting Gunicorn server..."
 # 컨테이너 로컬 타임존을 KST로 설정 (로그 타임스탬프 일관성)
 export TZ=Asia/Seoul
 exec uv run gunicorn app.main:app \
+    --config ./scripts/gunicorn.conf.py \
     --bind 0.0.0.0:8000 \
     --workers ${GUNICORN_WORKERS:-5} \
     --worker-class uvicorn.workers.UvicornWorker \
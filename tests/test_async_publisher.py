@@ -0,0 +1,138 @@
+"""비동기 RabbitMQ publisher 테스트 (브로커 없이 가짜 채널 사용)"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import aio_pika
+import pytest
+from aiormq import spec
+from aiormq.abc import DeliveredMessage
+
+from app.core.config import settings
+from app.services.async_rabbitmq import (
+    AsyncRabbitMQClusterClient,
+    PublishNackError,
+    QueueNotFoundError,
+)
+from app.services.topology import QueueTopologyCache, get_queue_topology_cache
+
+NODES = [
+    {"host": "127.0.0.1", "port": port, "user": "guest", "password": "guest"}
+    for port in (5672, 5673, 5674)
+]
+
+
+class _FakeExchange:
+    """publish마다 테스트가 제어하는 confirm future를 돌려주는 익스체인지"""
+
+    def __init__(self):
+        self.pending = []
+
+    async def publish(self, message, routing_key, mandatory=True, timeout=None):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((routing_key, message, future))
+        return await future
+
+
+class _FakeChannel:
+    def __init__(self):
+        self.is_closed = False
+        self.default_exchange = _FakeExchange()
+
+
+class _FakeConnection:
+    is_closed = False
+
+
+@pytest.fixture
+def client(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_confirm_window", 2)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_publisher_confirms", True)
+
+    client = AsyncRabbitMQClusterClient()
+    client.connection = _FakeConnection()
+    client.channel = _FakeChannel()
+    return client
+
+
+async def test_confirm_window_bounds_outstanding_publishes(client):
+    """윈도우 크기를 넘는 publish는 ack가 돌아올 때까지 대기"""
+    exchange = client.channel.default_exchange
+    tasks = [
+        asyncio.create_task(client.send_message("", "q", {"n": i}, retry_count=0))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    assert len(exchange.pending) == 2
+    assert client.confirm_stats["in_flight"] == 2
+
+    # multiple ack처럼 대기 중인 confirm을 한 번에 완료
+    for _, _, future in exchange.pending:
+        future.set_result(None)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert len(exchange.pending) == 3
+    exchange.pending[2][2].set_result(None)
+
+    assert await asyncio.gather(*tasks) == [True, True, True]
+    assert client.confirm_stats["acked"] == 3
+    assert client.confirm_stats["max_in_flight"] == 2
+
+
+async def test_nack_is_surfaced_to_caller(client):
+    """Basic.Nack는 재시도 없이 호출자에게 예외로 전달"""
+    exchange = client.channel.default_exchange
+    task = asyncio.create_task(client.send_message("", "q", {"n": 1}, retry_count=0))
+    await asyncio.sleep(0)
+
+    nack = aio_pika.exceptions.DeliveryError(None, spec.Basic.Nack(delivery_tag=1))
+    exchange.pending[0][2].set_exception(nack)
+
+    with pytest.raises(PublishNackError):
+        await task
+    assert client.confirm_stats["nacked"] == 1
+    assert client.confirm_stats["in_flight"] == 0
+
+
+async def test_returned_message_invalidates_topology_cache(client):
+    """NO_ROUTE로 반환된 메시지는 캐시 무효화 후 QueueNotFoundError로 전달"""
+    cache = get_queue_topology_cache()
+    cache.mark_declared("missing")
+    exchange = client.channel.default_exchange
+    task = asyncio.create_task(client.send_message("", "missing", {"n": 1}, retry_count=0))
+    await asyncio.sleep(0)
+
+    frame = spec.Basic.Return(reply_code=312, reply_text="NO_ROUTE", routing_key="missing")
+    delivered = DeliveredMessage(delivery=frame, header=None, body=b"", channel=None)
+    returned = aio_pika.exceptions.PublishError(delivered, frame)
+    exchange.pending[0][2].set_exception(returned)
+
+    with pytest.raises(QueueNotFoundError):
+        await task
+    assert not cache.is_known("missing")
+
+
+def test_topology_cache_expires_after_ttl():
+    cache = QueueTopologyCache(ttl=0)
+    cache.mark_declared("q")
+
+    assert not cache.is_known("q")
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_topology_cache_counts_lookups_from_many_threads():
+    cache = QueueTopologyCache(ttl=3600)
+    cache.mark_declared("q")
+
+    def lookup(_):
+        for queue in ("q", "missing") * 500:
+            cache.is_known(queue)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lookup, range(8)))
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (4000, 4000)
@@ -0,0 +1,172 @@
+"""비동기 클러스터 클라이언트 테스트 (실제 aio-pika로 로컬 브로커 대역에 연결, confirm, 노드 failover, 시작 단계 선언)"""
+import asyncio
+import os
+import socket
+
+import pytest
+
+from app.core.config import settings
+from app.main import create_app
+from app.services import cluster_nodes, topology
+from app.services.async_rabbitmq import AsyncRabbitMQClusterClient, QueueNotFoundError, close_async_rabbitmq_client
+from app.services.cluster_nodes import ClusterNodeRegistry
+from benchmarks.amqp_stub import StubBroker
+
+
+def _closed_port() -> int:
+    """연결을 거부하는 포트 (바인드 후 바로 닫음)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+async def cluster(monkeypatch):
+    """노드 1: 다운, 노드 2/3: 브로커 대역"""
+    broker = await StubBroker(ports=(0, 0)).start()
+    ports = [_closed_port(), *broker.ports]
+    nodes = [{"host": "127.0.0.1", "port": port, "user": "guest", "password": "guest"} for port in ports]
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: nodes)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_publisher_confirms", True)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_leader_aware", False)
+    registry = ClusterNodeRegistry()
+    monkeypatch.setattr(cluster_nodes, "_registry_instance", registry)
+    monkeypatch.setattr(cluster_nodes, "_registry_pid", os.getpid())
+    client = AsyncRabbitMQClusterClient()
+    yield client, broker, registry
+    await client.close()
+    await broker.stop()
+
+
+async def test_connects_past_down_node(cluster):
+    client, broker, registry = cluster
+    down = client.node_keys[0]
+    # 다운 노드를 첫 순위로 두어 반드시 시도하게 함
+    registry.record_rtt(down, 0.001)
+    for key in client.node_keys[1:]:
+        registry.record_rtt(key, 0.5)
+
+    assert await client.connect()
+
+    assert client._connected_node_key != down
+    assert registry.breaker(down).failures == 1
+    assert broker.stats["connections"] == 1
+
+
+async def test_send_waits_for_broker_confirm(cluster):
+    client, broker, _ = cluster
+    assert await client.declare_queue("sokind")
+
+    assert await client.send_message("", "sokind", {"n": 1}, retry_count=0)
+
+    assert client.confirm_stats["acked"] == 1
+    assert client.confirm_stats["in_flight"] == 0
+    assert broker.get_stats()["queues"]["sokind"]["messages"] == 1
+
+
+
+async def test_tracks_broker_blocked_notifications(cluster):
+    client, broker, _ = cluster
+    assert await client.connect()
+    assert client.is_blocked() is False
+
+    broker.set_blocked("low on memory")
+    for _ in range(50):
+        if client.is_blocked():
+            break
+        await asyncio.sleep(0.01)
+    assert client.is_blocked() is True
+
+    broker.set_blocked(None)
+    for _ in range(50):
+        if not client.is_blocked():
+            break
+        await asyncio.sleep(0.01)
+    assert client.is_blocked() is False
+
+async def test_fails_over_when_connected_node_is_lost(cluster):
+    client, broker, registry = cluster
+    assert await client.declare_queue("sokind")
+    first = client._connected_node_key
+    # 연결된 노드가 죽은 상황: 연결이 끊기고 회로 차단기가 열림
+    await client.connection.close()
+    breaker = registry.breaker(first)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    assert await client.send_message("", "sokind", {"n": 2}, retry_count=1)
+
+    assert client._connected_node_key not in (first, client.node_keys[0])
+    assert broker.get_stats()["queues"]["sokind"]["messages"] == 1
+
+
+async def test_send_batch_confirms_together(cluster):
+    client, broker, _ = cluster
+    assert await client.declare_queue("sokind")
+    messages = [(b'{"n": %d}' % n, 0, None, None) for n in range(5)]
+
+    assert await client.send_batch("", "sokind", messages) == [True] * 5
+    [returned] = await client.send_batch("", "missing", messages[:1], retry_count=0)
+
+    assert isinstance(returned, QueueNotFoundError)
+    assert client.confirm_stats["acked"] == 5
+    assert client.confirm_stats["max_in_flight"] == 5
+    stats = broker.get_stats()
+    assert stats["connections"] == 1
+    assert stats["queues"]["sokind"]["messages"] == 5 and stats["unroutable"] == 1
+
+
+@pytest.fixture
+def startup(monkeypatch):
+    """시작 단계 큐 선언용 설정 (노드 목록은 테스트에서 지정)"""
+    nodes = []
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: nodes)
+    for name, value in {
+        "rabbitmq_health_probe_enabled": False, "rabbitmq_leader_aware": False,
+        "spool_enabled": False, "rabbitmq_declare_retry_interval": 0.05,
+    }.items():
+        monkeypatch.setattr(settings._settings_instance, name, value)
+    monkeypatch.setattr(cluster_nodes, "_registry_instance", ClusterNodeRegistry())
+    monkeypatch.setattr(cluster_nodes, "_registry_pid", os.getpid())
+    monkeypatch.setattr(topology, "_topology_cache_instance", None)
+    return nodes
+
+
+async def test_startup_declare_retries_while_broker_unreachable(startup):
+    ports = [_closed_port() for _ in range(3)]
+    startup.extend({"host": "127.0.0.1", "port": port, "user": "guest", "password": "guest"} for port in ports)
+    app = create_app()
+    broker = None
+    try:
+        async with app.router.lifespan_context(app):
+            # 브로커에 닿지 않아도 워커는 기동하되 not ready
+            assert app.state.ready is False
+            broker = await StubBroker(ports=ports).start()
+            for _ in range(100):
+                if app.state.ready:
+                    break
+                await asyncio.sleep(0.02)
+            assert app.state.ready is True
+    finally:
+        await close_async_rabbitmq_client()
+        if broker is not None:
+            await broker.stop()
+
+    assert settings.default_queue in broker.queues
+
+
+async def test_startup_declare_conflict_is_fatal(startup):
+    broker = await StubBroker(ports=(0, 0, 0)).start()
+    startup.extend({"host": "127.0.0.1", "port": port, "user": "guest", "password": "guest"} for port in broker.ports)
+    # 같은 이름의 큐가 다른 인자로 이미 존재
+    broker.queues[settings.default_queue] = {"x-queue-type": "classic"}
+    app = create_app()
+    try:
+        with pytest.raises(topology.TopologyConflictError):
+            async with app.router.lifespan_context(app):
+                pass
+    finally:
+        await close_async_rabbitmq_client()
+        await broker.stop()
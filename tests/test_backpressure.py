@@ -0,0 +1,95 @@
+"""publish 입장 제어(load shedding) 테스트"""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.models.requests import SokindRequest
+from app.services.backpressure import LoadShedError, PublishAdmissionController
+from app.services.message_service import MessageService
+
+
+def _controller(blocked=lambda: False, **kwargs):
+    options = {
+        "max_pending": 10, "medium_threshold": 0.8, "low_threshold": 0.5,
+        "latency_threshold_ms": 1000.0, "retry_after": 7,
+    }
+    options.update(kwargs)
+    return PublishAdmissionController(blocked_probe=blocked, **options)
+
+
+async def _hold(controller, priority, count, release):
+    """count개의 publish 슬롯을 release가 설정될 때까지 점유"""
+    started = asyncio.Event()
+
+    async def hold():
+        async with controller.admit(priority):
+            if controller.pending == count:
+                started.set()
+            await release.wait()
+
+    holders = [asyncio.create_task(hold()) for _ in range(count)]
+    await started.wait()
+    return holders
+
+
+async def test_low_priority_is_shed_first_when_saturating():
+    controller = _controller()
+    release = asyncio.Event()
+    holders = await _hold(controller, settings.priority_high, 5, release)
+
+    with pytest.raises(LoadShedError) as exc_info:
+        async with controller.admit(settings.priority_low):
+            pass
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after == 7
+
+    # 중간/높은 우선순위는 아직 한도 안
+    async with controller.admit(settings.priority_medium):
+        pass
+    async with controller.admit(settings.priority_high):
+        pass
+
+    release.set()
+    await asyncio.gather(*holders)
+    assert controller.pending == 0
+    assert controller.get_stats()["shed"] == {"high": 0, "medium": 0, "low": 1}
+
+
+async def test_blocked_connection_admits_only_high_priority():
+    blocked = [True]
+    controller = _controller(blocked=lambda: blocked[0])
+
+    for priority in (settings.priority_low, settings.priority_medium):
+        with pytest.raises(LoadShedError) as exc_info:
+            async with controller.admit(priority):
+                pass
+        assert exc_info.value.status_code == 503
+
+    async with controller.admit(settings.priority_high):
+        pass
+
+    blocked[0] = False
+    async with controller.admit(settings.priority_low):
+        pass
+    assert controller.get_stats()["blocked_transitions"] == 1
+
+
+async def test_high_publish_latency_sheds_low_priority():
+    controller = _controller(latency_threshold_ms=1.0)
+    async with controller.admit(settings.priority_high):
+        await asyncio.sleep(0.01)
+
+    assert controller.get_stats()["degraded"] is True
+    with pytest.raises(LoadShedError) as exc_info:
+        async with controller.admit(settings.priority_low):
+            pass
+    assert exc_info.value.status_code == 503
+
+
+@pytest.mark.parametrize("edu_type", [4, 9])
+def test_listen_and_repeat_and_periodic_report_are_low_tier(edu_type):
+    model = SokindRequest(edu_key=1, edu_type=edu_type, member_key=1, company_key=1).to_specialized_model()
+    priority = MessageService().get_priority_for_model(model)
+
+    assert PublishAdmissionController.tier_for_priority(priority) == "low"
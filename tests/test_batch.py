@@ -0,0 +1,105 @@
+"""배치 수집 엔드포인트 테스트"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_app
+from app.services import message_service
+from app.services.backpressure import LoadShedError
+
+ITEMS = [
+    {"edu_key": 1, "edu_type": 9, "member_key": 1, "period_report_data_url": "https://x/1.json"},
+    {"edu_key": 2, "edu_type": 9},
+    {"edu_key": 3, "edu_type": 10, "member_key": 3, "generation_type": "REPORT"},
+]
+
+
+class _Client:
+    async def queue_exists(self, queue_name):
+        return True
+
+
+class _Batcher:
+    """submit 호출을 기록하는 가짜 배칭 단계"""
+
+    def __init__(self, shed_queue=None):
+        self.submitted = []
+        self.shed_queue = shed_queue
+
+    async def submit(self, queue, body, priority=0, deadline=None):
+        if queue == self.shed_queue:
+            raise LoadShedError("Publish queue saturated", 429, 5)
+        self.submitted.append((queue, json.loads(body)))
+        return True
+
+
+@pytest.fixture
+def batcher(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "publish_batching_enabled", False)
+    monkeypatch.setattr(settings._settings_instance, "spool_enabled", False)
+    fake = _Batcher()
+    monkeypatch.setattr(message_service, "get_async_rabbitmq_client", lambda lane="real_time": _Client())
+    monkeypatch.setattr(message_service, "get_publish_batcher", lambda lane="real_time": fake)
+    return fake
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+def test_json_array_returns_per_item_results(client, batcher):
+    response = client.post("/batch", json=ITEMS, headers={"X-Request-ID": "batch-1"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["total"], data["accepted"], data["failed"], data["message"]) == (3, 2, 1, "partial")
+    assert [item["status"] for item in data["items"]] == [200, 422, 200]
+    assert data["items"][0]["request_id"] == "batch-1-0"
+    assert data["items"][0]["queue"] == "periodic_report"
+    assert data["items"][1]["message"] == "member_key Field required"
+    assert data["items"][2]["queue"] == "V3_CONVERSATION_ANALYSIS_REPORT"
+    # PUBLISH_BATCHING_ENABLED=false여도 배칭 단계로 전송
+    assert [queue for queue, _ in batcher.submitted] == ["periodic_report", "V3_CONVERSATION_ANALYSIS_REPORT"]
+    assert batcher.submitted[0][1]["request_id"] == "batch-1-0"
+
+
+def test_ndjson_stream_isolates_bad_lines(client, batcher):
+    body = b"\n".join([json.dumps(ITEMS[0]).encode(), b"{broken", b"", json.dumps(ITEMS[2]).encode()])
+
+    response = client.post("/batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    data = response.json()
+    assert [item["status"] for item in data["items"]] == [200, 422, 200]
+    assert data["items"][1]["message"].startswith("body JSON decode error")
+
+
+def test_load_shed_items_report_retry_after(client, batcher):
+    batcher.shed_queue = "periodic_report"
+
+    response = client.post("/batch", json=[ITEMS[0], ITEMS[2]])
+
+    assert response.headers["Retry-After"] == "5"
+    assert [item["status"] for item in response.json()["items"]] == [429, 200]
+
+
+def test_limits_return_413(client, batcher, monkeypatch):
+    monkeypatch.setattr(settings._settings_instance, "batch_max_items", 2)
+    response = client.post("/batch", json=ITEMS)
+    assert response.status_code == 413
+    assert response.json()["message"] == "Batch has 3 items (limit 2)"
+
+    monkeypatch.setattr(settings._settings_instance, "batch_max_bytes", 10)
+    response = client.post("/batch", json=ITEMS[:1])
+    assert response.status_code == 413
+    assert not batcher.submitted
+
+
+def test_non_array_body_is_rejected(client, batcher):
+    response = client.post("/batch", json=ITEMS[0])
+
+    assert response.status_code == 422
+    assert response.json()["message"] == "body Input should be a valid list"
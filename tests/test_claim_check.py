@@ -0,0 +1,101 @@
+"""claim-check 단계와 blob 저장소 테스트"""
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import codec
+from app.core.config import settings
+from app.services import claim_check
+from app.services.blob_store import LocalBlobStore, S3BlobStore
+from app.services.claim_check import ClaimCheckIntegrityError, offload, offload_async, resolve
+
+BODY = {
+    "edu_type": 10,
+    "edu_key": 7,
+    "member_key": 3,
+    "generation_type": "REPORT",
+    "request_id": "req-1",
+    "memory_data_list": ["기억 데이터 " * 20] * 50,
+}
+DATA = codec.dumps(BODY)
+MODEL = SimpleNamespace(edu_type=10, edu_key=7, member_key=3, generation_type="REPORT")
+EXTRA = {"request_id": "req-1"}
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "claim_check_enabled", True)
+    monkeypatch.setattr(settings._settings_instance, "claim_check_threshold", 4096)
+    monkeypatch.setattr(claim_check, "_stats", dict.fromkeys(claim_check._stats, 0))
+
+
+def test_small_body_is_published_inline(enabled, tmp_path):
+    assert offload(b'{"edu_type": 1}', "sokind", MODEL, EXTRA, LocalBlobStore(str(tmp_path))) is None
+
+
+async def test_large_body_is_replaced_by_pointer(enabled, tmp_path):
+    store = LocalBlobStore(str(tmp_path), fsync=False)
+
+    pointer = codec.loads(await offload_async(DATA, "V3_CONVERSATION_ANALYSIS_REPORT", MODEL, EXTRA, store))
+
+    assert pointer["edu_type"] == 10
+    assert pointer["request_id"] == "req-1"
+    assert "memory_data_list" not in pointer
+    assert pointer["claim_check"]["uri"].startswith(f"file://{tmp_path}")
+    assert pointer["claim_check"]["size"] > 4096
+    assert resolve(pointer, store) == BODY
+    assert claim_check.get_claim_check_stats()["offloaded"] == 1
+
+
+def test_resolve_detects_tampered_payload(enabled, tmp_path):
+    store = LocalBlobStore(str(tmp_path), fsync=False)
+    pointer = codec.loads(offload(DATA, "q", MODEL, EXTRA, store))
+    path = pointer["claim_check"]["uri"][len("file://"):]
+    with open(path, "ab") as f:
+        f.write(b" ")
+
+    with pytest.raises(ClaimCheckIntegrityError):
+        resolve(pointer, store)
+
+
+def test_local_store_rejects_uri_outside_root(tmp_path):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    with pytest.raises(ValueError):
+        store.get(f"file://{tmp_path}/secret")
+
+
+def test_store_failure_falls_back_to_inline(enabled):
+    class _BrokenStore(LocalBlobStore):
+        def put(self, key, data, content_type="application/json"):
+            raise OSError("disk full")
+
+    assert offload(DATA, "q", MODEL, EXTRA, _BrokenStore("/nonexistent")) is None
+    assert claim_check.get_claim_check_stats()["failures"] == 1
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+def test_s3_store_round_trip(enabled):
+    s3 = _FakeS3()
+    store = S3BlobStore(bucket="blobs", prefix="gw", client=s3)
+
+    pointer = codec.loads(offload(DATA, "q", MODEL, EXTRA, store))
+
+    assert pointer["claim_check"]["uri"].startswith("s3://blobs/gw/")
+    assert resolve(pointer, store) == BODY
+    store.delete(pointer["claim_check"]["uri"])
+    assert not s3.objects
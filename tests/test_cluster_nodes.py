@@ -0,0 +1,163 @@
+"""노드 선택(RTT EWMA, 연결 분산, 리더 인지) 테스트"""
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services import cluster_nodes
+from app.services.async_rabbitmq import AsyncRabbitMQClusterClient
+from app.services.cluster_nodes import MAX_FAILURE_PENALTY, ClusterNodeRegistry
+from app.services.deadline import Deadline
+
+KEYS = ["mq:5671", "mq:5672", "mq:5673"]
+NODES = [
+    {"host": "mq", "port": port, "user": "guest", "password": "guest"}
+    for port in (5671, 5672, 5673)
+]
+
+
+def test_prefers_node_with_lowest_rtt():
+    registry = ClusterNodeRegistry(alpha=0.5)
+    registry.record_rtt("mq:5671", 0.030)
+    registry.record_rtt("mq:5672", 0.002)
+    registry.record_rtt("mq:5673", 0.010)
+
+    assert registry.rank_nodes(KEYS) == [1, 2, 0]
+
+
+def test_spreads_connections_across_equal_nodes():
+    registry = ClusterNodeRegistry()
+    chosen = []
+    for _ in range(3):
+        index = registry.rank_nodes(KEYS)[0]
+        registry.connection_opened(KEYS[index])
+        chosen.append(index)
+
+    assert sorted(chosen) == [0, 1, 2]
+    # 워커마다 시작 노드가 다르도록 PID 기준 회전
+    assert chosen[0] == os.getpid() % len(KEYS)
+
+
+def test_failure_demotes_node():
+    registry = ClusterNodeRegistry()
+    for key in KEYS:
+        registry.record_rtt(key, 0.005)
+    registry.record_failure("mq:5671")
+
+    assert registry.rank_nodes(KEYS)[-1] == 0
+
+
+def test_failure_penalty_is_bounded_and_cleared_on_success():
+    registry = ClusterNodeRegistry()
+    registry.record_rtt("mq:5671", 0.002)
+    for key in KEYS[1:]:
+        registry.record_rtt(key, 0.005)
+    for _ in range(8):
+        registry.record_failure("mq:5671")
+
+    node = registry.get_stats()["nodes"]["mq:5671"]
+    assert node["rtt_ewma_ms"] == 2.0
+    assert node["failure_penalty"] == MAX_FAILURE_PENALTY
+    assert registry.rank_nodes(KEYS)[-1] == 0
+
+    # 다시 연결되면 벌점이 해제되어 측정된 RTT대로 가장 먼저 선택
+    registry.record_success("mq:5671")
+    assert registry.rank_nodes(KEYS)[0] == 0
+
+
+class _FakeExchange:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, message, routing_key, mandatory=True, timeout=None):
+        self.published.append(routing_key)
+
+
+class _FakeChannel:
+    def __init__(self):
+        self.is_closed = False
+        self.default_exchange = _FakeExchange()
+
+
+class _FakeConnection:
+    is_closed = False
+
+    async def close(self):
+        self.is_closed = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ClusterNodeRegistry()
+    monkeypatch.setattr(cluster_nodes, "_registry_instance", registry)
+    monkeypatch.setattr(cluster_nodes, "_registry_pid", os.getpid())
+    return registry
+
+
+async def test_leader_aware_publish_uses_leader_node(monkeypatch, registry):
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_leader_aware", True)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_publisher_confirms", True)
+
+    client = AsyncRabbitMQClusterClient()
+    client.connection = _FakeConnection()
+    client.channel = _FakeChannel()
+    leader_channel = _FakeChannel()
+
+    async def open_connection(node, timeout=None):
+        return _FakeConnection()
+
+    async def open_channel(connection):
+        return leader_channel
+
+    monkeypatch.setattr(client, "_open_connection", open_connection)
+    monkeypatch.setattr(client, "_open_channel", open_channel)
+    registry.set_queue_leaders({"report": "mq:5673"})
+
+    assert await client.send_message("", "report", {"n": 1}, retry_count=0)
+    assert await client.send_message("", "sokind", {"n": 2}, retry_count=0)
+
+    assert leader_channel.default_exchange.published == ["report"]
+    assert client.channel.default_exchange.published == ["sokind"]
+    stats = registry.get_stats()["nodes"]
+    assert stats["mq:5673"]["connections"] == 1
+    assert stats["mq:5673"]["samples"] == 1
+    assert stats["mq:5671"]["samples"] == 1
+
+    await client.close()
+    assert registry.get_stats()["nodes"]["mq:5673"]["connections"] == 0
+
+
+async def test_leader_connect_stays_within_publish_deadline(monkeypatch, registry):
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_leader_aware", True)
+
+    client = AsyncRabbitMQClusterClient()
+    client.connection = _FakeConnection()
+    client.channel = _FakeChannel()
+    timeouts = []
+
+    async def open_connection(node, timeout=None):
+        timeouts.append(timeout)
+        return _FakeConnection()
+
+    async def open_channel(connection):
+        return _FakeChannel()
+
+    monkeypatch.setattr(client, "_open_connection", open_connection)
+    monkeypatch.setattr(client, "_open_channel", open_channel)
+    registry.set_queue_leaders({"report": "mq:5673"})
+
+    # 다른 코루틴이 연결 락을 잡고 있으면 예산만큼만 기다리고 주 연결로 fallback
+    await client._connect_lock.acquire()
+    node_index, channel = await client._select_channel("report", Deadline(0.05))
+    client._connect_lock.release()
+    assert channel is client.channel
+    assert timeouts == []
+
+    # 연결 시도 제한 시간은 남은 예산으로 절단
+    node_index, channel = await client._select_channel("report", Deadline(0.5))
+    assert client.node_keys[node_index] == "mq:5673"
+    assert timeouts[0] <= 0.5
@@ -0,0 +1,57 @@
+"""JSON 코덱 테스트"""
+import json
+
+import pytest
+
+from app.core import codec
+from app.core.codec import FastJSONResponse, model_to_bytes
+from app.core.config import settings
+from app.models.requests import SokindRequest
+
+EXTRA = {"request_id": "req-1", "client_ip": "203.0.113.10"}
+
+MODELS = [
+    SokindRequest(
+        edu_key=1, edu_type=edu_type, member_key=2, generation_type=generation_type,
+        script="고객님 안녕하세요", chat_list=[{"role": "user", "content": "환불해 주세요"}],
+        face_cut_time=[0.5, 1.25],
+    ).to_specialized_model()
+    for edu_type, generation_type in [(t, None) for t in range(1, 10)] + [
+        (10, "AUGMENTATION"), (10, "QUESTION"), (10, "REPORT"),
+    ]
+]
+
+
+def _legacy(model) -> bytes:
+    body = model.dict()
+    body.update(EXTRA)
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda m: type(m).__name__)
+@pytest.mark.parametrize("name", ["auto", "pydantic", "json"])
+def test_model_to_bytes_matches_legacy_body(monkeypatch, model, name):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "json_codec", name)
+
+    data = model_to_bytes(model, EXTRA)
+
+    assert json.loads(data) == json.loads(_legacy(model))
+    assert list(json.loads(data)) == list(json.loads(_legacy(model)))
+    if name == "json":
+        assert data == _legacy(model)
+
+
+def test_extra_overriding_model_field_keeps_single_key():
+    model = MODELS[0]
+    data = model_to_bytes(model, {"edu_key": 99})
+
+    assert data.count(b'"edu_key"') == 1
+    assert json.loads(data)["edu_key"] == 99
+
+
+def test_response_renders_utf8_without_escaping():
+    response = FastJSONResponse(content={"message": "성공", "status": 200})
+
+    assert "성공".encode("utf-8") in response.body
+    assert codec.loads(response.body) == {"message": "성공", "status": 200}
@@ -0,0 +1,107 @@
+"""메시지 본문 압축 테스트"""
+import json
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services import compression
+from app.services.async_rabbitmq import AsyncRabbitMQClusterClient
+from app.services.compression import (
+    UnsupportedContentEncodingError,
+    decode_body,
+    encode_body,
+    get_compression_stats,
+)
+
+NODES = [
+    {"host": "127.0.0.1", "port": port, "user": "guest", "password": "guest"}
+    for port in (5672, 5673, 5674)
+]
+
+# V3 REPORT와 비슷한 반복적인 대화 기록 본문
+REPORT_BODY = json.dumps({
+    "edu_type": 10,
+    "generation_type": "REPORT",
+    "previous_chat_history_data_list": [
+        {"role": "user", "content": f"질문 {i}: 고객 응대 시 주의할 점은 무엇인가요?"}
+        for i in range(500)
+    ],
+}, ensure_ascii=False).encode("utf-8")
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "publish_compression_enabled", True)
+    monkeypatch.setattr(settings._settings_instance, "publish_compression_threshold", 1024)
+    monkeypatch.setattr(compression, "_stats", compression.CompressionStats())
+
+
+@pytest.mark.parametrize("algorithm,encoding", [("zlib", "deflate"), ("zstd", "zstd")])
+def test_round_trip(monkeypatch, enabled, algorithm, encoding):
+    if algorithm == "zstd" and compression.zstandard is None:
+        pytest.skip("zstandard not installed")
+    monkeypatch.setattr(settings._settings_instance, "publish_compression_algorithm", algorithm)
+
+    encoded, content_encoding = encode_body(REPORT_BODY, "V3_CONVERSATION_ANALYSIS_REPORT")
+
+    assert content_encoding == encoding
+    assert len(encoded) * 4 < len(REPORT_BODY)
+    assert decode_body(encoded, content_encoding) == REPORT_BODY
+    stats = get_compression_stats()["queues"]["V3_CONVERSATION_ANALYSIS_REPORT"]
+    assert stats["compressed"] == 1
+    assert stats["ratio"] > 4
+
+
+def test_small_and_incompressible_bodies_are_sent_as_is(enabled):
+    small = b'{"edu_type": 1}'
+    random_bytes = os.urandom(4096)
+
+    assert encode_body(small, "sokind") == (small, None)
+    assert encode_body(random_bytes, "sokind") == (random_bytes, None)
+    stats = get_compression_stats()["queues"]["sokind"]
+    assert stats["messages"] == 2
+    assert stats["compressed"] == 0
+    assert stats["ratio"] == 1.0
+
+
+def test_decode_rejects_unknown_encoding():
+    assert decode_body(b"plain", None) == b"plain"
+    with pytest.raises(UnsupportedContentEncodingError):
+        decode_body(b"data", "br")
+
+
+class _FakeExchange:
+    def __init__(self):
+        self.messages = []
+
+    async def publish(self, message, routing_key, mandatory=True, timeout=None):
+        self.messages.append(message)
+
+
+class _FakeChannel:
+    def __init__(self):
+        self.is_closed = False
+        self.default_exchange = _FakeExchange()
+
+
+class _FakeConnection:
+    is_closed = False
+
+
+async def test_async_client_sets_content_encoding(monkeypatch, enabled):
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+    monkeypatch.setattr(settings._settings_instance, "publish_compression_algorithm", "zlib")
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_leader_aware", False)
+    client = AsyncRabbitMQClusterClient()
+    client.connection = _FakeConnection()
+    client.channel = _FakeChannel()
+
+    assert await client.send_message("", "V3_CONVERSATION_ANALYSIS_REPORT", REPORT_BODY, retry_count=0)
+    assert await client.send_message("", "sokind", {"edu_type": 1}, retry_count=0)
+
+    report, small = client.channel.default_exchange.messages
+    assert report.content_encoding == "deflate"
+    assert decode_body(report.body, report.content_encoding) == REPORT_BODY
+    assert small.content_encoding is None
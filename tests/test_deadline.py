@@ -0,0 +1,117 @@
+"""publish 데드라인 예산 테스트"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import cluster_nodes
+from app.services.async_rabbitmq import AsyncRabbitMQClusterClient
+from app.services.cluster_nodes import ClusterNodeRegistry
+from app.services.deadline import Deadline, PublishDeadlineExceededError
+
+NODES = [
+    {"host": "mq", "port": port, "user": "guest", "password": "guest"}
+    for port in (5671, 5672, 5673)
+]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_leader_aware", False)
+    monkeypatch.setattr(cluster_nodes, "_registry_instance", ClusterNodeRegistry())
+    monkeypatch.setattr(cluster_nodes, "_registry_pid", os.getpid())
+    return AsyncRabbitMQClusterClient()
+
+
+def test_backoff_is_capped_by_setting_and_remaining_budget():
+    deadline = Deadline(10.0)
+    for attempt in range(20):
+        assert 0.0 <= deadline.backoff(attempt) <= settings.publish_retry_backoff_cap
+
+    short = Deadline(0.01)
+    assert all(short.backoff(attempt) <= 0.01 for attempt in range(20))
+
+
+def test_budget_by_edu_type(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "publish_deadline_by_edu_type", {9: 30.0})
+    monkeypatch.setattr(settings._settings_instance, "publish_deadline_default", 2.0)
+
+    assert Deadline.for_edu_type(9).budget == 30.0
+    assert Deadline.for_edu_type(1).budget == 2.0
+    assert Deadline.for_edu_type(None).budget == 2.0
+
+
+async def test_unreachable_cluster_fails_within_budget(monkeypatch, client):
+    async def open_connection(node, timeout=None):
+        # 응답 없는 노드: 연결 제한 시간까지 대기
+        await asyncio.sleep(timeout)
+        raise ConnectionError("connect timed out")
+
+    monkeypatch.setattr(client, "_open_connection", open_connection)
+
+    started = time.monotonic()
+    with pytest.raises(PublishDeadlineExceededError):
+        await client.send_message("", "sokind", {"n": 1}, retry_count=10, deadline=Deadline(0.2))
+    assert time.monotonic() - started < 0.5
+
+
+class _FakeExchange:
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.published = []
+
+    async def publish(self, message, routing_key, mandatory=True, timeout=None):
+        if self.fail:
+            raise ConnectionError("connection reset")
+        self.published.append(routing_key)
+
+
+class _FakeChannel:
+    def __init__(self, fail: bool):
+        self.is_closed = False
+        self.default_exchange = _FakeExchange(fail)
+
+
+class _FakeConnection:
+    def __init__(self, node):
+        self.node = node
+        self.is_closed = False
+
+    async def close(self):
+        self.is_closed = True
+
+
+async def test_connection_error_fails_over_without_backoff(monkeypatch, client):
+    failing_port = None
+    channels = {}
+
+    async def open_connection(node, timeout=None):
+        return _FakeConnection(node)
+
+    async def open_channel(connection):
+        nonlocal failing_port
+        # 처음 연결된 노드에서 publish 시 연결 오류
+        if failing_port is None:
+            failing_port = connection.node["port"]
+        channel = _FakeChannel(fail=connection.node["port"] == failing_port)
+        channels[connection.node["port"]] = channel
+        return channel
+
+    def backoff(self, attempt):
+        raise AssertionError("connection errors must fail over without backoff")
+
+    monkeypatch.setattr(client, "_open_connection", open_connection)
+    monkeypatch.setattr(client, "_open_channel", open_channel)
+    monkeypatch.setattr(Deadline, "backoff", backoff)
+
+    assert await client.send_message("", "sokind", {"n": 1}, retry_count=3, deadline=Deadline(1.0))
+
+    other = [port for port in channels if port != failing_port]
+    assert len(other) == 1
+    assert channels[other[0]].default_exchange.published == ["sokind"]
+    await client.close()
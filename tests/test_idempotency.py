@@ -0,0 +1,167 @@
+"""멱등성 캐시 테스트"""
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_app
+from app.services import idempotency, message_service
+from app.services.idempotency import IdempotencyCache, SQLiteIdempotencyBackend
+
+ACCEPTED = {"message": "success", "status": 200, "request_id": "req-1", "queue": "sokind", "priority": 2}
+
+
+async def test_lru_evicts_oldest_and_tracks_memory():
+    cache = IdempotencyCache(max_entries=2, ttl=60)
+    for key in ("a", "b", "c"):
+        await cache.remember(key, {**ACCEPTED, "request_id": key})
+
+    assert await cache.lookup("a") is None
+    assert (await cache.lookup("c"))["request_id"] == "c"
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["evicted"], stats["hits"], stats["misses"]) == (2, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["memory_bytes"] > 0
+
+
+async def test_expired_and_rejected_results_are_not_replayed():
+    cache = IdempotencyCache(ttl=0.01)
+    await cache.remember("a", ACCEPTED)
+    assert await cache.remember("b", {**ACCEPTED, "status": 429}) is False
+
+    await asyncio.sleep(0.02)
+
+    assert await cache.lookup("a") is None
+    assert await cache.lookup("b") is None
+    assert cache.get_stats()["expired"] == 1
+
+
+async def test_shared_backend_serves_other_workers(tmp_path):
+    path = str(tmp_path / "idempotency.db")
+    first = IdempotencyCache(backend=SQLiteIdempotencyBackend(path))
+    second = IdempotencyCache(backend=SQLiteIdempotencyBackend(path))
+
+    await first.remember("req-1", ACCEPTED)
+
+    assert await second.lookup("req-1") == ACCEPTED
+    assert second.get_stats()["shared_hits"] == 1
+    assert await second.lookup("req-1") == ACCEPTED
+    assert second.get_stats()["hits"] == 1  # 두 번째부터는 로컬 LRU
+
+
+async def test_concurrent_duplicates_send_once():
+    cache = IdempotencyCache()
+    calls = []
+
+    async def send():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ACCEPTED
+
+    results = await asyncio.gather(*(cache.execute("req-1", send) for _ in range(3)))
+
+    assert len(calls) == 1
+    assert [replayed for _, replayed in results] == [False, True, True]
+    assert cache.get_stats()["inflight_hits"] == 2
+
+
+class _Batcher:
+    def __init__(self):
+        self.submitted = []
+
+    async def submit(self, queue, body, priority=0, deadline=None):
+        self.submitted.append((queue, json.loads(body)))
+        return True
+
+
+class _Client:
+    async def queue_exists(self, queue_name):
+        return True
+
+
+@pytest.fixture
+def batcher(monkeypatch):
+    settings._ensure_loaded()
+    for name, value in {"idempotency_enabled": True, "publish_batching_enabled": True, "spool_enabled": False}.items():
+        monkeypatch.setattr(settings._settings_instance, name, value)
+    monkeypatch.setattr(idempotency, "_cache_instance", IdempotencyCache())
+    monkeypatch.setattr(idempotency, "_cache_pid", os.getpid())
+    fake = _Batcher()
+    monkeypatch.setattr(message_service, "get_async_rabbitmq_client", lambda lane="real_time": _Client())
+    monkeypatch.setattr(message_service, "get_publish_batcher", lambda lane="real_time": fake)
+    return fake
+
+
+PAYLOAD = {"edu_key": 1, "edu_type": 9, "member_key": 1, "period_report_data_url": "https://x/1.json"}
+
+
+def test_retried_request_is_replayed_without_publishing(batcher):
+    client = TestClient(create_app())
+
+    first = client.post("/", json=PAYLOAD, headers={"X-Request-ID": "retry-1"})
+    second = client.post("/", json=PAYLOAD, headers={"X-Request-ID": "retry-1"})
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(batcher.submitted) == 1
+    assert client.get("/status/idempotency").json()["idempotency"]["hits"] == 1
+
+
+def test_generated_request_ids_are_not_cached(batcher):
+    client = TestClient(create_app())
+
+    client.post("/", json=PAYLOAD)
+    client.post("/", json=PAYLOAD)
+
+    assert len(batcher.submitted) == 2
+
+
+def test_retried_batch_replays_accepted_items(batcher):
+    client = TestClient(create_app())
+    items = [PAYLOAD, {"edu_key": 2, "edu_type": 9}]
+
+    client.post("/batch", json=items, headers={"X-Request-ID": "batch-1"})
+    response = client.post("/batch", json=items, headers={"X-Request-ID": "batch-1"})
+
+    assert [item["status"] for item in response.json()["items"]] == [200, 422]
+    assert len(batcher.submitted) == 1
+
+
+
+async def test_concurrent_batch_retries_publish_once(batcher, monkeypatch):
+    submit = batcher.submit
+
+    async def slow_submit(*args, **kwargs):
+        await asyncio.sleep(0.02)
+        return await submit(*args, **kwargs)
+
+    monkeypatch.setattr(batcher, "submit", slow_submit)
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        responses = await asyncio.gather(*(
+            client.post("/batch", json=[PAYLOAD], headers={"X-Request-ID": "batch-2"}) for _ in range(3)
+        ))
+
+    assert [response.json()["items"][0]["status"] for response in responses] == [200, 200, 200]
+    assert len(batcher.submitted) == 1
+
+def test_unavailable_shared_backend_fails_at_startup(monkeypatch):
+    settings._ensure_loaded()
+    for name, value in {
+        "idempotency_enabled": True, "idempotency_backend": "redis", "idempotency_redis_url": "redis://cache:6379/0",
+    }.items():
+        monkeypatch.setattr(settings._settings_instance, name, value)
+    monkeypatch.setattr(idempotency, "redis", None)
+    monkeypatch.setattr(idempotency, "_cache_instance", None)
+
+    with pytest.raises(RuntimeError, match=r"cdl-gateway\[redis\]"):
+        idempotency.get_idempotency_cache()
+    with pytest.raises(RuntimeError):
+        with TestClient(create_app()):
+            pass
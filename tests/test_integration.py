@@ -67,4 +67,11 @@ def test_docs_endpoints(client):
     
     # ReDoc
     response = client.get("/redoc")
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+def test_readiness_requires_startup_topology(client):
+    """브로커 설정이 없으면 시작 단계 큐 선언이 끝나지 않아 not ready"""
+    with client:
+        response = client.get("/status/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
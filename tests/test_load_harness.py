@@ -0,0 +1,64 @@
+"""부하 벤치마크 하네스 테스트 (브로커 대역 + 실제 앱/클라이언트 종단 간, 트래픽 구성, 결과 비교)"""
+import os
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import create_app
+from app.services import cluster_nodes, topology
+from app.services.async_rabbitmq import close_async_rabbitmq_client
+from app.services.cluster_nodes import ClusterNodeRegistry
+from benchmarks.amqp_stub import StubBroker
+from benchmarks.bench_load import MIXES, compare, parse_mix, percentile, run_load
+from benchmarks.payloads import PAYLOADS
+
+
+def test_parse_mix():
+    assert parse_mix("production") == MIXES["production"]
+    assert set(MIXES["uniform"]) == set(PAYLOADS)
+    assert parse_mix("10-QUESTION=3,1") == {"10-QUESTION": 3.0, "1": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("11=1")
+    with pytest.raises(ValueError):
+        parse_mix("1=0")
+
+
+def test_percentile_and_compare():
+    values = [float(n) for n in range(1, 101)]
+    assert [percentile(values, pct) for pct in (50, 95, 99)] == [50.0, 95.0, 99.0]
+
+    def run(p50, rps):
+        return {"mix": "production", "target_rps": 100, "achieved_rps": rps,
+                "latency_ms": {"p50": p50, "p95": p50 * 2, "p99": p50 * 4}}
+
+    [row] = compare({"runs": [run(10.0, 100.0)]}, {"runs": [run(12.0, 90.0)]})
+    assert row == {"mix": "production", "target_rps": 100, "p50": 20.0, "p95": 20.0, "p99": 20.0,
+                   "achieved_rps": -10.0}
+
+
+async def test_load_through_app_to_stub_broker(monkeypatch):
+    broker = await StubBroker(ports=(0, 0, 0), ack_delay_ms=1).start()
+    nodes = [{"host": "127.0.0.1", "port": port, "user": "guest", "password": "guest"} for port in broker.ports]
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: nodes)
+    monkeypatch.setattr(settings._settings_instance, "spool_enabled", False)
+    monkeypatch.setattr(cluster_nodes, "_registry_instance", ClusterNodeRegistry())
+    monkeypatch.setattr(cluster_nodes, "_registry_pid", os.getpid())
+    monkeypatch.setattr(topology, "_topology_cache_instance", None)
+    try:
+        transport = httpx.ASGITransport(create_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            result = await run_load(client, parse_mix("uniform"), rps=200, duration=0.5, concurrency=16)
+    finally:
+        await close_async_rabbitmq_client()
+        await broker.stop()
+
+    assert result["requests"] == 100
+    assert result["status_counts"] == {"200": 100}
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+    assert sum(row["requests"] for row in result["by_payload"].values()) == 100
+    # 요청마다 브로커가 confirm한 메시지 하나 (큐는 처음 publish 전에 선언)
+    stats = broker.get_stats()
+    assert stats["messages"] == 100 and stats["unroutable"] == 0
+    assert "V3_RESPONSE_GENERATION" in stats["queues"]
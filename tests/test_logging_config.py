@@ -0,0 +1,83 @@
+"""로깅 설정 테스트 (JSON 포맷터, 비동기 writer 스레드, 샘플링)"""
+import io
+import json
+import logging
+
+import pytest
+
+from app.core import logging_config
+from app.core.logging_config import configure_logging, get_logging_stats, parse_sample_rates
+
+
+@pytest.fixture
+def output():
+    stream = io.StringIO()
+    yield stream
+    configure_logging("INFO", async_enabled=False, sample_rates="")
+
+
+def _lines(stream):
+    logging_config._stop_listener()  # 큐에 남은 기록을 모두 쓴 뒤 종료
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_records_include_extra_fields(output):
+    configure_logging("INFO", log_format="json", async_enabled=True, sample_rates="", stream=output)
+
+    logging.getLogger("app.test").info("%s sent", "msg", extra={"request_id": "req-1", "queue": "Q", "obj": object()})
+
+    [entry] = _lines(output)
+    assert entry["message"] == "msg sent"
+    assert entry["level"] == "INFO" and entry["logger"] == "app.test"
+    assert entry["request_id"] == "req-1" and entry["queue"] == "Q"
+    assert entry["obj"].startswith("<object")
+    assert entry["time"].endswith("+09:00") and entry["time"][19] == "."
+
+
+def test_exception_is_formatted_by_writer(output):
+    configure_logging("INFO", log_format="json", async_enabled=True, sample_rates="", stream=output)
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("app.test").exception("failed")
+
+    [entry] = _lines(output)
+    assert entry["level"] == "ERROR"
+    assert "RuntimeError: boom" in entry["exc_info"]
+
+
+def test_sampling_drops_info_but_keeps_warnings(output):
+    configure_logging("INFO", async_enabled=False, sample_rates="app.sampled=0", stream=output)
+    sampled = logging.getLogger("app.sampled.child")
+
+    for _ in range(10):
+        sampled.info("ok")
+    sampled.warning("slow")
+    sampled.error("failed")
+    logging.getLogger("app.other").info("kept")
+
+    assert [entry["message"] for entry in _lines(output)] == ["slow", "failed", "kept"]
+    assert get_logging_stats()["sampled_out"] == 10
+
+
+def test_full_queue_drops_info_only(output):
+    configure_logging("INFO", async_enabled=True, sample_rates="", queue_size=1, stream=output)
+    logging_config._stop_listener()  # writer를 멈춰 큐가 비지 않게 함
+    handler = logging_config._handler
+
+    logging.getLogger("app.test").info("first")
+    logging.getLogger("app.test").info("dropped")
+
+    assert get_logging_stats() == {"queued": 1, "dropped": 1, "sampled_out": 0}
+    handler.queue.get_nowait()
+
+
+@pytest.mark.parametrize("spec", ["request", "request=2", "=0.5", "request=x"])
+def test_invalid_sample_rates_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_sample_rates(spec)
+
+
+def test_sample_rates_are_parsed():
+    assert parse_sample_rates(" request=0.1, app.services=1 ,") == {"request": 0.1, "app.services": 1.0}
@@ -0,0 +1,29 @@
+"""메시지 서비스 라우팅 테스트"""
+from app.core.config import settings
+from app.services.message_service import MessageService
+
+
+def test_queue_topology_covers_every_routing_branch():
+    """시작 시 선언 대상에 모든 도달 가능 큐 포함"""
+    topology = MessageService().get_queue_topology()
+
+    assert set(topology) == {
+        settings.default_queue,
+        "periodic_report",
+        "sokind_conversation",
+        "sokind_conversation_generate_response",
+        "sokind_demo_generate_response",
+        "sokind_demo_analyze_response",
+        "V3_PERSONA_GENERATION",
+        "V3_RESPONSE_GENERATION",
+        "V3_CONVERSATION_ANALYSIS_REPORT",
+    }
+
+
+def test_queue_topology_keeps_high_priority_overrides():
+    """고우선순위 큐 메모리 제한 덮어쓰기 유지"""
+    topology = MessageService().get_queue_topology()
+
+    arguments = topology["V3_RESPONSE_GENERATION"]["arguments"]
+    assert arguments["x-max-in-memory-length"] == 200000
+    assert arguments["x-max-in-memory-bytes"] == 209715200
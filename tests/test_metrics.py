@@ -0,0 +1,132 @@
+"""Prometheus 메트릭 테스트 (단계 히스토그램, 메시지 카운터, 런타임 게이지, 워커 간 집계)"""
+import os
+import subprocess
+import sys
+import textwrap
+
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.core.config import settings
+from app.core.metrics import GatewayMetrics
+from app.main import create_app
+from app.services import cluster_nodes, message_service
+from app.services.cluster_nodes import ClusterNodeRegistry
+from app.services.runtime_metrics import refresh_runtime_gauges
+from benchmarks.payloads import PAYLOADS
+
+NODES = [
+    {"host": "mq", "port": port, "user": "guest", "password": "guest"}
+    for port in (5671, 5672, 5673)
+]
+
+
+def _samples(text):
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+    }
+
+
+class _Batcher:
+    async def submit(self, queue, body, priority=0, deadline=None):
+        return True
+
+
+class _Client:
+    async def queue_exists(self, queue_name):
+        return True
+
+
+def test_metrics_endpoint_reports_stages_and_messages(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "spool_enabled", False)
+    monkeypatch.setattr(message_service, "get_async_rabbitmq_client", lambda lane="real_time": _Client())
+    monkeypatch.setattr(message_service, "get_publish_batcher", lambda lane="real_time": _Batcher())
+    monkeypatch.setattr(settings._settings_instance, "publish_batching_enabled", True)
+    client = TestClient(create_app())
+    before = _samples(client.get("/metrics").text)
+
+    assert client.post("/", json=PAYLOADS["10-QUESTION"]).status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    after = _samples(response.text)
+
+    def delta(name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        return after.get(key, 0) - before.get(key, 0)
+
+    for stage in ("validation", "routing", "serialization", "publish"):
+        assert delta("cdl_gateway_stage_seconds_count", stage=stage) == 1
+    assert delta(
+        "cdl_gateway_messages_total", queue="V3_RESPONSE_GENERATION", edu_type="10", priority="1", result="sent"
+    ) == 1
+
+
+def test_runtime_gauges_follow_node_status_and_connections(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+    registry = ClusterNodeRegistry()
+    monkeypatch.setattr(cluster_nodes, "_registry_instance", registry)
+    monkeypatch.setattr(cluster_nodes, "_registry_pid", os.getpid())
+    metrics = GatewayMetrics(registry=CollectorRegistry())
+    registry.breaker("mq:5671").record_success()
+    registry.connection_opened("mq:5671")
+    breaker = registry.breaker("mq:5672")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    refresh_runtime_gauges(metrics)
+
+    assert metrics.node_status.labels("mq:5671", "healthy")._value.get() == 1
+    assert metrics.node_status.labels("mq:5672", "failed")._value.get() == 1
+    assert metrics.node_status.labels("mq:5672", "healthy")._value.get() == 0
+    assert metrics.node_status.labels("mq:5673", "unknown")._value.get() == 1
+    assert metrics.node_connections.labels("mq:5671")._value.get() == 1
+
+
+WORKER = textwrap.dedent("""
+    import sys
+    from app.core.metrics import get_metrics, record_message, stage_timer
+    metrics = get_metrics()
+    record_message("sokind", 9, 2, "sent")
+    with stage_timer("publish"):
+        pass
+    metrics.publish_pending.set(int(sys.argv[1]))
+""")
+SCRAPER = textwrap.dedent("""
+    import sys
+    from app.core.metrics import mark_process_dead, render_metrics
+    for pid in sys.argv[1:]:
+        mark_process_dead(int(pid))
+    print(render_metrics()[0].decode())
+""")
+
+
+def _run(code, env, *args):
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args], env=env, capture_output=True, text=True, check=True, cwd=os.getcwd()
+    )
+    return result.stdout
+
+
+def test_values_are_aggregated_across_worker_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "METRICS_ENABLED": "true"}
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER, str(n)], env=env) for n in (3, 4)]
+    assert [worker.wait() for worker in workers] == [0, 0]
+
+    samples = _samples(_run(SCRAPER, env))
+    assert samples[("cdl_gateway_messages_total", (
+        ("edu_type", "9"), ("priority", "2"), ("queue", "sokind"), ("result", "sent")
+    ))] == 2
+    assert samples[("cdl_gateway_stage_seconds_count", (("stage", "publish"),))] == 2
+    assert samples[("cdl_gateway_publish_pending", ())] == 7
+
+    # 종료된 워커의 live 게이지는 제외, 카운터는 유지
+    samples = _samples(_run(SCRAPER, env, str(workers[0].pid)))
+    assert samples[("cdl_gateway_publish_pending", ())] == 4
+    assert samples[("cdl_gateway_stage_seconds_count", (("stage", "publish"),))] == 2
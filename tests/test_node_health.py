@@ -0,0 +1,134 @@
+"""노드별 회로 차단기와 백그라운드 헬스 프로버 테스트"""
+import os
+
+from app.core.config import settings
+from app.services import cluster_nodes
+from app.services.async_rabbitmq import AsyncRabbitMQClusterClient
+from app.services.cluster_nodes import (
+    CircuitState,
+    ClusterNodeRegistry,
+    NodeCircuitBreaker,
+    NodeStatus,
+)
+from app.services.node_health import NodeHealthProber
+
+NODES = [
+    {"host": "mq", "port": port, "user": "guest", "password": "guest"}
+    for port in (5671, 5672, 5673)
+]
+
+
+def test_breaker_opens_then_half_opens_after_timeout():
+    breaker = NodeCircuitBreaker(failure_threshold=2, open_timeout=0)
+    assert breaker.node_status is NodeStatus.UNKNOWN
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.node_status is NodeStatus.DEGRADED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    # 시험 권한이 없는 호출자는 half-open 시험을 가져가지 않음
+    assert breaker.allow_request(claim_trial=False) is False
+    assert breaker.allow_request() is True
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request() is False
+
+    # half-open 시험 실패 시 곧바로 다시 open
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.allow_request() is True
+    breaker.record_success()
+    assert breaker.node_status is NodeStatus.HEALTHY
+
+
+def test_breakers_are_independent_per_node():
+    """한 노드의 차단기 리셋이 다른 노드의 리셋을 막지 않음"""
+    registry = ClusterNodeRegistry()
+    for key in ("mq:5671", "mq:5672"):
+        breaker = registry.breaker(key)
+        breaker.open_timeout = 0
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+    assert registry.breaker("mq:5671").allow_request() is True
+    assert registry.breaker("mq:5672").allow_request() is True
+
+
+class _FakeChannel:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeConnection:
+    is_closed = False
+
+    def channel(self, publisher_confirms=False):
+        return _FakeChannel()
+
+    async def close(self):
+        self.is_closed = True
+
+
+async def test_prober_drives_breaker_open_and_closed():
+    registry = ClusterNodeRegistry()
+    down = {"mq:5672"}
+
+    async def connect(node):
+        if f"{node['host']}:{node['port']}" in down:
+            raise ConnectionError("refused")
+        return _FakeConnection()
+
+    prober = NodeHealthProber(
+        nodes=NODES, interval=1, timeout=1, canary=False, registry=registry, connect=connect,
+    )
+    for _ in range(registry.breaker("mq:5672").failure_threshold):
+        await prober.probe_all()
+
+    assert registry.get_node_status("mq:5671") is NodeStatus.HEALTHY
+    assert registry.get_node_status("mq:5672") is NodeStatus.FAILED
+    # open_timeout 전에는 프로브도 건너뜀
+    assert (await prober.probe_all())["mq:5672"] is None
+    penalty = registry.get_stats()["nodes"]["mq:5672"]["failure_penalty"]
+    assert penalty > 1.0
+
+    # open 이후의 half-open 시험 실패는 벌점을 더 누적하지 않음
+    registry.breaker("mq:5672").open_timeout = 0
+    assert (await prober.probe_all())["mq:5672"] is False
+    assert registry.get_stats()["nodes"]["mq:5672"]["failure_penalty"] == penalty
+
+    down.clear()
+    assert (await prober.probe_all())["mq:5672"] is True
+    assert registry.get_node_status("mq:5672") is NodeStatus.HEALTHY
+    assert prober.get_stats()["nodes"]["mq:5672"]["failures"] == 4
+    # 복구가 노드 선택에도 반영됨
+    assert registry.get_stats()["nodes"]["mq:5672"]["failure_penalty"] == 1.0
+
+
+async def test_requests_skip_open_nodes_while_prober_runs(monkeypatch):
+    registry = ClusterNodeRegistry()
+    registry.probing = True
+    monkeypatch.setattr(cluster_nodes, "_registry_instance", registry)
+    monkeypatch.setattr(cluster_nodes, "_registry_pid", os.getpid())
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+
+    client = AsyncRabbitMQClusterClient()
+    attempts = []
+
+    async def open_connection(node, timeout=None):
+        attempts.append(node["port"])
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(client, "_open_connection", open_connection)
+    for node in NODES:
+        breaker = registry.breaker(f"mq:{node['port']}")
+        breaker.open_timeout = 0
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+    assert await client.connect() is False
+    assert attempts == []
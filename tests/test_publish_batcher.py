@@ -0,0 +1,84 @@
+"""마이크로 배칭 publish 단계 테스트"""
+import asyncio
+
+from app.services.publish_batcher import PublishBatcher
+
+
+class _RecordingClient:
+    """send_batch 호출을 기록하는 가짜 비동기 클라이언트"""
+
+    def __init__(self, fail_bodies=()):
+        self.calls = []
+        self.batches = 0
+        self.fail_bodies = set(fail_bodies)
+
+    async def send_batch(self, exchange, routing_key, messages):
+        self.batches += 1
+        results = []
+        for body, priority, _, _ in messages:
+            self.calls.append((routing_key, body, priority))
+            results.append(ConnectionError("publish failed") if body in self.fail_bodies else True)
+        return results
+
+
+async def test_flushes_on_max_batch_size():
+    client = _RecordingClient()
+    batcher = PublishBatcher(
+        flush_interval_ms=10_000, max_batch_size=3, max_batch_bytes=1 << 20,
+        client_getter=lambda: client,
+    )
+
+    results = await asyncio.gather(*(batcher.submit("q", {"n": i}) for i in range(3)))
+
+    assert results == [True, True, True]
+    assert len(client.calls) == 3
+    assert client.batches == 1
+    stats = batcher.get_stats()
+    assert stats["batches"] == 1
+    assert stats["flush_reasons"]["size"] == 1
+    assert stats["batch_size_buckets"]["4"] == 1
+
+
+async def test_flushes_on_interval_per_queue():
+    client = _RecordingClient()
+    batcher = PublishBatcher(
+        flush_interval_ms=5, max_batch_size=100, max_batch_bytes=1 << 20,
+        client_getter=lambda: client,
+    )
+
+    results = await asyncio.gather(
+        batcher.submit("a", b"1"), batcher.submit("b", b"2"), batcher.submit("a", b"3"),
+    )
+
+    assert results == [True, True, True]
+    stats = batcher.get_stats()
+    assert stats["batches"] == 2
+    assert stats["flush_reasons"]["interval"] == 2
+    assert [c[1] for c in client.calls if c[0] == "a"] == [b"1", b"3"]
+
+
+async def test_flushes_on_max_batch_bytes():
+    client = _RecordingClient()
+    batcher = PublishBatcher(
+        flush_interval_ms=10_000, max_batch_size=100, max_batch_bytes=4,
+        client_getter=lambda: client,
+    )
+
+    assert await batcher.submit("q", b"12345") is True
+    assert batcher.get_stats()["flush_reasons"]["bytes"] == 1
+
+
+async def test_failures_complete_only_their_own_future():
+    client = _RecordingClient(fail_bodies={b"bad"})
+    batcher = PublishBatcher(
+        flush_interval_ms=10_000, max_batch_size=2, max_batch_bytes=1 << 20,
+        client_getter=lambda: client,
+    )
+
+    results = await asyncio.gather(
+        batcher.submit("q", b"good"), batcher.submit("q", b"bad"), return_exceptions=True,
+    )
+
+    assert results[0] is True
+    assert isinstance(results[1], ConnectionError)
+    assert batcher.get_stats()["failed_messages"] == 1
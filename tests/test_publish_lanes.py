@@ -0,0 +1,91 @@
+"""처리 유형별 publish 레인 테스트"""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.models.requests import SokindRequest
+from app.services import message_service
+from app.services.deadline import Deadline, PublishDeadlineExceededError
+from app.services.message_service import MessageService
+from app.services.publish_lanes import PublishLane, get_publish_lane_stats, lane_for
+
+
+def test_lane_for_processing_type(monkeypatch):
+    settings._ensure_loaded()
+    assert lane_for("batch") == "batch"
+    assert lane_for("scheduled") == "scheduled"
+    assert lane_for("unknown") == "real_time"
+
+    monkeypatch.setattr(settings._settings_instance, "publish_lanes_enabled", False)
+    assert lane_for("batch") == "real_time"
+
+
+async def test_lane_slot_bounds_concurrency_within_deadline():
+    lane = PublishLane("batch", max_concurrency=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with lane.slot(Deadline(1.0)):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert lane.stats["in_flight"] == 1
+
+    with pytest.raises(PublishDeadlineExceededError):
+        async with lane.slot(Deadline(0.05)):
+            pass
+    assert lane.stats["slot_timeouts"] == 1
+
+    release.set()
+    await holder
+    stats = lane.get_stats()
+    assert stats["published"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["max_in_flight"] == 1
+
+
+class _LaneClient:
+    """레인별 publish를 기록하는 가짜 비동기 클라이언트"""
+
+    def __init__(self, lane):
+        self.lane = lane
+        self.published = []
+
+    async def queue_exists(self, queue_name):
+        return True
+
+    async def send_message(self, exchange, routing_key, body, priority=0, deadline=None):
+        self.published.append((routing_key, deadline.budget))
+        return True
+
+
+async def test_message_service_publishes_on_processing_type_lane(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "publish_batching_enabled", False)
+    monkeypatch.setattr(settings._settings_instance, "publish_deadline_by_edu_type", {})
+    clients = {}
+
+    def get_client(lane="real_time"):
+        return clients.setdefault(lane, _LaneClient(lane))
+
+    monkeypatch.setattr(message_service, "get_async_rabbitmq_client", get_client)
+
+    service = MessageService()
+    for generation_type in ("QUESTION", "REPORT"):
+        model = SokindRequest(
+            edu_key=1, edu_type=10, member_key=1, generation_type=generation_type,
+        ).to_specialized_model()
+        result = await service.send_message_with_model_async(model, "127.0.0.1")
+        assert result["status"] == 200
+
+    assert clients["real_time"].published == [
+        ("V3_RESPONSE_GENERATION", settings.publish_lane_timeouts["real_time"]),
+    ]
+    assert clients["batch"].published == [
+        ("V3_CONVERSATION_ANALYSIS_REPORT", settings.publish_lane_timeouts["batch"]),
+    ]
+    stats = get_publish_lane_stats()
+    assert stats["real_time"]["published"] >= 1
+    assert stats["batch"]["published"] >= 1
@@ -0,0 +1,114 @@
+"""RabbitMQ 연결/채널 풀 테스트"""
+import threading
+
+import pytest
+
+from app.services.rabbitmq import RabbitMQChannelPool
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.is_closed = False
+
+
+class _FakeClient:
+    """브로커 없이 풀 동작을 검증하기 위한 가짜 클라이언트"""
+
+    instances = 0
+
+    def __init__(self):
+        _FakeClient.instances += 1
+        self.connection = _FakeConnection()
+        self.reconnects = 0
+        self.closed = False
+
+    def _ensure_connection(self):
+        if self.connection.is_closed:
+            self.connection = _FakeConnection()
+            self.reconnects += 1
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset_instances():
+    _FakeClient.instances = 0
+
+
+def test_pool_reuses_clients():
+    """반납된 클라이언트는 다음 요청에서 재사용"""
+    pool = RabbitMQChannelPool(size=2, health_check_interval=0, client_factory=_FakeClient)
+
+    with pool.acquire() as first:
+        pass
+    with pool.acquire() as second:
+        pass
+
+    assert first is second
+    assert _FakeClient.instances == 1
+    assert pool.get_stats()["acquired"] == 2
+
+
+def test_pool_replaces_dead_connection():
+    """죽은 연결은 대여 시 투명하게 재연결"""
+    pool = RabbitMQChannelPool(size=1, health_check_interval=0, client_factory=_FakeClient)
+
+    with pool.acquire() as client:
+        client.connection.is_closed = True
+    with pool.acquire() as client:
+        assert not client.connection.is_closed
+
+    assert client.reconnects == 1
+    assert pool.get_stats()["reconnected"] == 1
+
+
+def test_pool_respects_size_limit():
+    """풀이 가득 차면 대여 대기 후 타임아웃"""
+    pool = RabbitMQChannelPool(size=1, acquire_timeout=0.05, client_factory=_FakeClient)
+
+    with pool.acquire():
+        with pytest.raises(TimeoutError):
+            with pool.acquire():
+                pass
+
+    assert pool.get_stats()["timeouts"] == 1
+
+
+def test_pool_is_thread_safe():
+    """여러 스레드가 동시에 대여해도 size를 넘지 않음"""
+    pool = RabbitMQChannelPool(size=3, client_factory=_FakeClient)
+    in_use = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(50):
+            with pool.acquire() as client:
+                with lock:
+                    in_use.append(client)
+                    peak.append(len(in_use))
+                with lock:
+                    in_use.remove(client)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) <= 3
+    assert _FakeClient.instances <= 3
+
+
+def test_pool_close_closes_idle_clients():
+    """close 호출 시 유휴 클라이언트 종료"""
+    pool = RabbitMQChannelPool(size=2, client_factory=_FakeClient)
+    with pool.acquire() as client:
+        pass
+
+    pool.close()
+
+    assert client.closed
+    assert pool.get_stats()["open"] == 0
@@ -0,0 +1,62 @@
+"""요청 ID/로깅 ASGI 미들웨어 테스트"""
+import logging
+import uuid
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.request_context import RequestContextMiddleware
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/echo")
+    async def echo(request: Request):
+        return {"request_id": request.state.request_id, "supplied": request.state.request_id_supplied}
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_caller_request_id_is_kept_and_echoed(client):
+    response = client.get("/echo", headers={"X-Request-ID": "req-1"})
+
+    assert response.json() == {"request_id": "req-1", "supplied": True}
+    assert response.headers["X-Request-ID"] == "req-1"
+
+
+def test_missing_request_id_is_generated(client):
+    response = client.get("/echo")
+
+    request_id = response.json()["request_id"]
+    assert uuid.UUID(request_id)
+    assert response.json()["supplied"] is False
+    assert response.headers["X-Request-ID"] == request_id
+
+
+def test_access_log_has_request_id_and_client_info(client, caplog):
+    with caplog.at_level(logging.INFO, logger="request"):
+        client.get("/echo?x=1", headers={"X-Request-ID": "req-2", "User-Agent": "test", "X-Forwarded-For": "10.0.0.1"})
+
+    [record] = [record for record in caplog.records if record.name == "request"]
+    assert record.getMessage() == "GET /echo - 200"
+    assert (record.request_id, record.query, record.status) == ("req-2", "x=1", 200)
+    assert (record.user_agent, record.x_forwarded_for) == ("test", "10.0.0.1")
+
+
+def test_exception_is_logged_as_500(client, caplog):
+    with caplog.at_level(logging.INFO, logger="request"):
+        response = client.get("/fail", headers={"X-Request-ID": "req-3"})
+
+    assert response.status_code == 500
+    assert [record.getMessage() for record in caplog.records if record.name == "request"] == [
+        "Exception during request processing",
+        "GET /fail - 500",
+    ]
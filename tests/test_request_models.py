@@ -0,0 +1,135 @@
+"""단일 검증 요청 모델 호환성 테스트 (기존 SokindRequest → to_specialized_model 경로와 비교)"""
+import warnings
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.core.codec import model_to_bytes
+from app.core.config import settings
+from app.main import create_app
+from app.models.requests import SokindRequest, parse_specialized_request, request_errors, specialized_model_class
+from app.services.message_service import MessageService
+from benchmarks.payloads import PAYLOADS
+
+EXTRA = {"request_id": "req-1", "client_ip": "203.0.113.10"}
+BASE = {"edu_key": 1, "member_key": 2}
+
+CASES = {
+    **PAYLOADS,
+    "aliases": {**BASE, "edu_type": 6, "returnUrl": "https://x", "chat_list": [{"a": 1}], "use_feed_list": ["t"]},
+    "field-names": {**BASE, "edu_type": 6, "return_url": "https://x", "chatList": [{"a": 1}], "useFeedList": ["t"]},
+    "keyword-alias": {**BASE, "edu_type": 5, "arr_keyword": ["a", "b"]},
+    "keyword-name": {**BASE, "edu_type": 5, "arrKeyword": ["a", "b"]},
+    "unknown-keys": {**BASE, "edu_type": 1, "unknown": {"nested": True}, "another": 3},
+    "lax-coercion": {"edu_key": "12", "member_key": 2.0, "edu_type": 4, "round": "3", "face_cut_time": [1, "2.5"]},
+    "explicit-nulls": {**BASE, "edu_type": 7, "intro": None, "mission": None, "request_type": None},
+    "foreign-fields": {**BASE, "edu_type": 9, "chat_round": 3, "generation_type": "REPORT"},
+    "v3-no-generation-type": {**BASE, "edu_type": 10},
+    "v3-unknown-generation-type": {**BASE, "edu_type": 10, "generation_type": "report"},
+    "edu-type-string": {**BASE, "edu_type": "3", "script": "안녕하세요"},
+    "edu-type-bool": {**BASE, "edu_type": True},
+}
+
+INVALID = {
+    "empty": {},
+    "missing-member-key": {"edu_key": 1, "edu_type": 1},
+    "edu-type-out-of-range": {**BASE, "edu_type": 11},
+    "edu-type-not-int": {**BASE, "edu_type": "abc"},
+    "wrong-types": {"edu_key": "x", "edu_type": 7, "member_key": 2, "intro": "x", "round": [1]},
+    "nested-item": {**BASE, "edu_type": 1, "face_cut_time": [1, "x"], "disallowed_lst": [1]},
+    "v3-bad-generation-type": {**BASE, "edu_type": 10, "generation_type": 3},
+    "alias-field-error": {**BASE, "edu_type": 9, "returnUrl": 5, "arr_keyword": "a"},
+    "not-an-object": [1, 2],
+}
+
+
+def _legacy(data):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return SokindRequest.model_validate(data).to_specialized_model()
+
+
+@pytest.fixture
+def stdlib_codec(monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "json_codec", "json")
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_message_body_matches_two_pass_validation(stdlib_codec, name):
+    legacy = _legacy(CASES[name])
+    model = parse_specialized_request(CASES[name])
+
+    assert isinstance(model, type(legacy))
+    assert type(model).__name__ == type(legacy).__name__
+    assert model_to_bytes(model, EXTRA) == model_to_bytes(legacy, EXTRA)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_routing_matches_two_pass_validation(name):
+    service = MessageService()
+    legacy = _legacy(CASES[name])
+    model = parse_specialized_request(CASES[name])
+
+    assert service.get_queue_for_model(model) == service.get_queue_for_model(legacy)
+    assert service.get_priority_for_model(model) == service.get_priority_for_model(legacy)
+    assert model.get_processing_type() == legacy.get_processing_type()
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_class_business_priorities_cover_instances(name):
+    """큐 토폴로지 계산에 쓰는 클래스 수준 우선순위 후보가 실제 요청의 우선순위를 포함"""
+    model = parse_specialized_request(CASES[name])
+    edu_type, generation_type = model.edu_type, getattr(model, "generation_type", None)
+
+    assert type(model).__name__ == specialized_model_class(edu_type, generation_type).__name__
+    assert model.get_business_priority() in type(model).business_priorities(edu_type)
+    answered = parse_specialized_request({**CASES[name], "user_answer_text": "answer"})
+    assert answered.get_business_priority() in type(answered).business_priorities(edu_type)
+
+
+def _summary(errors):
+    return [(error["loc"], error["msg"], error["type"]) for error in errors]
+
+
+@pytest.mark.parametrize("name", INVALID)
+def test_validation_errors_match_two_pass_validation(name):
+    with pytest.raises(ValidationError) as legacy:
+        _legacy(INVALID[name])
+    with pytest.raises(ValidationError) as single:
+        parse_specialized_request(INVALID[name])
+
+    assert _summary(request_errors(single.value)) == _summary(legacy.value.errors())
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+def test_missing_field_returns_422_shape(client):
+    response = client.post("/", json={"edu_key": 1, "edu_type": 7})
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Validation error", "message": "member_key Field required", "status": 422}
+
+
+def test_specialized_validator_error_returns_422(client):
+    """특화 모델 검증기 오류도 본문 검증 단계에서 422 (기존에는 변환 단계 500)"""
+    response = client.post("/", json={**BASE, "edu_type": 1, "face_cut_time": [-1]})
+
+    assert response.status_code == 422
+    assert response.json()["message"].startswith("face_cut_time Value error")
+
+
+@pytest.mark.parametrize("content, message", [
+    (b"", "body Field required"),
+    (b"{bad", "1 JSON decode error"),
+    (b"[1]", "body Input should be a valid dictionary"),
+])
+def test_malformed_body_returns_422(client, content, message):
+    response = client.post("/", content=content, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 422
+    assert response.json()["message"].startswith(message)
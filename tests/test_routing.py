@@ -0,0 +1,116 @@
+"""라우팅 규칙 파일/테이블 테스트"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.models.requests import parse_specialized_request
+from app.services import routing
+from app.services.routing import RoutingRules, RoutingRulesError, RoutingTable, default_queue_arguments
+
+
+def _model(edu_type, **fields):
+    return parse_specialized_request({"edu_key": 1, "edu_type": edu_type, "member_key": 2, **fields})
+
+
+def _write(path, rules):
+    path.write_text(json.dumps({"priorities": {"high": "high", "normal": "medium", "low": "low"}, "rules": rules}))
+
+
+@pytest.mark.parametrize("edu_type, fields, queue, priority", [
+    (1, {}, "sokind", 1),
+    (4, {}, "sokind", 9),
+    (7, {"request_type": 2}, "sokind_conversation_generate_response", 1),
+    (7, {"request_type": None}, "sokind_conversation", 1),
+    (8, {"request_type": 3}, "sokind_demo_analyze_response", 2),
+    (8, {"request_type": 9}, "sokind", 2),
+    (9, {}, "periodic_report", 9),
+    (10, {"generation_type": "QUESTION", "user_answer_text": "네"}, "V3_RESPONSE_GENERATION", 1),
+    (10, {"generation_type": "REPORT"}, "V3_CONVERSATION_ANALYSIS_REPORT", 2),
+])
+def test_default_rules_keep_existing_routing(edu_type, fields, queue, priority):
+    rules = RoutingRules()
+
+    assert rules.resolve(_model(edu_type, **fields)) == (queue, priority)
+    assert not rules.unmatched
+
+
+def test_unmatched_combination_is_counted(tmp_path):
+    path = tmp_path / "rules.json"
+    _write(path, [{"edu_type": 9, "queue": "periodic_report"}])
+    rules = RoutingRules(str(path))
+
+    assert rules.resolve(_model(1))[0] == settings.default_queue
+    assert rules.resolve(_model(1))[0] == settings.default_queue
+    assert rules.get_stats()["unmatched"] == {"1/None/None": 2}
+
+
+def test_unmatched_combinations_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(routing, "MAX_UNMATCHED_KEYS", 2)
+    path = tmp_path / "rules.json"
+    _write(path, [{"edu_type": 9, "queue": "periodic_report"}])
+    rules = RoutingRules(str(path))
+
+    for generation_type in ("A", "B", "C", "D", "x" * 1000):
+        assert rules.route(10, None, generation_type).queue == settings.default_queue
+
+    assert rules.get_stats()["unmatched"] == {"10/None/A": 1, "10/None/B": 1, "other": 3}
+
+
+def test_rule_priority_and_arguments_override(tmp_path):
+    path = tmp_path / "rules.json"
+    _write(path, [{"edu_type": 4, "queue": "listen", "priority": "high", "arguments": {"x-delivery-limit": 3}}])
+    rules = RoutingRules(str(path))
+
+    assert rules.resolve(_model(4)) == ("listen", settings.priority_high)
+    assert rules.table.queue_arguments("listen", settings.priority_low) == {"arguments": {"x-delivery-limit": 3}}
+
+
+def test_default_arguments_only_for_high_priority_queues():
+    """시스템 우선순위는 숫자가 작을수록 높음"""
+    assert default_queue_arguments(settings.priority_high)["arguments"]["x-max-in-memory-length"] == 200000
+    assert default_queue_arguments(settings.priority_medium) == {}
+    assert default_queue_arguments(settings.priority_low) == {}
+
+
+def test_duplicate_rule_is_rejected():
+    with pytest.raises(RoutingRulesError):
+        RoutingTable({"rules": [{"edu_type": [1, 2]}, {"edu_type": 2, "queue": "other"}]})
+
+
+def test_invalid_reload_keeps_previous_table(tmp_path):
+    path = tmp_path / "rules.json"
+    _write(path, [{"edu_type": 9, "queue": "periodic_report"}])
+    rules = RoutingRules(str(path))
+    table = rules.table
+
+    path.write_text("{not json")
+
+    assert rules.reload() is False
+    assert rules.table is table
+    assert rules.get_stats()["reload_failures"] == 1
+
+
+async def test_file_change_swaps_table_and_runs_hook(tmp_path, monkeypatch):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "routing_rules_reload_interval", 0.01)
+    path = tmp_path / "rules.json"
+    _write(path, [{"edu_type": 9, "queue": "periodic_report"}])
+    rules = RoutingRules(str(path))
+    reloaded = asyncio.Event()
+
+    async def on_reload():
+        reloaded.set()
+
+    rules.start(on_reload=on_reload)
+    try:
+        _write(path, [{"edu_type": 9, "queue": "periodic_report_v2"}])
+        os.utime(path, (1, 1))
+        await asyncio.wait_for(reloaded.wait(), timeout=1)
+    finally:
+        await rules.stop()
+
+    assert rules.resolve(_model(9))[0] == "periodic_report_v2"
+    assert rules.get_stats()["reloads"] == 1
@@ -0,0 +1,188 @@
+"""로컬 publish 스풀 테스트"""
+import base64
+import errno
+import json
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services import message_service
+from app.services.async_rabbitmq import PublishNackError, QueueNotFoundError
+from app.services.spool import DEAD_LETTER_FILE, PublishSpool, SpoolDrainer, SpoolFullError
+
+
+def _spool(tmp_path, **kwargs):
+    options = {"segment_bytes": 4096, "max_bytes": 1 << 20, "fsync": False, "max_slots": 2}
+    options.update(kwargs)
+    return PublishSpool(directory=str(tmp_path), **options)
+
+
+def _drain_all(spool):
+    records = []
+    while (item := spool.peek()) is not None:
+        record, position = item
+        records.append(record)
+        spool.commit(position)
+    return records
+
+
+def test_replays_records_in_order_across_segments(tmp_path):
+    spool = _spool(tmp_path, segment_bytes=256)
+    for i in range(20):
+        spool.append("q", f'{{"n": {i}}}'.encode(), priority=2, request_id=f"r{i}")
+
+    assert spool.get_stats()["segments"] > 1
+    records = _drain_all(spool)
+
+    assert [r.request_id for r in records] == [f"r{i}" for i in range(20)]
+    assert records[0].body == b'{"n": 0}'
+    assert spool.get_stats()["depth"] == 0
+
+
+def test_recovers_pending_records_after_restart(tmp_path):
+    spool = _spool(tmp_path)
+    for i in range(3):
+        spool.append("q", b"{}", priority=1, request_id=f"r{i}")
+    record, position = spool.peek()
+    spool.commit(position)
+    spool.close()
+
+    reopened = _spool(tmp_path)
+
+    assert reopened.get_stats()["depth"] == 2
+    assert [r.request_id for r in _drain_all(reopened)] == ["r1", "r2"]
+
+
+def test_skips_torn_tail_record(tmp_path):
+    spool = _spool(tmp_path)
+    spool.append("q", b"{}", priority=1, request_id="ok")
+    spool.append("q", b"{}", priority=1, request_id="torn")
+    path = os.path.join(spool.directory, sorted(os.listdir(spool.directory))[-1])
+    spool.close()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    reopened = _spool(tmp_path)
+
+    assert [r.request_id for r in _drain_all(reopened)] == ["ok"]
+    assert reopened.get_stats()["corrupt_records"] == 1
+
+
+def test_rejects_appends_beyond_max_bytes(tmp_path):
+    spool = _spool(tmp_path, max_bytes=128)
+    spool.append("q", b"x" * 40, priority=1)
+
+    with pytest.raises(SpoolFullError):
+        spool.append("q", b"x" * 100, priority=1)
+
+
+def test_workers_claim_separate_slots(tmp_path):
+    first = _spool(tmp_path)
+    second = _spool(tmp_path)
+
+    assert first.directory != second.directory
+
+
+async def test_drainer_keeps_record_until_publish_succeeds(tmp_path):
+    spool = _spool(tmp_path)
+    spool.append("q", b"{}", priority=1, request_id="r0")
+    results = [False, True]
+    published = []
+
+    async def publish(queue, body, priority):
+        published.append(queue)
+        return results.pop(0)
+
+    drainer = SpoolDrainer(spool, publish, rate=1000)
+
+    assert await drainer.drain_once() is False
+    assert spool.broker_available is False
+    assert spool.get_stats()["depth"] == 1
+
+    assert await drainer.drain_once() is True
+    assert spool.broker_available is True
+    assert spool.get_stats()["depth"] == 0
+    assert published == ["q", "q"]
+
+
+
+@pytest.mark.parametrize("error", [
+    PublishNackError("nack"),
+    QueueNotFoundError("NO_ROUTE"),
+])
+async def test_drainer_dead_letters_rejected_record_and_moves_on(tmp_path, error):
+    spool = _spool(tmp_path)
+    spool.append("poison", b'{"a": 1}', priority=1, request_id="r0")
+    spool.append("q", b"{}", priority=1, request_id="r1")
+    published = []
+
+    async def publish(queue, body, priority):
+        published.append(queue)
+        if queue == "poison":
+            raise error
+        return True
+
+    drainer = SpoolDrainer(spool, publish, rate=1000)
+
+    assert await drainer.drain_once() is True
+    assert spool.broker_available is True
+    assert await drainer.drain_once() is True
+    assert published == ["poison", "q"]
+
+    stats = spool.get_stats()
+    assert stats["depth"] == 0
+    assert stats["dead_lettered"] == 1
+    with open(os.path.join(spool.directory, DEAD_LETTER_FILE)) as f:
+        entry = json.loads(f.readline())
+    assert entry["queue"] == "poison"
+    assert entry["request_id"] == "r0"
+    assert base64.b64decode(entry["body"]) == b'{"a": 1}'
+
+
+async def test_drainer_gives_up_after_max_attempts_without_marking_broker_down(tmp_path):
+    spool = _spool(tmp_path)
+    spool.append("q", b"{}", priority=1, request_id="r0")
+
+    async def publish(queue, body, priority):
+        raise ValueError("bad payload")
+
+    drainer = SpoolDrainer(spool, publish, rate=1000, max_attempts=2)
+
+    assert await drainer.drain_once() is False
+    assert spool.broker_available is True
+    assert spool.get_stats()["depth"] == 1
+    assert await drainer.drain_once() is True
+    assert spool.get_stats()["dead_lettered"] == 1
+    assert spool.get_stats()["depth"] == 0
+
+class _FailingClient:
+    """publish마다 지정한 오류를 내는 가짜 비동기 클라이언트"""
+
+    def __init__(self, error):
+        self.error = error
+
+    async def queue_exists(self, queue_name):
+        return True
+
+    async def send_message(self, exchange, routing_key, body, priority=0, deadline=None):
+        raise self.error
+
+
+@pytest.mark.parametrize("error, broker_available", [
+    (ConnectionError("connection refused"), False),
+    (OSError(errno.EMFILE, "Too many open files"), True),
+])
+async def test_only_connection_errors_mark_broker_unavailable(tmp_path, monkeypatch, error, broker_available):
+    spool = _spool(tmp_path)
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "spool_enabled", True)
+    monkeypatch.setattr(settings._settings_instance, "publish_batching_enabled", False)
+    monkeypatch.setattr(message_service, "get_publish_spool", lambda: spool)
+    monkeypatch.setattr(message_service, "get_async_rabbitmq_client", lambda lane="real_time": _FailingClient(error))
+
+    result = await message_service.MessageService()._deliver_async("q", b"{}", 1, request_id="r0")
+
+    assert result["status"] == 202
+    assert spool.get_stats()["depth"] == 1
+    assert spool.broker_available is broker_available
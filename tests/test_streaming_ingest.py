@@ -0,0 +1,175 @@
+"""스트리밍 요청 본문 수집 테스트 (기존 버퍼링 경로와 비교)"""
+import json
+import warnings
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from fastapi.testclient import TestClient
+
+from app.api.streaming_ingest import StreamingRequestParser
+from app.core import codec
+from app.core.codec import model_to_bytes
+from app.core.config import settings
+from app.core.streaming_json import JSONStreamError, ObjectStreamScanner
+from app.main import create_app
+from app.models.requests import parse_specialized_request
+from app.services import message_service
+from benchmarks.payloads import PAYLOADS
+
+EXTRA = {"request_id": "req-1", "client_ip": "203.0.113.10"}
+BASE = {"edu_key": 1, "member_key": 2}
+
+
+def _chunks(body: bytes, size: int):
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+def _scan(body: bytes, size: int):
+    scanner = ObjectStreamScanner()
+    members = [member for chunk in _chunks(body, size) for member in scanner.feed(chunk)]
+    scanner.close()
+    return members
+
+
+def _stream(body: bytes, size: int = 7, raw_field_bytes: int = 0):
+    parser = StreamingRequestParser(raw_field_bytes=raw_field_bytes)
+    for chunk in _chunks(body, size):
+        parser.feed(chunk)
+    return parser.close(), parser.raw_fields
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 64])
+def test_scanner_splits_members_across_any_chunk_boundary(size):
+    doc = {
+        "a": [{"x": "\\\"}]", "y": [1, {"z": "닫힘 ]"}]}, {}],
+        "b": "q\"\\",
+        "c": -1.5e3,
+        "d": [1, {"e": 2}],
+        "f": {"g": []},
+        "h": None,
+    }
+    body = json.dumps(doc, indent=2, ensure_ascii=False).encode("utf-8")
+
+    members = _scan(body, size)
+
+    assert {member.key: json.loads(member.raw) for member in members} == doc
+    first = members[0]
+    assert [json.loads(first.raw[start:end]) for start, end in first.elements] == doc["a"]
+    assert members[3].elements is None  # 객체가 아닌 원소가 섞인 배열
+    assert body[first.offset:first.offset + len(first.raw)] == first.raw
+
+
+@pytest.mark.parametrize("body, pos", [
+    (b'{"a":1,}', 7),
+    (b'{"a" 1}', 5),
+    (b'{"a":[1}', 7),
+    (b'{"a":1} x', 8),
+    (b'{"a":', 5),
+])
+def test_scanner_reports_structure_errors(body, pos):
+    scanner = ObjectStreamScanner()
+    with pytest.raises(JSONStreamError) as error:
+        scanner.feed(body)
+        scanner.close()
+    assert error.value.pos == pos
+
+
+@pytest.mark.parametrize("name", PAYLOADS)
+def test_message_body_matches_buffered_path(name):
+    body = json.dumps(PAYLOADS[name], ensure_ascii=False).encode("utf-8")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        buffered = parse_specialized_request(codec.loads(body))
+
+    model, raw_fields = _stream(body)
+
+    assert type(model) is type(buffered)
+    assert json.loads(model_to_bytes(model, EXTRA, raw_fields)) == json.loads(model_to_bytes(buffered, EXTRA))
+
+
+def test_large_list_fields_are_kept_as_raw_bytes():
+    history = [{"role": "user", "content": "안녕하세요 " * 10}] * 50
+    body = json.dumps({**BASE, "edu_type": 10, "generation_type": "REPORT", "memory_data_list": history}).encode()
+
+    model, raw_fields = _stream(body, size=4096, raw_field_bytes=1024)
+
+    assert model.memory_data_list is None
+    assert json.loads(raw_fields["memory_data_list"]) == history
+    assert json.loads(model_to_bytes(model, EXTRA, raw_fields))["memory_data_list"] == history
+
+
+def test_invalid_routing_field_fails_before_rest_of_body():
+    parser = StreamingRequestParser()
+
+    with pytest.raises(RequestValidationError) as error:
+        parser.feed(b'{"edu_key": 1, "edu_type": 11, "memory_data_list": [')
+
+    assert error.value.errors()[0]["loc"] == ("body", "edu_type")
+
+
+def test_invalid_element_in_raw_field_is_json_error():
+    body = b'{"edu_key": 1, "edu_type": 10, "member_key": 2, "memory_data_list": [{"a": 1}, {"a": tru}]}'
+
+    with pytest.raises(RequestValidationError) as error:
+        _stream(body)
+
+    assert error.value.errors()[0]["type"] == "json_invalid"
+
+
+class _Batcher:
+    def __init__(self):
+        self.submitted = []
+
+    async def submit(self, queue, body, priority=0, deadline=None):
+        self.submitted.append((queue, json.loads(body)))
+        return True
+
+
+class _Client:
+    async def queue_exists(self, queue_name):
+        return True
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    settings._ensure_loaded()
+    for name, value in {
+        "streaming_ingest_enabled": True,
+        "streaming_ingest_min_bytes": 0,
+        "streaming_ingest_raw_field_bytes": 0,
+        "publish_batching_enabled": True,
+        "spool_enabled": False,
+    }.items():
+        monkeypatch.setattr(settings._settings_instance, name, value)
+    batcher = _Batcher()
+    monkeypatch.setattr(message_service, "get_async_rabbitmq_client", lambda lane="real_time": _Client())
+    monkeypatch.setattr(message_service, "get_publish_batcher", lambda lane="real_time": batcher)
+    return batcher
+
+
+def test_streaming_endpoint_publishes_same_message(streaming):
+    client = TestClient(create_app())
+
+    response = client.post("/", json=PAYLOADS["10-QUESTION"], headers={"X-Request-ID": "req-1"})
+
+    assert response.status_code == 200
+    queue, body = streaming.submitted[0]
+    assert queue == "V3_RESPONSE_GENERATION"
+    assert body["previous_chat_history_data_list"] == PAYLOADS["10-QUESTION"]["previous_chat_history_data_list"]
+    assert body["request_id"] == "req-1"
+
+
+@pytest.mark.parametrize("content, message", [
+    (json.dumps({**BASE, "edu_type": 11}).encode(), "edu_type Value error"),
+    (b"{bad", "1 JSON decode error"),
+    (b"[1]", "body Input should be a valid dictionary"),
+    (b"", "body Field required"),
+])
+def test_streaming_endpoint_errors_match_buffered_shape(streaming, content, message):
+    client = TestClient(create_app())
+
+    response = client.post("/", content=content, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 422
+    assert response.json()["message"].startswith(message)
+    assert not streaming.submitted
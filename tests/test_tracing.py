@@ -0,0 +1,174 @@
+"""트레이싱 테스트 (traceparent 전파, 단계 span, 샘플링, AMQP 헤더, OTLP 형식)"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import (
+    FileSpanExporter,
+    OTLPHttpSpanExporter,
+    configure_tracing,
+    parse_traceparent,
+    shutdown_tracing,
+    start_span,
+)
+from app.main import create_app
+from app.services import message_service, publish_batcher
+from app.services.async_rabbitmq import AsyncRabbitMQClusterClient
+from benchmarks.payloads import PAYLOADS
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+PARENT_ID = "b7ad6b7169203331"
+NODES = [{"host": "mq", "port": 5672, "user": "guest", "password": "guest"}]
+
+
+class _Client:
+    """배처가 flush할 때 메시지별로 넘긴 trace 컨텍스트를 기록하는 클라이언트"""
+
+    def __init__(self):
+        self.contexts = []
+
+    async def queue_exists(self, queue_name):
+        return True
+
+    async def send_batch(self, exchange, routing_key, messages):
+        self.contexts.extend(context for *_, context in messages)
+        return [True] * len(messages)
+
+
+@pytest.fixture
+def spans_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    yield path
+    shutdown_tracing()
+
+
+def _read_spans(path):
+    shutdown_tracing()
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def _post(monkeypatch, headers):
+    settings._ensure_loaded()
+    monkeypatch.setattr(settings._settings_instance, "spool_enabled", False)
+    monkeypatch.setattr(settings._settings_instance, "publish_batching_enabled", True)
+    client = _Client()
+    monkeypatch.setattr(message_service, "get_async_rabbitmq_client", lambda lane="real_time": client)
+    monkeypatch.setattr(publish_batcher, "get_async_rabbitmq_client", lambda lane="real_time": client)
+    response = TestClient(create_app()).post("/", json=PAYLOADS["10-QUESTION"], headers=headers)
+    assert response.status_code == 200
+    return client
+
+
+def test_parse_traceparent():
+    context = parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01")
+    assert context == (TRACE_ID, PARENT_ID, True)
+    assert context.traceparent == f"00-{TRACE_ID}-{PARENT_ID}-01"
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00").sampled is False
+    for invalid in (None, "", "garbage", f"00-{'0' * 32}-{PARENT_ID}-01", f"ff-{TRACE_ID}-{PARENT_ID}-01"):
+        assert parse_traceparent(invalid) is None
+
+
+def test_request_spans_continue_incoming_trace(monkeypatch, spans_file):
+    configure_tracing(True, FileSpanExporter(str(spans_file)), sample_rate=0.0)
+    client = _post(monkeypatch, {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    spans = {span["name"]: span for span in _read_spans(spans_file)}
+    assert {span["trace_id"] for span in spans.values()} == {TRACE_ID}
+    root = spans["POST /"]
+    assert root["kind"] == "server"
+    assert root["parent_id"] == PARENT_ID
+    assert root["attributes"]["http.status_code"] == 200
+    send = spans["send_message_with_model"]
+    assert spans["validation"]["parent_id"] == root["span_id"]
+    assert send["parent_id"] == root["span_id"]
+    assert spans["routing"]["parent_id"] == send["span_id"]
+    assert spans["routing"]["attributes"]["queue"] == "V3_RESPONSE_GENERATION"
+    assert spans["serialization"]["parent_id"] == send["span_id"]
+    assert spans["send_to_queue"]["parent_id"] == send["span_id"]
+    assert spans["publish"]["parent_id"] == spans["send_to_queue"]["span_id"]
+    # 배처의 flush 태스크에서도 제출한 요청의 publish span 아래에서 전송
+    assert [(c.trace_id, c.span_id) for c in client.contexts] == [(TRACE_ID, spans["publish"]["span_id"])]
+
+
+def test_unsampled_trace_propagates_without_export(monkeypatch, spans_file):
+    configure_tracing(True, FileSpanExporter(str(spans_file)), sample_rate=0.0)
+    client = _post(monkeypatch, {})
+
+    assert _read_spans(spans_file) == []
+    [context] = client.contexts
+    assert context.sampled is False
+    assert context.traceparent.endswith("-00")
+
+
+def test_tracing_disabled_is_noop(monkeypatch):
+    configure_tracing(False)
+    client = _post(monkeypatch, {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    assert client.contexts == [None]
+    assert tracing.get_tracing_stats() is None
+
+
+class _FakeExchange:
+    def __init__(self):
+        self.messages = []
+
+    async def publish(self, message, routing_key, mandatory=True, timeout=None):
+        self.messages.append(message)
+
+
+class _FakeChannel:
+    def __init__(self):
+        self.is_closed = False
+        self.default_exchange = _FakeExchange()
+
+
+class _FakeConnection:
+    is_closed = False
+
+    async def close(self):
+        self.is_closed = True
+
+
+async def test_amqp_headers_carry_traceparent(monkeypatch, spans_file):
+    settings._ensure_loaded()
+    monkeypatch.setattr(type(settings._settings_instance), "get_rabbitmq_nodes", lambda self: NODES)
+    monkeypatch.setattr(settings._settings_instance, "rabbitmq_leader_aware", False)
+    configure_tracing(True, FileSpanExporter(str(spans_file)), sample_rate=1.0)
+    client = AsyncRabbitMQClusterClient()
+    client.connection = _FakeConnection()
+    client.channel = _FakeChannel()
+
+    with start_span("send_to_queue") as parent:
+        assert await client.send_message("", "sokind", {"n": 1}, retry_count=0)
+    [message] = client.channel.default_exchange.messages
+
+    [publish] = [span for span in _read_spans(spans_file) if span["name"] == "basic_publish"]
+    assert publish["kind"] == "producer"
+    assert publish["parent_id"] == parent.context.span_id
+    assert message.headers["sender"] == "cdl-gateway"
+    assert message.headers["traceparent"] == f"00-{publish['trace_id']}-{publish['span_id']}-01"
+
+
+def test_otlp_encoding():
+    tracer = configure_tracing(True, FileSpanExporter("/dev/null"), sample_rate=1.0)
+    try:
+        with pytest.raises(ValueError):
+            with tracer.start_span("publish", {"queue": "sokind", "priority": 2, "batched": True}, kind="producer"):
+                raise ValueError("nack")
+    finally:
+        span = tracer.processor._queue.get_nowait()
+        shutdown_tracing()
+
+    exporter = OTLPHttpSpanExporter(endpoint="http://collector:4318/v1/traces", headers="authorization=Bearer x")
+    assert exporter.headers["authorization"] == "Bearer x"
+    [encoded] = json.loads(exporter.encode([span]))["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert encoded["traceId"] == span.context.trace_id
+    assert encoded["kind"] == 4
+    assert "parentSpanId" not in encoded
+    assert encoded["status"] == {"code": 2, "message": "ValueError: nack"}
+    assert {"key": "priority", "value": {"intValue": "2"}} in encoded["attributes"]
+    assert {"key": "batched", "value": {"boolValue": True}} in encoded["attributes"]
+    assert encoded["events"][0]["name"] == "exception"